@@ -28,11 +28,15 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from lingua import Language, LanguageDetectorBuilder
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+from pipeline.util_line_lid import LineLanguageIdentifier  # noqa: E402
 
 # -------------------------------------------------------------------------
 # Config / heuristics
@@ -301,40 +305,49 @@ def extract_lines(item: Any) -> List[str]:
     return []
 
 
-def build_detector() -> Any:
-    """Build Lingua detector restricted to Spanish + English."""
-    return LanguageDetectorBuilder.from_languages(
-        Language.SPANISH, Language.ENGLISH
-    ).build()
+def build_detector(cache_dir: Optional[str] = None) -> LineLanguageIdentifier:
+    """Build the shared cached Lingua line LID restricted to Spanish + English."""
+    return LineLanguageIdentifier(["spanish", "english"], cache_dir=cache_dir)
 
 
-def detect_line(detector: Any, line: str) -> LidLine:
+def detect_line(detector: LineLanguageIdentifier, line: str) -> LidLine:
     """
     Detect language of a line using Lingua.
     Returns LidLine with detected language and confidence.
     """
     text = (line or "").strip()
+    detected_lang, confidence = detector.verdict(text)
 
-    detected_lang = None
-    confidence = None
-
-    if hasattr(detector, "compute_language_confidence_values"):
-        confs = detector.compute_language_confidence_values(text)
-        if confs:
-            top = confs[0]
-            detected_lang = getattr(top, "language", None)
-            confidence = float(getattr(top, "value", 0.0)) if hasattr(top, "value") else None
-    else:
-        detected_lang = detector.detect_language_of(text)
-
-    if detected_lang == Language.SPANISH:
+    if detected_lang == "spanish":
         return LidLine(text=text, detected="es", confidence=confidence)
-    if detected_lang == Language.ENGLISH:
+    if detected_lang == "english":
         return LidLine(text=text, detected="en", confidence=confidence)
 
     return LidLine(text=text, detected="unknown", confidence=confidence)
 
 
+def filter_usable_lines(raw_lines: List[str], max_lines: int) -> Tuple[List[str], List[str], int]:
+    """
+    Drop junk / Genius description lines, keeping at most ``max_lines``.
+    Returns (usable_lines, junk_reasons, description_lines_removed).
+    """
+    usable_lines: List[str] = []
+    junk_reasons: List[str] = []
+    description_lines_removed = 0
+
+    for ln in raw_lines:
+        if len(usable_lines) >= max_lines:
+            break
+        is_j, reasons = line_is_junk(ln)
+        if is_j:
+            junk_reasons.extend(reasons)
+            if "genius_description" in reasons:
+                description_lines_removed += 1
+            continue
+        usable_lines.append(ln)
+    return usable_lines, junk_reasons, description_lines_removed
+
+
 def classify_word(
     token: str,
     item: Dict[str, Any],
@@ -389,20 +402,10 @@ def classify_word(
         return decision, meta
 
     # --- Filter lines ---
-    usable_lines: List[str] = []
     lines_meta: List[LidLine] = []
-    description_lines_removed = 0
-
-    for ln in raw_lines:
-        if len(usable_lines) >= max_lines:
-            break
-        is_j, reasons = line_is_junk(ln)
-        if is_j:
-            junk_reasons.extend(reasons)
-            if "genius_description" in reasons:
-                description_lines_removed += 1
-            continue
-        usable_lines.append(ln)
+    usable_lines, line_junk_reasons, description_lines_removed = filter_usable_lines(
+        raw_lines, max_lines)
+    junk_reasons.extend(line_junk_reasons)
 
     # --- No usable lines after filtering ---
     if not usable_lines:
@@ -501,6 +504,8 @@ def main() -> None:
                     help="Max context lines per word for voting (default: 5)")
     ap.add_argument("--threshold", type=float, default=0.6,
                     help="Vote threshold for es/en (default: 0.6)")
+    ap.add_argument("--lid-cache", default=None,
+                    help="Directory of cached line-LID verdicts (e.g. Artists/spanish/lid_cache)")
     args = ap.parse_args()
 
     in_path = Path(args.input)
@@ -525,8 +530,15 @@ def main() -> None:
 
     print(f"Loaded {len(data)} words from {in_path}")
 
-    detector = build_detector()
-    print("Lingua detector built (Spanish + English)")
+    detector = build_detector(args.lid_cache)
+    # Every voting line of every word goes to lingua in one batch up front.
+    detector.prime(
+        line
+        for item in data.values() if isinstance(item, dict)
+        for line in filter_usable_lines(extract_lines(item), args.max_lines)[0]
+    )
+    detector.save()
+    print(detector.format_report())
 
     # --- Buckets (lists, not dicts — matching input format) ---
     buckets: Dict[str, List[Dict[str, Any]]] = {
@@ -64,7 +64,26 @@ const F = {
   SCHEMA: 23
 };
 const PROGRESS_MIGRATION_PROPERTY = 'FLUENCY_PROGRESS_V4_MIGRATED';
+// Incremental sync. Every Progress write stamps the rows it touches with a
+// server-side revision in a trailing Revision column, outside PROGRESS_HEADERS
+// so the v4 header check and every positional read are unaffected. A dump
+// given `since` returns only rows stamped later. Deletes and migrations leave
+// nothing to stamp, so they change the epoch instead, and a client holding an
+// older epoch gets the whole sheet.
+const PROGRESS_REVISION_HEADER = 'Revision';
+const PROGRESS_REVISION_COLUMN = 17;
+const PROGRESS_REVISION_PROPERTY = 'FLUENCY_PROGRESS_REVISION';
+const PROGRESS_EPOCH_PROPERTY = 'FLUENCY_PROGRESS_EPOCH';
+const PROGRESS_WRITE = { revision: 0, deleted: false };
 const FLAG_MIGRATION_PROPERTY = 'FLUENCY_FLAGS_V2_MIGRATED';
+// Chunked pushes. push_sheets.py sends each bulkSave chunk with a chunkId
+// unique to the chunk within one push plan; a retry of a chunk that already landed (the reply
+// was lost, not the write) is answered from the script cache instead of being
+// written again. CacheService keeps an entry for at most six hours.
+const BULK_CHUNK_CACHE_SECONDS = 21600;
+// Batched writes: dirty rows at most this many rows apart share one setValues
+// range, and the rows between them are rewritten with the values just read.
+const BULK_WRITE_GAP = 25;
 
 const P = {
   USER: 0,
@@ -90,16 +109,16 @@ function doPost(e) {
     const params = JSON.parse(e.postData.contents);
     const action = params.action;
 
-    if (action === 'save') return saveProgress(params);
+    if (action === 'save') return withProgressRevision(saveProgress, params);
     if (action === 'load') return loadProgress(params);
-    if (action === 'delete') return deleteProgress(params);
-    if (action === 'deleteRow') return deleteExactProgressRow(params);
+    if (action === 'delete') return withProgressRevision(deleteProgress, params);
+    if (action === 'deleteRow') return withProgressRevision(deleteExactProgressRow, params);
     if (action === 'dump') return dumpSheet(params);
-    if (action === 'bulkSave') return bulkSave(params);
-    if (action === 'saveItem') return saveItemProgress(params);
+    if (action === 'bulkSave') return withProgressRevision(bulkSave, params);
+    if (action === 'saveItem') return withProgressRevision(saveItemProgress, params);
     if (action === 'loadItems') return loadItemProgress(params);
-    if (action === 'deleteItems') return deleteItemProgress(params);
-    if (action === 'saveMeta') return saveMetaProgress(params);
+    if (action === 'deleteItems') return withProgressRevision(deleteItemProgress, params);
+    if (action === 'saveMeta') return withProgressRevision(saveMetaProgress, params);
     if (action === 'saveSongSet') return saveSongSet(params);
     if (action === 'loadSongSets') return loadSongSets(params);
     if (action === 'deleteSongSet') return deleteSongSet(params);
@@ -284,6 +303,52 @@ function rowTimestamp(row) {
   return latest;
 }
 
+/**
+ * Run one Progress write under the script lock with a fresh revision.
+ *
+ * The lock makes revisions commit in order: a reader can never see revision
+ * N+1 while N is still being written, so "rows after my watermark" never skips
+ * a row. The schema check runs first because a migration takes the same lock.
+ */
+function withProgressRevision(handler, params) {
+  const sheet = getProgressSheet();
+  const lock = LockService.getScriptLock();
+  lock.waitLock(30000);
+  const props = PropertiesService.getScriptProperties();
+  try {
+    PROGRESS_WRITE.revision = Number(props.getProperty(PROGRESS_REVISION_PROPERTY) || 0) + 1;
+    PROGRESS_WRITE.deleted = false;
+    if (sheet.getRange(1, PROGRESS_REVISION_COLUMN).getValue() !== PROGRESS_REVISION_HEADER) {
+      sheet.getRange(1, PROGRESS_REVISION_COLUMN).setValue(PROGRESS_REVISION_HEADER);
+    }
+    const response = handler(params);
+    props.setProperty(PROGRESS_REVISION_PROPERTY, String(PROGRESS_WRITE.revision));
+    if (PROGRESS_WRITE.deleted) resetProgressEpoch(props);
+    return response;
+  } finally {
+    PROGRESS_WRITE.revision = 0;
+    lock.releaseLock();
+  }
+}
+
+/** A row as written: the v4 columns plus the current write's revision. */
+function stampedProgressRow(row) {
+  const stamped = row.slice(0, PROGRESS_HEADERS.length);
+  while (stamped.length < PROGRESS_HEADERS.length) stamped.push('');
+  stamped.push(PROGRESS_WRITE.revision || '');
+  return stamped;
+}
+
+function progressEpoch(props) {
+  return props.getProperty(PROGRESS_EPOCH_PROPERTY) || resetProgressEpoch(props);
+}
+
+function resetProgressEpoch(props) {
+  const epoch = (props.getProperty(PROGRESS_REVISION_PROPERTY) || 0) + '@' + new Date().toISOString();
+  props.setProperty(PROGRESS_EPOCH_PROPERTY, epoch);
+  return epoch;
+}
+
 function findProgressRow(data, key) {
   for (let i = 1; i < data.length; i++) {
     if (progressRowKey(data[i]) === key) return i + 1;
@@ -295,8 +360,9 @@ function upsertProgressRow(row) {
   const sheet = getProgressSheet();
   const data = sheet.getDataRange().getValues();
   const rowIndex = findProgressRow(data, progressRowKey(row));
-  if (rowIndex > 0) sheet.getRange(rowIndex, 1, 1, PROGRESS_HEADERS.length).setValues([row]);
-  else sheet.appendRow(row);
+  const stamped = stampedProgressRow(row);
+  if (rowIndex > 0) sheet.getRange(rowIndex, 1, 1, stamped.length).setValues([stamped]);
+  else sheet.appendRow(stamped);
   return rowIndex > 0 ? 'updated' : 'inserted';
 }
 
@@ -540,6 +606,7 @@ function deleteProgress(params) {
       deleted++;
     }
   }
+  if (deleted) PROGRESS_WRITE.deleted = true;
   return createResponse(true, 'Deleted ' + deleted + ' progress rows');
 }
 
@@ -564,6 +631,7 @@ function deleteItemProgress(params) {
       deleted++;
     }
   }
+  if (deleted) PROGRESS_WRITE.deleted = true;
   return createResponse(true, 'Deleted ' + deleted + ' item progress rows');
 }
 
@@ -589,6 +657,7 @@ function deleteExactProgressRow(params) {
       deleted++;
     }
   }
+  if (deleted) PROGRESS_WRITE.deleted = true;
   return createResponse(true, 'Deleted ' + deleted + ' exact progress rows');
 }
 
@@ -613,7 +682,7 @@ function makeProgressIndex() {
     index[progressRowKey(data[i])] = i + 1;
   }
   return { sheet: sheet, data: data, index: index,
-           nextRow: data.length + 1, pending: [] };
+           nextRow: data.length + 1, dirty: {} };
 }
 
 function existingProgressRowIndexed(params, ctx) {
@@ -621,33 +690,67 @@ function existingProgressRowIndexed(params, ctx) {
   return rowIndex ? ctx.data[rowIndex - 1] : [];
 }
 
+/**
+ * Apply an upsert to the batch's copy of the sheet. Nothing is written until
+ * flushProgressWrites: each setValues or appendRow is a separate round trip to
+ * the Spreadsheets service, and a few hundred of them in one execution makes
+ * Google itself time out ("Service Spreadsheets timed out while accessing
+ * document").
+ */
 function upsertProgressRowIndexed(row, ctx) {
   const key = progressRowKey(row);
-  const rowIndex = ctx.index[key];
-  if (rowIndex) {
-    ctx.sheet.getRange(rowIndex, 1, 1, PROGRESS_HEADERS.length).setValues([row]);
-    ctx.data[rowIndex - 1] = row;
-    return 'updated';
+  let rowIndex = ctx.index[key];
+  const kind = rowIndex ? 'updated' : 'inserted';
+  if (!rowIndex) {
+    rowIndex = ctx.nextRow;
+    ctx.index[key] = rowIndex;
+    ctx.nextRow += 1;
+  }
+  ctx.data[rowIndex - 1] = stampedProgressRow(row);
+  ctx.dirty[rowIndex] = true;
+  return kind;
+}
+
+function flushProgressWrites(ctx) {
+  writeRowRuns(ctx.sheet, ctx.data, ctx.dirty, PROGRESS_REVISION_COLUMN);
+  ctx.dirty = {};
+}
+
+/**
+ * Write the dirty rows of `data` (1-based sheet row numbers as keys) back to
+ * `sheet`, one setValues per run of rows no more than BULK_WRITE_GAP apart.
+ * Appended rows are just dirty rows past the end, so a batch of inserts is a
+ * single range. Returns the number of ranges written.
+ */
+function writeRowRuns(sheet, data, dirty, width) {
+  const rows = Object.keys(dirty).map(Number).sort(function(a, b) { return a - b; });
+  let ranges = 0;
+  let start = 0;
+  for (let i = 1; i <= rows.length; i++) {
+    if (i < rows.length && rows[i] - rows[i - 1] <= BULK_WRITE_GAP + 1) continue;
+    const values = [];
+    for (let r = rows[start]; r <= rows[i - 1]; r++) {
+      const row = (data[r - 1] || []).slice(0, width);
+      while (row.length < width) row.push('');
+      values.push(row);
+    }
+    sheet.getRange(rows[start], 1, values.length, width).setValues(values);
+    ranges++;
+    start = i;
   }
-  // Queue the append instead of calling appendRow per row. Each appendRow is a
-  // separate round trip to the Spreadsheets service, and a few hundred of them
-  // in one execution makes Google itself time out ("Service Spreadsheets timed
-  // out while accessing document"). flushProgressAppends writes them all with a
-  // single setValues.
-  ctx.pending.push(row);
-  ctx.index[key] = ctx.nextRow;
-  ctx.data.push(row);
-  ctx.nextRow += 1;
-  return 'inserted';
-}
-
-function flushProgressAppends(ctx) {
-  if (!ctx.pending.length) return;
-  ctx.sheet
-    .getRange(ctx.nextRow - ctx.pending.length, 1,
-              ctx.pending.length, PROGRESS_HEADERS.length)
-    .setValues(ctx.pending);
-  ctx.pending = [];
+  return ranges;
+}
+
+/** The stored reply of a bulkSave chunk already applied, else null. */
+function bulkChunkReply(params) {
+  if (!params.chunkId) return null;
+  return CacheService.getScriptCache().get('bulkSave:' + params.sheet + ':' + params.chunkId);
+}
+
+function rememberBulkChunk(params, message) {
+  if (!params.chunkId) return;
+  CacheService.getScriptCache().put('bulkSave:' + params.sheet + ':' + params.chunkId,
+                                    message, BULK_CHUNK_CACHE_SECONDS);
 }
 
 function bulkSave(params) {
@@ -655,9 +758,18 @@ function bulkSave(params) {
   if (!rows || !Array.isArray(rows) || rows.length === 0) {
     return createResponse(false, 'Missing or empty rows array');
   }
-  if (params.sheet === 'FlaggedWords') return bulkSaveFlaggedWords(rows);
+  const replayed = bulkChunkReply(params);
+  if (replayed !== null) {
+    return createResponse(true, replayed, { chunkId: params.chunkId, replayed: true });
+  }
+  const message = params.sheet === 'FlaggedWords'
+    ? bulkSaveFlaggedWords(rows)
+    : bulkSaveProgress(rows, legacySheetMode(params.sheet));
+  rememberBulkChunk(params, message);
+  return createResponse(true, message, { chunkId: params.chunkId || '', replayed: false });
+}
 
-  const legacyMode = legacySheetMode(params.sheet);
+function bulkSaveProgress(rows, legacyMode) {
   const ctx = makeProgressIndex();
   let updated = 0;
   let inserted = 0;
@@ -731,19 +843,13 @@ function bulkSave(params) {
     if (responseKind === 'updated') updated++;
     else if (responseKind === 'inserted') inserted++;
   });
-  flushProgressAppends(ctx);
-  return createResponse(true, 'Bulk save complete: ' + updated + ' updated, ' + inserted + ' inserted');
+  flushProgressWrites(ctx);
+  return 'Bulk save complete: ' + updated + ' updated, ' + inserted + ' inserted';
 }
 
 function dumpSheet(params) {
   const requested = params.sheet || PROGRESS_SHEET_NAME;
-  if (requested === PROGRESS_SHEET_NAME) {
-    const data = getProgressSheet().getDataRange().getValues();
-    return createResponse(true, 'Sheet dumped successfully', {
-      headers: data[0] || PROGRESS_HEADERS,
-      rows: data.slice(1)
-    });
-  }
+  if (requested === PROGRESS_SHEET_NAME) return dumpProgress(params);
   const ss = SpreadsheetApp.getActiveSpreadsheet();
   // Flags migrate on read as well as on write: sync_sheets.py dumps the tab
   // before anything has been flagged, and must not receive the v1 shape.
@@ -764,6 +870,43 @@ function dumpSheet(params) {
   });
 }
 
+/**
+ * Progress rows, whole or incremental.
+ *
+ * With `since` and a matching `epoch`, only rows stamped after revision
+ * `since` are returned (`full: false`); otherwise every row (`full: true`).
+ * Either way the reply carries the `revision` and `epoch` to ask from next.
+ */
+function dumpProgress(params) {
+  const sheet = getProgressSheet();
+  const props = PropertiesService.getScriptProperties();
+  const lock = LockService.getScriptLock();
+  lock.waitLock(30000);
+  let data;
+  let revision;
+  let epoch;
+  try {
+    data = sheet.getDataRange().getValues();
+    revision = Number(props.getProperty(PROGRESS_REVISION_PROPERTY) || 0);
+    epoch = progressEpoch(props);
+  } finally {
+    lock.releaseLock();
+  }
+  const since = Number(params.since);
+  const full = params.since === undefined || params.since === null || !isFinite(since)
+    || params.epoch !== epoch;
+  const rows = full ? data.slice(1) : data.slice(1).filter(function(row) {
+    return Number(row[PROGRESS_REVISION_COLUMN - 1] || 0) > since;
+  });
+  return createResponse(true, 'Sheet dumped successfully', {
+    headers: data[0] || PROGRESS_HEADERS,
+    rows: rows,
+    full: full,
+    revision: revision,
+    epoch: epoch
+  });
+}
+
 function getProgressSheet() {
   return ensureProgressSchema(false).sheet;
 }
@@ -837,6 +980,9 @@ function ensureProgressSchema(force) {
     if (rows.length > 0) sheet.getRange(2, 1, rows.length, PROGRESS_HEADERS.length).setValues(rows);
     formatProgressSheet(sheet);
     props.setProperty(PROGRESS_MIGRATION_PROPERTY, '1');
+    // Every row was rewritten without its revision: incremental readers must
+    // start over.
+    resetProgressEpoch(props);
     return {
       sheet: sheet,
       summary: { migrated: true, rows: rows.length, legacyRows: migratedCounts }
@@ -1245,24 +1391,34 @@ function deleteFlaggedWord(params) {
   return createResponse(true, 'Deleted ' + deleted + ' flagged rows');
 }
 
+/** Upsert flag rows against one read of the sheet, written back in ranges. */
 function bulkSaveFlaggedWords(rows) {
   let updated = 0;
   let inserted = 0;
   const sheet = getOrCreateFlaggedWordsSheet();
+  const data = sheet.getDataRange().getValues();
+  const index = {};
+  for (let i = data.length - 1; i >= 1; i--) {
+    index[data[i][F.USER] + '|' + String(data[i][F.WORD_ID])] = i + 1;
+  }
+  const dirty = {};
   rows.forEach(function(row) {
     if (!row.user || row.wordId === undefined || String(row.wordId) === '') return;
-    const data = sheet.getDataRange().getValues();
-    const rowIndex = findFlagRowIndex(data, row.user, row.wordId);
-    const values = buildFlagRow(row, rowIndex > 0 ? data[rowIndex - 1] : null);
-    if (rowIndex > 0) {
-      sheet.getRange(rowIndex, 1, 1, values.length).setValues([values]);
+    const key = row.user + '|' + String(row.wordId);
+    let rowIndex = index[key];
+    const values = buildFlagRow(row, rowIndex ? data[rowIndex - 1] : null);
+    if (rowIndex) {
       updated++;
     } else {
-      sheet.appendRow(values);
+      rowIndex = data.length + 1;
+      index[key] = rowIndex;
       inserted++;
     }
+    data[rowIndex - 1] = values;
+    dirty[rowIndex] = true;
   });
-  return createResponse(true, 'Bulk save complete: ' + updated + ' updated, ' + inserted + ' inserted');
+  writeRowRuns(sheet, data, dirty, FLAGGED_WORDS_HEADERS.length);
+  return 'Bulk save complete: ' + updated + ' updated, ' + inserted + ' inserted';
 }
 
 /** Preserve a real zero while leaving legacy/migration rows blank. */
@@ -13,7 +13,9 @@ already knows.
 
 Cards an earlier migration had already retired are followed through
 superseded_by to whichever card is live now — the mapping only lists the cards
-that were active when it was generated.
+that were active when it was generated. Records are read through
+CardIdentityRegistry.reader, so merges still in cards.journal.jsonl (not yet
+compacted into cards.json) are followed too.
 
 Writes into backend/local/Progress.json so push_sheets.py does the upload.
 
@@ -26,12 +28,17 @@ import argparse
 import json
 import os
 import shutil
+import sys
 import unicodedata
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, REPO)
+
+from pipeline.util_identity_registry import CardIdentityRegistry  # noqa: E402
+
 LOCAL_DIR = os.path.join(SCRIPT_DIR, 'local')
 PROGRESS = os.path.join(LOCAL_DIR, 'Progress.json')
 MAPPING = os.path.join(REPO, 'Artists/spanish/evidence/artist_surface_id_migration.json')
@@ -71,12 +78,17 @@ def strength(row):
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--progress', default=PROGRESS)
+    ap.add_argument('--mapping', default=MAPPING)
+    ap.add_argument('--registry', default=REGISTRY)
+    ap.add_argument('--master', default=MASTER)
     ap.add_argument('--dry-run', action='store_true')
     args = ap.parse_args()
 
-    mapping = dict(json.load(open(MAPPING, encoding='utf-8'))['mapping'])
-    records = json.load(open(REGISTRY, encoding='utf-8'))['records']
-    master = json.load(open(MASTER, encoding='utf-8'))
+    mapping = dict(json.load(open(args.mapping, encoding='utf-8'))['mapping'])
+    # cards.json alone is only the last compaction; the reader folds in the
+    # journal, where tool_migrate_artist_surface_ids records its merges.
+    records = CardIdentityRegistry.reader(args.registry, 'spanish')
+    master = json.load(open(args.master, encoding='utf-8'))
 
     def destination(card_id, limit=10):
         seen = set()
@@ -192,7 +204,8 @@ def main():
 
     stamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H%MZ')
     shutil.copy2(args.progress,
-                 os.path.join(LOCAL_DIR, 'Progress.pre_artist_migration.%s.json' % stamp))
+                 os.path.join(os.path.dirname(os.path.abspath(args.progress)),
+                              'Progress.pre_artist_migration.%s.json' % stamp))
     if isinstance(payload, dict) and 'rows' in payload:
         payload['rows'] = merged_rows
         out = payload
@@ -0,0 +1,172 @@
+#!/usr/bin/env node
+'use strict';
+
+// In-memory stand-in for the Apps Script runtime around GoogleAppsScript.js.
+// The backend source runs unmodified against fake SpreadsheetApp /
+// PropertiesService / CacheService / LockService / ContentService objects, so the tests and
+// the Python sync tools can exercise the real request handlers offline.
+//
+//     node backend/apps_script_stub.js [--port N]
+//
+// serves doPost on http://127.0.0.1:N/ (N=0 picks a free port) and prints
+// "listening <port>" once ready. Point secrets.json's googleScriptUrl at it.
+const assert = require('node:assert/strict');
+const fs = require('node:fs');
+const http = require('node:http');
+const vm = require('node:vm');
+const path = require('node:path');
+
+class Range {
+    constructor(sheet, row, column, rowCount = 1, columnCount = 1) {
+        this.sheet = sheet;
+        this.row = row;
+        this.column = column;
+        this.rowCount = rowCount;
+        this.columnCount = columnCount;
+    }
+    getValues() {
+        this.sheet.spreadsheet.calls.getValues++;
+        return Array.from({ length: this.rowCount }, (_, rowOffset) =>
+            Array.from({ length: this.columnCount }, (_, columnOffset) =>
+                this.sheet.rows[this.row - 1 + rowOffset]?.[this.column - 1 + columnOffset] ?? ''));
+    }
+    setValues(values) {
+        this.sheet.spreadsheet.calls.setValues++;
+        assert.equal(values.length, this.rowCount, 'setValues row count');
+        for (let r = 0; r < this.rowCount; r++) {
+            assert.equal(values[r].length, this.columnCount, 'setValues column count');
+            const targetRow = this.row - 1 + r;
+            while (this.sheet.rows.length <= targetRow) this.sheet.rows.push([]);
+            for (let c = 0; c < this.columnCount; c++) {
+                this.sheet.rows[targetRow][this.column - 1 + c] = values[r][c];
+            }
+        }
+        return this;
+    }
+    getValue() { return this.getValues()[0][0]; }
+    setValue(value) { return this.setValues([[value]]); }
+    setFontWeight() { return this; }
+}
+
+class Sheet {
+    constructor(spreadsheet, name, rows = []) {
+        this.spreadsheet = spreadsheet;
+        this.name = name;
+        this.rows = rows.map(row => row.slice());
+    }
+    getName() { return this.name; }
+    setName(nextName) {
+        delete this.spreadsheet.sheets[this.name];
+        this.name = nextName;
+        this.spreadsheet.sheets[nextName] = this;
+        return this;
+    }
+    getLastRow() { return this.rows.length; }
+    getLastColumn() { return Math.max(0, ...this.rows.map(row => row.length)); }
+    getDataRange() {
+        const columns = Math.max(1, ...this.rows.map(row => row.length));
+        return new Range(this, 1, 1, Math.max(1, this.rows.length), columns);
+    }
+    getRange(row, column, rowCount = 1, columnCount = 1) {
+        return new Range(this, row, column, rowCount, columnCount);
+    }
+    appendRow(row) {
+        this.spreadsheet.calls.appendRow++;
+        this.rows.push(row.slice());
+        return this;
+    }
+    deleteRow(row) { this.rows.splice(row - 1, 1); }
+    clearContents() { this.rows = []; return this; }
+    setFrozenRows() { return this; }
+    autoResizeColumns() { return this; }
+}
+
+class Spreadsheet {
+    constructor(seed) {
+        this.sheets = {};
+        this.calls = { getValues: 0, setValues: 0, appendRow: 0 };
+        for (const [name, rows] of Object.entries(seed)) {
+            this.sheets[name] = new Sheet(this, name, rows);
+        }
+    }
+    getSheetByName(name) { return this.sheets[name] || null; }
+    getSheets() { return Object.values(this.sheets); }
+    insertSheet(name) {
+        assert.equal(this.getSheetByName(name), null, `duplicate sheet ${name}`);
+        const sheet = new Sheet(this, name);
+        this.sheets[name] = sheet;
+        return sheet;
+    }
+}
+
+/** Load GoogleAppsScript.js against a fresh in-memory spreadsheet. */
+function loadBackend(seed = {}) {
+    const spreadsheet = new Spreadsheet(seed);
+    const properties = new Map();
+    const cache = new Map();
+    const context = {
+        console,
+        Date,
+        JSON,
+        isFinite,
+        SpreadsheetApp: { getActiveSpreadsheet: () => spreadsheet },
+        PropertiesService: {
+            getScriptProperties: () => ({
+                getProperty: key => properties.get(key) ?? null,
+                setProperty: (key, value) => properties.set(key, String(value)),
+                deleteProperty: key => properties.delete(key)
+            })
+        },
+        CacheService: {
+            getScriptCache: () => ({
+                get: key => cache.get(key) ?? null,
+                put: (key, value) => cache.set(key, String(value))
+            })
+        },
+        LockService: {
+            getScriptLock: () => ({ waitLock() {}, releaseLock() {} })
+        },
+        ContentService: {
+            MimeType: { JSON: 'application/json' },
+            createTextOutput: text => ({
+                text,
+                setMimeType() { return this; }
+            })
+        }
+    };
+    vm.createContext(context);
+    const source = fs.readFileSync(path.join(__dirname, 'GoogleAppsScript.js'), 'utf8');
+    vm.runInContext(source, context, { filename: 'GoogleAppsScript.js' });
+
+    function post(payload) {
+        const response = context.doPost({ postData: { contents: JSON.stringify(payload) } });
+        return JSON.parse(response.text);
+    }
+    return { context, spreadsheet, properties, cache, post };
+}
+
+function serve(port = 0, seed = {}) {
+    const backend = loadBackend(seed);
+    const server = http.createServer((req, res) => {
+        let body = '';
+        req.on('data', chunk => { body += chunk; });
+        req.on('end', () => {
+            const text = req.method === 'POST'
+                ? backend.context.doPost({ postData: { contents: body } }).text
+                : backend.context.doGet().text;
+            res.writeHead(200, { 'Content-Type': 'application/json' });
+            res.end(text);
+        });
+    });
+    server.listen(port, '127.0.0.1', () => {
+        console.log(`listening ${server.address().port}`);
+    });
+    return { server, backend };
+}
+
+module.exports = { Range, Sheet, Spreadsheet, loadBackend, serve };
+
+if (require.main === module) {
+    const at = process.argv.indexOf('--port');
+    serve(at > 0 ? Number(process.argv[at + 1]) : 0);
+}
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Chunked, resumable bulkSave pushes, used by push_sheets.
+
+A push plans its upserts as chunks and journals the plan in local/push_journal/<sheet>.json before sending
+anything. Chunks go out a few at a time; each confirmation is journalled as it
+arrives, so an interrupted push (timeout, dropped connection, Ctrl-C) can be
+finished with `push_sheets.py --resume` by sending only the chunks never
+confirmed.
+
+A chunk whose reply was lost may still have been written. Retrying it is safe:
+the backend caches the reply of every chunkId it applies (GoogleAppsScript.js,
+bulkChunkReply) and answers a repeat from the cache without writing again.
+
+A chunk id hashes the chunk's rows with a nonce drawn once per plan and kept
+in the journal. Retries and --resume of that plan reuse its ids. A later push
+of the same rows gets new ones, so the six-hour reply cache cannot answer it
+as already applied: the rows may have changed in the sheet since, been
+deleted, or be pushed again with --replace.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+JOURNAL_DIR = os.path.join(SCRIPT_DIR, 'local', 'push_journal')
+# Writes serialize on the backend's script lock, so more requests in flight
+# overlap only the transport and Apps Script start-up, and each waiting request
+# uses up part of the 30-second lock wait.
+PUSH_WORKERS = 3
+ATTEMPTS = 4
+
+
+class ChunkFailed(Exception):
+    pass
+
+
+def chunk_id(sheet_name, rows, nonce):
+    payload = json.dumps([sheet_name, nonce, rows], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:20]
+
+
+def plan_chunks(sheet_name, rows, size, nonce):
+    return [{'id': chunk_id(sheet_name, rows[start:start + size], nonce),
+             'rows': rows[start:start + size]}
+            for start in range(0, len(rows), size)]
+
+
+def journal_path(sheet_name):
+    return os.path.join(JOURNAL_DIR, f'{sheet_name}.json')
+
+
+def new_journal(sheet_name, rows, size):
+    """A fresh plan for pushing `rows` in chunks of `size`, under a new nonce."""
+    nonce = secrets.token_hex(8)
+    return {
+        'planned_at': datetime.utcnow().isoformat() + 'Z',
+        'sheet': sheet_name,
+        'nonce': nonce,
+        'chunks': plan_chunks(sheet_name, rows, size, nonce),
+        'confirmed': [],
+    }
+
+
+def load_journal(sheet_name):
+    path = journal_path(sheet_name)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_journal(journal):
+    """Write atomically, so an interrupt never leaves half a journal."""
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+    path = journal_path(journal['sheet'])
+    with open(path + '.tmp', 'w') as f:
+        json.dump(journal, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def clear_journal(sheet_name):
+    path = journal_path(sheet_name)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def post_chunk(request, sheet_name, chunk, attempts=ATTEMPTS, backoff=3):
+    """The backend's reply to one chunk, retried with backoff until it succeeds.
+
+    `request(payload)` returns the decoded reply and raises OSError or
+    ValueError when the transport fails. Every failure is retried, whether
+    it is a lock wait, a Spreadsheets service timeout or the doGet
+    fallthrough, because a chunk is safe to resend.
+    """
+    message = ''
+    for attempt in range(1, attempts + 1):
+        try:
+            reply = request({'action': 'bulkSave', 'sheet': sheet_name,
+                             'chunkId': chunk['id'], 'rows': chunk['rows']})
+        except (OSError, ValueError) as e:
+            message = str(e)
+        else:
+            if reply.get('success'):
+                return reply
+            message = str(reply.get('message'))
+        if attempt < attempts:
+            time.sleep(backoff * attempt)
+    raise ChunkFailed(f"chunk {chunk['id']} failed after {attempts} attempts: {message}")
+
+
+def push_chunks(request, journal, workers=PUSH_WORKERS, attempts=ATTEMPTS, backoff=3):
+    """Send a journal's unconfirmed chunks, at most `workers` at a time.
+
+    Returns None once every chunk is confirmed (and the journal removed), else
+    the first failure. After a failure, no new chunk is started. Chunks
+    already in flight still finish and are journalled.
+    """
+    sheet_name = journal['sheet']
+    confirmed = set(journal['confirmed'])
+    pending = [c for c in journal['chunks'] if c['id'] not in confirmed]
+    total = sum(len(c['rows']) for c in journal['chunks'])
+    written = total - sum(len(c['rows']) for c in pending)
+    error = None
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(post_chunk, request, sheet_name, chunk, attempts, backoff): chunk
+                   for chunk in pending}
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            chunk = futures[future]
+            try:
+                reply = future.result()
+            except ChunkFailed as e:
+                error = error or str(e)
+                for other in futures:
+                    other.cancel()
+                continue
+            journal['confirmed'].append(chunk['id'])
+            save_journal(journal)
+            written += len(chunk['rows'])
+            replayed = (reply.get('data') or {}).get('replayed')
+            print(f"    {written}/{total} — {reply.get('message')}"
+                  + (' (already applied)' if replayed else ''), flush=True)
+    if error is None:
+        clear_journal(sheet_name)
+    return error
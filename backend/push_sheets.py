@@ -10,6 +10,12 @@ Usage:
     python3 backend/push_sheets.py --sheet Progress         # dry-run progress
     python3 backend/push_sheets.py --confirm                # push changes (with prompt)
     python3 backend/push_sheets.py --replace --confirm      # also delete remote-only rows
+    python3 backend/push_sheets.py --full                   # re-fetch the remote in full
+    python3 backend/push_sheets.py --resume --confirm       # finish an interrupted push
+
+The remote side of the diff is rebuilt from the last pull plus the rows the
+backend stamped since (sheet_delta.py), not re-downloaded whole. Upserts go out
+as journalled, retryable chunks (bulk_push.py).
 """
 
 import argparse
@@ -20,6 +26,10 @@ import time
 import urllib.request
 import urllib.error
 from datetime import datetime
+from functools import partial
+
+from bulk_push import PUSH_WORKERS, load_journal, new_journal, push_chunks, save_journal
+from sheet_delta import pull, row_key
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SECRETS_PATH = os.path.join(SCRIPT_DIR, 'secrets.json')
@@ -56,6 +66,7 @@ HEADER_ALIASES = {
     'correct': 'correct', 'wrong': 'wrong', 'lastcorrect': 'lastCorrect',
     'lastwrong': 'lastWrong', 'lastseen': 'lastSeen',
     'schemaversion': 'schemaVersion', 'srsstage': 'srsStage', 'value': 'value',
+    'revision': 'revision',
     # FlaggedWords v2. The sheet's Word column maps to `wordText` because the
     # backend reserves the `word` payload key for the v1 report-blob contract.
     'flaggedat': 'flaggedAt', 'lemma': 'lemma', 'cardid': 'cardId',
@@ -104,7 +115,8 @@ def load_script_url():
 BULK_CHUNK = 50   # rows per bulkSave request
 
 
-def post_json(script_url, payload, timeout=60):
+def request_json(script_url, payload, timeout=60):
+    """POST a payload and decode the reply. Transport errors propagate."""
     data = json.dumps(payload).encode()
     req = urllib.request.Request(
         script_url,
@@ -112,9 +124,13 @@ def post_json(script_url, payload, timeout=60):
         headers={'Content-Type': 'application/json'},
         method='POST'
     )
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read().decode())
+
+
+def post_json(script_url, payload, timeout=60):
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return json.loads(resp.read().decode())
+        return request_json(script_url, payload, timeout=timeout)
     except urllib.error.URLError as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -129,8 +145,8 @@ def load_local(sheet_name):
         return json.load(f)
 
 
-def dump_remote(script_url, sheet_name, attempts=5):
-    """Fetch the sheet, retrying the transient doGet fallthrough.
+def fetch_dump(script_url, sheet_name, attempts=5, **params):
+    """Fetch a dump reply's data, retrying the transient doGet fallthrough.
 
     Apps Script answers a POST by redirecting to a googleusercontent URL that
     serves the result. Intermittently — cold starts, and more often on the large
@@ -140,7 +156,7 @@ def dump_remote(script_url, sheet_name, attempts=5):
     """
     body = None
     for attempt in range(1, attempts + 1):
-        body = post_json(script_url, {'action': 'dump', 'sheet': sheet_name},
+        body = post_json(script_url, {'action': 'dump', 'sheet': sheet_name, **params},
                          timeout=180)
         if body.get('success') and body.get('data'):
             break
@@ -154,11 +170,14 @@ def dump_remote(script_url, sheet_name, attempts=5):
     if not body.get('success'):
         print(f"API error: {body.get('message')}")
         sys.exit(1)
-    headers = body['data'].get('headers', [])
+    return body['data']
+
+
+def rows_to_objects(headers, raw_rows):
     keys = [HEADER_ALIASES.get(str(header).lower(), f'col{i}')
             for i, header in enumerate(headers)]
     rows = []
-    for raw_row in body['data']['rows']:
+    for raw_row in raw_rows:
         obj = {}
         for i, val in enumerate(raw_row):
             key = keys[i] if i < len(keys) else f'col{i}'
@@ -167,6 +186,16 @@ def dump_remote(script_url, sheet_name, attempts=5):
     return rows
 
 
+def dump_remote(script_url, sheet_name, full=False):
+    """The remote rows as objects, fetching only what changed since the last pull."""
+    headers, rows, fetched, was_full = pull(
+        partial(fetch_dump, script_url), sheet_name, rows_to_objects, full=full)
+    if not was_full:
+        print(f"  {fetched} rows changed remotely since the last pull; "
+              f"{len(rows)} in total")
+    return rows_to_objects(headers, rows)
+
+
 def backup_remote(sheet_name, remote_rows):
     """Save a timestamped backup of the remote state before pushing."""
     os.makedirs(BACKUP_DIR, exist_ok=True)
@@ -184,23 +213,6 @@ def backup_remote(sheet_name, remote_rows):
     return path
 
 
-def row_key(row, sheet_name):
-    if sheet_name == 'Progress':
-        item_type = str(row.get('itemType', 'sense')).lower()
-        if item_type == 'expression':
-            item_type = 'mwe'
-        mode = str(row.get('mode', 'normal'))
-        if item_type == 'meta':
-            return '|'.join((
-                str(row.get('user', '')), item_type, mode,
-                str(row.get('source', '')), str(row.get('language', '')),
-                str(row.get('label', '')), str(row.get('itemId', ''))
-            ))
-        return '|'.join((str(row.get('user', '')), item_type, mode,
-                         str(row.get('itemId', ''))))
-    return f"{row.get('user', '')}|{row.get('wordId', '')}"
-
-
 def rows_differ(local_row, remote_row, sheet_name):
     for k in sheet_keys(sheet_name):
         lv = local_row.get(k, '')
@@ -251,6 +263,35 @@ def print_changeset(sheet_name, to_upsert, to_delete, remote_count, local_count)
         print(f"    No changes")
 
 
+def send_journal(script_url, journal, workers):
+    error = push_chunks(partial(request_json, script_url, timeout=300), journal, workers)
+    if error:
+        print(f"    Error: {error}")
+        print(f"    {len(journal['confirmed'])}/{len(journal['chunks'])} chunks confirmed; "
+              f"rerun with --resume --confirm to send the rest.")
+    return error is None
+
+
+def resume(script_url, sheets, args):
+    """Send the unconfirmed chunks of interrupted pushes, as they were planned."""
+    journals = [j for j in (load_journal(sheet_name) for sheet_name in sheets) if j]
+    if not journals:
+        print("No interrupted push to resume.")
+        return
+    for journal in journals:
+        rows = sum(len(c['rows']) for c in journal['chunks']
+                   if c['id'] not in journal['confirmed'])
+        print(f"  {journal['sheet']}: {len(journal['confirmed'])}/{len(journal['chunks'])} "
+              f"chunks confirmed; {rows} rows left (planned {journal['planned_at']})")
+    if not args.confirm:
+        print("\nDry run — no changes made. Use --resume --confirm to send them.")
+        return
+    for journal in journals:
+        print(f"  Resuming {journal['sheet']}...")
+        send_journal(script_url, journal, args.workers)
+    print("\nDone.")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Push local JSON data back to Google Sheets')
     parser.add_argument('--sheet', choices=PUSHABLE_SHEETS,
@@ -259,19 +300,38 @@ def main():
     parser.add_argument('--confirm', action='store_true', help='Actually push (default: dry-run)')
     parser.add_argument('--replace', action='store_true',
                         help='Replace entire sheet with local data (deletes remote-only rows)')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-fetch the whole remote sheet instead of the rows changed '
+                             'since the last pull')
+    parser.add_argument('--resume', action='store_true',
+                        help='Send the unconfirmed chunks of an interrupted push instead of '
+                             'computing a new changeset')
+    parser.add_argument('--workers', type=int, default=PUSH_WORKERS,
+                        help=f'Chunks in flight at once (default: {PUSH_WORKERS})')
     args = parser.parse_args()
 
     sheets = [args.sheet] if args.sheet else SHEETS
     script_url = load_script_url()
 
+    if args.resume:
+        resume(script_url, sheets, args)
+        return
+
     all_changesets = {}
 
     for sheet_name in sheets:
         local_data = load_local(sheet_name)
         local_rows = local_data.get('rows', [])
 
+        interrupted = load_journal(sheet_name)
+        if interrupted:
+            left = len(interrupted['chunks']) - len(interrupted['confirmed'])
+            print(f"  Note: an interrupted push of {sheet_name} left {left} chunk(s) "
+                  f"unconfirmed. This run diffs afresh and replaces it; "
+                  f"--resume sends them as planned.")
+
         print(f"Fetching current {sheet_name} from Sheets...")
-        remote_rows = dump_remote(script_url, sheet_name)
+        remote_rows = dump_remote(script_url, sheet_name, full=args.full)
 
         to_upsert, to_delete = compute_changeset(local_rows, remote_rows, sheet_name)
 
@@ -313,28 +373,14 @@ def main():
             print(f"  Pushing {len(to_upsert)} rows to {sheet_name}...")
             rows_payload = ([flag_push_payload(r) for r in to_upsert]
                             if sheet_name == 'FlaggedWords' else to_upsert)
-            # Chunked: Apps Script spends ~2.4s per row, so one request for
-            # 400+ rows blows through both the client timeout and Apps Script's
-            # own 6-minute execution ceiling — and a timeout there leaves a
-            # partial write with no report of how far it got. Each chunk is its
-            # own request; the changeset is recomputed on the next run, so an
-            # interrupted push resumes rather than duplicating.
-            written = 0
-            for start in range(0, len(rows_payload), BULK_CHUNK):
-                chunk = rows_payload[start:start + BULK_CHUNK]
-                result = post_json(script_url, {
-                    'action': 'bulkSave',
-                    'sheet': sheet_name,
-                    'rows': chunk
-                }, timeout=300)
-                if result.get('success'):
-                    written += len(chunk)
-                    print(f"    {written}/{len(rows_payload)} — {result['message']}",
-                          flush=True)
-                else:
-                    print(f"    Error after {written}/{len(rows_payload)}: "
-                          f"{result.get('message')}")
-                    break
+            # Chunked: one request for 400+ rows blows through both the client
+            # timeout and Apps Script's own 6-minute execution ceiling, and a
+            # timeout there leaves a partial write with no report of how far it
+            # got. The plan is journalled first, so --resume can send exactly
+            # the chunks that were never confirmed.
+            journal = new_journal(sheet_name, rows_payload, BULK_CHUNK)
+            save_journal(journal)
+            send_journal(script_url, journal, args.workers)
 
         if to_delete:
             print(f"  Deleting {len(to_delete)} rows from {sheet_name} "
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Incremental pulls of the Progress tab, shared by sync_sheets and push_sheets.
+
+The backend stamps each Progress row with the revision of the write that last
+touched it (GoogleAppsScript.js, dumpProgress). This module keeps a pristine
+copy of the remote rows as last pulled, with the revision/epoch watermark, in
+local/remote/<sheet>.json. That is separate from local/<sheet>.json, which is
+the working copy edited before a push.
+
+A pull asks only for rows stamped after the watermark and merges them into the
+copy, so a sync moves what changed instead of the whole sheet. A delete or a
+migration changes the epoch, and a backend predating revisions sends no
+watermark; either way the reply is the whole sheet, exactly as before.
+"""
+
+import json
+import os
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REMOTE_DIR = os.path.join(SCRIPT_DIR, 'local', 'remote')
+INCREMENTAL_SHEETS = {'Progress'}
+
+
+def row_key(row, sheet_name):
+    """The backend's upsert key for a row object (progressRowKey in the backend)."""
+    if sheet_name == 'Progress':
+        item_type = str(row.get('itemType', 'sense')).lower()
+        if item_type == 'expression':
+            item_type = 'mwe'
+        mode = str(row.get('mode', 'normal'))
+        if item_type == 'meta':
+            return '|'.join((
+                str(row.get('user', '')), item_type, mode,
+                str(row.get('source', '')), str(row.get('language', '')),
+                str(row.get('label', '')), str(row.get('itemId', ''))
+            ))
+        return '|'.join((str(row.get('user', '')), item_type, mode,
+                         str(row.get('itemId', ''))))
+    return f"{row.get('user', '')}|{row.get('wordId', '')}"
+
+
+def base_path(sheet_name):
+    return os.path.join(REMOTE_DIR, f'{sheet_name}.json')
+
+
+def load_base(sheet_name):
+    path = base_path(sheet_name)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_base(sheet_name, headers, rows, epoch, revision):
+    os.makedirs(REMOTE_DIR, exist_ok=True)
+    with open(base_path(sheet_name), 'w') as f:
+        json.dump({
+            'pulled_at': datetime.utcnow().isoformat() + 'Z',
+            'sheet': sheet_name,
+            'epoch': epoch,
+            'revision': revision,
+            'headers': headers,
+            'rows': rows,
+        }, f, ensure_ascii=False)
+
+
+def merge_rows(base_rows, base_keys, changed_rows, changed_keys):
+    """base_rows with changed rows applied the way the sheet applied them.
+
+    A changed row whose key exists replaces it in place (an update); any other
+    is appended in the order received (an insert lands at the bottom). With no
+    deletes in between -- which the epoch guarantees -- the result is the sheet.
+    """
+    merged = list(base_rows)
+    position = {key: i for i, key in enumerate(base_keys)}
+    for key, row in zip(changed_keys, changed_rows):
+        if key in position:
+            merged[position[key]] = row
+        else:
+            position[key] = len(merged)
+            merged.append(row)
+    return merged
+
+
+def pull(request, sheet_name, to_objects, full=False):
+    """(headers, rows, fetched, was_full) for a sheet, incrementally if possible.
+
+    `request(sheet_name, **params)` returns a dump reply's `data`;
+    `to_objects(headers, rows)` turns raw rows into keyed objects. `rows` are
+    raw, like a plain dump's; `fetched` is how many crossed the wire.
+    """
+    incremental = sheet_name in INCREMENTAL_SHEETS
+    base = load_base(sheet_name) if incremental and not full else None
+    params = {'since': base['revision'], 'epoch': base['epoch']} if base else {}
+    data = request(sheet_name, **params)
+    headers = data.get('headers', [])
+    rows = data.get('rows', [])
+    fetched = len(rows)
+    was_full = data.get('full', True) is not False
+    if base and not was_full:
+        def keys(raw):
+            return [row_key(obj, sheet_name) for obj in to_objects(headers, raw)]
+        rows = merge_rows(base['rows'], keys(base['rows']), rows, keys(rows))
+    if incremental and 'revision' in data:
+        save_base(sheet_name, headers, rows, data['epoch'], data['revision'])
+    return headers, rows, fetched, was_full
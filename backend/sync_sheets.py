@@ -5,6 +5,10 @@ Usage:
     python3 backend/sync_sheets.py                    # pull both sheets
     python3 backend/sync_sheets.py --sheet Progress  # pull one sheet
     python3 backend/sync_sheets.py --diff             # show changes since last pull
+    python3 backend/sync_sheets.py --full             # re-pull Progress in full
+
+Progress is pulled incrementally: only rows the backend stamped after the last
+pull cross the wire, merged into local/remote/Progress.json (see sheet_delta.py).
 """
 
 import argparse
@@ -14,6 +18,9 @@ import sys
 import urllib.request
 import urllib.error
 from datetime import datetime
+from functools import partial
+
+from sheet_delta import pull
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SECRETS_PATH = os.path.join(SCRIPT_DIR, 'secrets.json')
@@ -38,6 +45,7 @@ HEADER_KEYS = {
     'schemaversion': 'schemaVersion',
     'srsstage': 'srsStage',
     'value': 'value',
+    'revision': 'revision',
     # FlaggedWords schema v2 — each audit attribute is its own column instead of
     # being buried in the rendered report blob.
     'flaggedat': 'flaggedAt',
@@ -76,8 +84,8 @@ def load_script_url():
         sys.exit(1)
 
 
-def dump_sheet(script_url, sheet_name):
-    payload = json.dumps({'action': 'dump', 'sheet': sheet_name}).encode()
+def dump_sheet(script_url, sheet_name, **params):
+    payload = json.dumps({'action': 'dump', 'sheet': sheet_name, **params}).encode()
     req = urllib.request.Request(
         script_url,
         data=payload,
@@ -185,6 +193,8 @@ def main():
     parser = argparse.ArgumentParser(description='Pull Google Sheets progress data to local JSON')
     parser.add_argument('--sheet', choices=SHEETS, help='Pull only this sheet (default: both)')
     parser.add_argument('--diff', action='store_true', help='Show changes since last pull')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore the incremental watermark and pull whole sheets')
     args = parser.parse_args()
 
     sheets = [args.sheet] if args.sheet else SHEETS
@@ -196,9 +206,10 @@ def main():
         # Load previous data before overwriting (for diff)
         old_data = load_previous(sheet_name) if args.diff else None
 
-        raw = dump_sheet(script_url, sheet_name)
-        headers = raw.get('headers', [])
-        rows = raw.get('rows', [])
+        headers, rows, fetched, was_full = pull(
+            partial(dump_sheet, script_url), sheet_name, rows_to_objects, full=args.full)
+        if not was_full:
+            print(f"  {fetched} changed rows since the last pull")
         new_rows = rows_to_objects(headers, rows)
 
         if args.diff:
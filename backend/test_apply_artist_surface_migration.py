@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Progress re-keying must follow merges still in the registry journal.
+
+    python3 backend/test_apply_artist_surface_migration.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import apply_artist_surface_migration as apply_migration  # noqa: E402
+from pipeline.util_identity_registry import CardIdentityRegistry, journal_path  # noqa: E402
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+class JournalledMergeTests(unittest.TestCase):
+    def test_progress_on_a_journalled_merge_moves_to_the_survivor(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            registry_path = os.path.join(tmp, 'cards.json')
+            registry = CardIdentityRegistry('spanish')
+            registry.seed('000001', 'vino', 'venir')
+            registry.seed('000002', 'vino', 'vino')
+            registry.save(registry_path)
+            # The surface migration's merge lands in the journal; cards.json
+            # still says 000001 is active.
+            with CardIdentityRegistry.transaction(registry_path, 'spanish') as live:
+                live.merge('000001', '000002', 'surface')
+            self.assertTrue(journal_path(registry_path).exists())
+
+            mapping_path = os.path.join(tmp, 'mapping.json')
+            master_path = os.path.join(tmp, 'master.json')
+            progress_path = os.path.join(tmp, 'Progress.json')
+            write_json(mapping_path, {'mapping': {'000002': 'a1b2c3d4'}})
+            write_json(master_path, {'a1b2c3d4': {'word': 'vino'}})
+            write_json(progress_path, [
+                {'user': 'JT', 'itemId': 'es1000001', 'itemType': 'word', 'mode': 'artist',
+                 'label': 'vino', 'language': 'spanish', 'correct': 3, 'wrong': 1,
+                 'srsStage': 2, 'lastSeen': '2026-10-01T00:00:00.000Z'},
+            ])
+
+            argv = ['apply_artist_surface_migration', '--progress', progress_path,
+                    '--mapping', mapping_path, '--registry', registry_path,
+                    '--master', master_path]
+            with mock.patch.object(sys, 'argv', argv), mock.patch('builtins.print'):
+                apply_migration.main()
+            with open(progress_path, encoding='utf-8') as f:
+                rows = json.load(f)
+
+        words = [r for r in rows if r['itemType'] == 'word']
+        self.assertEqual([(r['itemId'], r['correct'], r['srsStage']) for r in words],
+                         [('es1a1b2c3d4', 3, 2)])
+        lemmas = [r for r in rows if r['itemType'] == 'lemma']
+        self.assertEqual([(r['parentWordId'], r['label']) for r in lemmas],
+                         [('es1a1b2c3d4', 'venir')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Chunked pushes against the real backend source, served by apps_script_stub.js.
+
+    python3 backend/test_bulk_push.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bulk_push  # noqa: E402
+import push_sheets  # noqa: E402
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'apps_script_stub.js')
+
+
+def word(n, correct):
+    return {'user': 'JT', 'itemId': f'es{n:06d}', 'itemType': 'word', 'mode': 'normal',
+            'label': f'w{n}', 'language': 'spanish', 'correct': correct, 'wrong': 0,
+            'lastSeen': '2026-10-01T00:00:00.000Z'}
+
+
+@unittest.skipUnless(shutil.which('node'), 'node is not installed')
+class ChunkedPushTests(unittest.TestCase):
+    def setUp(self):
+        self.server = subprocess.Popen(['node', STUB, '--port', '0'],
+                                       stdout=subprocess.PIPE, text=True)
+        port = self.server.stdout.readline().split()[1]
+        self.request = partial(push_sheets.request_json, f'http://127.0.0.1:{port}/', timeout=30)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.saved_dir = bulk_push.JOURNAL_DIR
+        bulk_push.JOURNAL_DIR = self.temp_dir.name
+        self.sent = []
+
+    def tearDown(self):
+        bulk_push.JOURNAL_DIR = self.saved_dir
+        self.temp_dir.cleanup()
+        self.server.terminate()
+        self.server.wait()
+        self.server.stdout.close()
+
+    def remote(self):
+        data = self.request({'action': 'dump', 'sheet': 'Progress'})['data']
+        return {row[1]: row[8] for row in data['rows']}
+
+    def plan(self, rows):
+        journal = bulk_push.new_journal('Progress', rows, 20)
+        bulk_push.save_journal(journal)
+        return journal
+
+    def failing_on(self, chunk_ids, lose_reply=False):
+        """A transport that drops the given chunks, before or after the backend sees them."""
+        def request(payload):
+            self.sent.append(payload['chunkId'])
+            if payload['chunkId'] in chunk_ids:
+                if lose_reply:
+                    self.request(payload)
+                raise TimeoutError('timed out')
+            return self.request(payload)
+        return request
+
+    def test_parallel_push_lands_every_row_and_clears_the_journal(self):
+        rows = [word(n, n) for n in range(230)]
+        journal = self.plan(rows)
+        self.assertEqual(len(journal['chunks']), 12)
+        self.assertIsNone(bulk_push.push_chunks(self.request, journal, workers=3, backoff=0))
+        self.assertEqual(self.remote(), {r['itemId']: r['correct'] for r in rows})
+        self.assertIsNone(bulk_push.load_journal('Progress'))
+
+    def test_resume_sends_only_the_unconfirmed_chunks(self):
+        rows = [word(n, n) for n in range(100)]
+        journal = self.plan(rows)
+        broken = journal['chunks'][2]['id']
+        error = bulk_push.push_chunks(self.failing_on({broken}), journal,
+                                      workers=1, attempts=2, backoff=0)
+        self.assertIn(broken, error)
+        # Chunks already started when the failure came back still finish;
+        # the journal records exactly what landed.
+        saved = bulk_push.load_journal('Progress')
+        self.assertNotIn(broken, saved['confirmed'])
+        self.assertLessEqual({c['id'] for c in journal['chunks'][:2]}, set(saved['confirmed']))
+        self.assertEqual(len(self.remote()), 20 * len(saved['confirmed']))
+
+        self.sent = []
+        request = self.failing_on(set())
+        unconfirmed = [c['id'] for c in journal['chunks'] if c['id'] not in saved['confirmed']]
+        self.assertIsNone(bulk_push.push_chunks(request, saved, workers=2, backoff=0))
+        self.assertEqual(sorted(self.sent), sorted(unconfirmed))
+        self.assertEqual(len(self.remote()), 100)
+
+    def test_a_chunk_whose_reply_was_lost_is_not_written_twice(self):
+        journal = self.plan([word(n, 1) for n in range(20)])
+        chunk = journal['chunks'][0]
+        flaky = {chunk['id']}
+
+        def once(payload):
+            try:
+                return self.failing_on(flaky, lose_reply=True)(payload)
+            finally:
+                flaky.clear()
+
+        self.assertIsNone(bulk_push.push_chunks(once, journal, backoff=0))
+        self.assertEqual(self.sent, [chunk['id'], chunk['id']])
+        reply = self.request({'action': 'bulkSave', 'sheet': 'Progress',
+                              'chunkId': chunk['id'], 'rows': chunk['rows']})
+        self.assertTrue(reply['data']['replayed'])
+        revisions = {row[16] for row in
+                     self.request({'action': 'dump', 'sheet': 'Progress'})['data']['rows']}
+        self.assertEqual(len(revisions), 1)
+
+    def test_chunk_ids_follow_the_contents_within_a_plan(self):
+        rows = [word(n, 1) for n in range(45)]
+        ids = [c['id'] for c in bulk_push.plan_chunks('Progress', rows, 20, 'n1')]
+        self.assertEqual(ids, [c['id'] for c in bulk_push.plan_chunks('Progress', rows, 20, 'n1')])
+        self.assertEqual(len(set(ids)), 3)
+        self.assertNotEqual(bulk_push.chunk_id('Progress', rows[:20], 'n1'),
+                            bulk_push.chunk_id('FlaggedWords', rows[:20], 'n1'))
+        self.assertNotEqual(bulk_push.chunk_id('Progress', rows[:20], 'n1'),
+                            bulk_push.chunk_id('Progress', rows[:20], 'n2'))
+
+    def test_a_new_push_of_the_same_rows_is_written_again(self):
+        rows = [word(n, 1) for n in range(30)]
+        first = self.plan(rows)
+        self.assertIsNone(bulk_push.push_chunks(self.request, first, backoff=0))
+        # The app changes a row in between; pushing the local rows again must
+        # put them back rather than be answered from the reply cache.
+        self.request({'action': 'bulkSave', 'sheet': 'Progress', 'rows': [word(3, 9)]})
+        self.assertEqual(self.remote()['es000003'], 9)
+
+        second = self.plan(rows)
+        self.assertNotEqual(second['nonce'], first['nonce'])
+        self.assertFalse({c['id'] for c in first['chunks']} & {c['id'] for c in second['chunks']})
+        replies = []
+
+        def request(payload):
+            replies.append(self.request(payload))
+            return replies[-1]
+
+        self.assertIsNone(bulk_push.push_chunks(request, second, backoff=0))
+        self.assertEqual([r['data']['replayed'] for r in replies], [False, False])
+        self.assertEqual(self.remote()['es000003'], 1)
+
+    def test_resume_keeps_the_plan_nonce(self):
+        journal = self.plan([word(n, 1) for n in range(20)])
+        saved = bulk_push.load_journal('Progress')
+        self.assertEqual(saved['nonce'], journal['nonce'])
+        self.assertEqual([c['id'] for c in saved['chunks']], [c['id'] for c in journal['chunks']])
+
+if __name__ == '__main__':
+    unittest.main()
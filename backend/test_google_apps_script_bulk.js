@@ -0,0 +1,122 @@
+#!/usr/bin/env node
+'use strict';
+
+// Batched bulkSave: a chunk is read once, applied in memory and written back in
+// a few setValues ranges; a repeated chunkId is answered without writing.
+// Ends by printing bulkSave throughput (rows/sec) and Spreadsheets service
+// calls per chunk. On Apps Script each service call is a round trip, so the
+// call count is the figure that carries over from this in-memory run.
+//
+//     node backend/test_google_apps_script_bulk.js
+const assert = require('node:assert/strict');
+const { loadBackend } = require('./apps_script_stub');
+
+function word(n, correct) {
+    return {
+        user: 'JT', itemId: 'es' + String(n).padStart(6, '0'), itemType: 'word',
+        mode: 'normal', label: 'w' + n, language: 'spanish', correct, wrong: n % 3,
+        lastSeen: '2026-10-01T00:00:00.000Z'
+    };
+}
+
+function flag(n, note) {
+    return { user: 'JT', wordId: 'es' + String(n).padStart(6, '0'), wordText: 'w' + n, note };
+}
+
+function bulkSave(post, sheet, rows, chunkId) {
+    const body = post({ action: 'bulkSave', sheet, rows, chunkId });
+    assert.equal(body.success, true, body.message);
+    return body;
+}
+
+function callsDuring(spreadsheet, action) {
+    const before = { ...spreadsheet.calls };
+    action();
+    return Object.fromEntries(Object.keys(before).map(k => [k, spreadsheet.calls[k] - before[k]]));
+}
+
+// The v4 columns of a sheet, without the per-request Revision stamp.
+function contents(spreadsheet, name, width) {
+    return spreadsheet.getSheetByName(name).rows.map(row => row.slice(0, width));
+}
+
+// One batch writes exactly what the same rows sent one request at a time write.
+const seed = Array.from({ length: 300 }, (_, n) => word(n, 1));
+const edits = [];
+for (let n = 0; n < 300; n += 7) edits.push(word(n, 50 + n));
+for (let n = 300; n < 340; n++) edits.push(word(n, 2));
+edits.push(word(14, 99));  // a key twice in one batch: the later row wins
+
+const batched = loadBackend({});
+const single = loadBackend({});
+for (const backend of [batched, single]) bulkSave(backend.post, 'Progress', seed);
+const calls = callsDuring(batched.spreadsheet, () => {
+    assert.equal(bulkSave(batched.post, 'Progress', edits).message,
+                 'Bulk save complete: 44 updated, 40 inserted');
+});
+for (const row of edits) bulkSave(single.post, 'Progress', [row]);
+assert.deepEqual(contents(batched.spreadsheet, 'Progress', 16),
+                 contents(single.spreadsheet, 'Progress', 16));
+assert.equal(calls.appendRow, 0);
+// Edits every 7th row are within BULK_WRITE_GAP of each other and of the
+// appended rows, so the whole chunk is one range.
+assert.equal(calls.setValues, 1);
+
+// Far-apart updates are separate ranges, and the rows between are untouched.
+const sparse = callsDuring(batched.spreadsheet, () => {
+    bulkSave(batched.post, 'Progress', [word(1, 7), word(200, 7)]);
+});
+assert.equal(sparse.setValues, 2);
+
+// A replayed chunk returns the first reply and writes nothing.
+const first = bulkSave(batched.post, 'Progress', [word(5, 11), word(400, 1)], 'chunk-a');
+assert.equal(first.data.replayed, false);
+const before = contents(batched.spreadsheet, 'Progress', 17);
+let again;
+const replayCalls = callsDuring(batched.spreadsheet, () => {
+    again = bulkSave(batched.post, 'Progress', [word(5, 11), word(400, 1)], 'chunk-a');
+});
+assert.equal(again.data.replayed, true);
+assert.equal(again.message, first.message);
+assert.equal(replayCalls.setValues, 0);
+assert.deepEqual(contents(batched.spreadsheet, 'Progress', 17), before);
+// The id is scoped to its sheet.
+assert.equal(bulkSave(batched.post, 'FlaggedWords', [flag(5, 'x')], 'chunk-a').data.replayed, false);
+
+// FlaggedWords: same contract against one read of the sheet.
+const flagsBatched = loadBackend({});
+const flagsSingle = loadBackend({});
+const flagRows = [flag(1, 'a'), flag(2, 'b'), flag(1, 'c'), flag(3, '')];
+bulkSave(flagsBatched.post, 'FlaggedWords', flagRows);
+for (const row of flagRows) bulkSave(flagsSingle.post, 'FlaggedWords', [row]);
+const flagWidth = flagsBatched.spreadsheet.getSheetByName('FlaggedWords').rows[0].length;
+const withoutTimestamps = rows => rows.map(row => row.filter((_, i) => i !== 1));
+assert.deepEqual(withoutTimestamps(contents(flagsBatched.spreadsheet, 'FlaggedWords', flagWidth)),
+                 withoutTimestamps(contents(flagsSingle.spreadsheet, 'FlaggedWords', flagWidth)));
+assert.equal(flagsBatched.spreadsheet.getSheetByName('FlaggedWords').getLastRow(), 4);
+
+console.log('GoogleAppsScript batched bulkSave tests passed');
+
+// Throughput: 50-row chunks (push_sheets.BULK_CHUNK), a third of them updates
+// spread over the sheet, against sheets of increasing size.
+for (const sheetRows of [1000, 5000]) {
+    const { post, spreadsheet } = loadBackend({});
+    for (let start = 0; start < sheetRows; start += 1000) {
+        bulkSave(post, 'Progress', Array.from({ length: 1000 }, (_, i) => word(start + i, 1)));
+    }
+    const chunks = 20;
+    let next = sheetRows;
+    const before = { ...spreadsheet.calls };
+    const started = process.hrtime.bigint();
+    for (let c = 0; c < chunks; c++) {
+        const rows = [];
+        for (let i = 0; i < 17; i++) rows.push(word(Math.floor((c * 17 + i) * sheetRows / (chunks * 17)), 3));
+        while (rows.length < 50) rows.push(word(next++, 1));
+        bulkSave(post, 'Progress', rows, 'bench-' + c);
+    }
+    const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+    const perChunk = key => ((spreadsheet.calls[key] - before[key]) / chunks).toFixed(1);
+    console.log(`  ${sheetRows} rows: ${Math.round(chunks * 50 / seconds)} rows/sec, `
+                + `per chunk ${perChunk('getValues')} reads, ${perChunk('setValues')} writes, `
+                + `${perChunk('appendRow')} appends`);
+}
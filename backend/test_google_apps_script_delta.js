@@ -0,0 +1,78 @@
+#!/usr/bin/env node
+'use strict';
+
+// Incremental Progress dumps: rows carry the revision of the write that last
+// touched them, and a dump `since` a revision returns only later rows.
+const assert = require('node:assert/strict');
+const { loadBackend } = require('./apps_script_stub');
+
+const { post } = loadBackend({});
+
+function dump(since, epoch) {
+    const body = post({ action: 'dump', sheet: 'Progress', since, epoch });
+    assert.equal(body.success, true, body.message);
+    return body.data;
+}
+
+function word(itemId, correct) {
+    return {
+        user: 'JT', itemId, itemType: 'word', mode: 'normal', label: itemId,
+        language: 'spanish', correct, wrong: 0, lastSeen: '2026-10-01T00:00:00.000Z'
+    };
+}
+
+const first = dump();
+assert.equal(first.full, true);
+assert.equal(first.rows.length, 0);
+
+assert.equal(post({
+    action: 'save', user: 'JT', word: 'hablar', wordId: 'es000001',
+    language: 'spanish', correct: 1, wrong: 0
+}).success, true);
+let delta = dump(first.revision, first.epoch);
+assert.equal(delta.full, false);
+assert.equal(delta.rows.length, 1);
+assert.equal(delta.headers[16], 'Revision');
+assert.equal(delta.rows[0][16], delta.revision);
+
+// One bulk request is one revision, whatever its size.
+const afterSave = delta;
+assert.equal(post({
+    action: 'bulkSave', sheet: 'Progress',
+    rows: [word('es000002', 1), word('es000003', 2), word('es000001', 5)]
+}).success, true);
+delta = dump(afterSave.revision, afterSave.epoch);
+assert.equal(delta.full, false);
+assert.deepEqual(delta.rows.map(row => row[1]), ['es000001', 'es000002', 'es000003']);
+assert.deepEqual(new Set(delta.rows.map(row => row[16])), new Set([afterSave.revision + 1]));
+assert.equal(delta.rows[0][8], 5);
+
+// Caught up: nothing to send.
+assert.equal(dump(delta.revision, delta.epoch).rows.length, 0);
+// A stale or unknown epoch always gets the whole sheet.
+assert.equal(dump(delta.revision, 'elsewhere').full, true);
+assert.equal(dump(delta.revision).full, true);
+
+// Reads and rejected writes stamp nothing.
+post({ action: 'load', user: 'JT' });
+post({ action: 'save', user: 'JT' });
+assert.equal(dump(delta.revision, delta.epoch).rows.length, 0);
+
+// A delete cannot be expressed as "rows after N", so it moves the epoch.
+const beforeDelete = dump(delta.revision, delta.epoch);
+assert.equal(post({
+    action: 'deleteRow', user: 'JT', itemId: 'es000002', itemType: 'word', mode: 'normal'
+}).success, true);
+const afterDelete = dump(beforeDelete.revision, beforeDelete.epoch);
+assert.equal(afterDelete.full, true);
+assert.notEqual(afterDelete.epoch, beforeDelete.epoch);
+assert.deepEqual(afterDelete.rows.map(row => row[1]), ['es000001', 'es000003']);
+// Deleting nothing keeps it.
+post({ action: 'deleteRow', user: 'JT', itemId: 'nope', itemType: 'word', mode: 'normal' });
+assert.equal(dump(afterDelete.revision, afterDelete.epoch).full, false);
+
+// So does a forced migration, which rewrites every row without its stamp.
+assert.equal(post({ action: 'migrateProgress' }).success, true);
+assert.equal(dump(afterDelete.revision, afterDelete.epoch).full, true);
+
+console.log('GoogleAppsScript incremental dump tests passed');
@@ -4,82 +4,7 @@
 // In-memory regression test for the manually deployed Apps Script backend.
 // It deliberately uses no package dependency so it can run with plain Node.
 const assert = require('node:assert/strict');
-const fs = require('node:fs');
-const vm = require('node:vm');
-const path = require('node:path');
-
-class Range {
-    constructor(sheet, row, column, rowCount = 1, columnCount = 1) {
-        this.sheet = sheet;
-        this.row = row;
-        this.column = column;
-        this.rowCount = rowCount;
-        this.columnCount = columnCount;
-    }
-    getValues() {
-        return Array.from({ length: this.rowCount }, (_, rowOffset) =>
-            Array.from({ length: this.columnCount }, (_, columnOffset) =>
-                this.sheet.rows[this.row - 1 + rowOffset]?.[this.column - 1 + columnOffset] ?? ''));
-    }
-    setValues(values) {
-        for (let r = 0; r < this.rowCount; r++) {
-            const targetRow = this.row - 1 + r;
-            while (this.sheet.rows.length <= targetRow) this.sheet.rows.push([]);
-            for (let c = 0; c < this.columnCount; c++) {
-                this.sheet.rows[targetRow][this.column - 1 + c] = values[r][c];
-            }
-        }
-        return this;
-    }
-    getValue() { return this.getValues()[0][0]; }
-    setValue(value) { return this.setValues([[value]]); }
-    setFontWeight() { return this; }
-}
-
-class Sheet {
-    constructor(spreadsheet, name, rows = []) {
-        this.spreadsheet = spreadsheet;
-        this.name = name;
-        this.rows = rows.map(row => row.slice());
-    }
-    getName() { return this.name; }
-    setName(nextName) {
-        delete this.spreadsheet.sheets[this.name];
-        this.name = nextName;
-        this.spreadsheet.sheets[nextName] = this;
-        return this;
-    }
-    getLastRow() { return this.rows.length; }
-    getDataRange() {
-        const columns = Math.max(1, ...this.rows.map(row => row.length));
-        return new Range(this, 1, 1, Math.max(1, this.rows.length), columns);
-    }
-    getRange(row, column, rowCount = 1, columnCount = 1) {
-        return new Range(this, row, column, rowCount, columnCount);
-    }
-    appendRow(row) { this.rows.push(row.slice()); return this; }
-    deleteRow(row) { this.rows.splice(row - 1, 1); }
-    clearContents() { this.rows = []; return this; }
-    setFrozenRows() { return this; }
-    autoResizeColumns() { return this; }
-}
-
-class Spreadsheet {
-    constructor(seed) {
-        this.sheets = {};
-        for (const [name, rows] of Object.entries(seed)) {
-            this.sheets[name] = new Sheet(this, name, rows);
-        }
-    }
-    getSheetByName(name) { return this.sheets[name] || null; }
-    getSheets() { return Object.values(this.sheets); }
-    insertSheet(name) {
-        assert.equal(this.getSheetByName(name), null, `duplicate sheet ${name}`);
-        const sheet = new Sheet(this, name);
-        this.sheets[name] = sheet;
-        return sheet;
-    }
-}
+const { loadBackend } = require('./apps_script_stub');
 
 const wordHeaders = [
     'User', 'Word', 'WordId', 'Language', 'Correct', 'Wrong',
@@ -89,7 +14,7 @@ const itemHeaders = [
     'User', 'ItemId', 'ParentWordId', 'ItemType', 'Label', 'Language',
     'Correct', 'Wrong', 'LastCorrect', 'LastWrong', 'LastSeen', 'SchemaVersion', 'SrsStage'
 ];
-const spreadsheet = new Spreadsheet({
+const { spreadsheet, post } = loadBackend({
     UserProgress: [
         wordHeaders,
         ['JT', 'hablar', 'es000001', 'spanish', 2, 1, '2026-07-20', '2026-07-19', 2, '2026-07-20'],
@@ -108,39 +33,6 @@ const spreadsheet = new Spreadsheet({
     ],
     FlaggedWords: [['User', 'Word', 'WordId', 'Language', 'Correct', 'Wrong', 'LastCorrect', 'LastWrong']]
 });
-const properties = new Map();
-const context = {
-    console,
-    Date,
-    JSON,
-    isFinite,
-    SpreadsheetApp: { getActiveSpreadsheet: () => spreadsheet },
-    PropertiesService: {
-        getScriptProperties: () => ({
-            getProperty: key => properties.get(key) ?? null,
-            setProperty: (key, value) => properties.set(key, String(value)),
-            deleteProperty: key => properties.delete(key)
-        })
-    },
-    LockService: {
-        getScriptLock: () => ({ waitLock() {}, releaseLock() {} })
-    },
-    ContentService: {
-        MimeType: { JSON: 'application/json' },
-        createTextOutput: text => ({
-            text,
-            setMimeType() { return this; }
-        })
-    }
-};
-vm.createContext(context);
-const source = fs.readFileSync(path.join(__dirname, 'GoogleAppsScript.js'), 'utf8');
-vm.runInContext(source, context, { filename: 'GoogleAppsScript.js' });
-
-function post(payload) {
-    const response = context.doPost({ postData: { contents: JSON.stringify(payload) } });
-    return JSON.parse(response.text);
-}
 
 const capabilities = post({ action: 'capabilities' }).data;
 assert.equal(capabilities.schemaVersion, 4);
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Incremental pulls against the real backend source, served by apps_script_stub.js.
+
+    python3 backend/test_sheet_delta.py
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import urllib.request
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import push_sheets  # noqa: E402
+import sheet_delta  # noqa: E402
+import sync_sheets  # noqa: E402
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'apps_script_stub.js')
+
+
+def word(item_id, correct, user='JT'):
+    return {'user': user, 'itemId': item_id, 'itemType': 'word', 'mode': 'normal',
+            'label': item_id, 'language': 'spanish', 'correct': correct, 'wrong': 0,
+            'lastSeen': '2026-10-01T00:00:00.000Z'}
+
+
+@unittest.skipUnless(shutil.which('node'), 'node is not installed')
+class IncrementalPullTests(unittest.TestCase):
+    def setUp(self):
+        self.server = subprocess.Popen(['node', STUB, '--port', '0'],
+                                       stdout=subprocess.PIPE, text=True)
+        port = self.server.stdout.readline().split()[1]
+        self.url = f'http://127.0.0.1:{port}/'
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.saved_dir = sheet_delta.REMOTE_DIR
+        sheet_delta.REMOTE_DIR = self.temp_dir.name
+
+    def tearDown(self):
+        sheet_delta.REMOTE_DIR = self.saved_dir
+        self.temp_dir.cleanup()
+        self.server.terminate()
+        self.server.wait()
+        self.server.stdout.close()
+
+    def post(self, payload):
+        req = urllib.request.Request(self.url, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            body = json.loads(resp.read().decode())
+        self.assertTrue(body['success'], body)
+        return body
+
+    def pull(self, full=False):
+        return sheet_delta.pull(partial(sync_sheets.dump_sheet, self.url), 'Progress',
+                                sync_sheets.rows_to_objects, full=full)
+
+    def whole_sheet(self):
+        return sync_sheets.dump_sheet(self.url, 'Progress')['rows']
+
+    def test_pulls_fetch_only_rows_written_since_and_rebuild_the_sheet(self):
+        self.post({'action': 'bulkSave', 'sheet': 'Progress',
+                   'rows': [word(f'es{n:06d}', n) for n in range(40)]})
+        headers, rows, fetched, was_full = self.pull()
+        self.assertTrue(was_full)
+        self.assertEqual(fetched, 40)
+
+        # What the app does between pulls: two reviews and one new card.
+        self.post({'action': 'save', 'user': 'JT', 'word': 'x', 'wordId': 'es000003',
+                   'language': 'spanish', 'correct': 9, 'wrong': 1})
+        self.post({'action': 'bulkSave', 'sheet': 'Progress',
+                   'rows': [word('es000010', 11), word('es999999', 1)]})
+        headers, rows, fetched, was_full = self.pull()
+        self.assertFalse(was_full)
+        self.assertEqual(fetched, 3)
+        self.assertEqual(rows, self.whole_sheet())
+
+        self.assertEqual(self.pull()[2], 0)
+
+        # A delete moves the epoch: the next pull is whole, and still right.
+        self.post({'action': 'deleteRow', 'user': 'JT', 'itemId': 'es000005',
+                   'itemType': 'word', 'mode': 'normal'})
+        headers, rows, fetched, was_full = self.pull()
+        self.assertTrue(was_full)
+        self.assertEqual(rows, self.whole_sheet())
+        self.assertEqual(len(rows), 40)
+
+    def test_push_diffs_against_the_rebuilt_remote(self):
+        self.post({'action': 'bulkSave', 'sheet': 'Progress',
+                   'rows': [word(f'es{n:06d}', n) for n in range(20)]})
+        local = push_sheets.dump_remote(self.url, 'Progress')
+        local[4]['correct'] = 99
+        self.post({'action': 'bulkSave', 'sheet': 'Progress', 'rows': [word('es000007', 70)]})
+
+        rebuilt = push_sheets.dump_remote(self.url, 'Progress')
+        whole = push_sheets.dump_remote(self.url, 'Progress', full=True)
+        self.assertEqual(rebuilt, whole)
+        upsert, delete = push_sheets.compute_changeset(local, rebuilt, 'Progress')
+        # The local edit, and the remote row the stale local copy would revert.
+        self.assertEqual(sorted(r['itemId'] for r in upsert), ['es000004', 'es000007'])
+        self.assertEqual(delete, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-import './state.js?v=20260819b';
+import './state.js?v=20261019d';
 
 // Per-artist default album art, keyed by slug (for multi-artist fallback)
 const artistDefaultArt = {};
@@ -0,0 +1,161 @@
+// Rank-ordered filter bitsets shipped next to each deck index as
+// <base>.filter.json (pipeline/util_8a_filter_index.py). Bit i of every set is
+// the card at ids[i], the card at rank i + 1; sets are little-endian 32-bit
+// words, so they decode straight into Uint32Arrays and a visible set is a few
+// word-wise ANDs instead of a pass over the joined entries. Keep this module
+// dependency-free so it can be tested directly.
+
+export const FILTER_INDEX_VERSION = 1;
+
+/** `X.index.json` -> `X.filter.json`; null for decks without a split index. */
+export function filterIndexPath(indexPath) {
+    return /\.index\.json$/.test(indexPath || '')
+        ? indexPath.replace(/\.index\.json$/, '.filter.json')
+        : null;
+}
+
+function decodeWords(text, words) {
+    const binary = atob(text);
+    const bytes = new Uint8Array(words * 4);
+    for (let i = 0; i < binary.length && i < bytes.length; i++) bytes[i] = binary.charCodeAt(i);
+    return new Uint32Array(bytes.buffer);
+}
+
+/**
+ * The parsed .filter.json as
+ * { count, ids, words, bits: Map(name -> Uint32Array), cognateThresholds, sources }.
+ */
+export function decodeFilterIndex(data) {
+    if (data?.version !== FILTER_INDEX_VERSION) return null;
+    const words = Math.ceil(data.count / 32);
+    const bits = new Map();
+    for (const [name, text] of Object.entries(data.bits || {})) {
+        bits.set(name, decodeWords(text, words));
+    }
+    return {
+        count: data.count,
+        ids: data.ids,
+        words,
+        bits,
+        cognateThresholds: data.cognateThresholds || [],
+        sources: data.sources || {}
+    };
+}
+
+/**
+ * True when the bitsets were built from the files the app loaded: `sources`
+ * holds the sha256 of the index bytes and, for artist decks, of the master
+ * (FilterIndex.is_current() in pipeline/util_8a_filter_index.py). The master
+ * is stamped after assembly, so a stale filter file is common, not an error.
+ */
+export function isCurrent(index, sources) {
+    if (!index || !sources?.index) return false;
+    return ['index', 'master'].every(name => (index.sources[name] || null) === (sources[name] || null));
+}
+
+/** A set by name; empty when no card has the flag. */
+export function bitset(index, name) {
+    return index.bits.get(name) || new Uint32Array(index.words);
+}
+
+export function and(a, b) {
+    const out = new Uint32Array(a.length);
+    for (let i = 0; i < a.length; i++) out[i] = a[i] & b[i];
+    return out;
+}
+
+export function or(a, b) {
+    const out = new Uint32Array(a.length);
+    for (let i = 0; i < a.length; i++) out[i] = a[i] | b[i];
+    return out;
+}
+
+export function andNot(a, b) {
+    const out = new Uint32Array(a.length);
+    for (let i = 0; i < a.length; i++) out[i] = a[i] & ~b[i];
+    return out;
+}
+
+/** Zero-based ranks of the cards in a set, ascending. */
+export function ranksOf(set) {
+    const ranks = [];
+    for (let w = 0; w < set.length; w++) {
+        let word = set[w];
+        while (word) {
+            const low = word & -word;
+            ranks.push(w * 32 + 31 - Math.clz32(low));
+            word ^= low;
+        }
+    }
+    return ranks;
+}
+
+export function idsOf(index, set) {
+    return ranksOf(set).map(rank => index.ids[rank]);
+}
+
+export function hasRank(set, rank) {
+    return (set[rank >>> 5] & (1 << (rank & 31))) !== 0;
+}
+
+const VISIBLE_DEFAULTS = {
+    artist: false,
+    excludeNoise: true,
+    excludeEnglishLoanwords: true,
+    excludeProperNouns: true,
+    excludeCognates: true,
+    cognateThreshold: 0.85
+};
+
+/**
+ * The cards buildFilteredVocab() keeps on its flag checks, as one set. Scope
+ * (Main/Extra), the active song subset and Merge Lemmas depend on runtime
+ * state and stay in buildFilteredVocab(). Null when the index was not built
+ * for the requested cognate threshold.
+ */
+export function visibleSet(index, options = {}) {
+    const {
+        artist, excludeNoise, excludeEnglishLoanwords, excludeProperNouns, excludeCognates, cognateThreshold
+    } = { ...VISIBLE_DEFAULTS, ...options };
+    let keep = bitset(index, 'has_translation');
+    if (artist) {
+        // One-off artist forms may show without a translated sense; repeated
+        // ones need a sense assigned to this artist.
+        const single = andNot(bitset(index, 'present'), bitset(index, 'multi_occurrence'));
+        keep = or(and(keep, bitset(index, 'artist_sense')), single);
+        keep = andNot(keep, bitset(index, 'english'));
+        if (excludeNoise) keep = andNot(keep, bitset(index, 'noise'));
+        if (excludeEnglishLoanwords) keep = andNot(keep, bitset(index, 'english_loanword'));
+        if (excludeProperNouns) {
+            keep = andNot(keep, or(bitset(index, 'propernoun'), bitset(index, 'all_propn')));
+        }
+    }
+    if (excludeCognates) {
+        if (!index.cognateThresholds.includes(cognateThreshold)) return null;
+        keep = andNot(keep, bitset(index, `cognate@${cognateThreshold}`));
+    }
+    return keep;
+}
+
+/**
+ * The buildFilteredVocab() count a card outside visibleSet() falls under:
+ * 'english', 'singleOcc' or 'cognates', checked in the order the scan checks
+ * them. Only meaningful for a card with a translated sense or, for an artist,
+ * a one-off card; the scan drops the others before it counts anything.
+ */
+export function hiddenReason(index, rank, options = {}) {
+    const {
+        artist, excludeNoise, excludeEnglishLoanwords, excludeProperNouns
+    } = { ...VISIBLE_DEFAULTS, ...options };
+    const has = name => index.bits.has(name) && hasRank(index.bits.get(name), rank);
+    if (artist) {
+        if (has('english')
+            || (excludeNoise && has('noise'))
+            || (excludeEnglishLoanwords && has('english_loanword'))
+            || (excludeProperNouns && (has('propernoun') || has('all_propn')))) {
+            return 'english';
+        }
+        if (has('multi_occurrence') && !has('artist_sense')) return 'singleOcc';
+    }
+    return 'cognates';
+}
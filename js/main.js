@@ -1,21 +1,21 @@
-import './theme.js?v=20260819b';
-import './state.js?v=20260819b';
-import './offline-db.js?v=20260819b';
-import './sync-queue.js?v=20260819b';
-import { initOfflineContent } from './offline-content.js?v=20260819b';
-import './speech.js?v=20260819b';
-import './artist-ui.js?v=20260819b';
-import './auth.js?v=20260819b';
-import './about-example.js?v=20260819b';
-import './estimation.js?v=20260819b';
-import './config.js?v=20260819b';
-import './progress.js?v=20260819b';
-import './knowledge.js?v=20260819b';
-import './ui.js?v=20260819b';
-import './vocab.js?v=20260819b';
-import './song-sets.js?v=20260819b';
-import './vocabulary-import.js?v=20260819b';
-import './flashcards.js?v=20260819b';
+import './theme.js?v=20261019d';
+import './state.js?v=20261019d';
+import './offline-db.js?v=20261019d';
+import './sync-queue.js?v=20261019d';
+import { initOfflineContent } from './offline-content.js?v=20261019d';
+import './speech.js?v=20261019d';
+import './artist-ui.js?v=20261019d';
+import './auth.js?v=20261019d';
+import './about-example.js?v=20261019d';
+import './estimation.js?v=20261019d';
+import './config.js?v=20261019d';
+import './progress.js?v=20261019d';
+import './knowledge.js?v=20261019d';
+import './ui.js?v=20261019d';
+import './vocab.js?v=20261019d';
+import './song-sets.js?v=20261019d';
+import './vocabulary-import.js?v=20261019d';
+import './flashcards.js?v=20261019d';
 
 // Spotify is lyrics-only and its module is sizeable. Start the dynamic import
 // immediately for an artist URL so it races setup/data loading, but keep it
@@ -24,7 +24,7 @@ import './flashcards.js?v=20260819b';
 const _initialParams = new URLSearchParams(window.location.search);
 const _speechVnextRoute = _initialParams.get('speech') === 'vnext';
 const _spotifyModulePromise = (_initialParams.has('artist') || _initialParams.get('mode') === 'badbunny')
-    ? import('./spotify.js?v=20260819b').catch(error => {
+    ? import('./spotify.js?v=20261019d').catch(error => {
         console.warn('Spotify controls deferred:', error);
         return null;
     })
@@ -330,7 +330,7 @@ loadConfig().then(async () => {
         try {
             selectedLanguage = 'spanish';
             applyLanguageColorTheme();
-            const speechVnext = await import('./speech-vnext.js?v=20260819b');
+            const speechVnext = await import('./speech-vnext.js?v=20261019d');
             await speechVnext.startSpeechVnext();
         } catch (error) {
             console.error('Speech vNext preview failed to load:', error);
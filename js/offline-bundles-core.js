@@ -0,0 +1,64 @@
+// Delta updates of retained offline content. The catalogue lists each file's
+// content-addressed chunks in order (scripts/offline_bundles.py), and the
+// chunks concatenated are the file. Updating a source copies every chunk the
+// installed version already has out of its installed file and fetches only
+// the rest. Keep this module dependency-free so it can be tested directly.
+
+/** The chunk layout of a source, kept in its downloads record once installed. */
+export function chunkLayout(source) {
+    const layout = {};
+    for (const file of source.files || []) {
+        if (Array.isArray(file.chunks) && file.chunks.length) {
+            layout[file.path] = file.chunks.map(chunk => [chunk.sha256, chunk.bytes]);
+        }
+    }
+    return layout;
+}
+
+/** Where each chunk of an installed layout sits: sha256 -> { path, start, end }. */
+export function installedChunks(layout) {
+    const located = new Map();
+    for (const [path, chunks] of Object.entries(layout || {})) {
+        let offset = 0;
+        for (const [sha256, bytes] of chunks) {
+            if (!located.has(sha256)) located.set(sha256, { path, start: offset, end: offset + bytes });
+            offset += bytes;
+        }
+    }
+    return located;
+}
+
+/**
+ * How to assemble one file of the new version: its chunks in order, each with
+ * `from` set to the installed copy's location when there is one. Null for a
+ * file the catalogue does not chunk, which is fetched whole.
+ */
+export function planFile(file, located) {
+    if (!Array.isArray(file.chunks) || !file.chunks.length) return null;
+    return file.chunks.map(chunk => ({ ...chunk, from: located.get(chunk.sha256) || null }));
+}
+
+/** Bytes an update of `source` fetches, given the installed layout. */
+export function updateBytes(source, layout) {
+    const located = installedChunks(layout);
+    let total = 0;
+    for (const file of source.files || []) {
+        const plan = planFile(file, located);
+        total += plan ? plan.reduce((sum, part) => sum + (part.from ? 0 : part.bytes), 0) : file.bytes;
+    }
+    return total;
+}
+
+export function chunkUrl(catalogue, sha256) {
+    return `${catalogue.chunkPath}${sha256}.json`;
+}
+
+export function concatChunks(parts) {
+    const body = new Uint8Array(parts.reduce((sum, part) => sum + part.byteLength, 0));
+    let offset = 0;
+    for (const part of parts) {
+        body.set(part, offset);
+        offset += part.byteLength;
+    }
+    return body;
+}
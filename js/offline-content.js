@@ -1,4 +1,7 @@
-import { dbDelete, dbGetAll, dbPut } from './offline-db.js?v=20260819b';
+import { dbDelete, dbGet, dbGetAll, dbPut } from './offline-db.js?v=20261019d';
+import {
+    chunkLayout, chunkUrl, concatChunks, installedChunks, planFile, updateBytes
+} from './offline-bundles-core.js?v=20261019d';
 
 const MANIFEST_URL = 'config/offline-content-manifest.json';
 const CONTENT_CACHE_PREFIX = 'fluency-content-';
@@ -41,10 +44,67 @@ export async function loadOfflineManifest({ refresh = false } = {}) {
 
 async function sha256(response) {
     if (!crypto.subtle) return null;
-    const digest = await crypto.subtle.digest('SHA-256', await response.clone().arrayBuffer());
+    return sha256Hex(await response.clone().arrayBuffer());
+}
+
+async function sha256Hex(body) {
+    const digest = await crypto.subtle.digest('SHA-256', body);
     return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
 }
 
+/**
+ * Rebuild a chunked file from the installed version's copy plus the chunks it
+ * lacks. Returns null when a chunk cannot be fetched or the result does not
+ * match the catalogue (an evicted or stale installed copy), so the caller
+ * falls back to a whole-file fetch. `installed` holds the last installed file read, as
+ * { path, body }, since consecutive chunks mostly come from the same file.
+ */
+async function assembleFile(catalogue, file, plan, installed, signal) {
+    const parts = [];
+    let fetched = 0;
+    for (const part of plan) {
+        if (part.from && installed.cache) {
+            if (installed.path !== part.from.path) {
+                const response = await installed.cache.match(part.from.path);
+                installed.path = part.from.path;
+                installed.body = response ? new Uint8Array(await response.arrayBuffer()) : null;
+            }
+            if (installed.body && installed.body.byteLength >= part.from.end) {
+                parts.push(installed.body.subarray(part.from.start, part.from.end));
+                continue;
+            }
+        }
+        // A missing (pruned), failed or corrupt chunk only loses the delta:
+        // the caller fetches the whole file instead.
+        let response;
+        try {
+            response = await fetch(chunkUrl(catalogue, part.sha256), { signal, cache: 'no-store' });
+        } catch (error) {
+            if (signal?.aborted) throw error;
+            return null;
+        }
+        if (!response.ok) return null;
+        const body = new Uint8Array(await response.arrayBuffer());
+        if (crypto.subtle && await sha256Hex(body) !== part.sha256) return null;
+        parts.push(body);
+        fetched += body.byteLength;
+    }
+    const body = concatChunks(parts);
+    if (body.byteLength !== file.bytes) return null;
+    if (file.sha256 && crypto.subtle && await sha256Hex(body) !== file.sha256) return null;
+    return { response: new Response(body, { headers: { 'Content-Type': 'application/json' } }), fetched };
+}
+
+async function fetchWholeFile(file, signal) {
+    const response = await fetch(file.path, { signal, cache: 'no-store' });
+    if (!response.ok) throw new Error(`${file.path}: HTTP ${response.status}`);
+    if (file.sha256 && crypto.subtle) {
+        const actual = await sha256(response);
+        if (actual !== file.sha256) throw new Error(`${file.path}: integrity check failed`);
+    }
+    return response;
+}
+
 export async function downloadSource(sourceId, onProgress = () => {}) {
     const catalogue = await loadOfflineManifest();
     const source = catalogue.sources.find(item => item.id === sourceId);
@@ -55,27 +115,44 @@ export async function downloadSource(sourceId, onProgress = () => {}) {
     const stagingName = `${CONTENT_CACHE_PREFIX}staging-${source.id}-${source.contentVersion}`;
     const finalName = `${CONTENT_CACHE_PREFIX}${source.id}-${source.contentVersion}`;
     const staging = await caches.open(stagingName);
+    // The installed version supplies every chunk it shares with this one. Its
+    // cache stays complete until this download replaces it, and the in-progress
+    // records carry it as `base`, so a paused update resumes with the same reuse.
+    const previous = await dbGet('downloads', sourceId).catch(() => null);
+    const base = previous?.status === 'installed'
+        ? { contentVersion: previous.contentVersion, chunkLayout: previous.chunkLayout || null }
+        : previous?.base || null;
+    const located = installedChunks(base?.chunkLayout);
+    const installed = {
+        cache: located.size
+            ? await caches.open(`${CONTENT_CACHE_PREFIX}${source.id}-${base.contentVersion}`)
+            : null,
+        path: null,
+        body: null
+    };
     let downloaded = 0;
+    let fetched = 0;
     try {
         await dbPut('downloads', {
             sourceId, contentVersion: source.contentVersion, status: 'downloading',
-            filesCompleted: 0, bytesDownloaded: 0, updatedAt: Date.now()
+            filesCompleted: 0, bytesDownloaded: 0, base, updatedAt: Date.now()
         });
         for (const [index, file] of source.files.entries()) {
-            const response = await fetch(file.path, { signal: controller.signal, cache: 'no-store' });
-            if (!response.ok) throw new Error(`${file.path}: HTTP ${response.status}`);
-            if (file.sha256 && crypto.subtle) {
-                const actual = await sha256(response);
-                if (actual !== file.sha256) throw new Error(`${file.path}: integrity check failed`);
-            }
+            const plan = catalogue.chunkPath ? planFile(file, located) : null;
+            const assembled = plan
+                ? await assembleFile(catalogue, file, plan, installed, controller.signal)
+                : null;
+            const response = assembled?.response || await fetchWholeFile(file, controller.signal);
+            fetched += assembled ? assembled.fetched : file.bytes;
             await staging.put(file.path, response.clone());
             downloaded += file.bytes;
             onProgress({ source, downloaded, total: source.storageBytes, file: index + 1 });
             await dbPut('downloads', {
                 sourceId, contentVersion: source.contentVersion, status: 'downloading',
-                filesCompleted: index + 1, bytesDownloaded: downloaded, updatedAt: Date.now()
+                filesCompleted: index + 1, bytesDownloaded: downloaded, base, updatedAt: Date.now()
             });
         }
+        installed.body = null;
         const existingFinal = await caches.open(finalName);
         for (const request of await staging.keys()) {
             await existingFinal.put(request, await staging.match(request));
@@ -85,7 +162,8 @@ export async function downloadSource(sourceId, onProgress = () => {}) {
         await existingFinal.put('/__fluency_content_complete__', new Response(source.contentVersion));
         await dbPut('downloads', {
             sourceId, contentVersion: source.contentVersion, status: 'installed',
-            filesCompleted: source.files.length, bytesDownloaded: downloaded,
+            filesCompleted: source.files.length, bytesDownloaded: downloaded, bytesFetched: fetched,
+            chunkLayout: chunkLayout(source),
             installedAt: Date.now(), lastUsedAt: Date.now(), updatedAt: Date.now()
         });
         await caches.delete(stagingName);
@@ -99,7 +177,7 @@ export async function downloadSource(sourceId, onProgress = () => {}) {
         await dbPut('downloads', {
             sourceId, contentVersion: source.contentVersion,
             status: error.name === 'AbortError' ? 'paused' : 'failed',
-            filesCompleted: 0, bytesDownloaded: downloaded, updatedAt: Date.now(),
+            filesCompleted: 0, bytesDownloaded: downloaded, base, updatedAt: Date.now(),
             lastError: error.name === 'AbortError' ? 'Download paused' : String(error.message || error)
         });
         throw error;
@@ -137,7 +215,7 @@ export async function renderOfflineContent() {
         target.innerHTML = sources.map(source => {
             const installed = source.local?.status === 'installed';
             const update = installed && source.local.contentVersion !== source.contentVersion;
-            const status = installed ? (update ? 'Update available' : 'Downloaded') :
+            const status = installed ? (update ? `Update available · ${fmt(updateBytes(source, source.local.chunkLayout))}` : 'Downloaded') :
                 source.local?.status === 'downloading' ? 'Downloading…' :
                 source.local?.status === 'failed' ? 'Download failed' : 'Not downloaded';
             return `<article class="offline-source" data-source="${source.id}">
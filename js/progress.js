@@ -1,4 +1,4 @@
-import './state.js?v=20260819b';
+import './state.js?v=20261019d';
 
 const SRS_DAY_MS = 24 * 60 * 60 * 1000;
 const SRS_INTERVAL_DAYS = [1, 3, 7, 14, 30, 60, 120];
@@ -1,7 +1,10 @@
 // Vocabulary loading, filtering, and ID generation.
 // Key functions: buildFilteredVocab() (central filter), loadVocabularyData(), getWordId(),
 // mergeArtistVocabularies() (multi-artist merge by hex ID).
-import './state.js?v=20260819b';
+import './state.js?v=20261019d';
+import {
+    decodeFilterIndex, filterIndexPath, hasRank, hiddenReason, isCurrent, visibleSet
+} from './filter-index-core.js?v=20261019d';
 
 const LAST_STUDY_SESSION_KEY = 'fluency_last_study_session_v1';
 
@@ -347,10 +350,17 @@ async function buildEstimatedKnownIds(estimate) {
     const normalConfig = window._normalModeLangConfigs?.[selectedLanguage];
     if (!normalConfig) return new Set();
 
-    const normalVocab = await fetchAndJoinIndex(normalConfig);
+    // Only the rank order is needed here. The filter index carries it for a
+    // fraction of the bytes, so an artist session no longer downloads and
+    // parses the whole normal index just to answer this.
+    const indexPath = normalConfig.indexPath || normalConfig.dataPath;
+    const filterIndex = joinedIndexCacheByPath.has(indexPath) ? null : await fetchFilterIndex(normalConfig);
+    const rankedIds = filterIndex
+        ? filterIndex.ids
+        : (await fetchAndJoinIndex(normalConfig)).map(entry => entry.id);
     const ids = new Set();
-    for (let i = 0; i < Math.min(estimate, normalVocab.length); i++) {
-        if (normalVocab[i].id) ids.add(normalVocab[i].id);
+    for (let i = 0; i < Math.min(estimate, rankedIds.length); i++) {
+        if (rankedIds[i]) ids.add(rankedIds[i]);
     }
 
     window._estimatedKnownIdsCache = { key: cacheKey, ids };
@@ -906,10 +916,15 @@ async function fetchAndJoinIndex(langConfig) {
         return cached;
     }
 
+    const filterIndexPromise = fetchFilterIndex(langConfig);
     const response = await fetch(indexPath);
     if (!response.ok) throw new Error(`HTTP ${response.status}`);
     trackDataFreshness(response);
-    let data = await response.json();
+    const indexBytes = await response.arrayBuffer();
+    let data = JSON.parse(new TextDecoder().decode(indexBytes));
+    // Digests of the files this join is built from, matched against the
+    // filter index's `sources` before its bitsets stand in for the scan.
+    const sources = { index: await bytesSha256(indexBytes) };
 
     // Detect new master-based format and join if needed
     if (activeArtist && langConfig.masterPath && data.length > 0 && data[0].sense_frequencies) {
@@ -918,7 +933,9 @@ async function fetchAndJoinIndex(langConfig) {
                 const masterResp = await fetch(langConfig.masterPath);
                 if (masterResp.ok) {
                     trackDataFreshness(masterResp);
-                    window._cachedMasterVocab = await masterResp.json();
+                    const masterBytes = await masterResp.arrayBuffer();
+                    window._cachedMasterVocab = JSON.parse(new TextDecoder().decode(masterBytes));
+                    masterSha256ByObject.set(window._cachedMasterVocab, await bytesSha256(masterBytes));
                 }
             } catch (e) {
                 console.warn('Failed to load master vocabulary:', e);
@@ -926,8 +943,10 @@ async function fetchAndJoinIndex(langConfig) {
         }
         if (window._cachedMasterVocab) {
             data = joinWithMaster(data, window._cachedMasterVocab);
+            sources.master = masterSha256ByObject.get(window._cachedMasterVocab) || null;
         }
     }
+    placeInFilterIndex(await filterIndexPromise, data, sources);
 
     window._cachedJoinedIndex = data;
     window._cachedJoinedIndexPath = indexPath;
@@ -935,6 +954,49 @@ async function fetchAndJoinIndex(langConfig) {
     return data;
 }
 
+// Decoded <base>.filter.json per index path (js/filter-index-core.js); null
+// when a deck was built without one, so callers fall back to the full index.
+const filterIndexCacheByPath = new Map();
+
+function fetchFilterIndex(langConfig) {
+    const path = filterIndexPath(langConfig.indexPath || langConfig.dataPath);
+    if (!path) return Promise.resolve(null);
+    if (!filterIndexCacheByPath.has(path)) {
+        filterIndexCacheByPath.set(path, fetch(path)
+            .then(response => {
+                if (!response.ok) return null;
+                trackDataFreshness(response);
+                return response.json();
+            })
+            .then(data => data ? decodeFilterIndex(data) : null)
+            .catch(() => null));
+    }
+    return filterIndexCacheByPath.get(path);
+}
+
+// sha256 of the master bytes, per parsed master object.
+const masterSha256ByObject = new WeakMap();
+
+async function bytesSha256(bytes) {
+    if (!globalThis.crypto?.subtle) return null;
+    const digest = await crypto.subtle.digest('SHA-256', bytes);
+    return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Joined entry -> { index, rank } in a filter index built from the same
+// index and master bytes. Entries without a place (stale or missing filter
+// file, merged multi-artist decks) go through the per-card checks.
+const filterPlaceByEntry = new WeakMap();
+
+function placeInFilterIndex(filterIndex, entries, sources) {
+    if (!isCurrent(filterIndex, sources)) return;
+    const rankById = new Map(filterIndex.ids.map((id, rank) => [id, rank]));
+    for (const entry of entries) {
+        const rank = rankById.get(entry.id);
+        if (rank !== undefined) filterPlaceByEntry.set(entry, { index: filterIndex, rank });
+    }
+}
+
 async function fetchActiveVocabularyData(langConfig) {
     const selectedSlugs = window._selectedArtistSlugs || [];
     const allConfigs = window._allArtistsConfig;
@@ -1287,6 +1349,19 @@ function buildFilteredVocab(vocabData) {
     const counts = { english: 0, cognates: 0, singleOcc: 0, lemma: 0 };
     const hasCorpusFrequency = vocabData.length > 0
         && vocabData[0].hasOwnProperty('corpus_count');
+    // Main scope and normal decks answer the flag checks below from the
+    // shipped bitsets (js/filter-index-core.js) for entries placed in a
+    // current filter index; Extra keeps the flagged words, so it always scans.
+    const visibleOptions = {
+        artist: Boolean(activeArtist),
+        excludeNoise,
+        excludeEnglishLoanwords,
+        excludeProperNouns,
+        excludeCognates: excludeCognates && cognateFieldAvailable,
+        cognateThreshold
+    };
+    const useFilterIndex = !(activeArtist && artistVocabularyScope === 'extra');
+    const visibleByIndex = new Map();
     let result = [];
     for (const item of vocabData) {
         if (!item.word || item.word.trim() === '' || item.duplicate
@@ -1304,6 +1379,22 @@ function buildFilteredVocab(vocabData) {
         // but an empty gloss). Mutates the item, matching prior behavior.
         item.meanings = (item.meanings || []).filter(m => m.translation && m.translation.trim());
         if (item.meanings.length === 0 && !allowsRawArtistCard) continue;
+        const place = useFilterIndex ? filterPlaceByEntry.get(item) : undefined;
+        if (place) {
+            if (!visibleByIndex.has(place.index)) {
+                visibleByIndex.set(place.index, visibleSet(place.index, visibleOptions));
+            }
+            const visible = visibleByIndex.get(place.index);
+            // Null when the index has no bitset for this cognate threshold.
+            if (visible) {
+                if (hasRank(visible, place.rank)) {
+                    result.push(item);
+                } else {
+                    counts[hiddenReason(place.index, place.rank, visibleOptions)]++;
+                }
+                continue;
+            }
+        }
         // Artist Extra deliberately KEEPS the over-tagged words (English,
         // loanwords, proper nouns, noise) instead of dropping them, so they
         // surface grouped by their `extra_category` rather than vanishing.
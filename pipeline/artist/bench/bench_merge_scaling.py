@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for tool_8c_merge_to_master.
+
+Builds N synthetic artists in a temporary Artists/ tree, each deck a seeded
+random slice of a vocabulary master (default: the checked-in wikt master),
+and times three runs of the merge for each N:
+
+  - full     : first run, every output written
+  - changed  : one deck edited, everything re-merged, only changed files written
+  - no-op    : nothing changed since the last run, language skipped
+
+Artists share each word's translations, so no sense needs a canonical
+translation and spaCy is never loaded. The real Artists/ tree is not touched.
+
+Run from project root:
+    .venv/bin/python3 pipeline/artist/bench/bench_merge_scaling.py
+    .venv/bin/python3 pipeline/artist/bench/bench_merge_scaling.py --artists 5 10 --deck-size 2000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "pipeline" / "artist"))
+
+import tool_8c_merge_to_master as merge  # noqa: E402
+
+MASTER = "Artists/spanish/vocabulary_master_wikt.json"
+LANG = "spanish"
+
+
+def make_deck(rng, pool, size):
+    deck = []
+    for wid, m in rng.sample(pool, size):
+        meanings = []
+        keys = set()
+        for sense in m.get("senses") or []:
+            # Senses that would merge need spaCy to pick a translation.
+            key = merge._sense_key(sense.get("pos", "X"), sense.get("translation", ""), "")
+            if key in keys:
+                continue
+            keys.add(key)
+            meanings.append({
+                "pos": sense.get("pos", "X"),
+                "translation": sense.get("translation", ""),
+                "examples": [{"song": "s%d" % rng.randrange(500), "spanish": m["word"],
+                              "english": sense.get("translation", "")}
+                             for _ in range(rng.randrange(3))],
+            })
+        deck.append({"id": wid, "word": m["word"], "lemma": m["lemma"],
+                     "meanings": meanings, "corpus_count": rng.randrange(1, 400)})
+    return deck
+
+
+def build_tree(root, n_artists, pool, deck_size, seed):
+    rng = random.Random(seed)
+    for i in range(n_artists):
+        artist_dir = root / LANG / ("Artist %02d" % i)
+        artist_dir.mkdir(parents=True)
+        (artist_dir / "artist.json").write_text(json.dumps(
+            {"name": "Artist %02d" % i, "language": LANG, "vocabulary_file": "vocabulary.json"}),
+            encoding="utf-8")
+        (artist_dir / "vocabulary.json").write_text(
+            json.dumps(make_deck(rng, pool, deck_size), ensure_ascii=False), encoding="utf-8")
+
+
+def run_once(workers):
+    """One tool_8c pass over the temp tree; (seconds, merged?)."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        artists = merge.discover_artists()[LANG]
+        if merge.is_up_to_date(LANG, artists):
+            return time.perf_counter() - start, False
+        master, per_artist_data, _stats = merge.build_master(
+            artists, morph_cache_path=merge.morph_cache_path_for_language(LANG))
+        merge.write_language(LANG, master, per_artist_data, workers=workers)
+    return time.perf_counter() - start, True
+
+
+def touch_one_deck(root):
+    path = root / LANG / "Artist 00" / "vocabulary.json"
+    deck = json.loads(path.read_text(encoding="utf-8"))
+    deck[0]["corpus_count"] += 1
+    path.write_text(json.dumps(deck, ensure_ascii=False), encoding="utf-8")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="tool_8c merge scaling benchmark")
+    ap.add_argument("--master", default=MASTER,
+                    help="Vocabulary master the synthetic decks sample (default: %(default)s)")
+    ap.add_argument("--artists", type=int, nargs="+", default=[5, 10, 20, 50],
+                    help="Artist counts to time (default: 5 10 20 50)")
+    ap.add_argument("--deck-size", type=int, default=4000,
+                    help="Entries per synthetic deck (default: %(default)s)")
+    ap.add_argument("--workers", type=int, default=4,
+                    help="Writer threads passed to tool_8c (default: %(default)s)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    with open(PROJECT_ROOT / args.master, "r", encoding="utf-8") as f:
+        pool = {}
+        for wid, m in sorted(json.load(f).items()):
+            pool.setdefault((m["word"], m["lemma"]), (wid, m))
+        pool = list(pool.values())
+    print("Pool: %d words (%s), %d entries per deck" % (len(pool), args.master, args.deck_size))
+    print("%8s %10s %10s %10s" % ("artists", "full", "changed", "no-op"))
+
+    saved_dir = merge.ARTISTS_DIR
+    try:
+        for n in args.artists:
+            with tempfile.TemporaryDirectory() as tmp:
+                root = Path(tmp)
+                build_tree(root, n, pool, args.deck_size, args.seed)
+                merge.ARTISTS_DIR = str(root)
+                full, _ = run_once(args.workers)
+                touch_one_deck(root)
+                changed, _ = run_once(args.workers)
+                noop, merged = run_once(args.workers)
+                if merged:
+                    print("  WARNING: unchanged tree was re-merged")
+                print("%8d %9.2fs %9.2fs %9.2fs" % (n, full, changed, noop))
+    finally:
+        merge.ARTISTS_DIR = saved_dir
+
+
+if __name__ == "__main__":
+    main()
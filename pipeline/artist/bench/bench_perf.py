@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""Speed / memory benchmark for the artist pipeline hot paths.
+
+The other benches in this directory measure quality (WSD accuracy, gap-fill
+recall, deck defects). This one runs the functions that dominate a pipeline
+run on a fixed slice of the two checked-in test decks and records, per case:
+
+  - wall_seconds   : best of --repeat untraced runs (perf_counter)
+  - wall_units     : median over those runs of (case time / calibration time)
+  - peak_kb        : tracemalloc peak during one traced run
+  - alloc_blocks   : memory blocks allocated and still live at the end of the
+                     traced run (the result plus anything cached by the call)
+
+Wall time depends on the host, so it is gated in calibration units: every
+untraced run of a case is preceded by a run of a fixed pure-Python workload
+(_calibration_workload()), and the case's time is divided by the calibration
+time taken right next to it. Load that comes and goes during a session slows
+both halves of a pair alike, and the median over the pairs drops the odd run
+that only one half caught. A baseline recorded on one machine then holds on
+another; absolute seconds are kept for reading. Peak memory and allocated
+blocks are counts of traced allocations and are gated as recorded.
+
+Inputs are loaded outside the timed region, so a case measures only the
+function under test. Nothing touches the network: LRC cases read
+data/lrclib_cache and cases whose fixture files are missing are skipped.
+
+Results are compared to perf_baseline.json (next to this file). A case
+regresses when its wall units, peak memory or allocated blocks exceed
+baseline x --threshold AND the absolute change is above that metric's noise
+floor (--min-delta-ms, converted to this host's seconds, / --min-delta-kb /
+--min-delta-blocks). A wall-time regression must also reproduce when the
+case is measured again before it counts. Any regression exits 1, so the
+bench can gate a change.
+
+Run from project root:
+    .venv/bin/python3 pipeline/artist/bench/bench_perf.py              # compare
+    .venv/bin/python3 pipeline/artist/bench/bench_perf.py --record     # new baseline
+    .venv/bin/python3 pipeline/artist/bench/bench_perf.py --cases lrc --out /tmp/perf.json
+"""
+import argparse
+import atexit
+import contextlib
+import gc
+import io
+import json
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "pipeline"))
+sys.path.insert(0, str(PROJECT_ROOT / "pipeline" / "artist"))
+
+BASELINE_PATH = Path(__file__).resolve().parent / "perf_baseline.json"
+SPANISH_DIR = PROJECT_ROOT / "Artists" / "spanish" / "SpanishTestPlaylist"
+FRENCH_DIR = PROJECT_ROOT / "Artists" / "french" / "TestPlaylist"
+
+# Fixed fixture slice: the first N songs / evidence entries in sorted order.
+# Changing these invalidates the stored baseline (re-run with --record).
+SONG_SLICE = 24
+EVIDENCE_SLICE = 1500
+LRC_SONG_SLICE = 12
+
+DEFAULT_REPEAT = 7
+DEFAULT_THRESHOLD = 1.5
+DEFAULT_MIN_DELTA_MS = 5.0
+DEFAULT_MIN_DELTA_KB = 256.0
+DEFAULT_MIN_DELTA_BLOCKS = 2000
+
+
+class SkipCase(Exception):
+    """Fixture input for a case is not present in this checkout."""
+
+
+def _require(path):
+    if not Path(path).exists():
+        raise SkipCase("missing %s" % Path(path).relative_to(PROJECT_ROOT))
+    return Path(path)
+
+
+def _load_json(path):
+    with open(_require(path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _song_slice(artist_dir, language):
+    from step_2a_count_words import iter_songs_from_batches
+    lyrics_dir = _require(artist_dir / "lyrics" / language)
+    songs = iter_songs_from_batches(str(lyrics_dir / "*.json"))
+    songs.sort(key=lambda s: (str(s.get("title", "")), str(s.get("id", ""))))
+    return songs[:SONG_SLICE]
+
+
+# ---------------------------------------------------------------------------
+# Cases. Each setup returns a zero-argument callable; only the callable is
+# measured.
+# ---------------------------------------------------------------------------
+
+def setup_count_words(artist_dir, language):
+    from step_2a_count_words import build_counts_and_candidates
+    songs = _song_slice(artist_dir, language)
+
+    def run():
+        return build_counts_and_candidates(
+            [dict(song) for song in songs], lid_detector=None,
+            analysis_language=language)
+    return run
+
+
+def setup_detect_mwes(artist_dir, language):
+    from step_2a_count_words import build_counts_and_candidates, detect_mwes
+    with contextlib.redirect_stdout(io.StringIO()):
+        _c, _cand, _lid, ngram_data, _ws = build_counts_and_candidates(
+            _song_slice(artist_dir, language), lid_detector=None,
+            analysis_language=language)
+
+    def run():
+        return detect_mwes(ngram_data, frozenset())
+    return run
+
+
+def setup_merge_evidence(artist_dir, language):
+    import step_3a_merge_elisions as step_3a
+    data = _load_json(artist_dir / "data" / "word_counts" / "vocab_evidence.json")
+    data = data[:EVIDENCE_SLICE]
+    if language == "french":
+        def run():
+            return step_3a.merge_evidence_french(json.loads(json.dumps(data)))
+        return run
+    from util_1a_artist_config import SHARED_DIR
+    targets = step_3a.load_merge_targets(
+        _require(Path(SHARED_DIR) / "elision_mapping.json"))
+    known_vocab = step_3a.load_known_vocab()
+
+    def run():
+        return step_3a.merge_evidence(json.loads(json.dumps(data)), targets, known_vocab)
+    return run
+
+
+def _scratch_dir():
+    scratch = Path(tempfile.mkdtemp(prefix="bench_perf_"))
+    atexit.register(shutil.rmtree, scratch, True)
+    return scratch
+
+
+def _fixture_evidence_dir(evidence_dir):
+    """Return an evidence dir whose profile only selects runs that exist.
+
+    The checked-in test decks carry one ledger run and a few overlay runs,
+    not every run their profile points at. Re-point the profile at what is
+    present (in a scratch dir; the real files are symlinked, not copied).
+    """
+    profile = _load_json(evidence_dir / "profiles" / "current.json")
+    ledger_runs = sorted((evidence_dir / "ledger" / "runs").glob("*/segments.jsonl"))
+    if not ledger_runs:
+        raise SkipCase("no ledger run under %s" % evidence_dir.relative_to(PROJECT_ROOT))
+    runs = dict(profile.get("runs") or {})
+    if (evidence_dir / "ledger" / "runs" / str(runs.get("ledger")) / "segments.jsonl").exists():
+        return evidence_dir
+    runs["ledger"] = ledger_runs[-1].parent.name
+    for layer_dir in sorted((evidence_dir / "overlays").glob("*")):
+        present = sorted(path.stem for path in layer_dir.glob("*.jsonl"))
+        if present:
+            runs[layer_dir.name] = present[-1]
+    for layer in list(runs):
+        if layer != "ledger" and not (
+                evidence_dir / "overlays" / layer / ("%s.jsonl" % runs[layer])).exists():
+            del runs[layer]
+    scratch = _scratch_dir() / "evidence"
+    (scratch / "profiles").mkdir(parents=True)
+    for sub in ("ledger", "overlays"):
+        (scratch / sub).symlink_to(evidence_dir / sub, target_is_directory=True)
+    profile = {**profile, "runs": runs, "claim_runs": {}}
+    with open(scratch / "profiles" / "current.json", "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+    return scratch
+
+
+def setup_materialize_evidence(artist_dir, language):
+    from util_2b_evidence_view import materialize_vocabulary_evidence
+    evidence_dir = _fixture_evidence_dir(_require(artist_dir / "data" / "evidence"))
+
+    def run():
+        return materialize_vocabulary_evidence(str(evidence_dir))
+    return run
+
+
+def setup_assemble(artist_dir, language):
+    import step_8b_assemble_artist_vocabulary as step_8b
+    _require(artist_dir / "data" / "layers" / "word_inventory.json")
+    # assemble_from_layers saves the per-language card/sense identity
+    # registries next to the Artists/<language>/ tree it runs under. Run it on
+    # a scratch copy so the bench never touches the real registries.
+    scratch = _scratch_dir()
+    data_dir = scratch / "Artists" / language / artist_dir.name / "data"
+    for sub in ("layers", "word_counts", "evidence/profiles"):
+        if (artist_dir / "data" / sub).is_dir():
+            shutil.copytree(artist_dir / "data" / sub, data_dir / sub)
+    registries = scratch / "Artists" / language / "evidence" / "registries"
+
+    def run():
+        # Start every run from an empty registry so repeats do equal work.
+        shutil.rmtree(registries, ignore_errors=True)
+        return step_8b.assemble_from_layers(str(data_dir / "layers"), {})
+    return run
+
+
+def setup_match_lrc(artist_dir, language):
+    from step_8a_fetch_lrc_timestamps import (
+        get_synced_result, match_examples_to_lrc, parse_lrc)
+    examples_raw = _load_json(artist_dir / "data" / "layers" / "examples_raw.json")
+    cache_dir = _require(artist_dir / "data" / "lrclib_cache")
+    songs = {}
+    for word_examples in examples_raw.values():
+        for ex in word_examples:
+            if ex.get("title") and ex.get("spanish"):
+                songs.setdefault(ex["title"], set()).add(ex["spanish"])
+    pairs = []
+    for title in sorted(songs):
+        # Same slug load_or_fetch uses for its cache file names.
+        slug = re.sub(r'[^\w\-]', '_', title.lower())
+        cache_path = cache_dir / ("%s.json" % slug)
+        if not cache_path.exists():
+            continue
+        with open(cache_path, "r", encoding="utf-8") as f:
+            synced_result = get_synced_result(json.load(f))
+        synced = synced_result.get("syncedLyrics") if synced_result else None
+        if synced:
+            pairs.append((sorted(songs[title]), parse_lrc(synced)))
+        if len(pairs) >= LRC_SONG_SLICE:
+            break
+    if not pairs:
+        raise SkipCase("no cached synced lyrics")
+
+    def run():
+        return [match_examples_to_lrc(lines, lrc_lines) for lines, lrc_lines in pairs]
+    return run
+
+
+def _claim_paths(artist_dir):
+    overlays = _require(artist_dir / "data" / "evidence" / "overlays")
+    paths = sorted(overlays.glob("*/*.jsonl"))
+    if not paths:
+        raise SkipCase("no evidence overlay claims")
+    return paths
+
+
+def setup_read_jsonl(artist_dir, language):
+    from pipeline.util_evidence_store import read_jsonl
+    ledger_runs = artist_dir / "data" / "evidence" / "ledger" / "runs"
+    paths = _claim_paths(artist_dir) + sorted(ledger_runs.glob("*/*.jsonl"))
+
+    def run():
+        return [read_jsonl(path) for path in paths]
+    return run
+
+
+def setup_resolve_claims(artist_dir, language):
+    from pipeline.util_evidence_store import read_jsonl, resolve_claims
+    claims = [claim for path in _claim_paths(artist_dir) for claim in read_jsonl(path)]
+
+    def run():
+        return resolve_claims(claims)
+    return run
+
+
+ARTISTS = (
+    ("spanish", SPANISH_DIR, "spanish"),
+    ("french", FRENCH_DIR, "french"),
+)
+
+CASE_SETUPS = (
+    ("build_counts_and_candidates", setup_count_words),
+    ("detect_mwes", setup_detect_mwes),
+    ("merge_evidence", setup_merge_evidence),
+    ("materialize_vocabulary_evidence", setup_materialize_evidence),
+    ("assemble_from_layers", setup_assemble),
+    ("match_examples_to_lrc", setup_match_lrc),
+    ("read_jsonl", setup_read_jsonl),
+    ("resolve_claims", setup_resolve_claims),
+)
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _calibration_workload():
+    """Tokenise, count, sort and JSON round-trip a fixed synthetic text: the
+    same kinds of work the cases do, with no I/O and no imports."""
+    words = ["w%d%s" % (i % 997, "aeiou"[i % 5]) for i in range(40000)]
+    text = " ".join(words)
+    counts = {}
+    for token in re.findall(r"\w+", text):
+        counts[token] = counts.get(token, 0) + 1
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    return json.loads(json.dumps([{"w": w, "n": n, "s": w[::-1]} for w, n in ranked] * 8))
+
+
+def _timed(fn):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    del result
+    return elapsed
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def measure(fn, repeat):
+    """Return wall / memory stats for ``fn``; step chatter is discarded.
+
+    Each timed run is paired with a calibration run just before it; the
+    calibration times come back under "calibration_seconds" for the caller
+    and are not part of the stored stats.
+    """
+    timings, calibrations = [], []
+    for _ in range(repeat):
+        calibrations.append(_timed(_calibration_workload))
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings.append(_timed(fn))
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn()
+        _current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    alloc_blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "wall_seconds": round(min(timings), 4),
+        "wall_seconds_median": round(_median(timings), 4),
+        "wall_units": round(_median([t / c for t, c in zip(timings, calibrations)]), 3),
+        "peak_kb": round(peak / 1024, 1),
+        "alloc_blocks": alloc_blocks,
+        "calibration_seconds": calibrations,
+    }
+
+
+def run_cases(selected=None, repeat=DEFAULT_REPEAT):
+    """Measure every case; returns (results, calibration_seconds).
+
+    The returned calibration is the median over every calibration run of
+    the session, for the report and the noise floor in compare().
+    """
+    calibrations = []
+    results = {}
+    for label, artist_dir, language in ARTISTS:
+        for func_name, setup in CASE_SETUPS:
+            case_id = "%s:%s" % (func_name, label)
+            if selected and not any(s in case_id for s in selected):
+                continue
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    fn = setup(artist_dir, language)
+            except SkipCase as exc:
+                print("  %-42s skipped (%s)" % (case_id, exc))
+                continue
+            stats = measure(fn, repeat)
+            calibrations.extend(stats.pop("calibration_seconds"))
+            results[case_id] = stats
+            print("  %-42s %8.3fs  %8.2f units  peak %9.1f KB  %8d blocks" % (
+                case_id, stats["wall_seconds"], stats["wall_units"], stats["peak_kb"],
+                stats["alloc_blocks"]))
+    return results, (_median(calibrations) if calibrations else None)
+
+
+def compare(results, baseline, threshold, min_delta_ms, min_delta_kb,
+            min_delta_blocks, calibration):
+    """Return ``(case_id, metric, line)`` for every regression (empty when clean).
+
+    Wall time is compared in calibration units; the millisecond noise floor
+    is converted to units at this session's calibration.
+    """
+    regressions = []
+    unit_floor = min_delta_ms / 1000.0 / calibration if calibration else 0.0
+    for case_id, stats in sorted(results.items()):
+        base = baseline.get(case_id)
+        if not base:
+            continue
+        checks = [("peak_kb", stats["peak_kb"], base["peak_kb"], min_delta_kb, " KB")]
+        if base.get("wall_units"):
+            checks.insert(0, ("wall_units", stats["wall_units"], base["wall_units"],
+                              unit_floor, " units"))
+        if base.get("alloc_blocks") is not None:
+            checks.append(("alloc_blocks", stats["alloc_blocks"], base["alloc_blocks"],
+                           min_delta_blocks, " blocks"))
+        for metric, now, then, floor, unit in checks:
+            if then and now > then * threshold and now - then > floor:
+                regressions.append((case_id, metric, "%s %s: %.3f%s -> %.3f%s (x%.2f > x%.2f)" % (
+                    case_id, metric, then, unit, now, unit, now / then, threshold)))
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Artist pipeline speed/memory benchmark")
+    ap.add_argument("--cases", nargs="*", default=None,
+                    help="Only run cases whose id contains one of these substrings")
+    ap.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                    help="Untraced timing runs per case, each paired with a calibration "
+                         "run; the median ratio counts (default %d)" % DEFAULT_REPEAT)
+    ap.add_argument("--baseline", default=str(BASELINE_PATH),
+                    help="Baseline JSON path (default: perf_baseline.json here)")
+    ap.add_argument("--record", action="store_true",
+                    help="Write this run as the new baseline instead of comparing")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="Fail when a metric exceeds baseline x this (default %.2f)"
+                         % DEFAULT_THRESHOLD)
+    ap.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                    help="Ignore wall-time regressions smaller than this (default %.0f ms)"
+                         % DEFAULT_MIN_DELTA_MS)
+    ap.add_argument("--min-delta-kb", type=float, default=DEFAULT_MIN_DELTA_KB,
+                    help="Ignore peak-memory regressions smaller than this (default %.0f KB)"
+                         % DEFAULT_MIN_DELTA_KB)
+    ap.add_argument("--min-delta-blocks", type=int, default=DEFAULT_MIN_DELTA_BLOCKS,
+                    help="Ignore allocated-block regressions smaller than this (default %d)"
+                         % DEFAULT_MIN_DELTA_BLOCKS)
+    ap.add_argument("--out", default=None, help="Also write this run's results here")
+    args = ap.parse_args()
+
+    print("Running perf cases (repeat=%d)..." % args.repeat)
+    results, calibration = run_cases(args.cases, repeat=max(1, args.repeat))
+    if calibration is None:
+        print("No cases ran.")
+        return
+    print("  calibration: %.4fs" % calibration)
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "calibration_seconds": round(calibration, 5),
+        "slice": {"songs": SONG_SLICE, "evidence_entries": EVIDENCE_SLICE,
+                  "lrc_songs": LRC_SONG_SLICE},
+        "cases": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print("Wrote %s" % args.out)
+
+    baseline_path = Path(args.baseline)
+    if args.record:
+        if baseline_path.exists() and args.cases:
+            # Partial re-record: keep the other cases' numbers.
+            with open(baseline_path, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+            if not previous.get("calibration_seconds"):
+                sys.exit("%s predates calibration units; re-record every case "
+                         "(drop --cases)." % baseline_path.name)
+            report["cases"] = {**previous.get("cases", {}), **results}
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print("Recorded baseline -> %s" % baseline_path)
+        return
+
+    if not baseline_path.exists():
+        print("No baseline at %s — run with --record first." % baseline_path)
+        return
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if not baseline.get("calibration_seconds"):
+        print("%s has no calibration; wall time is not gated until it is "
+              "re-recorded with --record." % baseline_path.name)
+    floors = (args.min_delta_ms, args.min_delta_kb, args.min_delta_blocks)
+    regressions = compare(results, baseline.get("cases", {}), args.threshold,
+                          *floors, calibration)
+    slow = sorted({case_id for case_id, metric, _line in regressions
+                   if metric == "wall_units"})
+    if slow:
+        # One slow session is not a regression: measure those cases again and
+        # keep a wall-time failure only if the second run repeats it.
+        print("\nRe-measuring %d case(s) over the wall-time threshold..." % len(slow))
+        again, again_calibration = run_cases(slow, repeat=max(1, args.repeat))
+        repeated = {(case_id, metric) for case_id, metric, _line in compare(
+            again, baseline.get("cases", {}), args.threshold, *floors, again_calibration)}
+        regressions = [r for r in regressions
+                       if r[1] != "wall_units" or (r[0], r[1]) in repeated]
+    if regressions:
+        print("\nREGRESSIONS (threshold x%.2f):" % args.threshold)
+        for _case_id, _metric, line in regressions:
+            print("  " + line)
+        sys.exit(1)
+    print("\nNo regressions against %s (threshold x%.2f)." % (
+        baseline_path.name, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
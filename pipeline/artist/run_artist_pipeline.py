@@ -16,6 +16,7 @@ import os
 import subprocess
 import sys
 import time
+from datetime import datetime, timezone
 
 
 def _load_dotenv():
@@ -33,6 +34,16 @@ SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPTS_DIR))
 ARTISTS_DIR = os.path.join(PROJECT_ROOT, "Artists")
 PYTHON = os.path.join(PROJECT_ROOT, ".venv", "bin", "python3")
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from pipeline.util_pipeline_meta import read_meta  # noqa: E402
+from pipeline.util_pipeline_metrics import cpu_seconds  # noqa: E402
+from pipeline.util_layer_format import LAYER_FORMAT_ENV, LAYER_FORMATS  # noqa: E402
+
+# One JSON report per orchestrated run, under <artist>/data/pipeline_runs/.
+# scripts/pipeline_status.py reads these for per-step time/cost trends.
+RUN_REPORT_DIR = os.path.join("data", "pipeline_runs")
 
 _load_dotenv()
 
@@ -301,7 +312,22 @@ def file_mtime(artist_dir, path):
     return os.path.getmtime(full) if os.path.exists(full) else 0
 
 
-def run_step(step, args, artist_dir, dry_run=False):
+def _step_output_metrics(artist_dir, step, since):
+    """Return the `metrics` block the step stamped into its output meta.
+
+    Only a meta generated during this run counts; an untouched output from an
+    earlier run would otherwise report stale timings as this run's.
+    """
+    if not step.get("output"):
+        return None
+    path = os.path.join(artist_dir, step["output"])
+    meta = read_meta(path) if os.path.isfile(path) else None
+    if not meta or int(meta.get("generated_at", 0) or 0) < int(since):
+        return None
+    return meta.get("metrics")
+
+
+def run_step(step, args, artist_dir, dry_run=False, report=None):
     script_path = os.path.join(SCRIPTS_DIR, step["script"])
     extra_args = step["args_fn"](args, artist_dir)
     cmd = [PYTHON, script_path] + extra_args
@@ -316,11 +342,28 @@ def run_step(step, args, artist_dir, dry_run=False):
 
     print("  Running...")
     start = time.time()
+    cpu_start = cpu_seconds(children=True)
     env = os.environ.copy()
     env["PYTHONUNBUFFERED"] = "1"
+    if getattr(args, "layer_format", None):
+        env[LAYER_FORMAT_ENV] = args.layer_format
     result = subprocess.run(cmd, cwd=PROJECT_ROOT, env=env)
     elapsed = time.time() - start
 
+    if report is not None:
+        record = {
+            "step": str(step["num"]),
+            "script": step["script"],
+            "returncode": result.returncode,
+            "wall_seconds": round(elapsed, 3),
+        }
+        if cpu_start is not None:
+            record["cpu_seconds"] = round(cpu_seconds(children=True) - cpu_start, 3)
+        step_metrics = _step_output_metrics(artist_dir, step, start)
+        if step_metrics:
+            record["metrics"] = step_metrics
+        report.append(record)
+
     if result.returncode == 0:
         print("  Done (%.1f seconds)" % elapsed)
         return True
@@ -328,6 +371,40 @@ def run_step(step, args, artist_dir, dry_run=False):
     return False
 
 
+def write_run_report(artist_dir, run_id, records, args):
+    """Persist the per-step timing records of one orchestrated run."""
+    report = {
+        "run_id": run_id,
+        "artist_dir": os.path.relpath(artist_dir, PROJECT_ROOT),
+        "language": args.language,
+        "classifier": args.classifier,
+        "total_wall_seconds": round(sum(r["wall_seconds"] for r in records), 3),
+        "completed": all(r["returncode"] == 0 for r in records),
+        "steps": records,
+    }
+    out_dir = os.path.join(artist_dir, RUN_REPORT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, "%s.json" % run_id)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def print_timing_report(records):
+    """Print one line per step: wall, CPU, peak RSS and the main counters."""
+    print("\n--- Step timings ---")
+    print("%-7s %9s %9s %9s  %s" % ("Step", "wall s", "cpu s", "rss MB", "counters"))
+    for r in records:
+        m = r.get("metrics") or {}
+        counters = m.get("counters") or {}
+        shown = ", ".join("%s=%s" % (k, "{:,}".format(v))
+                          for k, v in sorted(counters.items()))
+        print("%-7s %9.1f %9s %9s  %s" % (
+            r["step"], r["wall_seconds"],
+            "%.1f" % r["cpu_seconds"] if "cpu_seconds" in r else "-",
+            m.get("peak_rss_mb", "-"), shown))
+
+
 def _discover_artists():
     """Walk Artists/<lang>/<name>/artist.json and return {name: full_path}.
 
@@ -400,6 +477,10 @@ def main():
                         help="Occurrence-level vocal-artifact policy. 'basic' "
                              "records and excludes only conservative adlib/echo/stutter "
                              "rules; 'off' records the run but materializes parity.")
+    parser.add_argument("--layer-format", choices=LAYER_FORMATS, default=None,
+                        help="'binary' also writes .layer siblings for the large "
+                             "layer files, which step 8b loads instead of the JSON "
+                             "(default: $%s or json)." % LAYER_FORMAT_ENV)
     args = parser.parse_args()
 
     # Resolve artist name → directory. A value containing a path separator is
@@ -480,11 +561,19 @@ def main():
             print("%s Step %s: %-35s  (missing)" % (marker, step["num"], step["output"] or "(none)"))
 
     total_start = time.time()
+    run_id = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H%M%SZ")
+    records = []
     for step in steps_to_run:
-        if not run_step(step, args, artist_dir, dry_run=args.dry_run):
+        if not run_step(step, args, artist_dir, dry_run=args.dry_run, report=records):
+            print_timing_report(records)
+            write_run_report(artist_dir, run_id, records, args)
             print("\nAborting — step %s failed." % step["num"])
             sys.exit(1)
 
+    if records:
+        print_timing_report(records)
+        print("  Run report: %s" % write_run_report(artist_dir, run_id, records, args))
+
     print("\n" + "=" * 60)
     if args.dry_run:
         print("Dry run complete.")
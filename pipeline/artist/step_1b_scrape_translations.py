@@ -39,6 +39,7 @@ _PROJECT_ROOT = os.path.dirname(os.path.dirname(_THIS_DIR))
 if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 from pipeline.util_pipeline_meta import make_meta, write_sidecar  # noqa: E402
+from pipeline.util_pipeline_metrics import METRICS  # noqa: E402
 
 STEP_VERSION = 1
 STEP_VERSION_NOTES = {
@@ -76,6 +77,7 @@ class ETATracker(object):
         self.lock = threading.Lock()
 
     def tick(self):
+        METRICS.count("items")
         with self.lock:
             self.done += 1
             return self.done
@@ -199,6 +201,7 @@ def find_english_translation(song_id):
     _geniurl_throttle()
     url = "%s/%s" % (GENIURL_BASE, song_id)
     try:
+        METRICS.count("api_calls")
         resp = requests.get(url, timeout=15)
 
         # Rate-limited — honour Retry-After header
@@ -206,6 +209,7 @@ def find_english_translation(song_id):
             retry_after = int(resp.headers.get("Retry-After", 30))
             print("  Rate-limited by geniURL, waiting %ds..." % retry_after)
             time.sleep(retry_after)
+            METRICS.count("api_calls")
             resp = requests.get(url, timeout=15)
 
         if resp.status_code >= 400:
@@ -50,6 +50,11 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 from pipeline.util_pipeline_meta import make_meta, write_sidecar  # noqa: E402
 from pipeline.util_evidence_store import archive_json_artifact  # noqa: E402
+from pipeline.util_line_lid import (  # noqa: E402
+    LINGUA_AVAILABLE,
+    LineLanguageIdentifier,
+    default_cache_dir,
+)
 
 # Bump when counting logic, tokenization, or output schema changes in a way
 # that invalidates existing vocab_evidence.json files.
@@ -81,13 +86,6 @@ STEP_VERSION_NOTES = {
         "before vocal-artifact, routing, POS and WSD layers",
 }
 
-try:
-    from lingua import Language, LanguageDetectorBuilder
-    _LINGUA_AVAILABLE = True
-except ImportError:
-    _LINGUA_AVAILABLE = False
-
-
 # ====== Tokenization & cleaning ======
 LETTER_CLASS = r"A-Za-zÁÉÍÓÚÜÑáéíóúüñ"
 WORD_RE = re.compile(rf"[{LETTER_CLASS}]+(?:'[{LETTER_CLASS}]+)*'?")
@@ -649,12 +647,31 @@ def score_line(tokens: List[str]) -> int:
     return score
 
 
-def _is_english_line(detector, line_text: str) -> bool:
+def _is_english_line(lid, line_text: str) -> bool:
     """Return True if lingua detects the line as English above the confidence threshold."""
-    confs = detector.compute_language_confidence_values(line_text)
-    if confs and confs[0].language == Language.ENGLISH and confs[0].value >= _EN_CONFIDENCE_THRESHOLD:
-        return True
-    return False
+    return lid.is_language(line_text, "english", _EN_CONFIDENCE_THRESHOLD)
+
+
+def _prime_line_lid(lid, songs, mwe_map) -> None:
+    """Batch-detect every LID-eligible line of the corpus before counting.
+
+    Eligibility mirrors the counting loop: a line whose expanded token count
+    reaches _MIN_TOKENS_FOR_LID. Repeated choruses and lines shared between
+    songs reach lingua once; cached verdicts not at all.
+    """
+    eligible = []
+    for song in songs:
+        raw_lyrics = song.get("lyrics")
+        if not raw_lyrics:
+            continue
+        for line_text, _vocalists in clean_genius_lyrics(raw_lyrics, with_sections=True):
+            line_text = line_text.strip()
+            count_text = strip_adlibs(line_text) if line_text else ""
+            raw_toks = tokenize(count_text) if count_text else []
+            n_tokens = sum(len(mwe_map[t]) if t in mwe_map else 1 for t in raw_toks)
+            if n_tokens >= _MIN_TOKENS_FOR_LID:
+                eligible.append(line_text)
+    lid.prime(eligible)
 
 
 # ====== Input loader ======
@@ -715,6 +732,10 @@ def build_counts_and_candidates(
     - counts[word] = total occurrences across corpus
     - candidates[word] = list of candidate context lines across songs
     - lid_stats = summary of lingua English line filtering
+
+    `lid_detector` is a `util_line_lid.LineLanguageIdentifier` (a bare lingua
+    detector is wrapped in one); every eligible line is detected in one batch
+    before the counting pass.
     - ngram_data = counters used by MWE detection
     - word_songs[word] = every distinct corpus song containing the word
 
@@ -730,6 +751,11 @@ def build_counts_and_candidates(
                  "ngram_elision_subs": 0}
     mwe_map = mwe_map or {}
     elision_map = elision_map or {}
+    if lid_detector is not None:
+        if not isinstance(lid_detector, LineLanguageIdentifier):
+            lid_detector = LineLanguageIdentifier(
+                ["spanish", "english"], detector=lid_detector)
+        _prime_line_lid(lid_detector, songs, mwe_map)
     analysis_known_forms = None
     if ledger is not None and analysis_language == "spanish":
         try:
@@ -1812,6 +1838,9 @@ def main():
     ap.add_argument("--preview", type=int, default=0, help="Print first N entries after writing")
     ap.add_argument("--no-lid", action="store_true",
                     help="Disable lingua English line detection")
+    ap.add_argument("--lid-cache", default=None,
+                    help="Directory of cached line-LID verdicts "
+                         "(default: Artists/<language>/lid_cache, shared by artists)")
 
     args = ap.parse_args()
     PIPELINE_DIR = os.path.abspath(args.artist_dir)
@@ -1821,11 +1850,13 @@ def main():
 
     lid_detector = None
     if not args.no_lid:
-        if _LINGUA_AVAILABLE:
-            print("Building lingua detector (Spanish + English)...")
-            lid_detector = LanguageDetectorBuilder.from_languages(
-                Language.SPANISH, Language.ENGLISH
-            ).build()
+        if LINGUA_AVAILABLE:
+            lid_detector = LineLanguageIdentifier(
+                ["spanish", "english"],
+                cache_dir=args.lid_cache or default_cache_dir(args.artist_dir),
+            )
+            print("Lingua line detection (Spanish + English), cache: %s"
+                  % lid_detector.cache_path)
         else:
             print("WARNING: lingua not installed — skipping English line detection. "
                   "Install with: pip install lingua-language-detector")
@@ -1894,6 +1925,9 @@ def main():
               f"{lid_stats['lines_below_min_tokens']:,}")
     elif lid_detector is not None:
         print("  Lingua: no English lines detected")
+    if lid_detector is not None:
+        lid_detector.save()
+        print("  " + lid_detector.format_report())
 
     if lid_stats.get("multi_word_splits"):
         print(f"  Multi-word elision splits: {lid_stats['multi_word_splits']:,} tokens expanded")
@@ -68,6 +68,8 @@ from pipeline.util_pipeline_meta import (  # noqa: E402
     write_sidecar,
 )
 from pipeline.util_evidence_store import archive_json_artifact  # noqa: E402
+from pipeline.util_4a_lexicon import load_lexicon  # noqa: E402
+from pipeline.util_layer_format import write_layer  # noqa: E402
 
 STEP_VERSION = 12
 STEP_VERSION_NOTES = {
@@ -702,7 +704,10 @@ def load_spanish_forms():
     global _spanish_forms_cache
     if _spanish_forms_cache is None:
         path = os.path.join(_PROJECT_ROOT, "Data", "Spanish", "layers", "spanish_forms.json")
-        if not os.path.isfile(path):
+        lexicon = load_lexicon()
+        if lexicon is not None and lexicon.pos is not None:
+            _spanish_forms_cache = frozenset(lexicon.pos)
+        elif not os.path.isfile(path):
             _spanish_forms_cache = frozenset()
         else:
             with open(path, "r", encoding="utf-8") as f:
@@ -723,15 +728,20 @@ def load_surface_frequency():
     if _surface_frequency_cache is None:
         path = os.path.join(_PROJECT_ROOT, "Data", "Spanish", "es_50k_wordlist.txt")
         frequencies = {}
-        if os.path.isfile(path):
+        lexicon = load_lexicon()
+        if lexicon is not None and lexicon.es_50k is not None:
+            rows = lexicon.es_50k
+        elif os.path.isfile(path):
             with open(path, encoding="utf-8") as handle:
-                for line in handle:
-                    parts = line.strip().split()
-                    if len(parts) >= 2:
-                        try:
-                            frequencies[parts[0].casefold()] = int(parts[1])
-                        except ValueError:
-                            continue
+                rows = [line.strip().split() for line in handle]
+        else:
+            rows = ()
+        for parts in rows:
+            if len(parts) >= 2:
+                try:
+                    frequencies[parts[0].casefold()] = int(parts[1])
+                except ValueError:
+                    continue
         _surface_frequency_cache = frequencies
     return _surface_frequency_cache
 
@@ -1072,9 +1082,7 @@ def main():
         apos_index = load_french_apos_phrases(french_kaikki_path)
         merged, stats = merge_evidence_french(data, apos_phrase_index=apos_index)
 
-        os.makedirs(os.path.dirname(str(OUT_PATH)), exist_ok=True)
-        with open(OUT_PATH, "w", encoding="utf-8") as f:
-            json.dump(merged, f, ensure_ascii=False, indent=2)
+        write_layer(OUT_PATH, merged)
         upstream = dependency_metadata(IN_PATH)
         write_sidecar(OUT_PATH, make_meta("merge_elisions", STEP_VERSION,
                                           extra={**upstream, "language": "french",
@@ -1113,9 +1121,7 @@ def main():
 
     merged, stats = merge_evidence(data, targets, known_vocab)
 
-    os.makedirs(os.path.dirname(str(OUT_PATH)), exist_ok=True)
-    with open(OUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(merged, f, ensure_ascii=False, indent=2)
+    write_layer(OUT_PATH, merged)
     upstream = dependency_metadata(IN_PATH)
     write_sidecar(OUT_PATH, make_meta(
         "merge_elisions", STEP_VERSION, extra=upstream))
@@ -57,6 +57,7 @@ Reads:  <artist-dir>/data/elision_merge/vocab_evidence_merged.json
         Artists/curations/*.json
 Writes: <artist-dir>/data/known_vocab/word_routing.json
         <artist-dir>/data/known_vocab/word_routing_debug.json
+        Artists/<language>/clitic_cache/  (clitic verdicts shared by artists)
 
 Usage:
     .venv/bin/python3 pipeline/artist/step_4a_filter_known_vocab.py \
@@ -76,14 +77,18 @@ _THIS_DIR = os.path.dirname(os.path.abspath(__file__))
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(_THIS_DIR))
 if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
-from pipeline.util_pipeline_meta import dependency_metadata, make_meta  # noqa: E402
+from pipeline.util_pipeline_meta import dependency_metadata, make_meta, write_sidecar  # noqa: E402
 from pipeline.util_evidence_store import archive_json_artifact  # noqa: E402
+from pipeline.util_4a_lexicon import is_default_source, load_lexicon  # noqa: E402
+from pipeline.util_4a_clitic_memo import CliticVerdictMemo, default_cache_dir  # noqa: E402
 from pipeline.util_4a_routing import (  # noqa: E402
     clitic_roles,
+    clitic_splits,
     decompose_gerund_clitic,
     is_reflexive_candidate,
     load_spanishdict_parents,
     prefers_reflexive_parent,
+    prime_clitic_splits,
     reflexive_parent,
     resolve_derivation,
 )
@@ -174,10 +179,21 @@ _REPEAT_RE = re.compile(r"(.)\1{2,}")
 # ---------------------------------------------------------------------------
 
 def load_spanish_forms(path):
-    """Return {word: set(pos)} from the canonical spanish_forms.json."""
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return {w: set(pos_str.split(",")) if pos_str else set() for w, pos_str in data.items()}
+    """Return {word: frozenset(pos)} from the canonical spanish_forms.json.
+
+    Served from the compiled lexicon when it is fresh; words sharing a POS
+    combination share one frozenset.
+    """
+    lexicon = load_lexicon() if is_default_source("spanish_forms", path) else None
+    if lexicon is not None and lexicon.pos is not None:
+        data = lexicon.pos
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    tag_sets = {}
+    for pos_str in set(data.values()):
+        tag_sets[pos_str] = frozenset(pos_str.split(",")) if pos_str else frozenset()
+    return {w: tag_sets[pos_str] for w, pos_str in data.items()}
 
 
 def load_en_50k(path):
@@ -200,13 +216,17 @@ def load_es_50k_freq(path):
     Higher count = more frequent. Missing / malformed → empty dict.
     """
     freq = {}
-    if not os.path.exists(path):
+    lexicon = load_lexicon() if is_default_source("es_50k", path) else None
+    if lexicon is not None and lexicon.es_50k is not None:
+        rows = lexicon.es_50k
+    elif os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            rows = [line.split() for line in f]
+    else:
         return freq
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            parts = line.split()
-            if len(parts) >= 2 and parts[1].lstrip("-").isdigit():
-                freq[parts[0].lower()] = int(parts[1])
+    for parts in rows:
+        if len(parts) >= 2 and parts[1].lstrip("-").isdigit():
+            freq[parts[0].lower()] = int(parts[1])
     return freq
 
 
@@ -324,6 +344,8 @@ def strip_clitic(word, verb_forms, conj_reverse=None, spanish_forms=None,
     Without ``conj_reverse``, falls back to the looser ``verb_forms`` check
     (older callers) and returns the accent-stripped base, not a lemma.
     """
+    if not word.endswith(_CLITIC_PRONOUNS):
+        return None
     if spanish_forms is not None:
         surface_pos = spanish_forms.get(word)
         if surface_pos and any(p != "verb" for p in surface_pos):
@@ -526,6 +548,9 @@ def main():
                              "(the pre-2026-08 behaviour) instead of letting "
                              "sense discovery decide what they are. Cheaper on a "
                              "large corpus; costs you the genre slang.")
+    parser.add_argument("--clitic-cache", default=None,
+                        help="Directory of cached clitic verdicts "
+                             "(default: Artists/<language>/clitic_cache, shared by artists)")
     args = parser.parse_args()
 
     artist_dir = os.path.abspath(args.artist_dir)
@@ -587,7 +612,11 @@ def main():
     # with it, resolves to infinitive `parar`.
     conj_reverse_path = os.path.join(_PROJECT_ROOT, "Data", "Spanish", "layers", "conjugation_reverse.json")
     conj_reverse = {}
-    if os.path.isfile(conj_reverse_path):
+    lexicon = load_lexicon()
+    if lexicon is not None and lexicon.conj_reverse is not None:
+        conj_reverse = lexicon.conj_reverse
+        print(f"  conjugation_reverse: {len(conj_reverse)} forms (compiled lexicon)")
+    elif os.path.isfile(conj_reverse_path):
         with open(conj_reverse_path, "r", encoding="utf-8") as f:
             conj_reverse = json.load(f)
         print(f"  conjugation_reverse: {len(conj_reverse)} forms")
@@ -600,6 +629,30 @@ def main():
     print(f"  spanishdict parents: {len(sd_parents)} headwords "
           f"({sum(1 for h in sd_parents if h.endswith('se'))} pronominal)")
 
+    # Both clitic verdicts are a function of the word and the Spanish-wide
+    # tables just loaded, so they are shared across artists (keyed by those
+    # tables' fingerprints + ROUTING_VERSION + STEP_VERSION) instead of
+    # re-derived per artist.
+    clitic_memo = CliticVerdictMemo(
+        cache_dir=args.clitic_cache or default_cache_dir(artist_dir), version=STEP_VERSION)
+    known_forms_set = set(spanish_forms.keys())
+    print(f"  clitic splits: {prime_clitic_splits(artist_words)} clitic-final words")
+
+    # A word with no enclitic split is None under both rules and costs nothing
+    # to decide, so only clitic-final words go through the memo.
+    def _strip_clitic(w):
+        if not clitic_splits(w):
+            return None
+        return clitic_memo.get("strip", w, lambda: strip_clitic(
+            w, verb_forms, conj_reverse, spanish_forms=spanish_forms,
+            lemma_freq=lemma_freq, sd_parents=sd_parents))
+
+    def _decompose_clitic_form(w):
+        if not clitic_splits(w):
+            return None
+        return clitic_memo.get("decompose", w, lambda: decompose_clitic_form(
+            w, known_forms_set, conj_reverse, sd_parents))
+
     # Curations — sectioned files (drop + keep in one file).
     # Each curation has a "drop" list (words to filter into a bucket) and a
     # "keep" list (override — words that look like the filtered category but
@@ -790,9 +843,7 @@ def main():
         # (surface POS, verbecc-known base, clitic-host mood) keep noun/adj
         # surfaces and indicative bases out.
         if conj_reverse and pos == {"verb"} and w not in conj_reverse:
-            split = strip_clitic(w, verb_forms, conj_reverse,
-                                 spanish_forms=spanish_forms, lemma_freq=lemma_freq,
-                                 sd_parents=sd_parents)
+            split = _strip_clitic(w)
             if split is not None:
                 base, clitic = split
                 buckets["clitic_merge"][w] = base
@@ -846,8 +897,6 @@ def main():
     # ------------------------------------------------------------------
     print("\n--- Phase 3: Clitic + derivation ---")
 
-    known_forms_set = set(spanish_forms.keys())
-
     def _merge_clitic(w, base, clitics, source):
         buckets["clitic_merge"][w] = base
         _record_clitic_roles(clitic_role_map, w, base, clitics)
@@ -865,17 +914,14 @@ def main():
     clitic_count = 0
     stacked_count = 0
     for w in list(remaining):
-        result = strip_clitic(w, verb_forms, conj_reverse,
-                              spanish_forms=spanish_forms, lemma_freq=lemma_freq,
-                              sd_parents=sd_parents)
+        result = _strip_clitic(w)
         if result is not None:
             base, clitic = result
             _merge_clitic(w, base, [clitic], "strip_clitic")
             remaining.discard(w)
             clitic_count += 1
             continue
-        decomposed = decompose_clitic_form(w, known_forms_set, conj_reverse,
-                                           sd_parents)
+        decomposed = _decompose_clitic_form(w)
         if decomposed is None:
             continue
         base, clitics = decomposed
@@ -894,8 +940,7 @@ def main():
     reclaimed_clitic = 0
     for bucket_name in ("conjugation", "normal_vocab"):
         for w in sorted(buckets[bucket_name]):
-            decomposed = decompose_clitic_form(w, known_forms_set, conj_reverse,
-                                               sd_parents)
+            decomposed = _decompose_clitic_form(w)
             if decomposed is None:
                 continue
             base, clitics = decomposed
@@ -903,6 +948,9 @@ def main():
             _merge_clitic(w, base, clitics, f"reclaimed_from_{bucket_name}")
             reclaimed_clitic += 1
     print(f"  Clitic reclaims from Phase 2: {reclaimed_clitic}")
+    clitic_memo.save()
+    clitic_memo.report_counters()
+    print("  " + clitic_memo.format_report())
     _reflexive_parents = sum(1 for v in clitic_role_map.values() if v["reflexive"])
     print(f"    → {_reflexive_parents} routed to a SpanishDict -se parent")
 
@@ -1149,12 +1197,16 @@ def main():
             "clitic_keep": 0,
             "min_freq": args.min_freq,
         },
+        # Archived below as a content-addressed snapshot: this run's timings
+        # would make every re-run a distinct one, so they go in the sidecar.
         "_meta": make_meta(
             "filter_known_vocab", STEP_VERSION,
-            extra=dependency_metadata(input_path)),
+            extra=dependency_metadata(input_path), metrics=False),
     }
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
+    write_sidecar(output_path, make_meta(
+        "filter_known_vocab", STEP_VERSION, extra=dependency_metadata(input_path)))
     archive_json_artifact(
         os.path.join(artist_dir, "data", "evidence"),
         "word_routing",
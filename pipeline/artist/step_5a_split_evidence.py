@@ -37,6 +37,7 @@ from pipeline.util_pipeline_meta import (  # noqa: E402
     make_meta,
     write_sidecar,
 )
+from pipeline.util_layer_format import write_layer  # noqa: E402
 
 # Bump when split-evidence logic or output schema changes.
 STEP_VERSION = 6
@@ -248,10 +249,8 @@ def main():
     inv_path = os.path.join(layers_dir, "word_inventory.json")
     ex_path = os.path.join(layers_dir, "examples_raw.json")
 
-    with open(inv_path, "w", encoding="utf-8") as f:
-        json.dump(inventory, f, ensure_ascii=False, indent=2)
-    with open(ex_path, "w", encoding="utf-8") as f:
-        json.dump(examples_raw, f, ensure_ascii=False)
+    write_layer(inv_path, inventory)
+    write_layer(ex_path, examples_raw, indent=None)
     upstream = dependency_metadata(merged_path)
     write_sidecar(inv_path, make_meta(
         "split_evidence", STEP_VERSION, extra=upstream))
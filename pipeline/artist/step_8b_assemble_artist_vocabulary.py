@@ -37,8 +37,15 @@ if _PROJECT_ROOT not in sys.path:
 from pipeline.artist.util_2b_evidence_view import (  # noqa: E402
     corpus_profile_fingerprint,
 )
+from pipeline.artist.util_8b_mwe_index import (  # noqa: E402
+    MweOccurrenceIndex,
+    detected_occurrences,
+)
 from pipeline.util_evidence_store import archive_json_artifact  # noqa: E402
+from pipeline.util_8a_filter_index import write_filter_index  # noqa: E402
 from pipeline.util_pipeline_meta import make_meta, read_meta, write_sidecar  # noqa: E402
+from pipeline.util_pipeline_metrics import METRICS  # noqa: E402
+from pipeline.util_layer_format import layer_exists, read_layer  # noqa: E402
 from pipeline.util_6a_assignment_format import (load_assignments, resolve_best_per_example,  # noqa: E402
                                                 is_proper_noun_gloss, is_proper_noun_sense,
                                                 carry_sense_tags, normalize_pos,
@@ -419,7 +426,16 @@ def assign_ids_from_master(entries, master, registry_path=None, language="und",
         wl_to_id[pair] = mid
         wl_to_ids.setdefault(pair, []).append(mid)
 
-    registry = CardIdentityRegistry.load(registry_path, language) if registry_path else None
+    if not registry_path:
+        _assign_ids(entries, master, None, wl_to_id, wl_to_ids, surface_cards)
+        return
+    # Several artists of one language can be assembled at once; the
+    # transaction serializes their read-modify-write of the shared registry.
+    with CardIdentityRegistry.transaction(registry_path, language) as registry:
+        _assign_ids(entries, master, registry, wl_to_id, wl_to_ids, surface_cards)
+
+
+def _assign_ids(entries, master, registry, wl_to_id, wl_to_ids, surface_cards):
     if registry:
         for pair, legacy_ids in wl_to_ids.items():
             # Some historical masters contain duplicate IDs for one word|lemma.
@@ -433,25 +449,12 @@ def assign_ids_from_master(entries, master, registry_path=None, language="und",
             for duplicate_id in legacy_ids:
                 if duplicate_id == canonical_id:
                     continue
-                duplicate = registry.records.setdefault(duplicate_id, {
-                    "card_id": duplicate_id,
-                    "aliases": [],
-                    "evidence_ids": [],
-                })
-                duplicate["status"] = "merged"
-                duplicate["superseded_by"] = canonical_id
-                migration = {
+                registry.retire(duplicate_id, canonical_id, {
                     "kind": "legacy_duplicate",
                     "from": duplicate_id,
                     "to": canonical_id,
                     "reason": "duplicate word|lemma in materialized master",
-                }
-                if migration not in registry.migrations:
-                    registry.migrations.append(migration)
-        # The duplicate reconciliation above mutates records directly in one
-        # bulk pass. Rebuild the registry's indexes once before assigning the
-        # candidate deck instead of rescanning every record for every card.
-        registry.invalidate_indexes()
+                })
 
     used = set(master.keys()) | (set(registry.records) if registry else set())
     claimed_ids = set()
@@ -499,9 +502,6 @@ def assign_ids_from_master(entries, master, registry_path=None, language="und",
         used.add(entry["id"])
         claimed_ids.add(entry["id"])
 
-    if registry:
-        registry.save(registry_path)
-
 
 def _coalesce_card_identities(entries, master):
     """Merge candidate analyses that the identity registry resolves to one card.
@@ -668,7 +668,11 @@ def _card_registry_context(layers_dir):
 
 def _stabilize_sense_identities(entries, master, registry_path, language):
     """Resolve mutable menu/gloss rows onto persistent per-card sense IDs."""
-    registry = SenseIdentityRegistry.load(registry_path, language)
+    with SenseIdentityRegistry.transaction(registry_path, language) as registry:
+        _reconcile_sense_identities(entries, master, registry)
+
+
+def _reconcile_sense_identities(entries, master, registry):
     for card_id, master_entry in master.items():
         for sense in master_entry.get("senses") or []:
             if sense.get("pos") in ("X", "SENSE_CYCLE"):
@@ -734,7 +738,6 @@ def _stabilize_sense_identities(entries, master, registry_path, language):
                 meaning["sense_id_aliases"] = aliases
             else:
                 meaning.pop("sense_id_aliases", None)
-    registry.save(registry_path)
 
 
 
@@ -743,9 +746,10 @@ def _stabilize_sense_identities(entries, master, registry_path, language):
 # ---------------------------------------------------------------------------
 
 def load_layer(path, name, required=True):
-    if os.path.isfile(path):
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    """Load a layer, preferring its binary sibling (util_layer_format)."""
+    if layer_exists(path):
+        data, source = read_layer(path)
+        METRICS.note_read(source)
         count = len(data)
         print("  %s: %d entries" % (name, count))
         return data
@@ -1104,6 +1108,12 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
             lemma_assignments = load_assignments(lemma_assignments_path) if os.path.isfile(lemma_assignments_path) else {}
             print("  sense_assignments (auto): %d entries" % len(assignments))
             print("  sense_assignments_lemma (auto): %d entries" % len(lemma_assignments))
+    # word -> its "word|lemma" keys, in layer order. The per-word loops below
+    # used to re-scan every lemma key with startswith(), which is quadratic in
+    # deck size.
+    lemma_keys_by_word = {}
+    for _lkey in lemma_assignments:
+        lemma_keys_by_word.setdefault(_lkey.split("|", 1)[0], []).append(_lkey)
     # Shared layers at Data/Spanish/layers/ (project root from script location)
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     shared_cognates = os.path.join(project_root, "Data", "Spanish", "layers", "cognates.json")
@@ -1498,9 +1508,9 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
         # Gated on `grouped` (word HAS a menu): pure sense-discovery words keep
         # their existing fallback path unchanged.
         if lemma_assignments and grouped:
-            _word_prefix = word + "|"
-            for _lkey, _lval in lemma_assignments.items():
-                if _lkey in lemma_key_to_group or not _lkey.startswith(_word_prefix):
+            for _lkey in lemma_keys_by_word.get(word, ()):
+                _lval = lemma_assignments[_lkey]
+                if _lkey in lemma_key_to_group:
                     continue
                 if not isinstance(_lval, dict) or not _lval:
                     continue
@@ -1599,7 +1609,8 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
             # exists.
             grouped = _build_menu_free_groups(
                 word,
-                lemma_assignments,
+                {key: lemma_assignments[key]
+                 for key in lemma_keys_by_word.get(word, ())},
                 min_priority,
                 method_priorities,
                 min_prompt_tier=min_prompt_tier,
@@ -2368,15 +2379,13 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
             # straight from the assignment layer (all word|lemma keys for this
             # surface, covering gap-fill orphan lemmas). write_split_files reads
             # it by master sense_id — robust to whichever path built the meaning.
-            _prefix = "%s|" % word
             _entry_prov = {}
-            for _lkey, _lval in lemma_assignments.items():
-                if _lkey == "%s|%s" % (word, word_lemma) or _lkey.startswith(_prefix):
-                    _entry_prov.update(resolve_sense_provenance(
-                        _lval, prompt_registry,
-                        min_prompt_tier=min_prompt_tier,
-                        accepted_model_prompt_ids=accepted_model_prompt_ids,
-                        prompt_preference=prompt_preference))
+            for _lkey in lemma_keys_by_word.get(word, ()):
+                _entry_prov.update(resolve_sense_provenance(
+                    lemma_assignments[_lkey], prompt_registry,
+                    min_prompt_tier=min_prompt_tier,
+                    accepted_model_prompt_ids=accepted_model_prompt_ids,
+                    prompt_preference=prompt_preference))
             if _entry_prov:
                 entry["_sense_provenance"] = _entry_prov
 
@@ -2395,39 +2404,9 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
                     if key in ex:
                         line_info[line][key] = ex[key]
 
-    # Unicode-aware word-boundary pattern: matches if character before/after
-    # is NOT a Spanish letter (handles accented chars that \b misses)
-    _SPANISH_LETTER = r'a-zA-ZáéíóúñüÁÉÍÓÚÑÜ'
-
-    # Pattern entries from the clitic-placeholder bucket carry a "[PRON]" slot
-    # that won't appear literally in any lyric line. When we see it, expand
-    # to a regex alternation over the object/reflexive clitics so the same
-    # function can surface example lines for "no [PRON] hagas" by matching
-    # "no te hagas", "no me hagas", "no lo hagas", etc.
-    _PRON_PLACEHOLDER_RE = re.compile(r'\[pron\]', re.IGNORECASE)
-    _PRON_CLITIC_ALT = r'(?:me|te|se|le|les|nos|lo|la|los|las)'
-
-    def _mwe_pattern(expression):
-        tokens = str(expression or '').lower().split()
-        body_parts = []
-        for index, token in enumerate(tokens):
-            if index:
-                # Curated Caribbean forms often contain ``vo' a`` while the
-                # original lyric displays ``vo'a``. Treat that one elision
-                # boundary as optional whitespace; ordinary word boundaries
-                # still require at least one space.
-                separator = r'\s*' if tokens[index - 1].endswith(("'", "’")) else r'\s+'
-                body_parts.append(separator)
-            if _PRON_PLACEHOLDER_RE.fullmatch(token):
-                body_parts.append(_PRON_CLITIC_ALT)
-            else:
-                body_parts.append(re.escape(token).replace("'", "['’]"))
-        body = ''.join(body_parts)
-        return re.compile(
-            r'(?<![' + _SPANISH_LETTER + r'])' + body +
-            r'(?![' + _SPANISH_LETTER + r'])',
-            re.IGNORECASE,
-        )
+    # One postings index over the distinct lines serves every MWE card; each
+    # expression only regex-checks lines that contain all of its tokens.
+    mwe_index = MweOccurrenceIndex(line_info)
 
     def find_mwe_examples(expression, variants=None, detected_examples=None,
                           max_examples=3):
@@ -2438,7 +2417,6 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
             value = str(value or '').strip()
             if value and value.lower() not in {form.lower() for form in candidate_forms}:
                 candidate_forms.append(value)
-        patterns = [(form, _mwe_pattern(form)) for form in candidate_forms]
         found = []
         seen = set()
 
@@ -2474,20 +2452,9 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
         # Artist detection now carries exact full-corpus evidence. Prefer it
         # over the old component-word sample, which could miss a valid phrase
         # merely because none of its words retained that particular line.
-        for raw in detected_examples or []:
-            line = raw.get("line") or raw.get("spanish") or ""
-            if not line:
-                continue
-            raw_id = str(raw.get("id") or "")
-            info = {
-                "song_id": raw_id.split(":")[0] if ":" in raw_id else raw_id,
-                "title": raw.get("title", ""),
-            }
-            for key in _EXAMPLE_PRIORITY_KEYS:
-                if key in raw:
-                    info[key] = raw[key]
-            append_example(
-                line, info, raw.get("matched_variant"), raw.get("matched_surface"))
+        for line, info, matched_variant, matched_surface in detected_occurrences(
+                detected_examples, _EXAMPLE_PRIORITY_KEYS):
+            append_example(line, info, matched_variant, matched_surface)
             if len(found) >= max_examples:
                 return found
 
@@ -2498,12 +2465,10 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
         if found:
             return found
 
-        for line, info in line_info.items():
-            matched = next((form for form, pattern in patterns if pattern.search(line)), None)
-            if matched:
-                append_example(line, info, matched)
-                if len(found) >= max_examples:
-                    break
+        for line, info, matched in mwe_index.scan(candidate_forms):
+            append_example(line, info, matched)
+            if len(found) >= max_examples:
+                break
         return found
 
     # --- Mark most frequent lemma instance ---
@@ -2923,11 +2888,15 @@ def assemble_from_layers(layers_dir, master, curated_translations_path=None,
 
                 # Find lyric examples
                 if expr not in mwe_examples_cache:
-                    mwe_examples_cache[expr] = find_mwe_examples(
-                        expr,
-                        variants=mwe.get("variants"),
-                        detected_examples=mwe.get("detected_examples"),
-                    )
+                    METRICS.count("cache_misses")
+                    with METRICS.span("mwe_examples"):
+                        mwe_examples_cache[expr] = find_mwe_examples(
+                            expr,
+                            variants=mwe.get("variants"),
+                            detected_examples=mwe.get("detected_examples"),
+                        )
+                else:
+                    METRICS.count("cache_hits")
 
                 # Truncate long translations
                 if len(trans) > MAX_TRANSLATION_LEN:
@@ -3430,6 +3399,7 @@ def write_split_files(entries, master, vocab_path, master_path, clitic_data=None
     os.makedirs(os.path.dirname(index_path), exist_ok=True)
     with open(index_path, "w", encoding="utf-8") as f:
         json.dump(index, f, ensure_ascii=False)
+    METRICS.note_write(index_path)
     write_sidecar(index_path, make_meta(
         "assemble_artist_vocabulary", STEP_VERSION,
         extra=build_contract or None))
@@ -3445,11 +3415,20 @@ def write_split_files(entries, master, vocab_path, master_path, clitic_data=None
         json.dump(master, f, ensure_ascii=False)
     write_sidecar(master_path, make_meta("assemble_artist_vocabulary", STEP_VERSION, extra={"output": "master"}))
 
+    # Filter bitsets over this index, stamped with the master they were read
+    # from (util_8a_filter_index.py), so it is written after the master.
+    filter_path = write_filter_index(index_path, index, master, master_path)
+    METRICS.note_write(filter_path)
+    write_sidecar(filter_path, make_meta(
+        "assemble_artist_vocabulary", STEP_VERSION,
+        extra=build_contract or None))
+
     idx_size = os.path.getsize(index_path)
     ex_size = os.path.getsize(examples_path)
     print("  Split files written:")
     print("    %s: %s bytes" % (index_path, "{:,}".format(idx_size)))
     print("    %s: %s bytes" % (examples_path, "{:,}".format(ex_size)))
+    print("    %s: %s bytes" % (filter_path, "{:,}".format(os.path.getsize(filter_path))))
     print("  Master: %d entries -> %s" % (len(master), master_path))
     return {"index": index_path, "examples": examples_path}
 
@@ -3561,16 +3540,18 @@ def main():
     # Assemble from layers
     print("Sense source: %s" % args.sense_source)
     skip_words_path = os.path.join(artist_dir, "data", "known_vocab", "word_routing.json")
-    entries, master, clitic_data, raw_examples, translations, timestamp_map = assemble_from_layers(
-        layers_dir, master, curated_path,
-        sense_source=args.sense_source,
-        skip_words_path=skip_words_path,
-        emit_remainders=args.remainders,
-        min_priority=args.min_priority,
-        min_prompt_tier=args.min_prompt_tier,
-        prompt_policy_id=args.prompt_policy,
-        stamp_cognate_scores=args.stamp_cognate_scores,
-        surface_cards=args.surface_cards)
+    with METRICS.span("assemble_from_layers"):
+        entries, master, clitic_data, raw_examples, translations, timestamp_map = assemble_from_layers(
+            layers_dir, master, curated_path,
+            sense_source=args.sense_source,
+            skip_words_path=skip_words_path,
+            emit_remainders=args.remainders,
+            min_priority=args.min_priority,
+            min_prompt_tier=args.min_prompt_tier,
+            prompt_policy_id=args.prompt_policy,
+            stamp_cognate_scores=args.stamp_cognate_scores,
+            surface_cards=args.surface_cards)
+    METRICS.count("items", len(entries))
 
     _trimmed = cap_examples_per_card(entries, args.max_examples)
     if _trimmed:
@@ -3617,13 +3598,14 @@ def main():
         print("  ID migration: %d mappings -> %s" % (len(id_migration), migration_path))
 
     # Write split files
-    split_paths = write_split_files(
-        entries, master, vocab_path, master_path, clitic_data,
-        raw_examples=raw_examples,
-        translations=translations,
-        timestamp_map=timestamp_map,
-        build_contract=build_contract,
-    )
+    with METRICS.span("write_split_files"):
+        split_paths = write_split_files(
+            entries, master, vocab_path, master_path, clitic_data,
+            raw_examples=raw_examples,
+            translations=translations,
+            timestamp_map=timestamp_map,
+            build_contract=build_contract,
+        )
 
     if build_contract:
         evidence_dir = os.path.join(artist_dir, "data", "evidence")
@@ -0,0 +1,109 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import tool_8c_merge_to_master as merge  # noqa: E402
+
+
+class FakeNlp:
+    """Stands in for spaCy: every word is a 3rd-person singular finite verb."""
+
+    meta = {"version": "test-1"}
+
+    def __init__(self):
+        self.piped = []
+
+    def pipe(self, words, batch_size=None):
+        self.piped.append(list(words))
+        for word in words:
+            morph = SimpleNamespace(to_dict=lambda: {"VerbForm": "Fin", "Person": "3",
+                                                     "Number": "Sing"})
+            yield [SimpleNamespace(pos_="VERB", lemma_=word[:-1] + "ar", morph=morph)]
+
+
+def _deck(*meanings, word="canta"):
+    return [{"id": "", "word": word, "lemma": "cantar", "corpus_count": 3,
+             "meanings": [dict(m, examples=[{"song": "s"}]) for m in meanings]}]
+
+
+class MergeToMasterTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.saved = (merge.ARTISTS_DIR, merge._NLP, merge.spacy_model_version)
+        merge.ARTISTS_DIR = str(self.root)
+        merge._NLP = self.nlp = FakeNlp()
+        self.installed = "test-1"
+        merge.spacy_model_version = lambda: self.installed
+
+    def tearDown(self):
+        merge.ARTISTS_DIR, merge._NLP, merge.spacy_model_version = self.saved
+        self.temp_dir.cleanup()
+
+    def add_artist(self, name, deck):
+        artist_dir = self.root / "spanish" / name
+        artist_dir.mkdir(parents=True, exist_ok=True)
+        (artist_dir / "artist.json").write_text(json.dumps(
+            {"name": name, "vocabulary_file": "vocab.json"}), encoding="utf-8")
+        (artist_dir / "vocab.json").write_text(json.dumps(deck), encoding="utf-8")
+
+    def run_merge(self):
+        artists = merge.discover_artists()["spanish"]
+        master, per_artist_data, stats = merge.build_master(
+            artists, morph_cache_path=merge.morph_cache_path_for_language("spanish"))
+        merge.write_language("spanish", master, per_artist_data, workers=2)
+        return master, stats
+
+    def test_senses_merge_by_context_and_tag_once_through_the_cache(self):
+        self.add_artist("A", _deck({"pos": "VERB", "translation": "sings"},
+                                   {"pos": "VERB", "translation": "sings", "context": "opera"}))
+        self.add_artist("B", _deck({"pos": "VERB", "translation": "he sings"},
+                                   {"pos": "VERB", "translation": "sings", "context": "Opera "}))
+
+        master, stats = self.run_merge()
+
+        senses = next(iter(master.values()))["senses"]
+        self.assertEqual([(s["translation"], s.get("context")) for s in senses],
+                         [("he/she sing", None), ("sings", "opera")])
+        self.assertEqual(stats["senses_merged"], 1)
+        self.assertEqual(self.nlp.piped, [["canta"]])
+        self.run_merge()
+        self.assertEqual(self.nlp.piped, [["canta"]])
+
+    def test_a_new_model_version_retags_a_warm_cache(self):
+        cache = merge.morph_cache_path_for_language("spanish")
+        merge.analyze_words(["canta", "baila"], cache)
+        self.assertEqual(self.nlp.piped, [["baila", "canta"]])
+
+        # Every word is cached; only the installed version says it is stale.
+        self.installed = "test-2"
+        merge.analyze_words(["canta"], cache)
+        self.assertEqual(self.nlp.piped, [["baila", "canta"], ["canta"]])
+        with open(cache, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["version"], "test-2")
+
+        # A warm run at the cached version never loads the model.
+        merge._NLP = None
+        self.assertEqual(merge.analyze_words(["canta"], cache)["canta"]["lemma"], "cantar")
+        self.assertIsNone(merge._NLP)
+
+    def test_unchanged_decks_are_up_to_date_until_one_changes(self):
+        self.add_artist("A", _deck({"pos": "VERB", "translation": "sings"}))
+        self.add_artist("B", _deck({"pos": "NOUN", "translation": "song"}, word="canto"))
+        artists = merge.discover_artists()["spanish"]
+        self.assertFalse(merge.is_up_to_date("spanish", artists))
+
+        self.run_merge()
+        self.assertTrue(merge.is_up_to_date("spanish", artists))
+
+        self.add_artist("B", _deck({"pos": "NOUN", "translation": "chant"}, word="canto"))
+        self.assertFalse(merge.is_up_to_date("spanish", artists))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from pipeline.artist.util_8b_mwe_index import (
+    MweOccurrenceIndex,
+    detected_occurrences,
+    mwe_pattern,
+)
+
+
+LINES = {
+    "No te hagas la loca": {"song_id": "s1"},
+    "Yo vo'a llegar tarde": {"song_id": "s2"},
+    "Qué va a pasar mañana": {"song_id": "s3"},
+    "no lo hagas así, bebé": {"song_id": "s4"},
+    "Dime qué va": {"song_id": "s5"},
+    "novato hagas lo que hagas": {"song_id": "s6"},
+}
+
+
+def _full_scan(line_info, forms):
+    patterns = [(form, mwe_pattern(form)) for form in forms]
+    for line, info in line_info.items():
+        matched = next((form for form, pattern in patterns if pattern.search(line)), None)
+        if matched:
+            yield line, info, matched
+
+
+class MweOccurrenceIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = MweOccurrenceIndex(LINES)
+
+    def test_matches_full_regex_scan(self):
+        for forms in (
+            ["no [PRON] hagas"],
+            ["vo' a llegar"],
+            ["qué va"],
+            ["qué va a pasar", "qué va"],
+            ["hagas"],
+            ["nunca jamás"],
+        ):
+            with self.subTest(forms=forms):
+                self.assertEqual(
+                    list(self.index.scan(forms)),
+                    list(_full_scan(LINES, forms)),
+                )
+
+    def test_pron_placeholder_and_elision_boundary(self):
+        lines = [line for line, _info, _form in self.index.scan(["no [PRON] hagas"])]
+        self.assertEqual(lines, ["No te hagas la loca", "no lo hagas así, bebé"])
+        lines = [line for line, _info, _form in self.index.scan(["vo' a llegar"])]
+        self.assertEqual(lines, ["Yo vo'a llegar tarde"])
+
+    def test_word_boundaries_are_not_substrings(self):
+        # "novato" contains "no" but is not the token "no".
+        self.assertNotIn(5, self.index.candidate_positions("no [PRON] hagas"))
+
+    def test_detected_occurrences_normalize_step_2a_examples(self):
+        rows = list(detected_occurrences([
+            {"line": "", "id": "x:1"},
+            {"spanish": "Qué va", "id": "song-a:4", "title": "A",
+             "matched_variant": "qué va", "spotify_available": True},
+        ], priority_keys=("spotify_available",)))
+        self.assertEqual(rows, [(
+            "Qué va",
+            {"song_id": "song-a", "title": "A", "spotify_available": True},
+            "qué va",
+            None,
+        )])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Run step 6c's SpanishDict classify-or-propose across a whole sense register.
+
+Artists in a register (artist.json ``sense_registers``) share featured verses
+and collaborations, so the same (word, menu, line) recurs across their decks.
+Run one artist at a time, each pays for those examples separately. This tool:
+
+  1. refreshes the register and each member's menu (tool_5d, as step 6a does);
+  2. builds every member's classify-or-propose records with step 6c's
+     ``--dry-run-prompt --prompt-plan-json`` (no API call), keys every example
+     with util_6c_assignment_store and reports how many examples and API
+     batches the shared answer store saves across the register;
+  3. unless --plan-only, runs step 6c for each member in turn. Members share
+     Artists/<lang>/assignment_store/, so an example any earlier member (or an
+     earlier run) answered is reused rather than sent again.
+
+Contributors run before consumers (policy.json roles), then by name.
+Unrecognised arguments are passed through to every step 6c call.
+
+Usage (from project root):
+    .venv/bin/python3 pipeline/artist/tool_6c_assign_register_senses.py \\
+        --language-dir Artists/spanish --register reggaeton --plan-only
+    .venv/bin/python3 pipeline/artist/tool_6c_assign_register_senses.py \\
+        --language-dir Artists/spanish --register reggaeton --gemini-workers 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_DIR = os.path.dirname(SCRIPTS_DIR)
+sys.path.insert(0, PIPELINE_DIR)
+
+from step_6a_assign_senses import _spanishdict_args_gemini, run_step  # noqa: E402
+from util_6a_prompt_registry import CURRENT_SD_PROMPT_ID  # noqa: E402
+from util_6c_assignment_store import (  # noqa: E402
+    AssignmentAnswerStore, record_keys,
+)
+
+BATCH_SIZE = 10  # step_6c SD_CLASSIFY_BATCH_SIZE
+_ROLE_ORDER = {"contributor": 0, "both": 0, "consumer": 1}
+
+
+def register_members(language_dir, register):
+    """[(name, artist_dir)] of artists opted into `register`, in run order."""
+    language_dir = Path(language_dir)
+    policy_path = language_dir / "sense_registers" / "policy.json"
+    roles = {}
+    if policy_path.exists():
+        policy = json.loads(policy_path.read_text(encoding="utf-8"))
+        roles = ((policy.get("registers") or {}).get(register) or {}).get("members") or {}
+    members = []
+    for config_path in sorted(language_dir.glob("*/artist.json")):
+        config = json.loads(config_path.read_text(encoding="utf-8"))
+        if register not in (config.get("sense_registers") or []):
+            continue
+        name = config.get("name") or config_path.parent.name
+        members.append((_ROLE_ORDER.get(roles.get(name, "contributor"), 1), name,
+                        str(config_path.parent)))
+    return [(name, artist_dir) for _order, name, artist_dir in sorted(members)]
+
+
+def _batches(n_records):
+    return -(-n_records // BATCH_SIZE)
+
+
+def plan_register(plans, store, prompt_id):
+    """Simulate the member runs in order against the answer store.
+
+    `plans` is [(name, records)]. Returns one row per member plus a total row
+    with examples, reused (already stored), shared (answered by an earlier
+    member this run), repeated (same line twice in one record), sent, and the
+    API batches with and without the store.
+    """
+    seen = set()
+    rows = []
+    for name, records in plans:
+        row = {"artist": name, "records": len(records), "examples": 0, "reused": 0,
+               "shared": 0, "repeated": 0, "sent": 0}
+        sending = 0
+        for record in records:
+            local = set()
+            sends = False
+            for key in record_keys(record, prompt_id):
+                row["examples"] += 1
+                if key in store:
+                    row["reused"] += 1
+                elif key in local:
+                    row["repeated"] += 1
+                elif key in seen:
+                    row["shared"] += 1
+                else:
+                    row["sent"] += 1
+                    sends = True
+                local.add(key)
+            seen.update(local)
+            sending += sends
+        row["batches"] = _batches(sending)
+        row["batches_without"] = _batches(len(records))
+        rows.append(row)
+    total = {"artist": "TOTAL"}
+    for field in ("records", "examples", "reused", "shared", "repeated", "sent",
+                  "batches", "batches_without"):
+        total[field] = sum(row[field] for row in rows)
+    return rows + [total]
+
+
+def print_plan(rows):
+    print("\n%-24s %8s %8s %8s %8s %8s %8s %14s" % (
+        "artist", "examples", "stored", "shared", "repeat", "send", "avoided", "API batches"))
+    for row in rows:
+        avoided = row["examples"] - row["sent"]
+        print("%-24s %8d %8d %8d %8d %8d %7.1f%% %6d / %-6d" % (
+            row["artist"][:24], row["examples"], row["reused"], row["shared"],
+            row["repeated"], row["sent"],
+            100.0 * avoided / row["examples"] if row["examples"] else 0.0,
+            row["batches"], row["batches_without"]))
+    total = rows[-1]
+    if total["batches_without"]:
+        print("\nAPI calls avoided: %d of %d batches (%.1f%%)" % (
+            total["batches_without"] - total["batches"], total["batches_without"],
+            100.0 * (total["batches_without"] - total["batches"]) / total["batches_without"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Register-wide step 6c with cross-artist answer reuse")
+    parser.add_argument("--language-dir", required=True,
+                        help="Language directory holding the artists (e.g. Artists/spanish)")
+    parser.add_argument("--register", required=True,
+                        help="Register name from artist.json sense_registers")
+    parser.add_argument("--plan-only", action="store_true",
+                        help="Report the reuse plan without calling the API")
+    parser.add_argument("--prompt-id", default=CURRENT_SD_PROMPT_ID,
+                        help="Prompt id for step 6c and the store (default: %(default)s)")
+    parser.add_argument("--gemini-model", default=None,
+                        help="Passed through to step 6c")
+    args, passthrough = parser.parse_known_args()
+
+    language_dir = os.path.abspath(args.language_dir)
+    members = register_members(language_dir, args.register)
+    if not members:
+        print("No artists opt into register %r under %s" % (args.register, language_dir))
+        sys.exit(1)
+    print("Register %s: %s" % (args.register, ", ".join(name for name, _ in members)))
+
+    step_args = ["--prompt-id", args.prompt_id] + passthrough
+    if args.gemini_model:
+        step_args += ["--gemini-model", args.gemini_model]
+
+    for name, artist_dir in members:
+        run_step("Refresh shared sense registers: %s" % name,
+                 "artist/tool_5d_build_shared_sense_registers.py",
+                 ["--artist-dir", artist_dir])
+
+    plans = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, artist_dir) in enumerate(members):
+            plan_path = os.path.join(tmp, "%02d.json" % i)
+            run_step("Plan (no API): %s" % name, "step_6c_assign_senses_gemini.py",
+                     ["--artist-dir", artist_dir] + _spanishdict_args_gemini(args.gemini_model)
+                     + step_args + ["--dry-run-prompt", "--prompt-plan-json", plan_path])
+            records = []
+            if os.path.isfile(plan_path):
+                with open(plan_path, encoding="utf-8") as f:
+                    records = json.load(f).get("records") or []
+            plans.append((name, records))
+
+    store = AssignmentAnswerStore(os.path.join(language_dir, "assignment_store"), args.prompt_id)
+    print_plan(plan_register(plans, store, args.prompt_id))
+    if args.plan_only:
+        return
+
+    for name, artist_dir in members:
+        run_step("Classify-or-propose: %s" % name, "step_6c_assign_senses_gemini.py",
+                 ["--artist-dir", artist_dir] + _spanishdict_args_gemini(args.gemini_model)
+                 + step_args)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,16 +15,26 @@ Artists are discovered at Artists/<lang>/<name>/ and grouped by language so each
 language gets its own master (progress keys are per-language).
 
 Also validates that no two distinct word|lemma pairs collide on the same 6-char ID.
+
+Re-runs are incremental. Artists/<lang>/vocabulary_master.merge_state.json
+records the hash of every deck and output file this tool last wrote; when no
+deck has changed since, the language is skipped, and otherwise only output
+files whose content actually changed are rewritten (on --workers threads).
+spaCy tags the merged-sense words in one nlp.pipe batch and its analyses
+persist in Artists/<lang>/morph_cache/, keyed by the model's installed package
+version, so a warm run never loads the model.
+--full ignores the saved state.
 """
 
 import argparse
 import hashlib
+import importlib.metadata
 import json
 import os
 import sys
+import time
 from collections import defaultdict
-
-import spacy
+from concurrent.futures import ThreadPoolExecutor
 
 from util_1a_artist_config import normalize_translation
 
@@ -46,6 +56,8 @@ STEP_VERSION_NOTES = {
     3: "preserve canonical sense IDs and aliases while merging equivalent artist senses",
 }
 
+SPACY_MODEL = "es_core_news_lg"
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -60,6 +72,16 @@ def master_path_for_language(language):
     return os.path.join(ARTISTS_DIR, language, "vocabulary_master.json")
 
 
+def merge_state_path_for_language(language):
+    # type: (str) -> str
+    return os.path.join(ARTISTS_DIR, language, "vocabulary_master.merge_state.json")
+
+
+def morph_cache_path_for_language(language):
+    # type: (str) -> str
+    return os.path.join(ARTISTS_DIR, language, "morph_cache", SPACY_MODEL + ".json")
+
+
 # ---------------------------------------------------------------------------
 # Sense dedup: spaCy morphology for canonical translation selection
 # ---------------------------------------------------------------------------
@@ -80,13 +102,90 @@ def _get_nlp():
     # type: () -> object
     global _NLP
     if _NLP is None:
-        print("Loading spaCy es_core_news_lg...")
-        _NLP = spacy.load("es_core_news_lg")
+        import spacy
+        print("Loading spaCy %s..." % SPACY_MODEL)
+        _NLP = spacy.load(SPACY_MODEL)
     return _NLP
 
 
-def choose_canonical_translation(word, translations, lemma=None):
-    # type: (str, list, str) -> str
+def _token_analysis(token):
+    # type: (object) -> dict
+    """The parts of a spaCy token choose_canonical_translation reads."""
+    morph = token.morph.to_dict()
+    return {
+        "pos": token.pos_,
+        "lemma": token.lemma_,
+        "VerbForm": morph.get("VerbForm", ""),
+        "Person": morph.get("Person"),
+        "Number": morph.get("Number"),
+    }
+
+
+def spacy_model_version():
+    # type: () -> str
+    """Installed version of SPACY_MODEL, read from its package metadata so
+    the morph cache can be checked without loading the model. None when the
+    model is not installed as a package (loaded from a path, or missing)."""
+    try:
+        return importlib.metadata.version(SPACY_MODEL)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _load_morph_cache(path):
+    # type: (str) -> tuple
+    """(model version, {word: analysis}) from a morph cache file."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None, {}
+    if not isinstance(data, dict):
+        return None, {}
+    return data.get("version"), data.get("words") or {}
+
+
+def analyze_words(words, cache_path=None, batch_size=256):
+    # type: (list, str, int) -> dict
+    """spaCy analysis of each word, as ``{word: _token_analysis(doc[0])}``.
+
+    Words missing from the cache at `cache_path` are tagged in one
+    ``nlp.pipe`` batch (each word is still its own doc, exactly as
+    ``nlp(word)`` would see it) and written back, so the model is only loaded
+    when there is something new to tag. The cache records the model version
+    and is dropped when the installed model (spacy_model_version) differs,
+    even if every word is cached.
+    """
+    cached_version, cached = _load_morph_cache(cache_path) if cache_path else (None, {})
+    version = spacy_model_version()
+    if version is not None and cached and cached_version != version:
+        print("  morph cache tagged by %s %s, %s is installed: re-tagging" % (
+            SPACY_MODEL, cached_version, version))
+        cached = {}
+    missing = sorted({w for w in words if w not in cached})
+    if missing:
+        nlp = _get_nlp()
+        version = version or nlp.meta.get("version", "")
+        if cached and cached_version != version:
+            cached = {}
+            missing = sorted(set(words))
+        start = time.time()
+        for word, doc in zip(missing, nlp.pipe(missing, batch_size=batch_size)):
+            cached[word] = _token_analysis(doc[0])
+        print("  spaCy tagged %d words in %.1fs (%d from cache)" % (
+            len(missing), time.time() - start, len(set(words)) - len(missing)))
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp = cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"model": SPACY_MODEL, "version": version, "words": cached},
+                          f, ensure_ascii=False)
+            os.replace(tmp, cache_path)
+    return {w: cached[w] for w in words}
+
+
+def choose_canonical_translation(word, translations, lemma=None, analysis=None):
+    # type: (str, list, str, dict) -> str
     """Pick the best translation for a merged sense using spaCy morphology.
 
     For conjugated verbs, builds '{pronoun} {base_verb}' from the
@@ -95,27 +194,28 @@ def choose_canonical_translation(word, translations, lemma=None):
 
     Falls back to longest translation when spaCy gives unreliable results
     (detected by comparing spaCy's lemma against our known lemma).
+
+    `analysis` is the word's entry from `analyze_words`; without it the word
+    is tagged on its own.
     """
     if not translations:
         return ""
     if len(translations) == 1:
         return translations[0]
 
-    nlp = _get_nlp()
-    doc = nlp(word)
-    token = doc[0]
-    morph = token.morph.to_dict()
+    if analysis is None:
+        analysis = _token_analysis(_get_nlp()(word)[0])
 
     # Validate spaCy's analysis: if the lemma doesn't match what we
     # already know, the morphological features are unreliable.
     spacy_reliable = True
-    if lemma and token.lemma_ != lemma:
+    if lemma and analysis["lemma"] != lemma:
         spacy_reliable = False
 
-    if spacy_reliable and token.pos_ in ("VERB", "AUX"):
-        verbform = morph.get("VerbForm", "")
-        person = morph.get("Person")
-        number = morph.get("Number")
+    if spacy_reliable and analysis["pos"] in ("VERB", "AUX"):
+        verbform = analysis["VerbForm"]
+        person = analysis["Person"]
+        number = analysis["Number"]
 
         if verbform == "Inf":
             # Infinitive — prefer 'to X' form
@@ -236,8 +336,20 @@ def assign_all_ids(artists):
     return word_lemma_to_id, artist_vocabs, reassignments
 
 
-def build_master(artists):
-    # type: (list) -> tuple
+_NORMALIZED_TRANSLATIONS = {}  # type: dict
+
+
+def _sense_key(pos, translation, context):
+    # type: (str, str, str) -> tuple
+    """(pos, normalized translation, normalized context): the sense merge key."""
+    norm = _NORMALIZED_TRANSLATIONS.get(translation)
+    if norm is None:
+        norm = _NORMALIZED_TRANSLATIONS[translation] = normalize_translation(translation)
+    return (pos, norm, (context or "").strip().lower())
+
+
+def build_master(artists, morph_cache_path=None):
+    # type: (list, str) -> tuple
     """Build master vocabulary from artist monoliths.
 
     Returns (master_dict, per_artist_data, stats).
@@ -258,6 +370,9 @@ def build_master(artists):
         "old_id_changes": 0,
     }
 
+    # Per master entry: sense merge key -> the first master sense with it.
+    sense_index = {}  # type: dict
+
     for artist, vocab in artist_vocabs:
         print("\nProcessing %s..." % artist["name"])
         print("  %d entries" % len(vocab))
@@ -291,9 +406,11 @@ def build_master(artists):
                     "is_transparent_cognate": entry.get("is_transparent_cognate", False),
                     "display_form": entry.get("display_form"),
                 }
+                sense_index[new_id] = {}
                 stats["unique_words"] += 1
 
             m = master[new_id]
+            m_senses = sense_index[new_id]
 
             # Union flags (if any artist says true, keep true). Treat
             # is_noise and is_interjection as one underlying flag.
@@ -317,17 +434,11 @@ def build_master(artists):
                 translation = meaning.get("translation", "")
                 context = meaning.get("context", "") or ""
                 source = meaning.get("source")
-                norm = normalize_translation(translation)
-                norm_ctx = context.strip().lower()
-                # Check if a matching sense already exists
-                existing_sense = None
-                for s in m["senses"]:
-                    s_ctx = (s.get("context") or "").strip().lower()
-                    if (s["pos"] == pos
-                        and normalize_translation(s["translation"]) == norm
-                        and s_ctx == norm_ctx):
-                        existing_sense = s
-                        break
+                # Check if a matching sense already exists. A master sense's
+                # key never changes during the merge: its translation is only
+                # rewritten afterwards, by the canonical-translation pass.
+                key = _sense_key(pos, translation, context)
+                existing_sense = m_senses.get(key)
                 if existing_sense:
                     merge_sense_identity(existing_sense, meaning)
                     # Track candidate translations for later canonical selection
@@ -356,6 +467,7 @@ def build_master(artists):
                     if source:
                         new_sense["source"] = source
                     m["senses"].append(new_sense)
+                    m_senses[key] = new_sense
                     stats["new_senses_added"] += 1
 
             # MWE memberships no longer stored in master (handled by build step)
@@ -371,7 +483,11 @@ def build_master(artists):
             "entries": artist_entries,
         })
 
-    # Resolve canonical translations for merged senses using spaCy
+    # Resolve canonical translations for merged senses using spaCy, tagging
+    # every affected word in one batch.
+    merged_words = [m["word"] for m in master.values()
+                    if any(len(s.get("_candidates") or ()) > 1 for s in m["senses"])]
+    analyses = analyze_words(merged_words, morph_cache_path) if merged_words else {}
     merged_count = 0
     for wid, m in master.items():
         for sense in m["senses"]:
@@ -379,7 +495,8 @@ def build_master(artists):
             if candidates and len(candidates) > 1:
                 old = sense["translation"]
                 sense["translation"] = choose_canonical_translation(
-                    m["word"], candidates, lemma=m.get("lemma")
+                    m["word"], candidates, lemma=m.get("lemma"),
+                    analysis=analyses[m["word"]],
                 )
                 if sense["translation"] != old:
                     merged_count += 1
@@ -405,12 +522,65 @@ def build_master(artists):
     return master, per_artist_data, stats
 
 
-def write_artist_files(master, artist_data):
-    # type: (dict, dict) -> None
-    """Write per-artist index, examples, and monolith files in the new format."""
+def _file_sha1(path):
+    # type: (str) -> str
+    """sha1 of a file's bytes, or None if it can't be read."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _write_if_changed(path, data, written):
+    # type: (str, bytes, dict) -> bool
+    """Write ``data`` to ``path`` unless the file already holds exactly it.
+
+    `written` maps paths to [sha1, size, mtime_ns] of what this tool last
+    wrote there (from the merge state) and is updated in place. A file whose
+    size and mtime still match its record is trusted without being read back;
+    anything else is hashed from disk.
+    """
+    digest = hashlib.sha1(data).hexdigest()
+    key = os.path.relpath(path, ARTISTS_DIR)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        stat = None
+    if stat is not None and stat.st_size == len(data):
+        record = written.get(key)
+        if record and record[1:] == [stat.st_size, stat.st_mtime_ns]:
+            on_disk = record[0]
+        else:
+            on_disk = _file_sha1(path)
+        if on_disk == digest:
+            written[key] = [digest, stat.st_size, stat.st_mtime_ns]
+            return False
+    with open(path, "wb") as f:
+        f.write(data)
+    stat = os.stat(path)
+    written[key] = [digest, stat.st_size, stat.st_mtime_ns]
+    return True
+
+
+def _dump(obj):
+    # type: (object) -> bytes
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def write_artist_files(master, artist_data, written=None):
+    # type: (dict, dict, dict) -> list
+    """Write per-artist index, examples, and monolith files in the new format.
+
+    Files whose content is unchanged are left untouched (see
+    `_write_if_changed`). Returns the report lines rather than printing them,
+    so artists can be written concurrently.
+    """
+    written = {} if written is None else written
     artist = artist_data["artist"]
     entries = artist_data["entries"]
     vocab_path = artist["vocab_path"]
+    report = []
 
     # Build artist index and examples
     index = []
@@ -421,6 +591,12 @@ def write_artist_files(master, artist_data):
         entry = ae["entry"]
         m = master[new_id]
 
+        # Artist meanings by merge key; the first meaning with a key wins.
+        meanings_by_key = {}  # type: dict
+        for meaning in entry.get("meanings", []):
+            meanings_by_key.setdefault(_sense_key(
+                meaning.get("pos"), meaning.get("translation", ""), meaning.get("context")), meaning)
+
         # Compute sense_frequencies: for each master sense, what fraction of
         # this artist's examples map to it?
         sense_freq = []
@@ -431,19 +607,8 @@ def write_artist_files(master, artist_data):
             # Find matching meaning in artist's entry (normalized match on
             # pos + translation + context so disambiguated senses don't
             # steal each other's examples / frequencies).
-            norm_sense = normalize_translation(sense["translation"])
-            sense_ctx = (sense.get("context") or "").strip().lower()
-            matching_meaning = None
-            for meaning in entry.get("meanings", []):
-                if meaning.get("pos") != sense["pos"]:
-                    continue
-                if normalize_translation(meaning.get("translation", "")) != norm_sense:
-                    continue
-                m_ctx = (meaning.get("context") or "").strip().lower()
-                if m_ctx != sense_ctx:
-                    continue
-                matching_meaning = meaning
-                break
+            matching_meaning = meanings_by_key.get(_sense_key(
+                sense["pos"], sense["translation"], sense.get("context")))
             if matching_meaning and matching_meaning.get("examples"):
                 exs = matching_meaning["examples"]
                 sense_examples.append(exs)
@@ -487,15 +652,15 @@ def write_artist_files(master, artist_data):
     index_path = base + ".index.json"
     examples_path = base + ".examples.json"
 
-    with open(index_path, "w", encoding="utf-8") as f:
-        json.dump(index, f, ensure_ascii=False)
-    print("  Index: %s (%d entries, %s bytes)" % (
-        index_path, len(index), "{:,}".format(os.path.getsize(index_path))))
+    data = _dump(index)
+    changed = _write_if_changed(index_path, data, written)
+    report.append("  Index: %s (%d entries, %s bytes)%s" % (
+        index_path, len(index), "{:,}".format(len(data)), "" if changed else " unchanged"))
 
-    with open(examples_path, "w", encoding="utf-8") as f:
-        json.dump(examples, f, ensure_ascii=False)
-    print("  Examples: %s (%s bytes)" % (
-        examples_path, "{:,}".format(os.path.getsize(examples_path))))
+    data = _dump(examples)
+    changed = _write_if_changed(examples_path, data, written)
+    report.append("  Examples: %s (%s bytes)%s" % (
+        examples_path, "{:,}".format(len(data)), "" if changed else " unchanged"))
 
     # Write denormalized monolith (master + artist data combined)
     monolith = []
@@ -547,10 +712,99 @@ def write_artist_files(master, artist_data):
             mono_entry["mwe_memberships"] = mwe_memberships
         monolith.append(mono_entry)
 
-    with open(vocab_path, "w", encoding="utf-8") as f:
-        json.dump(monolith, f, ensure_ascii=False)
-    print("  Monolith: %s (%d entries, %s bytes)" % (
-        vocab_path, len(monolith), "{:,}".format(os.path.getsize(vocab_path))))
+    data = _dump(monolith)
+    changed = _write_if_changed(vocab_path, data, written)
+    report.append("  Monolith: %s (%d entries, %s bytes)%s" % (
+        vocab_path, len(monolith), "{:,}".format(len(data)), "" if changed else " unchanged"))
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Incremental re-runs
+# ---------------------------------------------------------------------------
+
+def _merge_inputs(lang, artists):
+    # type: (str, list) -> dict
+    """What a language's merge depends on: step version, deck hashes, master hash.
+
+    The decks are also outputs (the monolith is rewritten in place), so the
+    hashes recorded after a write are those of the decks as written.
+    """
+    return {
+        "step_version": STEP_VERSION,
+        "decks": {os.path.relpath(a["vocab_path"], ARTISTS_DIR): _file_sha1(a["vocab_path"])
+                  for a in artists},
+        "master": _file_sha1(master_path_for_language(lang)),
+    }
+
+
+def load_merge_state(lang):
+    # type: (str) -> dict
+    try:
+        with open(merge_state_path_for_language(lang), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_merge_state(lang, artists, written):
+    # type: (str, list, dict) -> None
+    path = merge_state_path_for_language(lang)
+    state = {"inputs": _merge_inputs(lang, artists), "outputs": written}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def is_up_to_date(lang, artists):
+    # type: (str, list) -> bool
+    """True if no deck, nor the master, changed since this tool last wrote them.
+
+    The merge is order-dependent across artists (first sense wins, IDs are
+    assigned over the union), so one changed deck means re-merging all of
+    them; only the no-change case can be skipped outright.
+    """
+    current = _merge_inputs(lang, artists)
+    return current["master"] is not None and load_merge_state(lang).get("inputs") == current
+
+
+def write_language(lang, master, per_artist_data, workers=1):
+    # type: (str, dict, list, int) -> None
+    """Write the master and every artist's files, then record the merge state."""
+    master_path = master_path_for_language(lang)
+    os.makedirs(os.path.dirname(master_path), exist_ok=True)
+    print("\nWriting master vocabulary to %s..." % master_path)
+    # Outputs recorded by the last run; a stale entry only costs a re-read.
+    recorded = load_merge_state(lang).get("outputs") or {}
+    data = json.dumps(master, ensure_ascii=False, indent=None).encode("utf-8")
+    master_key = os.path.relpath(master_path, ARTISTS_DIR)
+    master_written = {k: v for k, v in recorded.items() if k == master_key}
+    changed = _write_if_changed(master_path, data, master_written)
+    if changed:
+        write_sidecar(master_path, make_meta("merge_to_master", STEP_VERSION))
+    print("  %d entries, %s bytes%s" % (
+        len(master), "{:,}".format(len(data)), "" if changed else " (unchanged)"))
+
+    # Per-artist files are independent given the master; report in artist order.
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        # Each artist reads and updates only its own files' entries.
+        written = [{k: v for k, v in recorded.items()
+                    if k.startswith(os.path.relpath(ad["artist"]["dir"], ARTISTS_DIR) + os.sep)}
+                   for ad in per_artist_data]
+        reports = list(pool.map(lambda ad, w: write_artist_files(master, ad, w),
+                                per_artist_data, written))
+    for ad, report in zip(per_artist_data, reports):
+        print("\nWriting files for %s..." % ad["artist"]["name"])
+        for line in report:
+            print(line)
+    print("\nArtist files written in %.1fs (%d workers)" % (time.time() - start, max(1, workers)))
+
+    for artist_written in written:
+        master_written.update(artist_written)
+    save_merge_state(lang, [ad["artist"] for ad in per_artist_data], master_written)
 
 
 def validate(master, per_artist_data, stats):
@@ -607,6 +861,10 @@ def main():
     parser = argparse.ArgumentParser(description="Build/rebuild shared master vocabulary")
     parser.add_argument("--dry-run", action="store_true",
                         help="Report sense merges without writing any files")
+    parser.add_argument("--full", action="store_true",
+                        help="Rebuild every language even if no deck changed since the last run")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Threads writing per-artist files (default: 4)")
     args = parser.parse_args()
 
     print("Discovering artists...")
@@ -621,8 +879,15 @@ def main():
         print("=" * 60)
         print("Found %d artists: %s" % (len(artists), ", ".join(a["name"] for a in artists)))
 
+        if not args.dry_run and not args.full and is_up_to_date(lang, artists):
+            print("\nUp to date: no deck changed since the last merge (--full to rebuild)")
+            continue
+
         print("\nBuilding master vocabulary for %s..." % lang)
-        master, per_artist_data, stats = build_master(artists)
+        start = time.time()
+        master, per_artist_data, stats = build_master(
+            artists, morph_cache_path=morph_cache_path_for_language(lang))
+        print("\nMerged %d artists in %.1fs" % (len(artists), time.time() - start))
 
         if args.dry_run:
             print("\nDRY RUN (%s) — no files written" % lang)
@@ -639,19 +904,7 @@ def main():
             validate(master, per_artist_data, stats)
             continue
 
-        master_path = master_path_for_language(lang)
-        os.makedirs(os.path.dirname(master_path), exist_ok=True)
-        print("\nWriting master vocabulary to %s..." % master_path)
-        with open(master_path, "w", encoding="utf-8") as f:
-            json.dump(master, f, ensure_ascii=False, indent=None)
-        write_sidecar(master_path, make_meta("merge_to_master", STEP_VERSION))
-        master_size = os.path.getsize(master_path)
-        print("  %d entries, %s bytes" % (len(master), "{:,}".format(master_size)))
-
-        for ad in per_artist_data:
-            print("\nWriting files for %s..." % ad["artist"]["name"])
-            write_artist_files(master, ad)
-
+        write_language(lang, master, per_artist_data, workers=args.workers)
         validate(master, per_artist_data, stats)
 
     if args.dry_run:
@@ -58,14 +58,9 @@ def surfaces_of(record):
             for a in (record.get("aliases") or []) if a.get("surface")}
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--registry", default=str(REGISTRY))
-    ap.add_argument("--language", default="spanish")
-    ap.add_argument("--dry-run", action="store_true")
-    args = ap.parse_args()
-
-    registry = CardIdentityRegistry.load(Path(args.registry), args.language)
+def migrate(registry, dry_run=False):
+    """Plan the surface migration and, unless `dry_run`, apply it to
+    `registry`; returns (mapping, by_surface, merged, seeded)."""
     actives = active_records(registry)
     print("registry: %d records (%d active, %d migrations)"
           % (len(registry.records), len(actives), len(registry.migrations)))
@@ -121,9 +116,9 @@ def main():
     print("  sample:", [(a, b, [s for s, c in by_surface.items() if a in c][0])
                         for a, b in sample])
 
-    if args.dry_run:
+    if dry_run:
         print("\n--dry-run: registry untouched, nothing written")
-        return
+        return mapping, by_surface, 0, 0
 
     merged = seeded = 0
     for surface in sorted(by_surface):
@@ -138,20 +133,30 @@ def main():
             # record. merge() handles that correctly — it retires the source
             # before rebinding, and the alias index is built from active
             # records only — so the target just needs to exist.
-            registry.records[target] = {
-                "card_id": target,
-                "status": "active",
-                "aliases": [],
-                "evidence_ids": [],
-            }
-            registry.invalidate_indexes()
+            registry.ensure_card(target)
             seeded += 1
         for source in sources:
             registry.merge(source, target,
                            "surface identity migration: %s" % surface)
             merged += 1
 
-    registry.save(Path(args.registry))
+    return mapping, by_surface, merged, seeded
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--registry", default=str(REGISTRY))
+    ap.add_argument("--language", default="spanish")
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args()
+
+    if args.dry_run:
+        migrate(CardIdentityRegistry.load(Path(args.registry), args.language), dry_run=True)
+        return
+    # Planning reads the same registry it rewrites: hold the lock from load to
+    # save so a concurrent step_8b cannot land updates this save would drop.
+    with CardIdentityRegistry.transaction(Path(args.registry), args.language) as registry:
+        mapping, by_surface, merged, seeded = migrate(registry)
 
     stamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H%MZ")
     OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -170,6 +175,5 @@ def main():
     print("mapping  -> %s" % out)
     print("\nNext: rebuild each artist deck with step_8b --surface-cards")
 
-
 if __name__ == "__main__":
     main()
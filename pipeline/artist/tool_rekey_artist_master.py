@@ -27,11 +27,17 @@ from __future__ import annotations
 import argparse
 import json
 import shutil
+import sys
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
 
 REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+
+from pipeline.util_identity_registry import CardIdentityRegistry  # noqa: E402
+
+REGISTRY = REPO / "Artists/spanish/evidence/registries/cards.json"
 MASTER = REPO / "Artists/spanish/vocabulary_master.json"
 MAPPING = REPO / "Artists/spanish/evidence/artist_surface_id_migration.json"
 
@@ -61,9 +67,7 @@ def main():
     # because it only walked active records. They still hold learner progress, so
     # follow superseded_by to whichever card is live now rather than stranding
     # them under a dead key.
-    records = json.loads(
-        (REPO / "Artists/spanish/evidence/registries/cards.json").read_text(
-            encoding="utf-8"))["records"]
+    records = CardIdentityRegistry.reader(REGISTRY, "spanish")
 
     def final_destination(card_id, limit=10):
         """Walk superseded_by until a live card, not until a mapping key.
@@ -0,0 +1,166 @@
+"""Token-postings index for resolving artist MWE examples in step 8b.
+
+``assemble_from_layers`` used to compile a regex per expression and test it
+against every distinct lyric line, once per MWE card.  With thousands of
+shared and artist-detected expressions that scan is quadratic.  This module
+tokenizes every example line once, keeps a ``token -> line positions``
+posting list, and narrows each expression to the lines containing all of its
+tokens with set intersections.  The original boundary-aware regex is still
+applied, but only to that (usually tiny) candidate set, so the selected
+examples and their order are identical to the full scan.
+"""
+
+import re
+from collections import defaultdict
+
+
+# Unicode-aware word-boundary class: the same letters the lyric regexes treat
+# as part of a word (``\b`` misses accented characters).
+SPANISH_LETTER = r'a-zA-ZáéíóúñüÁÉÍÓÚÑÜ'
+_LETTER_RUN_RE = re.compile(r'[' + SPANISH_LETTER + r']+')
+
+# Pattern entries from the clitic-placeholder bucket carry a "[PRON]" slot
+# that won't appear literally in any lyric line. Expand it to the object /
+# reflexive clitics so "no [PRON] hagas" finds "no te hagas", "no lo hagas"...
+PRON_PLACEHOLDER_RE = re.compile(r'\[pron\]', re.IGNORECASE)
+PRON_CLITICS = ("me", "te", "se", "le", "les", "nos", "lo", "la", "los", "las")
+_PRON_CLITIC_ALT = r'(?:' + '|'.join(PRON_CLITICS) + r')'
+
+
+def mwe_pattern(expression):
+    """Compile the boundary-aware lyric regex for one MWE surface form."""
+    tokens = str(expression or '').lower().split()
+    body_parts = []
+    for index, token in enumerate(tokens):
+        if index:
+            # Curated Caribbean forms often contain ``vo' a`` while the
+            # original lyric displays ``vo'a``. Treat that one elision
+            # boundary as optional whitespace; ordinary word boundaries
+            # still require at least one space.
+            separator = r'\s*' if tokens[index - 1].endswith(("'", "’")) else r'\s+'
+            body_parts.append(separator)
+        if PRON_PLACEHOLDER_RE.fullmatch(token):
+            body_parts.append(_PRON_CLITIC_ALT)
+        else:
+            body_parts.append(re.escape(token).replace("'", "['’]"))
+    body = ''.join(body_parts)
+    return re.compile(
+        r'(?<![' + SPANISH_LETTER + r'])' + body +
+        r'(?![' + SPANISH_LETTER + r'])',
+        re.IGNORECASE,
+    )
+
+
+def line_tokens(text):
+    """Return the lowercase letter runs of ``text``.
+
+    Every letter run of an expression is also a maximal letter run of any line
+    its ``mwe_pattern`` matches (tokens are delimited by whitespace, elision
+    apostrophes, or the pattern's non-letter lookarounds), so postings built
+    from these runs never drop a true match.
+    """
+    return _LETTER_RUN_RE.findall(str(text or '').lower())
+
+
+def _required_token_sets(expression):
+    """Return one alternative-set per required token of ``expression``."""
+    required = []
+    for token in str(expression or '').lower().split():
+        if PRON_PLACEHOLDER_RE.fullmatch(token):
+            required.append(PRON_CLITICS)
+            continue
+        required.extend((run,) for run in line_tokens(token))
+    return required
+
+
+def detected_occurrences(detected_examples, priority_keys=()):
+    """Normalize step 2a ``ngram_examples`` rows into scan-result tuples.
+
+    Yields ``(line, info, matched_variant, matched_surface)`` in input order,
+    the same shape ``MweOccurrenceIndex.scan`` produces for lyric lines.
+    """
+    for raw in detected_examples or []:
+        line = raw.get("line") or raw.get("spanish") or ""
+        if not line:
+            continue
+        raw_id = str(raw.get("id") or "")
+        info = {
+            "song_id": raw_id.split(":")[0] if ":" in raw_id else raw_id,
+            "title": raw.get("title", ""),
+        }
+        for key in priority_keys:
+            if key in raw:
+                info[key] = raw[key]
+        yield line, info, raw.get("matched_variant"), raw.get("matched_surface")
+
+
+class MweOccurrenceIndex:
+    """Posting-list lookup of MWE surface forms over distinct lyric lines.
+
+    ``line_info`` maps each distinct example line to its song metadata; its
+    insertion order is the scan order, exactly as the former full scan.
+    Build once per assembly and share across every MWE card.
+    """
+
+    def __init__(self, line_info):
+        self._lines = list(line_info.items())
+        postings = defaultdict(set)
+        for position, (line, _info) in enumerate(self._lines):
+            for token in line_tokens(line):
+                postings[token].add(position)
+        self._postings = dict(postings)
+        self._patterns = {}
+        self._candidates = {}
+
+    def __len__(self):
+        return len(self._lines)
+
+    def pattern(self, form):
+        key = form.lower()
+        compiled = self._patterns.get(key)
+        if compiled is None:
+            compiled = self._patterns[key] = mwe_pattern(form)
+        return compiled
+
+    def candidate_positions(self, form):
+        """Return the line positions containing every token of ``form``."""
+        key = form.lower()
+        cached = self._candidates.get(key)
+        if cached is not None:
+            return cached
+        required = _required_token_sets(form)
+        if not required:
+            positions = frozenset(range(len(self._lines)))
+        else:
+            postings = []
+            for alternatives in required:
+                union = set()
+                for token in alternatives:
+                    union |= self._postings.get(token, set())
+                postings.append(union)
+            postings.sort(key=len)
+            positions = set(postings[0])
+            for posting in postings[1:]:
+                if not positions:
+                    break
+                positions &= posting
+            positions = frozenset(positions)
+        self._candidates[key] = positions
+        return positions
+
+    def scan(self, forms):
+        """Yield ``(line, info, matched_form)`` for lines matching any form.
+
+        Lines come out in ``line_info`` order and each is attributed to the
+        first form in ``forms`` whose pattern matches it.
+        """
+        per_form = [(form, self.candidate_positions(form)) for form in forms]
+        union = set()
+        for _form, positions in per_form:
+            union |= positions
+        for position in sorted(union):
+            line, info = self._lines[position]
+            for form, positions in per_form:
+                if position in positions and self.pattern(form).search(line):
+                    yield line, info, form
+                    break
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Throughput + parity benchmark for shared/flag_cognates.cognate_score.
+
+Scores every (form, gloss) pair of a vocabulary master three ways:
+
+  - reference : the plain formulation (difflib.SequenceMatcher ratios and a
+                linear SUFFIX_RULES scan), kept here as the oracle
+  - cold      : cognate_score with an empty memo
+  - warm      : cognate_score again, served from the per-process memo
+
+and fails (exit 1) if any score differs from the reference. It also checks
+sequence_ratio against difflib on random short strings, where tie-breaking
+between equally long matching blocks is most likely to matter.
+
+Read-only. Run from the project root:
+
+    .venv/bin/python3 pipeline/bench_cognate_score.py
+    .venv/bin/python3 pipeline/bench_cognate_score.py --master Artists/spanish/vocabulary_master.json
+"""
+import difflib
+import json
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from shared import flag_cognates  # noqa: E402
+from shared.flag_cognates import (  # noqa: E402
+    SUFFIX_RULES, _phonetic_normalize_en, _strip_prosthetic_e, apply_suffix,
+    normalize, sequence_ratio, split_english_glosses, strip_plural,
+)
+
+MASTER = "Artists/spanish/vocabulary_master_wikt.json"
+
+
+def reference_cognate_score(spanish, english):
+    """cognate_score as written before the compiled engine."""
+    s = normalize(spanish)
+    e = normalize(english)
+    if len(s) < 4 or len(e) < 4:
+        return 0.0
+    s0 = strip_plural(s)
+    e0 = strip_plural(e)
+    if s0 == e0:
+        return 1.0
+    for es_suffix, en_suffix in SUFFIX_RULES:
+        result = apply_suffix(s0, es_suffix, en_suffix)
+        if result is not None and (result == e0 or result == e):
+            return 1.0
+    s1 = _strip_prosthetic_e(s0)
+    if s1 != s0:
+        if s1 == e0:
+            return 1.0
+        for es_suffix, en_suffix in SUFFIX_RULES:
+            result = apply_suffix(s1, es_suffix, en_suffix)
+            if result is not None and (result == e0 or result == e):
+                return 1.0
+    best = difflib.SequenceMatcher(None, s0, e0).ratio()
+    if len(s0) >= 6 and len(e0) >= 6:
+        e_phon = _phonetic_normalize_en(e0)
+        if e_phon != e0:
+            best = max(best, difflib.SequenceMatcher(None, s0, e_phon).ratio())
+        if s1 != s0:
+            best = max(best, difflib.SequenceMatcher(None, s1, e0).ratio())
+            if e_phon != e0:
+                best = max(best, difflib.SequenceMatcher(None, s1, e_phon).ratio())
+    return round(best, 3)
+
+
+def load_pairs(master_path):
+    with open(master_path, "r", encoding="utf-8") as f:
+        master = json.load(f)
+    pairs = []
+    for m in master.values():
+        forms = sorted({m.get("word", ""), m.get("lemma", "")} - {""})
+        for sense in m.get("senses") or m.get("meanings") or []:
+            for eng in split_english_glosses(sense.get("translation", "")):
+                pairs.extend((sp, eng) for sp in forms)
+    return pairs
+
+
+def timed(fn, pairs):
+    start = time.perf_counter()
+    scores = [fn(sp, eng) for sp, eng in pairs]
+    return scores, time.perf_counter() - start
+
+
+def check_ratio_parity(trials, seed=0):
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(trials):
+        a = "".join(rng.choice("abcde") for _ in range(rng.randint(0, 14)))
+        b = "".join(rng.choice("abcde") for _ in range(rng.randint(0, 14)))
+        if sequence_ratio(a, b) != difflib.SequenceMatcher(None, a, b).ratio():
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="cognate_score throughput + parity")
+    ap.add_argument("--master", default=MASTER,
+                    help="Vocabulary master whose senses supply the pairs "
+                         "(default: %(default)s)")
+    ap.add_argument("--ratio-trials", type=int, default=20000,
+                    help="Random string pairs for the sequence_ratio check")
+    args = ap.parse_args()
+
+    pairs = load_pairs(os.path.join(PROJECT_ROOT, args.master))
+    print("Pairs: %d (%s)" % (len(pairs), args.master))
+
+    flag_cognates._SCORES.clear()
+    reference, ref_s = timed(reference_cognate_score, pairs)
+    cold, cold_s = timed(flag_cognates.cognate_score, pairs)
+    warm, warm_s = timed(flag_cognates.cognate_score, pairs)
+    for label, seconds in (("reference", ref_s), ("cold", cold_s), ("warm", warm_s)):
+        print("  %-9s %6.2fs  %9.0f pairs/s" % (label, seconds, len(pairs) / seconds))
+
+    diffs = [(p, r, c) for p, r, c in zip(pairs, reference, cold) if r != c]
+    diffs += [(p, r, w) for p, r, w in zip(pairs, reference, warm) if r != w]
+    ratio_diffs = check_ratio_parity(args.ratio_trials)
+    print("  score mismatches: %d   sequence_ratio mismatches: %d / %d"
+          % (len(diffs), ratio_diffs, args.ratio_trials))
+    for (sp, eng), want, got in diffs[:10]:
+        print("    %s / %s: reference %s, got %s" % (sp, eng, want, got))
+    if diffs or ratio_diffs:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,15 +22,22 @@ deck quality:
   - propernoun_caps     : the word is capitalized mid-sentence in every
                           lyric line it appears in — proper noun leak.
 
+When a deck ships a current `.filter.json` (util_8a_filter_index.py) the
+visible set is read from its bitsets, the same index the app uses; otherwise
+every card goes through visible().
+
 Read-only. Run from the project root:
 
     .venv/bin/python3 pipeline/bench_deck_quality.py
 """
 import json
+import os
 import re
 import collections
 import unicodedata
 
+from util_8a_filter_index import cognate_bit, filter_index_path, load_filter_index
+
 MASTER = "Artists/spanish/vocabulary_master.json"
 ARTISTS = {
     "BadBunny": (
@@ -231,6 +238,24 @@ def visible(mst, idx):
     return True
 
 
+def visible_mask(fi):
+    """visible() for every card at once, from a deck's filter index."""
+    hidden = (fi["english"] | fi["noise"] | fi["english_loanword"] | fi["propernoun"]
+              | fi["all_propn"] | fi[cognate_bit(COGNATE_THRESHOLD)])
+    return fi["has_translation"] & fi["multi_occurrence"] & ~hidden
+
+
+def visible_card_ids(idx_list, m, index_path, master_path):
+    """Ids of the visible cards of one deck, from its filter index when current."""
+    fpath = filter_index_path(index_path)
+    if os.path.isfile(fpath):
+        fi = load_filter_index(fpath)
+        if COGNATE_THRESHOLD in fi.cognate_thresholds and fi.is_current(index_path, master_path):
+            return set(fi.ids_of(visible_mask(fi)))
+        print("(%s is stale — scanning)" % fpath)
+    return {idx.get("id") for idx in idx_list if visible(m.get(idx.get("id")), idx)}
+
+
 def main():
     import argparse
     ap = argparse.ArgumentParser(description="Deck-quality diagnostics")
@@ -247,7 +272,6 @@ def main():
         if args.suffix:
             ip = ip.replace("vocabulary.", "vocabulary%s." % args.suffix)
             ep = ep.replace("vocabulary.", "vocabulary%s." % args.suffix)
-            import os
             if not os.path.isfile(ip):
                 print("(skipping %s — no %s)" % (name, ip))
                 continue
@@ -260,12 +284,14 @@ def main():
     defect = collections.defaultdict(list)
 
     # Per-card structural defects (master-side).
+    shown = {}
     for artist, (ipath, _epath) in artists.items():
         idx_list = json.load(open(ipath))
+        shown[artist] = visible_card_ids(idx_list, m, ipath, args.master)
         for idx in idx_list:
             mid = idx.get("id")
             mst = m.get(mid)
-            if not visible(mst, idx):
+            if mid not in shown[artist]:
                 continue
             per_artist[artist] += 1
             if mid in visible_ids:
@@ -303,7 +329,7 @@ def main():
     for artist, (ipath, epath) in artists.items():
         idx_list = json.load(open(ipath))
         ex = json.load(open(epath))
-        vis = {idx["id"]: idx for idx in idx_list if visible(m.get(idx.get("id")), idx)}
+        vis = {idx["id"]: idx for idx in idx_list if idx.get("id") in shown[artist]}
         for mid in vis:
             node = ex.get(mid)
             if not node:
@@ -19,17 +19,25 @@ Inputs (paths derived from --language):
 
 Output:
     Data/{Lang}/layers/examples_raw.json  — {word: [{target, english, source, easiness}]}
+
+Cache:
+    Data/{Lang}/corpora/sentence_index/   — built sentence indexes (tatoeba, the
+        sampled and the raw OpenSubtitles), reused while corpus, ranks and
+        inventory are unchanged. See util_5a_sentence_index.
 """
 
 import argparse
 import json
+import os
 import random
 import re
 import sys
 import time
 import unicodedata
 import zlib
+from array import array
 from collections import defaultdict
+from itertools import chain
 from pathlib import Path
 from statistics import median
 
@@ -37,6 +45,10 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT / "pipeline"))
 from util_pipeline_meta import make_meta, write_sidecar  # noqa: E402
 from util_5a_example_id import example_id, update_example_store  # noqa: E402
+from util_5a_sentence_index import (  # noqa: E402
+    chunked, file_fingerprint, fingerprint, open_or_build, pairs_fingerprint,
+)
+from util_subtitle_corpus import SubtitleCorpus  # noqa: E402
 
 # Bump when example-selection logic, scoring, or corpus sources change.
 STEP_VERSION = 1
@@ -73,6 +85,7 @@ RANKS_FILE = None
 OUTPUT_FILE = None
 OPENSUBS_CACHE = None
 EXAMPLE_STORE = None  # append-only flat {id: example} store
+SENTENCE_INDEX_DIR = None  # built sentence indexes (util_5a_sentence_index)
 
 SENTINEL_RANK = 999_999
 DEFAULT_MAX_LINES = 5_000_000
@@ -155,41 +168,36 @@ def load_opensubtitles(es_path, en_path, max_lines):
             print(f"    Subsampled to {len(sentences):,} pairs")
         return sentences
 
-    # No cache — process from raw files
-    # First pass: count total lines (fast, just counts newlines)
-    print("    Counting total lines...")
-    t0 = time.time()
-    total = 0
-    with open(es_path, "rb") as f:
-        for _ in f:
-            total += 1
+    # No cache — read the sampled lines straight from the raw files. The
+    # line-offset index (util_subtitle_corpus) gives the line count and puts
+    # each read at the next sampled line, so only every stride-th line is read.
+    corpus = _opensubtitles_corpus(es_path)
+    sides = (corpus.lang, "en")
+    total = corpus.count(sides)
     stride = max(1, total // max_lines)
-    print(f"    {total:,} total lines, stride={stride} ({time.time() - t0:.1f}s)")
+    print(f"    {total:,} total lines, stride={stride}")
 
     sentences = []
     t0 = time.time()
-    report_every = total // 20  # report every 5%
-    with open(es_path, encoding="utf-8") as f_es, \
-         open(en_path, encoding="utf-8") as f_en:
-        for i, (line_es, line_en) in enumerate(zip(f_es, f_en)):
-            if report_every and i % report_every == 0 and i > 0:
-                pct = 100 * i / total
-                elapsed = time.time() - t0
-                rate = i / elapsed if elapsed > 0 else 0
-                remaining = (total - i) / rate if rate > 0 else 0
-                sys.stdout.write(
-                    f"\r    {pct:5.1f}%  {len(sentences):,} kept  "
-                    f"~{remaining:.0f}s remaining   "
-                )
-                sys.stdout.flush()
-            if i % stride != 0:
-                continue
-            if len(sentences) >= max_lines:
-                break
-            spa = clean_subtitle_line(line_es)
-            eng = clean_subtitle_line(line_en)
-            if spa and eng:
-                sentences.append((eng, spa))
+    picks = range(1, total + 1, stride)
+    report_every = len(picks) // 20  # report every 5%
+    for i, (number, line) in enumerate(corpus.lines(picks, sides)):
+        if report_every and i % report_every == 0 and i > 0:
+            pct = 100 * number / total
+            elapsed = time.time() - t0
+            rate = i / elapsed if elapsed > 0 else 0
+            remaining = (len(picks) - i) / rate if rate > 0 else 0
+            sys.stdout.write(
+                f"\r    {pct:5.1f}%  {len(sentences):,} kept  "
+                f"~{remaining:.0f}s remaining   "
+            )
+            sys.stdout.flush()
+        if len(sentences) >= max_lines:
+            break
+        spa = clean_subtitle_line(line[corpus.lang])
+        eng = clean_subtitle_line(line["en"])
+        if spa and eng:
+            sentences.append((eng, spa))
     elapsed = time.time() - t0
     print(f"\r    Done: {len(sentences):,} pairs in {elapsed:.1f}s" + " " * 30)
 
@@ -216,48 +224,48 @@ def load_tatoeba(path):
     return sentences
 
 
-def build_sentence_index(sentences, word_to_rank, inv_rank_lookup,
-                         phrase_to_inv_rank=None):
-    """One-pass index build. Computes per-sentence scoring metadata once,
-    drops trash (too short/long, trivial, no-inventory), and returns:
-      - records: list[dict] of surviving sentences with precomputed scores
-      - inv_index: dict[token_or_phrase, list[record_idx]] for fast lookup
+# Per-process lookups for score_chunk, set by _init_index_worker so they are
+# sent to each worker once rather than with every chunk.
+_INDEX_LOOKUPS = {}
 
-    Single-token index keys are literal tokens. Wiktionary headwords + the
-    inventory both treat accented and unaccented forms as distinct (à vs a,
-    où vs ou, sé vs se), so the example index does the same.
 
-    Multi-token inventory entries (l', parce que, grand-père, etc.) can't be
-    captured by token-level lookup because the tokenizer regex splits on
-    apostrophes, hyphens, and spaces. Pass them via phrase_to_inv_rank — they
-    get scanned with a precompiled multi-pattern regex per kept sentence,
-    then folded into both inv_ranks (drives tier scoring) and inv_index
-    (drives candidate lookup at scoring time).
-    """
+def _init_index_worker(word_to_rank, inv_rank_lookup, phrase_to_inv_rank, clean):
     phrase_re = None
     if phrase_to_inv_rank:
         # Longest-first ordering so "parce que" wins over "que" at overlaps.
         phrases_sorted = sorted(phrase_to_inv_rank, key=len, reverse=True)
         phrase_re = re.compile("|".join(re.escape(p) for p in phrases_sorted))
+    _INDEX_LOOKUPS.update(word_to_rank=word_to_rank, inv_rank_lookup=inv_rank_lookup,
+                          phrase_to_inv_rank=phrase_to_inv_rank,
+                          phrase_re=phrase_re, clean=clean)
+
+
+def score_chunk(pairs):
+    """Score and tokenize one chunk of (eng, spa) pairs for the sentence index.
 
-    records = []
-    inv_index = defaultdict(list)
+    Drops trash (too short/long, trivial, no-inventory) and returns the kept
+    sentences as compact columns plus postings {token_or_phrase: local ids},
+    flattened to (tokens, token_count, postings). With ``clean`` set (raw
+    OpenSubtitles lines) each side goes through clean_subtitle_line first.
+    """
+    word_to_rank = _INDEX_LOOKUPS["word_to_rank"]
+    inv_rank_lookup = _INDEX_LOOKUPS["inv_rank_lookup"]
+    phrase_to_inv_rank = _INDEX_LOOKUPS["phrase_to_inv_rank"]
+    phrase_re = _INDEX_LOOKUPS["phrase_re"]
+    clean = _INDEX_LOOKUPS["clean"]
+
+    lengths, easiness, inv_count, inv_ranks = array("B"), array("i"), array("I"), array("i")
+    spa_len, eng_len = array("I"), array("I")
+    spa_parts, eng_parts = [], []
+    postings = defaultdict(list)
     drop_short = drop_long = drop_trivial = drop_no_inv = 0
-    total = len(sentences)
-    report_every = max(1, total // 20)
-    t0 = time.time()
 
-    for i, (eng, spa) in enumerate(sentences):
-        if i % report_every == 0 and i > 0:
-            pct = 100 * i / total
-            elapsed = time.time() - t0
-            rate = i / elapsed if elapsed > 0 else 0
-            remaining = (total - i) / rate if rate > 0 else 0
-            sys.stdout.write(
-                f"\r    {pct:5.1f}%  {len(records):,} kept  "
-                f"~{remaining:.0f}s remaining   "
-            )
-            sys.stdout.flush()
+    for eng, spa in pairs:
+        if clean:
+            spa = clean_subtitle_line(spa)
+            eng = clean_subtitle_line(eng)
+            if not spa or not eng:
+                continue
 
         tokens = tokenize(spa)
         length = len(tokens)
@@ -302,28 +310,127 @@ def build_sentence_index(sentences, word_to_rank, inv_rank_lookup,
             drop_no_inv += 1
             continue
 
-        easiness = int(median(ranks))
-        rec_idx = len(records)
-        records.append({
-            "eng": eng,
-            "spa": spa,
-            "length": length,
-            "easiness": easiness,
-            "inv_ranks": tuple(sorted(inv_ranks_set)),
-        })
-        seen = set()
-        for t in tokens:
-            if t not in seen:
-                seen.add(t)
-                inv_index[t].append(rec_idx)
+        rec_idx = len(lengths)
+        spa_bytes, eng_bytes = spa.encode("utf-8"), eng.encode("utf-8")
+        spa_parts.append(spa_bytes)
+        eng_parts.append(eng_bytes)
+        spa_len.append(len(spa_bytes))
+        eng_len.append(len(eng_bytes))
+        lengths.append(length)
+        easiness.append(int(median(ranks)))
+        inv_count.append(len(inv_ranks_set))
+        inv_ranks.extend(sorted(inv_ranks_set))
+        for t in dict.fromkeys(tokens):
+            postings[t].append(rec_idx)
         for p in matched_phrases:
-            inv_index[p].append(rec_idx)
+            postings[p].append(rec_idx)
 
-    elapsed = time.time() - t0
-    print(f"\r    Done in {elapsed:.1f}s — kept {len(records):,} of {total:,} "
-          f"(dropped: {drop_short} short, {drop_long} long, "
-          f"{drop_trivial} trivial, {drop_no_inv} no-inv)" + " " * 10)
-    return records, inv_index
+    out = {"seen": len(pairs), "length": lengths, "easiness": easiness,
+           "inv_count": inv_count, "inv_ranks": inv_ranks,
+           "spa_len": spa_len, "eng_len": eng_len,
+           "spa": b"".join(spa_parts), "eng": b"".join(eng_parts),
+           "tokens": list(postings),
+           "token_count": array("I", map(len, postings.values())),
+           "postings": array("I", chain.from_iterable(postings.values())),
+           "drops": (drop_short, drop_long, drop_trivial, drop_no_inv)}
+    return out
+
+
+_LOOKUP_KEYS = {}
+
+
+def _lookups_key(word_to_rank, inv_rank_lookup, phrase_to_inv_rank):
+    """Fingerprint of everything besides the corpus that shapes the index."""
+    ident = (id(word_to_rank), id(inv_rank_lookup), id(phrase_to_inv_rank))
+    if ident not in _LOOKUP_KEYS:
+        _LOOKUP_KEYS[ident] = fingerprint(
+            word_to_rank, inv_rank_lookup, phrase_to_inv_rank or {},
+            [MIN_SENTENCE_WORDS, MAX_SENTENCE_LEN, TOP_N_TRIVIAL, SENTINEL_RANK])
+    return _LOOKUP_KEYS[ident]
+
+
+def _default_workers():
+    return os.cpu_count() or 1
+
+
+def build_sentence_index(sentences, word_to_rank, inv_rank_lookup,
+                         phrase_to_inv_rank=None, name=None, workers=None):
+    """Index a pair list. Computes per-sentence scoring metadata once,
+    drops trash (too short/long, trivial, no-inventory), and returns:
+      - records: list[dict] of surviving sentences with precomputed scores
+      - inv_index: {token_or_phrase: list[record_idx]} for fast lookup
+
+    Single-token index keys are literal tokens. Wiktionary headwords + the
+    inventory both treat accented and unaccented forms as distinct (à vs a,
+    où vs ou, sé vs se), so the example index does the same.
+
+    Multi-token inventory entries (l', parce que, grand-père, etc.) can't be
+    captured by token-level lookup because the tokenizer regex splits on
+    apostrophes, hyphens, and spaces. Pass them via phrase_to_inv_rank — they
+    get scanned with a precompiled multi-pattern regex per kept sentence,
+    then folded into both inv_ranks (drives tier scoring) and inv_index
+    (drives candidate lookup at scoring time).
+
+    Chunks are scored in `workers` processes (default: one per CPU) and the
+    index is kept under SENTENCE_INDEX_DIR as `name`, keyed by the corpus
+    content and the lookups, so a rerun (--word, a new tunable) reuses it.
+    """
+    key = fingerprint(pairs_fingerprint(sentences),
+                      _lookups_key(word_to_rank, inv_rank_lookup, phrase_to_inv_rank))
+    index = open_or_build(
+        SENTENCE_INDEX_DIR, name, key, lambda: chunked(sentences), score_chunk,
+        workers=workers or _default_workers(), initializer=_init_index_worker,
+        initargs=(word_to_rank, inv_rank_lookup, phrase_to_inv_rank, False),
+        meta={"name": name}, total=len(sentences))
+    return index.materialize(), index.postings
+
+
+def _opensubtitles_corpus(es_path):
+    """The aligned OpenSubtitles files next to `es_path` (OpenSubtitles.en-xx.xx)."""
+    es_path = Path(es_path)
+    return SubtitleCorpus(es_path.parent, lang=es_path.suffix[1:], errors="strict")
+
+
+def _raw_pair_chunks(raw_es_path, raw_en_path):
+    """Raw OpenSubtitles lines as (eng, spa) chunks, cleaned in the workers."""
+    corpus = _opensubtitles_corpus(raw_es_path)
+    chunk = []
+    for _, line in corpus.iter_range(sides=(corpus.lang, "en")):
+        chunk.append((line["en"], line[corpus.lang]))
+        if len(chunk) == 50_000:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Raw-corpus index builds kept per language, one per inventory in use.
+RAW_INDEX_KEEP = 4
+
+
+def raw_opensubtitles_index(raw_es_path, raw_en_path, word_to_rank,
+                            inv_rank_lookup, phrase_to_inv_rank,
+                            index_dir=None, workers=None):
+    """Sentence index over the whole raw OpenSubtitles pair, built once.
+
+    Kept next to the corpus (corpora/sentence_index/) and keyed by the raw
+    files' size/mtime and the lookups, so the rare-word backfill (and
+    tool_5a_extend_examples) look words up instead of streaming 3 GB. The
+    lookups differ per artist inventory, and the directory is shared by every
+    artist of a language, so the RAW_INDEX_KEEP most recently used builds are
+    kept: artists run in turn reuse theirs instead of evicting each other's.
+    """
+    raw_es_path, raw_en_path = Path(raw_es_path), Path(raw_en_path)
+    index_dir = Path(index_dir) if index_dir else raw_es_path.parent.parent / "sentence_index"
+    key = fingerprint(file_fingerprint(raw_es_path, raw_en_path),
+                      _lookups_key(word_to_rank, inv_rank_lookup, phrase_to_inv_rank))
+    return open_or_build(
+        index_dir, "opensubtitles_raw", key,
+        lambda: _raw_pair_chunks(raw_es_path, raw_en_path), score_chunk,
+        workers=workers or _default_workers(), initializer=_init_index_worker,
+        initargs=(word_to_rank, inv_rank_lookup, phrase_to_inv_rank, True),
+        keep=RAW_INDEX_KEEP,
+        meta={"name": "opensubtitles_raw", "es": str(raw_es_path), "en": str(raw_en_path)})
 
 
 # Co-study scoring. A candidate sentence's overlap_tier counts how many of
@@ -439,24 +546,23 @@ def select_examples(record_indices, records, source="tatoeba",
 
 def _backfill_rare_examples(output, inventory, raw_es_path, raw_en_path,
                             word_to_rank, inv_rank_lookup, phrase_to_inv_rank,
-                            max_per_word, threshold, restrict_to=None):
-    """Streaming pass over the raw OpenSubs files to backfill examples for
-    inventory words that finished the main pass with < threshold examples.
+                            max_per_word, threshold, restrict_to=None,
+                            index_dir=None, workers=None):
+    """Backfill examples from the raw OpenSubs files for inventory words that
+    finished the main pass with < threshold examples.
 
-    Why streaming: the raw corpus is ~3 GB / ~30M parallel pairs. The main
+    Why the raw files: the raw corpus is ~3 GB / ~30M parallel pairs. The main
     pass works from a 5M-pair stride-sampled cache (~30 MB), so rare words
-    with corpus_count ≤ 10 typically end up with 1-2 examples. Streaming the
-    raw file once, retaining only matches for the ~few-thousand undersupplied
-    target words, costs ~5 min wall + ~250 MB peak — far cheaper than
-    rebuilding the cache from the full corpus.
+    with corpus_count ≤ 10 typically end up with 1-2 examples. Candidates
+    come from raw_opensubtitles_index, built once over every raw line (in
+    parallel) and kept, so this is a postings lookup per undersupplied word
+    rather than a streaming pass per run.
 
     Existing examples are preserved verbatim (so example indices stay stable
     for downstream sense_assignments). New examples are appended.
     """
     # 1. Identify targets
     targets = {}  # word_lower -> (target_rank, original_word, slots)
-    target_words_set = set()       # single-token target lookups
-    target_phrase_words = set()    # phrase target lookups
     for i, e in enumerate(inventory):
         wl = e["word"].lower()
         if restrict_to is not None and wl not in restrict_to:
@@ -468,119 +574,44 @@ def _backfill_rare_examples(output, inventory, raw_es_path, raw_en_path,
         if slots <= 0:
             continue
         targets[wl] = (i, e["word"], slots)
-        if any(c in wl for c in " '-"):
-            target_phrase_words.add(wl)
-        else:
-            target_words_set.add(wl)
 
     if not targets:
         print("Backfill: no undersupplied words.")
         return
     print(f"Backfill: {len(targets):,} undersupplied words "
-          f"(<{threshold} examples). Streaming raw OpenSubs...")
-
-    # Reuse the full-inventory phrase regex so inv_ranks gets the same scoring
-    # signal it would in the main indexer (preserves tier accuracy).
-    full_phrase_re = None
-    if phrase_to_inv_rank:
-        phrases_sorted = sorted(phrase_to_inv_rank, key=len, reverse=True)
-        full_phrase_re = re.compile("|".join(re.escape(p) for p in phrases_sorted))
-
-    # 2. Stream the raw files. Cap candidates per target to avoid runaway
-    # memory on marginally-undersupplied common-ish words.
-    candidates_by_target = defaultdict(list)
+          f"(<{threshold} examples). Loading raw OpenSubs index...")
+
+    # 2. Look targets up. Single-token targets hit token postings; multi-token
+    # ones hit the phrase postings (the full-inventory phrase scan, so
+    # inv_ranks gets the same scoring signal as in the main indexer). The
+    # first cap_per_target matches in corpus order are kept, to bound memory
+    # on marginally-undersupplied common-ish words.
+    index = raw_opensubtitles_index(raw_es_path, raw_en_path, word_to_rank,
+                                    inv_rank_lookup, phrase_to_inv_rank,
+                                    index_dir=index_dir, workers=workers)
     cap_per_target = max_per_word * 5
-    line_count = 0
-    matched_count = 0
-    drop_short = drop_long = drop_trivial = drop_no_inv = 0
     t0 = time.time()
-
-    with open(raw_es_path, encoding="utf-8") as f_es, \
-         open(raw_en_path, encoding="utf-8") as f_en:
-        for line_es, line_en in zip(f_es, f_en):
-            line_count += 1
-            if line_count % 1_000_000 == 0:
-                elapsed = time.time() - t0
-                rate = line_count / elapsed if elapsed > 0 else 0
-                sys.stdout.write(
-                    f"\r    {line_count:,} lines  "
-                    f"{matched_count:,} matches  "
-                    f"{rate/1000:.0f}k lines/s   "
-                )
-                sys.stdout.flush()
-
-            spa = clean_subtitle_line(line_es)
-            eng = clean_subtitle_line(line_en)
-            if not spa or not eng:
-                continue
-
-            tokens = tokenize(spa)
-            length = len(tokens)
-            if length < MIN_SENTENCE_WORDS:
-                drop_short += 1
-                continue
-            if length > MAX_SENTENCE_LEN:
-                drop_long += 1
-                continue
-
-            ranks = []
-            for t in tokens:
-                r = word_to_rank.get(t)
-                if r is None:
-                    r = word_to_rank.get(strip_accents(t))
-                if r is None:
-                    r = SENTINEL_RANK
-                ranks.append(r)
-            if all(r <= TOP_N_TRIVIAL for r in ranks):
-                drop_trivial += 1
-                continue
-
-            inv_ranks_set = set()
-            for t in tokens:
-                ir = inv_rank_lookup.get(t)
-                if ir is not None:
-                    inv_ranks_set.add(ir)
-            spa_lower = spa.lower()
-            matched_phrases = ()
-            if full_phrase_re is not None:
-                matched_phrases = set(full_phrase_re.findall(spa_lower))
-                for p in matched_phrases:
-                    inv_ranks_set.add(phrase_to_inv_rank[p])
-            if not inv_ranks_set:
-                drop_no_inv += 1
-                continue
-
-            # Target match: tokens ∩ target_words_set, plus matched_phrases ∩
-            # target_phrase_words (the latter requires the phrase to be both a
-            # target AND have shown up in the regex scan above).
-            matched_targets = set()
-            for t in tokens:
-                if t in target_words_set:
-                    matched_targets.add(t)
-            if matched_phrases and target_phrase_words:
-                matched_targets |= matched_phrases & target_phrase_words
-            if not matched_targets:
-                continue
-
-            matched_count += 1
-            easiness = int(median(ranks))
-            record = {
-                "eng": eng,
-                "spa": spa,
-                "length": length,
-                "easiness": easiness,
-                "inv_ranks": tuple(sorted(inv_ranks_set)),
-            }
-            for t in matched_targets:
-                bucket = candidates_by_target[t]
-                if len(bucket) < cap_per_target:
-                    bucket.append(record)
-
-    elapsed = time.time() - t0
-    print(f"\r    Done in {elapsed:.1f}s — scanned {line_count:,} lines, "
-          f"{matched_count:,} target-matching records collected "
-          f"(dropped: {drop_short} short, {drop_long} long, "
-          f"{drop_trivial} trivial, {drop_no_inv} no-inv)" + " " * 5)
+    hits = {}
+    matched = set()
+    for wl in targets:
+        ids = index.postings.get(wl)
+        if ids:
+            hits[wl] = ids[:cap_per_target]
+            matched.update(ids)
+    # One fetch for every matched row; a row shared by several targets is one
+    # dict, as it was in the streaming pass. Targets in corpus order of first
+    # match, as that pass produced them.
+    wanted = sorted({i for ids in hits.values() for i in ids})
+    rows = dict(zip(wanted, index.records(wanted)))
+    candidates_by_target = {
+        wl: [rows[i] for i in ids]
+        for wl, ids in sorted(hits.items(), key=lambda item: item[1][0])
+    }
+    drops = index.meta["drops"]
+    print(f"    Done in {time.time() - t0:.1f}s — {index.meta['seen']:,} indexed lines, "
+          f"{len(matched):,} target-matching records collected "
+          f"(dropped: {drops['short']} short, {drops['long']} long, "
+          f"{drops['trivial']} trivial, {drops['no_inv']} no-inv)")
 
     # 3. Score and select per target. Re-uses select_examples, which pulls
     # in greedy + tier-0 fallback for free.
@@ -668,6 +699,12 @@ def parse_args():
              "examples. Default: backfill is on. The cache is stride-sampled, "
              "so rare words underflow without it; off only for diagnostics."
     )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Processes for building the sentence indexes (default: one per "
+             "CPU). Built indexes are kept under corpora/sentence_index/ and "
+             "reused while the corpus, ranks and inventory are unchanged."
+    )
     parser.add_argument(
         "--force", action="store_true",
         help="Allow a full rebuild even when examples_raw.json already exists. "
@@ -682,7 +719,7 @@ def parse_args():
 def _bind_paths(language):
     """Bind module-level path globals from --language."""
     global INVENTORY_FILE, TATOEBA_FILE, OPENSUBS_ES, OPENSUBS_EN
-    global RANKS_FILE, OUTPUT_FILE, OPENSUBS_CACHE, EXAMPLE_STORE
+    global RANKS_FILE, OUTPUT_FILE, OPENSUBS_CACHE, EXAMPLE_STORE, SENTENCE_INDEX_DIR
     cfg = _LANGUAGE_CONFIG[language]
     lang_dir = language.capitalize()
     base = PROJECT_ROOT / "Data" / lang_dir
@@ -694,6 +731,7 @@ def _bind_paths(language):
     RANKS_FILE = base / cfg["ranks_file"]
     OUTPUT_FILE = base / "layers" / "examples_raw.json"
     EXAMPLE_STORE = base / "layers" / "example_store.json"
+    SENTENCE_INDEX_DIR = base / "corpora" / "sentence_index"
 
 
 def main():
@@ -786,7 +824,10 @@ def main():
     print(f"  {len(tat_sentences)} sentence pairs")
 
     print("Building Tatoeba sentence index...")
-    tat_records, tat_index = build_sentence_index(tat_sentences, word_to_rank, inv_rank_lookup, phrase_to_inv_rank)
+    tat_records, tat_index = build_sentence_index(
+        tat_sentences, word_to_rank, inv_rank_lookup, phrase_to_inv_rank,
+        name="tatoeba" if stride == 1 else f"tatoeba_1in{stride}",
+        workers=args.workers)
     print(f"  {len(tat_index)} unique tokens indexed across {len(tat_records):,} kept sentences")
     del tat_sentences  # records carry eng/spa from here on
 
@@ -801,7 +842,9 @@ def main():
         print(f"  {len(sub_sentences)} sentence pairs after cleaning")
 
         print("Building OpenSubtitles sentence index...")
-        sub_records, sub_index = build_sentence_index(sub_sentences, word_to_rank, inv_rank_lookup, phrase_to_inv_rank)
+        sub_records, sub_index = build_sentence_index(
+            sub_sentences, word_to_rank, inv_rank_lookup, phrase_to_inv_rank,
+            name=f"opensubtitles_{max_lines}", workers=args.workers)
         print(f"  {len(sub_index)} unique tokens indexed across {len(sub_records):,} kept sentences")
         del sub_sentences
 
@@ -878,6 +921,8 @@ def main():
             max_per_word=MAX_EXAMPLES_PER_WORD,
             threshold=MAX_EXAMPLES_PER_WORD,
             restrict_to=target_words,
+            index_dir=SENTENCE_INDEX_DIR,
+            workers=args.workers,
         )
 
     # Recompute coverage from the final output dict so backfill counts land
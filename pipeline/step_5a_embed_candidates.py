@@ -35,21 +35,11 @@ REPO = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from step_5a_build_examples_v2 import embed  # noqa: E402  (path set above)
+from util_5a_sentence_bank import SentenceBank  # noqa: E402
 
 SUBS = REPO / "Data/Spanish/layers/subtitles"
 
 
-def load_bank(path):
-    rows = {}
-    with path.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                row = json.loads(line)
-                rows[row["id"]] = row
-    return rows
-
-
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--subs", default=str(SUBS))
@@ -64,7 +54,7 @@ def main():
     args = ap.parse_args()
 
     subs = Path(args.subs)
-    bank = load_bank(subs / "sentence_bank.jsonl")
+    bank = SentenceBank(subs / "sentence_bank.jsonl")
     candidates = json.loads((subs / "word_candidates.json").read_text(encoding="utf-8"))
 
     if args.top:
@@ -80,7 +70,7 @@ def main():
         wanted.update(pools.get("clean") or [])
         if args.include_held:
             wanted.update(pools.get("held") or [])
-    wanted &= set(bank)
+    wanted = {sid for sid in wanted if sid in bank}
 
     align_path = subs / "alignment.json"
     alignment = {}
@@ -93,17 +83,20 @@ def main():
     if args.limit:
         todo = todo[:args.limit]
         print("  limited to %d this run" % len(todo))
+    # Read only the rows being scored, not the whole bank.
+    rows = bank.get_many(todo)
+    bank.close()
     if not todo:
         print("nothing to do")
         return
 
     # One embed() call for both sides: it de-duplicates internally and a repeated
     # subtitle line is common, so batching the whole set beats per-sentence calls.
-    texts = [bank[sid]["es"] for sid in todo] + [bank[sid]["en"] for sid in todo]
+    texts = [rows[sid]["es"] for sid in todo] + [rows[sid]["en"] for sid in todo]
     vectors = embed(texts)
 
     for sid in todo:
-        row = bank[sid]
+        row = rows[sid]
         es_v, en_v = vectors.get(row["es"]), vectors.get(row["en"])
         if es_v is None or en_v is None:
             continue
@@ -24,8 +24,9 @@ Outputs, all under Data/Spanish/layers/subtitles/:
 
   sentence_bank.jsonl    One row per surviving sentence: content id, both sides,
                          score parts, and the OpenSubtitles title/subtitle/line
-                         it came from. Merged with any existing bank on re-run;
-                         rows are never rewritten or dropped.
+                         it came from. New rows are appended on re-run; rows
+                         are never rewritten or dropped. sentence_bank.jsonl.idx
+                         is its id -> offset index (util_5a_sentence_bank).
   word_candidates.json   word -> sentence ids, best first. A view over the bank,
                          rebuildable without touching the corpus.
   harvest_manifest.json  Run id, arguments, counts, and the reject histogram.
@@ -33,9 +34,17 @@ Outputs, all under Data/Spanish/layers/subtitles/:
 Embedding, alignment and the final pick are separate steps. This one is pure
 CPU and disk — no API key needed.
 
+Since the gates and the score are properties of the sentence, they are also
+computed only once per corpus: the first run builds a features table
+(util_5a_sentence_features) under Data/Spanish/corpora/sentence_index/ in
+--workers processes, and every harvest — new targets, caps or line range —
+is a join over it plus reading back the lines that survive. --no-features
+streams the corpus as before, as a util_corpus_scan visitor.
+
 Usage:
     python3 pipeline/step_5a_harvest_subtitles.py                    # all words
     python3 pipeline/step_5a_harvest_subtitles.py --top 500 --max-lines 2000000
+    python3 pipeline/step_5a_harvest_subtitles.py --no-features     # stream instead
 """
 
 from __future__ import annotations
@@ -43,17 +52,22 @@ from __future__ import annotations
 import argparse
 import heapq
 import json
+import os
 import re
 import sys
 import time
+from array import array
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
+
 REPO = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from step_5a_build_examples_v2 import (  # noqa: E402  (path set above)
+    BAND,
     MAX_CLAUSES,
     MAX_LEN,
     MIN_LEN,
@@ -62,11 +76,30 @@ from step_5a_build_examples_v2 import (  # noqa: E402  (path set above)
     Scorer,
 )
 from util_5a_example_id import example_id  # noqa: E402
+from util_5a_sentence_bank import SentenceBank  # noqa: E402
+from util_5a_sentence_features import (  # noqa: E402
+    WORD_ABSENT,
+    WORD_OK,
+    WORD_PROPER,
+    WORD_REASONS,
+    SentenceFeatures,
+    build_features,
+    line_chunks,
+)
+from util_5a_sentence_index import fingerprint, file_fingerprint, open_or_build  # noqa: E402
+from util_corpus_scan import CorpusVisitor, scan_corpus  # noqa: E402
+from util_subtitle_corpus import SubtitleCorpus, decode_line  # noqa: E402
+from util_pipeline_metrics import METRICS, metrics_snapshot  # noqa: E402
 
 CORP = REPO / "Data/Spanish/corpora/opensubtitles"
 OUT = REPO / "Data/Spanish/layers/subtitles"
+FEATURES_DIR = REPO / "Data/Spanish/corpora/sentence_index"
 
 HARVEST_VERSION = "harvest-v1"
+# Bump when gate_broken, gate_taste, gate_word, Scorer.structural or
+# Scorer.clauses changes what a features table holds: features_key includes
+# it, so the next run rebuilds the table.
+FEATURES_VERSION = "features-v1"
 MERGED_LINES = re.compile(r"(?<=[a-záéíóúüñ]) +([A-ZÁÉÍÓÚÜÑ][a-záéíóúüñ]+)")
 JUNK = re.compile(r"[♪<>{}]|https?://|\d{3,}")
 
@@ -152,21 +185,19 @@ def provenance(ids):
     return prov
 
 
-# ---------------------------------------------------------------- harvest
+def subtitle_corpus():
+    return SubtitleCorpus(CORP).require()
 
-def harvest(sc, targets, max_lines, cap, taste_cap, compact_every, run_id,
-            skip_lines=0, cap_top=0, tail_cap=0):
-    """Stream the corpus once, keeping the best sentences per target word.
 
-    Two pools per word. `heaps` holds sentences the current policy wants.
-    `held` holds sentences that are perfectly good but fail a taste gate, under
-    a smaller cap, so they cannot crowd out the clean ones. Changing the policy
-    later re-filters both instead of re-reading the corpus.
+def lines_scanned(total, skip_lines, max_lines):
+    """The line count a harvest reports, as the original streaming loop
+    counted it: skipped lines included, plus the one read past --max-lines."""
+    if max_lines and total > max(skip_lines, max_lines):
+        return max(skip_lines, max_lines) + 1
+    return total
 
-    Memory is bounded by keeping only (score, sentence id) per word and sweeping
-    the sentence table of anything no word still points at. Without the sweep a
-    full-corpus run over 10k targets would hold every surviving line in RAM.
-    """
+
+def word_caps(sc, targets, cap, cap_top=0, tail_cap=0):
     # Per-word cap by frequency rank. Depth only pays for two things:
     # showing a learner more than one example, and measuring how sense share
     # divides. The second is worthless until the WSD is trustworthy, so a first
@@ -177,118 +208,352 @@ def harvest(sc, targets, max_lines, cap, taste_cap, compact_every, run_id,
         rank = sc.rank.get(word)
         caps[word] = (cap if (cap_top and rank is not None and rank < cap_top)
                       else (tail_cap or cap))
+    return caps
+
+
+def bank_row(sid, es, en, score, naturalness, hard_words, tokens, taste, ids, run_id):
+    return {"id": sid, "es": es, "en": en,
+            "score": round(score, 4),
+            "naturalness": naturalness,
+            "hard_words": hard_words,
+            "tokens": tokens,
+            "gate": taste,
+            "provenance": provenance(ids),
+            "harvest_run": run_id}
+
 
-    heaps = defaultdict(list)   # word -> bounded min-heap of (score, sentence id)
-    held = defaultdict(list)    # word -> same, for taste-rejected sentences
-    rows = {}                   # sentence id -> bank row, periodically swept
-    rejects = Counter()        # per line, dropped as broken
-    word_rejects = Counter()   # per (line, word) pair
-    banked = Counter()
-    n = 0
-    t0 = time.time()
-
-    es_p = CORP / "OpenSubtitles.en-es.es"
-    en_p = CORP / "OpenSubtitles.en-es.en"
-    id_p = CORP / "OpenSubtitles.en-es.ids"
-    for p in (es_p, en_p, id_p):
-        if not p.exists():
-            raise SystemExit("missing corpus file: %s" % p)
-
-    with es_p.open(encoding="utf-8", errors="ignore") as es_f, \
-         en_p.open(encoding="utf-8", errors="ignore") as en_f, \
-         id_p.open(encoding="utf-8", errors="ignore") as id_f:
-        if skip_lines:
-            # Read and discard in lockstep. The three files must stay
-            # line-aligned or provenance points at the wrong subtitle, and they
-            # cannot be byte-seeked to the same place — .ids is twice the size
-            # of .es, so the same offset is a different line in each. Discarding
-            # is still far cheaper than harvesting, because it skips
-            # tokenisation and the gates.
-            #
-            # The corpus is ordered by IMDb id, which tracks release year, so
-            # this is really an era control: skipping half starts the harvest in
-            # the 2000s instead of the 1930s.
-            skipped = 0
-            for _ in zip(es_f, en_f, id_f):
-                skipped += 1
-                if skipped >= skip_lines:
-                    break
-            print("  skipped %s lines (%.0f%% in)"
-                  % ("{:,}".format(skipped), 100.0 * skipped / max(skip_lines, 1)),
+# ---------------------------------------------------------------- harvest
+
+class HarvestVisitor(CorpusVisitor):
+    """The streaming harvest as a util_corpus_scan visitor (see harvest()).
+
+    Not mergeable: a full pool keeps the first of equally scored sentences,
+    so the result depends on the order lines arrive in.
+    """
+
+    name = "harvest"
+
+    def __init__(self, sc, targets, cap, taste_cap, compact_every, run_id,
+                 cap_top=0, tail_cap=0):
+        self.sc, self.targets, self.cap, self.taste_cap = sc, targets, cap, taste_cap
+        self.compact_every, self.run_id = compact_every, run_id
+        self.caps = word_caps(sc, targets, cap, cap_top, tail_cap)
+        self.heaps = defaultdict(list)   # word -> bounded min-heap of (score, sentence id)
+        self.held = defaultdict(list)    # word -> same, for taste-rejected sentences
+        self.rows = {}                   # sentence id -> bank row, periodically swept
+        self.rejects = Counter()         # per line, dropped as broken
+        self.word_rejects = Counter()    # per (line, word) pair
+        self.banked = Counter()
+        self.t0 = time.time()
+
+    def sweep(self):
+        live = {s for p in (self.heaps, self.held) for h in p.values() for _, s in h}
+        self.rows = {k: v for k, v in self.rows.items() if k in live}
+
+    def visit(self, n, line):
+        sc, targets, caps, cap = self.sc, self.targets, self.caps, self.cap
+        es, en, ids = line["es"], line["en"], line["ids"]
+        # Sweep before the filters below, not after: most lines `return`
+        # early, so a check placed further down almost never runs and the
+        # sentence table grows without bound.
+        if n % self.compact_every == 0:
+            self.sweep()
+            filled = sum(1 for w, h in self.heaps.items()
+                         if len(h) >= caps.get(w, cap))
+            rate = int(n / max(1e-9, time.time() - self.t0))
+            print(f"  {n:,} lines | {filled}/{len(targets)} words full | "
+                  f"{len(self.rows):,} sentences held | {rate:,} lines/s",
                   flush=True)
-            n = skipped
-        for es, en, ids in zip(es_f, en_f, id_f):
-            n += 1
-            if max_lines and n > max_lines:
-                break
-
-            # Sweep before the filters below, not after: most lines `continue`
-            # out, so a check placed further down almost never runs and the
-            # sentence table grows without bound.
-            if n % compact_every == 0:
-                live = {s for p in (heaps, held) for h in p.values() for _, s in h}
-                rows = {k: v for k, v in rows.items() if k in live}
-                filled = sum(1 for w, h in heaps.items()
-                             if len(h) >= caps.get(w, cap))
-                rate = int(n / max(1e-9, time.time() - t0))
-                print(f"  {n:,} lines | {filled}/{len(targets)} words full | "
-                      f"{len(rows):,} sentences held | {rate:,} lines/s",
-                      flush=True)
-
-            # Cheap byte-length prefilter before any tokenisation, as in v2.
-            if not (24 <= len(es) <= 110):
+
+        # Cheap byte-length prefilter before any tokenisation, as in v2.
+        if not (24 <= len(es) <= 110):
+            return
+        es, en = es.strip(), en.strip()
+        hits = targets & set(TOK.findall(es.lower()))
+        if not hits:
+            return
+
+        raw = WORDCHARS.findall(es)
+        t = [w.lower() for w in raw]
+        broken = gate_broken(sc, es, en)
+        if broken:
+            self.rejects[broken] += 1
+            return
+        taste = gate_taste(sc, es, t)
+        self.banked["clean" if taste is None else taste] += 1
+
+        metrics = sc.structural(es)
+        score = metrics["score"]
+        clean_pool = taste is None
+        sid = None
+        for w in hits:
+            word_why = gate_word(raw, t, w)
+            if word_why:
+                # Counted separately: this is one (line, word) pair, not a
+                # line, so it cannot be added to the per-line tallies.
+                self.word_rejects[word_why] += 1
                 continue
-            es, en = es.strip(), en.strip()
-            hits = targets & set(TOK.findall(es.lower()))
-            if not hits:
+            limit = caps.get(w, cap) if clean_pool else self.taste_cap
+            h = (self.heaps if clean_pool else self.held)[w]
+            # This word's pool is already full and this sentence cannot beat
+            # its worst survivor, so there is nothing to store.
+            if len(h) >= limit and score <= h[0][0]:
                 continue
+            if sid is None:
+                sid = example_id(es, en)
+                if sid not in self.rows:
+                    self.rows[sid] = bank_row(sid, es, en, score,
+                                              metrics["naturalness"],
+                                              metrics["hard_words"],
+                                              metrics["tokens"], taste, ids,
+                                              self.run_id)
+            heapq.heappush(h, (score, sid))
+            if len(h) > limit:
+                heapq.heappop(h)
 
-            raw = WORDCHARS.findall(es)
-            t = [w.lower() for w in raw]
-            broken = gate_broken(sc, es, en)
-            if broken:
-                rejects[broken] += 1
-                continue
-            taste = gate_taste(sc, es, t)
-            banked["clean" if taste is None else taste] += 1
 
+def harvest(sc, targets, max_lines, cap, taste_cap, compact_every, run_id,
+            skip_lines=0, cap_top=0, tail_cap=0):
+    """Stream the corpus once, keeping the best sentences per target word.
+
+    Two pools per word. `heaps` holds sentences the current policy wants.
+    `held` holds sentences that are perfectly good but fail a taste gate, under
+    a smaller cap, so they cannot crowd out the clean ones. Changing the policy
+    later re-filters both instead of re-reading the corpus.
+
+    Memory is bounded by keeping only (score, sentence id) per word and sweeping
+    the sentence table of anything no word still points at. Without the sweep a
+    full-corpus run over 10k targets would hold every surviving line in RAM.
+    """
+    visitor = HarvestVisitor(sc, targets, cap, taste_cap, compact_every, run_id,
+                             cap_top, tail_cap)
+    corpus = subtitle_corpus()
+    start = 1
+    if skip_lines:
+        # The corpus is ordered by IMDb id, which tracks release year, so
+        # this is really an era control: skipping half starts the harvest in
+        # the 2000s instead of the 1930s. The line-offset index puts all three
+        # files at the same line directly; they cannot be byte-seeked by
+        # position alone, as .ids lines are twice as long.
+        skipped = min(skip_lines, len(corpus))
+        print("  skipped %s lines (%.0f%% in)"
+              % ("{:,}".format(skipped), 100.0 * skipped / max(skip_lines, 1)),
+              flush=True)
+        start = skipped + 1
+    scan_corpus(corpus, [visitor], start=start, stop=max_lines or None)
+    visitor.sweep()
+    return (visitor.heaps, visitor.held, visitor.rows, visitor.rejects,
+            visitor.word_rejects, visitor.banked,
+            lines_scanned(len(corpus), skip_lines, max_lines))
+
+
+# ---------------------------------------------------------------- features
+# The same gates and score, computed once per corpus line instead of once per
+# harvest (util_5a_sentence_features). A harvest is then a join: each target
+# word's rows, filtered by line range and gate, pushed through the same
+# bounded heaps.
+
+_FEATURES_SCORER = None
+_WORD_CODES = {None: WORD_OK, "target absent": WORD_ABSENT, "proper noun": WORD_PROPER}
+
+
+def _init_features_worker(sc):
+    global _FEATURES_SCORER
+    _FEATURES_SCORER = sc
+
+
+def score_lines(chunk):
+    """Gate and score one chunk of corpus lines (see line_chunks).
+
+    Keeps the lines the streaming harvest would look at for *some* inventory
+    word: inside the prefilter and containing one. Broken lines are kept with
+    their reason so the reject histogram can still be reported.
+    """
+    sc = _FEATURES_SCORER
+    out = {name: array(code) for name, code in (
+        ("line", "Q"), ("es_off", "Q"), ("en_off", "Q"), ("ids_off", "Q"),
+        ("gate", "B"), ("score", "d"), ("naturalness", "d"),
+        ("hard_words", "H"), ("tokens", "H"))}
+    gates = {"clean": 0}
+    broken_gates = set()
+    sids = []
+    postings = defaultdict(list)
+    for i, (es, en) in enumerate(zip(chunk["es"], chunk["en"])):
+        es = decode_line(es)
+        if not (24 <= len(es) <= 110):
+            continue
+        es, en = es.strip(), decode_line(en).strip()
+        words = {w for w in TOK.findall(es.lower()) if w in sc.rank}
+        if not words:
+            continue
+
+        raw = WORDCHARS.findall(es)
+        t = [w.lower() for w in raw]
+        broken = gate_broken(sc, es, en)
+        if broken:
+            name, metrics, sid = broken, None, b""
+            broken_gates.add(broken)
+        else:
+            name = gate_taste(sc, es, t) or "clean"
             metrics = sc.structural(es)
-            score = metrics["score"]
-            clean_pool = taste is None
-            sid = None
-            for w in hits:
-                word_why = gate_word(raw, t, w)
-                if word_why:
-                    # Counted separately: this is one (line, word) pair, not a
-                    # line, so it cannot be added to the per-line tallies.
-                    word_rejects[word_why] += 1
-                    continue
-                limit = caps.get(w, cap) if clean_pool else taste_cap
-                h = (heaps if clean_pool else held)[w]
-                # This word's pool is already full and this sentence cannot beat
-                # its worst survivor, so there is nothing to store.
-                if len(h) >= limit and score <= h[0][0]:
+            sid = example_id(es, en).encode("ascii")
+        local = len(sids)
+        for w in sorted(words):
+            postings[w].append((local, WORD_OK if broken else _WORD_CODES[gate_word(raw, t, w)]))
+
+        for col in ("line", "es_off", "en_off", "ids_off"):
+            out[col].append(chunk[col][i])
+        out["gate"].append(gates.setdefault(name, len(gates)))
+        out["score"].append(metrics["score"] if metrics else 0.0)
+        out["naturalness"].append(metrics["naturalness"] if metrics else 0.0)
+        out["hard_words"].append(metrics["hard_words"] if metrics else 0)
+        out["tokens"].append(metrics["tokens"] if metrics else 0)
+        sids.append(sid.ljust(12, b"\0"))
+
+    keys = sorted(postings)
+    out.update(
+        seen=chunk["seen"],
+        gates=[(name, name in broken_gates) for name in gates],
+        sid=b"".join(sids),
+        post_keys=keys,
+        post_count=array("I", (len(postings[w]) for w in keys)),
+        post_rows=array("I", (local for w in keys for local, _ in postings[w])),
+        post_word=array("B", (code for w in keys for _, code in postings[w])),
+    )
+    return out
+
+
+def features_key(sc, paths):
+    """Everything the table depends on: the corpus, FEATURES_VERSION for the
+    gate and score code, and the parts of the scorer's tables that code
+    reads. Of the ranks that is only which words are in the inventory and
+    which fall inside BAND, so a re-ranking within those sets reuses the
+    table."""
+    band = sorted(word for word, rank in sc.rank.items() if rank < BAND)
+    return fingerprint(FEATURES_VERSION, file_fingerprint(*paths), sorted(sc.rank), band,
+                       sc.conj,
+                       [MERGED_LINES.pattern, JUNK.pattern, TOK.pattern,
+                        WORDCHARS.pattern, MIN_LEN, MAX_LEN, MAX_CLAUSES, BAND])
+
+
+def open_features(sc, workers=None, cache_root=None):
+    """The features table for the current corpus and scorer, built if needed."""
+    paths = tuple(subtitle_corpus().paths.values())
+    return open_or_build(
+        cache_root or FEATURES_DIR, "subtitle_features", features_key(sc, paths),
+        lambda: line_chunks(*paths, min_bytes=24), score_lines,
+        opener=SentenceFeatures, builder=build_features,
+        workers=workers or os.cpu_count() or 1,
+        initializer=_init_features_worker, initargs=(sc,),
+        meta={"name": "subtitle_features", "corpus": [str(p) for p in paths]})
+
+
+def harvest_features(features, sc, targets, max_lines, cap, taste_cap, run_id,
+                     skip_lines=0, cap_top=0, tail_cap=0):
+    """harvest() as a join over a features table; same return value.
+
+    The heaps see the same (score, sentence id) pushes in the same order, minus
+    rows that provably cannot survive (below the cap-th best score), so they
+    end up holding the same entries. A bank row is written from the first line
+    that entered a surviving pool.
+    """
+    caps = word_caps(sc, targets, cap, cap_top, tail_cap)
+    line = features.line
+    gate = features.gate
+    score = features.score
+    is_broken = features.is_broken
+    hi = max_lines or np.iinfo(np.uint64).max
+
+    heaps, held = defaultdict(list), defaultdict(list)
+    first_push = {}              # sentence id -> earliest row that entered a pool
+    hit_rows = []
+    word_rejects, word_first = [], {}
+    for w in sorted(targets):
+        rows, verdicts = features.word_rows(w)
+        if not len(rows):
+            continue
+        lines = line[rows]
+        keep = (lines > skip_lines) & (lines <= hi)
+        rows, verdicts = rows[keep], verdicts[keep]
+        hit_rows.append(rows)
+        codes = gate[rows]
+        keep = ~is_broken[codes]
+        rows, verdicts, codes = rows[keep], verdicts[keep], codes[keep]
+
+        rejected = verdicts != WORD_OK
+        for code in np.unique(verdicts[rejected]):
+            where = rows[verdicts == code]
+            reason = WORD_REASONS[int(code)]
+            word_rejects.extend([reason] * len(where))
+            word_first[reason] = min(word_first.get(reason, where[0]), where[0])
+        rows, codes = rows[~rejected], codes[~rejected]
+
+        clean = codes == 0
+        for pools, pool_rows, limit in ((heaps, rows[clean], caps[w]),
+                                        (held, rows[~clean], taste_cap)):
+            if not len(pool_rows) or limit <= 0:
+                continue
+            scores = score[pool_rows]
+            if len(pool_rows) > limit:
+                # A row scoring below the limit-th best is either never pushed
+                # or popped again before anything that survives, so dropping
+                # it up front leaves the final heap unchanged.
+                floor = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+                keep = scores >= floor
+                pool_rows, scores = pool_rows[keep], scores[keep]
+            h = pools[w]
+            for row, s in zip(pool_rows.tolist(), scores.tolist()):
+                if len(h) >= limit and s <= h[0][0]:
                     continue
-                if sid is None:
-                    sid = example_id(es, en)
-                    if sid not in rows:
-                        rows[sid] = {"id": sid, "es": es, "en": en,
-                                     "score": round(score, 4),
-                                     "naturalness": metrics["naturalness"],
-                                     "hard_words": metrics["hard_words"],
-                                     "tokens": metrics["tokens"],
-                                     "gate": taste,
-                                     "provenance": provenance(ids),
-                                     "harvest_run": run_id}
-                heapq.heappush(h, (score, sid))
+                sid = features.sid[row].decode("ascii")
+                heapq.heappush(h, (s, sid))
                 if len(h) > limit:
                     heapq.heappop(h)
+                if row < first_push.get(sid, row + 1):
+                    first_push[sid] = row
+
+    # Per-line tallies, over every line that hit at least one target.
+    rejects, banked = Counter(), Counter()
+    if hit_rows:
+        union = np.unique(np.concatenate(hit_rows))
+        codes, first, counts = np.unique(gate[union], return_index=True,
+                                         return_counts=True)
+        for i in np.argsort(first, kind="stable"):
+            name = features.gates[int(codes[i])]
+            (rejects if is_broken[codes[i]] else banked)[name] = int(counts[i])
+    tallied = Counter(word_rejects)
+    word_rejects = Counter()
+    for reason in sorted(tallied, key=lambda r: word_first[r]):
+        word_rejects[reason] = tallied[reason]
 
     live = {s for p in (heaps, held) for h in p.values() for _, s in h}
-    rows = {k: v for k, v in rows.items() if k in live}
+    rows = read_rows(features, sorted((first_push[s], s) for s in live), run_id)
+
+    n = lines_scanned(int(features.meta["lines"]), skip_lines, max_lines)
     return heaps, held, rows, rejects, word_rejects, banked, n
 
 
+def read_rows(features, located, run_id):
+    """Bank rows for (row, sentence id) pairs, read back by byte offset."""
+    out = {}
+    es_p, en_p, id_p = subtitle_corpus().paths.values()
+    with open(es_p, "rb") as es_f, open(en_p, "rb") as en_f, open(id_p, "rb") as id_f:
+        def at(f, offset):
+            f.seek(int(offset))
+            return decode_line(f.readline())
+
+        for row, sid in located:
+            gate = features.gates[int(features.gate[row])]
+            out[sid] = bank_row(
+                sid, at(es_f, features.es_off[row]).strip(),
+                at(en_f, features.en_off[row]).strip(),
+                float(features.score[row]), float(features.naturalness[row]),
+                int(features.hard_words[row]), int(features.tokens[row]),
+                None if gate == "clean" else gate,
+                at(id_f, features.ids_off[row]), run_id)
+    return out
+
+
 # ---------------------------------------------------------------- output
 
 def merge_bank(path, rows):
@@ -296,20 +561,14 @@ def merge_bank(path, rows):
 
     Re-running with different arguments adds sentences; it never rewrites or
     removes one, which is what makes a later run cheap to compare against.
+    Only the new rows are written: the bank is an append-only log and its
+    index answers "already there?" without reading it. Returns the bank size
+    before and after.
     """
-    merged = {}
-    if path.exists():
-        with path.open(encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                row = json.loads(line)
-                merged[row["id"]] = row
-    before = len(merged)
-    for sid, row in rows.items():
-        merged.setdefault(sid, row)
-    return merged, before
+    with SentenceBank(path) as bank:
+        before = len(bank)
+        bank.append(rows[sid] for sid in sorted(rows))
+        return before, len(bank)
 
 
 def main():
@@ -336,7 +595,15 @@ def main():
                     help="per word, how many sentences that fail only a taste "
                          "gate to bank anyway, so a later policy change is a "
                          "re-filter rather than another corpus scan")
-    ap.add_argument("--compact-every", type=int, default=1_000_000)
+    ap.add_argument("--compact-every", type=int, default=1_000_000,
+                    help="with --no-features, sweep unreferenced sentences "
+                         "every N lines")
+    ap.add_argument("--workers", type=int, default=0,
+                    help="processes for building the features table "
+                         "(default: one per CPU)")
+    ap.add_argument("--no-features", action="store_true",
+                    help="stream the corpus instead of joining over the "
+                         "cached features table")
     ap.add_argument("--out", default=str(OUT))
     args = ap.parse_args()
 
@@ -356,15 +623,30 @@ def main():
           % (len(targets), cap_desc, args.taste_cap,
              "all" if not args.max_lines else "{:,}".format(args.max_lines)))
 
-    heaps, held, rows, rejects, word_rejects, banked, scanned = harvest(
-        sc, targets, args.max_lines, args.per_word_cap, args.taste_cap,
-        args.compact_every, run_id, skip_lines=args.skip_lines,
-        cap_top=args.cap_top, tail_cap=args.tail_cap)
+    if args.no_features:
+        with METRICS.span("harvest"):
+            heaps, held, rows, rejects, word_rejects, banked, scanned = harvest(
+                sc, targets, args.max_lines, args.per_word_cap, args.taste_cap,
+                args.compact_every, run_id, skip_lines=args.skip_lines,
+                cap_top=args.cap_top, tail_cap=args.tail_cap)
+    else:
+        with METRICS.span("features"):
+            features = open_features(sc, workers=args.workers)
+        with METRICS.span("harvest"):
+            heaps, held, rows, rejects, word_rejects, banked, scanned = harvest_features(
+                features, sc, targets, args.max_lines, args.per_word_cap,
+                args.taste_cap, run_id, skip_lines=args.skip_lines,
+                cap_top=args.cap_top, tail_cap=args.tail_cap)
+    METRICS.count("items", scanned)
 
     def ordered_ids(heap):
-        """Best first, deduped: a repeated subtitle line hashes to one id."""
+        """Best first, deduped: a repeated subtitle line hashes to one id.
+
+        Equal scores go by id, so the order does not depend on how the heap
+        happened to be laid out.
+        """
         seen, out = set(), []
-        for _, sid in sorted(heap, key=lambda x: -x[0]):
+        for _, sid in sorted(heap, key=lambda x: (-x[0], x[1])):
             if sid not in seen:
                 seen.add(sid)
                 out.append(sid)
@@ -378,10 +660,9 @@ def main():
             candidates[word] = {"clean": clean, "held": spare}
 
     bank_path = out_dir / "sentence_bank.jsonl"
-    merged, before = merge_bank(bank_path, rows)
-    with bank_path.open("w", encoding="utf-8") as f:
-        for sid in sorted(merged):
-            f.write(json.dumps(merged[sid], ensure_ascii=False) + "\n")
+    with METRICS.span("merge_bank"):
+        before, total = merge_bank(bank_path, rows)
+    METRICS.note_write(bank_path)
 
     (out_dir / "word_candidates.json").write_text(
         json.dumps(candidates, ensure_ascii=False), encoding="utf-8")
@@ -396,6 +677,7 @@ def main():
         "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         "args": {"top": args.top, "max_lines": args.max_lines,
                  "skip_lines": args.skip_lines,
+                 "features": not args.no_features,
                  "per_word_cap": args.per_word_cap,
                  "cap_top": args.cap_top, "tail_cap": args.tail_cap,
                  "taste_cap": args.taste_cap},
@@ -403,17 +685,18 @@ def main():
         "targets": len(targets),
         "words_with_clean": len(with_clean),
         "words_with_none": len(empty),
-        "sentences_new": len(merged) - before,
-        "sentences_total": len(merged),
+        "sentences_new": total - before,
+        "sentences_total": total,
         "banked_by_gate": dict(banked.most_common()),
         "dropped_as_broken": dict(rejects.most_common()),
         "word_level_rejects": dict(word_rejects.most_common()),
+        "metrics": metrics_snapshot(),
     }
     (out_dir / "harvest_manifest.json").write_text(
         json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
 
     print("\nscanned {:,} lines".format(scanned))
-    print("  sentences in bank: {:,} ({:,} new)".format(len(merged), len(merged) - before))
+    print("  sentences in bank: {:,} ({:,} new)".format(total, total - before))
     print("  words with clean candidates: %d of %d" % (len(with_clean), len(targets)))
     if empty:
         print("  words with none: %d e.g. %s" % (len(empty), empty[:8]))
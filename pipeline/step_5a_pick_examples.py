@@ -32,6 +32,7 @@ REPO = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from util_5a_example_id import update_example_store  # noqa: E402
+from util_5a_sentence_bank import SentenceBank  # noqa: E402
 
 LAYERS = REPO / "Data/Spanish/layers"
 SUBS = LAYERS / "subtitles"
@@ -41,17 +42,6 @@ SCORE_WEIGHT = 0.15   # alignment dominates; structural score breaks ties
 DUP_PREFIX = 25       # crude near-duplicate guard, as in the v2 builder
 
 
-def load_bank(path):
-    rows = {}
-    with path.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                row = json.loads(line)
-                rows[row["id"]] = row
-    return rows
-
-
 def choose(cands, bank, alignment, per_word, floor, weight):
     """Rank by alignment, then take one sentence per film where possible.
 
@@ -118,7 +108,7 @@ def main():
     args = ap.parse_args()
 
     subs = Path(args.subs)
-    bank = load_bank(subs / "sentence_bank.jsonl")
+    bank = SentenceBank(subs / "sentence_bank.jsonl")
     candidates = json.loads((subs / "word_candidates.json").read_text(encoding="utf-8"))
     align_path = subs / "alignment.json"
     if not align_path.exists() and not args.no_align_gate:
@@ -136,7 +126,8 @@ def main():
         cands = list(pools.get("clean") or [])
         if args.include_held:
             cands += list(pools.get("held") or [])
-        chosen = choose(cands, bank, alignment, args.per_word,
+        # Only this word's candidate rows are read, via the bank index.
+        chosen = choose(cands, bank.get_many(cands), alignment, args.per_word,
                         None if args.no_align_gate else args.align_floor,
                         args.score_weight)
         if not chosen:
@@ -156,6 +147,7 @@ def main():
                            "tokens": row["tokens"],
                            "provenance": row.get("provenance") or {}}
                           for sid, row, align, _ in chosen]
+    bank.close()
 
     out_dir = subs / "example_picks"
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -50,6 +50,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT / "pipeline"))
 from util_pipeline_meta import make_meta, write_sidecar  # noqa: E402
 from util_evidence_store import archive_json_artifact  # noqa: E402
+from util_layer_format import write_layer  # noqa: E402
 
 STEP_VERSION = 3
 STEP_VERSION_NOTES = {
@@ -1169,8 +1170,7 @@ def build_spanishdict_menu(
     # Write output
     output_file.parent.mkdir(parents=True, exist_ok=True)
     print(f"\nWriting {output_file}...")
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    write_layer(output_file, output)
     write_sidecar(output_file, make_meta("build_senses", STEP_VERSION, extra={"source": "spanishdict"}))
     archive_json_artifact(
         output_file.parents[2] / "evidence",
@@ -1549,8 +1549,7 @@ def main():
     output_file = sense_menu_path(LAYERS_DIR, args.sense_source)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     print(f"\nWriting {output_file}...")
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    write_layer(output_file, output)
     write_sidecar(output_file, make_meta("build_senses", STEP_VERSION, extra={"source": args.sense_source}))
     archive_json_artifact(
         output_file.parents[2] / "evidence",
@@ -42,6 +42,7 @@ from util_6a_prompt_registry import (
     load_registry,
 )
 from util_7a_lemma_split import merge_method_maps
+from util_6c_assignment_store import AssignmentAnswerStore, default_cache_dir
 from util_5c_sense_paths import sense_menu_path, sense_assignments_path
 from util_6a_pos_menu_filter import (
     filter_senses_by_pos, filter_senses_by_precomputed_pos,
@@ -1184,6 +1185,15 @@ def main():
                         help="Concurrent Gemini batches for the SpanishDict "
                              "classify-or-propose path (default 1). Checkpoints "
                              "are still written after each completed batch.")
+    parser.add_argument("--assignment-store", default=None,
+                        help="Directory of the cross-artist answer store for "
+                             "the SpanishDict classify-or-propose path "
+                             "(default in artist mode: Artists/<lang>/"
+                             "assignment_store). Identical (menu, line, word, "
+                             "prompt id) examples reuse a stored answer "
+                             "instead of being sent again.")
+    parser.add_argument("--no-assignment-store", action="store_true",
+                        help="Send every example, ignoring the answer store.")
     args = parser.parse_args()
     if args.max_examples < 1:
         print("ERROR: --max-examples must be >= 1")
@@ -1994,14 +2004,29 @@ def main():
                 if done_words:
                     print("  Resuming from checkpoint: %d words done" % len(done_words))
 
+            # Cross-artist answer store: examples another artist (or an
+            # earlier run) already resolved under the same menu and prompt are
+            # answered from it and never reach the API.
+            store = None
+            if not args.no_assignment_store and (args.assignment_store or is_artist):
+                store = AssignmentAnswerStore(
+                    args.assignment_store or default_cache_dir(artist_dir), args.prompt_id)
+                print("  Assignment store: %d stored answers (%s)" % (
+                    len(store), store.cache_path))
+
             def process_sd_batch(batch_start, batch):
                 batch_no = batch_start // SD_CLASSIFY_BATCH_SIZE + 1
-                print("  Batch %d: %s" % (batch_no, [r["word"] for r in batch][:5]))
+                if store is not None:
+                    sent = [store.request(r, r["plan"]) for r in batch if r["plan"]["send"]]
+                else:
+                    sent = batch
+                if sent:
+                    print("  Batch %d: %s" % (batch_no, [r["word"] for r in sent][:5]))
                 batch_data = [{"word": r["word"], "lemma": r["lemma"],
                                "senses": r["senses"], "ids": r["ids"],
-                               "examples": r["examples"]} for r in batch]
+                               "examples": r["examples"]} for r in sent]
                 results = classify_or_propose_batch(
-                    batch_data, api_key, gemini_model, artist_context)
+                    batch_data, api_key, gemini_model, artist_context) if batch_data else []
                 result_map = {}
                 if isinstance(results, list):
                     for o in results:
@@ -2016,6 +2041,8 @@ def main():
                 for r in batch:
                     word = r["word"]
                     calls = result_map.get(word, [])
+                    if store is not None:
+                        calls = store.merge_calls(r, r["plan"], calls)
                     id_set = set(r["ids"])
                     menu_buckets = {}   # sid -> [abs_idx]
                     proposed_map = {}   # gloss -> {examples, pos, ex}
@@ -2161,6 +2188,8 @@ def main():
                                "assignments": assignments_out,
                                "done_words": sorted(done_words),
                                "review_items": review_items}, f)
+                if store is not None:
+                    store.save()
 
             t_start = time.time()
             proposed_total = 0
@@ -2171,6 +2200,24 @@ def main():
                 batch = [r for r in batch if r["word"] not in done_words]
                 if batch:
                     pending_batches.append((batch_start, batch))
+            batches_without_store = len(pending_batches)
+            if store is not None:
+                # Words fully answered from the store are resolved up front;
+                # the rest are re-batched so every API batch is full.
+                pending = [r for _start, batch in pending_batches for r in batch]
+                for r in pending:
+                    r["plan"] = store.plan(r)
+                answered = [r for r in pending if not r["plan"]["send"]]
+                to_send = [r for r in pending if r["plan"]["send"]]
+                if answered:
+                    print("  %d words answered entirely from the store" % len(answered))
+                    result = process_sd_batch(0, answered)
+                    apply_sd_batch(result)
+                    classified_total += result["classified_total"]
+                    proposed_total += result["proposed_total"]
+                pending_batches = [
+                    (batch_start, to_send[batch_start:batch_start + SD_CLASSIFY_BATCH_SIZE])
+                    for batch_start in range(0, len(to_send), SD_CLASSIFY_BATCH_SIZE)]
 
             workers = min(args.gemini_workers, len(pending_batches) or 1)
             if workers > 1:
@@ -2195,6 +2242,8 @@ def main():
             elapsed = time.time() - t_start
             print("  Done (%.1fs): %d words with menu senses, %d proposals" % (
                 elapsed, classified_total, proposed_total))
+            if store is not None:
+                print("  " + store.format_report(len(pending_batches), batches_without_store))
 
         # Review queue: off-menu proposals ranked by corpus_count (artist mode).
         if is_artist:
@@ -59,10 +59,13 @@ REPO = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from util_6a_assignment_format import stamp_example_ids  # noqa: E402
+from util_pipeline_meta import make_meta, write_sidecar  # noqa: E402
+from util_pipeline_metrics import METRICS  # noqa: E402
 
 LAYERS = REPO / "Data/Spanish/layers"
 CACHE = LAYERS / "sense_vectors"
 METHOD = "spanishdict-embed-v1"
+STEP_VERSION = 1
 # bumped 2026-08-16: same picks, but `confidence` now means the tuple gap, so
 # claims either side of this id are not comparable on confidence
 PROMPT_ID = "embed-gloss-tuplegap-hub-v1"
@@ -85,7 +88,10 @@ def embed(texts):
     CACHE.mkdir(parents=True, exist_ok=True)
     idx = json.loads(idx_p.read_text()) if idx_p.exists() else {}
     M = np.load(vec_p) if vec_p.exists() else np.zeros((0, 3072), np.float16)
-    todo = [t for t in dict.fromkeys(texts) if t not in idx]
+    unique = dict.fromkeys(texts)
+    todo = [t for t in unique if t not in idx]
+    METRICS.count("cache_hits", len(unique) - len(todo))
+    METRICS.count("cache_misses", len(todo))
     if todo:
         from concurrent.futures import ThreadPoolExecutor
         from google import genai
@@ -108,6 +114,7 @@ def embed(texts):
             for a in range(6):
                 take(len(ch))
                 try:
+                    METRICS.count("api_calls")
                     r = cl.models.embed_content(
                         model="gemini-embedding-001", contents=ch,
                         config=types.EmbedContentConfig(
@@ -135,7 +142,7 @@ def embed(texts):
 
         print(f"  embedding {len(todo):,} new texts "
               f"(~${len(todo)*30/1e6*0.15:.3f})")
-        with ThreadPoolExecutor(4) as ex:
+        with METRICS.span("embed_api"), ThreadPoolExecutor(4) as ex:
             list(ex.map(work, [(i // 100, todo[i:i + 100])
                                for i in range(0, len(todo), 100)]))
         new = np.vstack(out)
@@ -298,6 +305,9 @@ def main():
         return print("\n--dry-run: nothing written")
     Path(a.out).parent.mkdir(parents=True, exist_ok=True)
     Path(a.out).write_text(json.dumps(out, ensure_ascii=False), encoding="utf-8")
+    METRICS.count("items", n)
+    write_sidecar(a.out, make_meta("assign_senses_embeddings", STEP_VERSION,
+                                   extra={"method": METHOD, "prompt_id": PROMPT_ID}))
     print(f"wrote {a.out}")
 
 
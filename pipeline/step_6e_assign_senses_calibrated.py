@@ -60,6 +60,7 @@ import collections
 import datetime as dt
 import json
 import sys
+import time
 from pathlib import Path
 
 import numpy as np
@@ -75,8 +76,7 @@ from step_6d_assign_senses_embeddings import embed, gloss, norm_tr  # noqa: E402
 from util_6a_assignment_format import stamp_example_ids  # noqa: E402
 from util_pipeline_meta import display_path  # noqa: E402
 from pipeline.util_6d_wsd_features import (  # noqa: E402
-    FEATURE_VERSION, build as build_features, companion_features,
-    structural_features)
+    FEATURE_VERSION, construction_features, feature_matrix)
 from pipeline.util_6e_leaf_selection import (  # noqa: E402
     companion_of, companion_satisfied, renderable, select_display_leaf)
 from pipeline.util_6a_pos_menu_filter import (  # noqa: E402
@@ -195,6 +195,18 @@ Reply with ONLY compact JSON: {{"id": "<sense id>"}}"""
 ABSTAIN = "__ABSTAIN__"
 
 
+def pick_confidence(cal, X, tuple_gaps):
+    """P(correct) for every pick, from one predict_proba call over the matrix.
+
+    Without a calibrator the tuple gap, clamped to [0, 1], stands in.
+    """
+    if cal is None:
+        return np.clip(np.asarray(tuple_gaps, np.float64), 0.0, 1.0)
+    if not len(X):
+        return np.zeros(0)
+    return cal.predict_proba(X)[:, 1]
+
+
 def load_prototypes(base):
     d = base / "token_prototypes"
     if not (d / "proto.npy").exists():
@@ -465,6 +477,8 @@ def main():
     voted = 0
     vote_suppressed = 0
     per_word, leaf_ctx = {}, {}
+    # Calibrator inputs, one entry per pick, scored together after the loop.
+    cols = collections.defaultdict(list)
 
     for w in words:
         sids = list(menus[w])
@@ -582,24 +596,20 @@ def main():
                 tok_agree = float(int(o[0]) == tid[k])
 
             m = menus[w][sids[k]]
-            pt = tuple_of(w, m)
             # Features describe the ARGMAX pick, always -- the calibrator was
             # trained on that distribution, and re-scoring it against a leaf the
             # trainer never saw would silently shift its input. Leaf selection
             # below changes what is displayed, never what is scored.
-            feats = build_features(
-                tuple_gap=tgap, class_gap=cgap, n_tup=n_tup, n_leaf=len(sids),
-                sent_len=len(ex_text(c).split()), pred_tuple=pt,
-                pred_empty=not (m.get("translation") or "").strip(),
-                token=(tok_avail, tok_gap, tok_agree),
-                companion=companion_features(w, ex_text(c), menus[w], sids[k], tuple_of),
-                structural=structural_features(w, ex_text(c), menus[w], sids[k], tuple_of),
-                menu_pos=list(menus[w]).index(sids[k]))
-            conf = (float(cal.predict_proba(np.array([feats]))[0, 1]) if cal
-                    else min(max(tgap, 0.0), 1.0))
-            band = "high" if conf >= cuts[0] else "medium" if conf >= cuts[1] else "low"
-            bands[band] += 1
-            picks.append((sids[k], conf, tgap, band, j))
+            for key, value in (
+                    ("tuple_gap", tgap), ("class_gap", cgap), ("n_tup", n_tup),
+                    ("n_leaf", len(sids)), ("sent_len", len(ex_text(c).split())),
+                    ("pred_tuple", tuple_of(w, m)),
+                    ("pred_empty", not (m.get("translation") or "").strip()),
+                    ("token", (tok_avail, tok_gap, tok_agree)),
+                    ("word", w), ("sentence", ex_text(c)), ("menu", menus[w]),
+                    ("pred", sids[k])):
+                cols[key].append(value)
+            picks.append((sids[k], tgap, j))
         per_word[w] = picks
         # Kept so leaf selection can run once, AFTER escalation has had its say:
         # Gemini picks a raw leaf off the same menu and lands on empty glosses
@@ -609,6 +619,28 @@ def main():
         # and can undo the prior on the one leaf it touches.
         leaf_ctx[w] = (sids, tid, (C + prior[None, :]) if a.menu_prior else C)
 
+    # ---- calibrated confidence for every pick at once: the same vectors the
+    # trainer builds (util_6d_wsd_features.feature_matrix), one predict_proba.
+    t0 = time.time()
+    comp, struct = construction_features(
+        cols.pop("word", []), cols.pop("sentence", []), cols.pop("menu", []),
+        cols.pop("pred", []), tuple_of)
+    X = feature_matrix(**{key: cols[key] for key in (
+        "tuple_gap", "class_gap", "n_tup", "n_leaf", "sent_len", "pred_tuple",
+        "pred_empty", "token")}, companion=comp, structural=struct)
+    conf = pick_confidence(cal, X, cols["tuple_gap"])
+    print(f"scored {len(X):,} picks in {time.time() - t0:.2f}s")
+    row = 0
+    for w, picks in per_word.items():
+        scored = []
+        for sid, tgap, j in picks:
+            cf = float(conf[row])
+            row += 1
+            band = "high" if cf >= cuts[0] else "medium" if cf >= cuts[1] else "low"
+            bands[band] += 1
+            scored.append((sid, cf, tgap, band, j))
+        per_word[w] = scored
+
     # ---- escalate the weak band to Gemini
     esc_of = {}
     if a.escalate:
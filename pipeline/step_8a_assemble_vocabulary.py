@@ -58,6 +58,7 @@ from util_8a_assembly_helpers import (make_stable_id, make_surface_id,
                                      split_count_proportionally)
 from util_pipeline_config import get_default_min_priority
 from util_pipeline_meta import make_meta, write_sidecar
+from util_8a_filter_index import write_filter_index
 from util_sense_ids import carry_sense_identity, merge_sense_identity
 
 # Default language; overridden by --language at runtime.
@@ -1784,6 +1785,10 @@ def main():
         json.dump(index, f, ensure_ascii=False)
     write_sidecar(index_path, make_meta("assemble_vocabulary", STEP_VERSION))
 
+    filter_path = write_filter_index(index_path, index)
+    print(f"Wrote {filter_path}")
+    write_sidecar(filter_path, make_meta("assemble_vocabulary", STEP_VERSION))
+
     print(f"Writing {examples_path}...")
     with open(examples_path, "w", encoding="utf-8") as f:
         json.dump(examples_out, f, ensure_ascii=False)
@@ -2,7 +2,14 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from pipeline.util_identity_registry import CardIdentityRegistry, SenseIdentityRegistry
+from pipeline import util_identity_registry
+from pipeline.util_evidence_store import canonical_json
+from pipeline.util_identity_registry import (
+    CardIdentityRegistry,
+    SenseIdentityRegistry,
+    journal_path,
+    offsets_path,
+)
 
 
 class CardIdentityRegistryTests(unittest.TestCase):
@@ -75,6 +82,100 @@ class CardIdentityRegistryTests(unittest.TestCase):
         self.assertEqual(registry.resolve("vo'a", "ir", ["occ-2"]), "222222")
 
 
+class RegistryJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "cards.json"
+        registry = CardIdentityRegistry("spanish")
+        registry.seed("111111", "voy", "ir", ["occ-1"])
+        registry.save(self.path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_appends_changed_records_instead_of_rewriting(self):
+        snapshot = self.path.read_text(encoding="utf-8")
+        registry = CardIdentityRegistry.load(self.path, "spanish")
+        registry.seed("222222", "pa'", "para", ["occ-2"])
+        registry.save(self.path)
+
+        self.assertEqual(self.path.read_text(encoding="utf-8"), snapshot)
+        lines = journal_path(self.path).read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 1)
+        loaded = CardIdentityRegistry.load(self.path, "spanish")
+        self.assertEqual(loaded.resolve("pa'", "para"), "222222")
+        self.assertEqual(loaded.resolve("voy", "ir"), "111111")
+
+    def test_journal_replays_merges_and_compacts_when_long(self):
+        registry = CardIdentityRegistry.load(self.path, "spanish")
+        registry.seed("222222", "voy", "voy")
+        registry.merge("222222", "111111", "manual reconciliation")
+        registry.save(self.path)
+
+        loaded = CardIdentityRegistry.load(self.path, "spanish")
+        self.assertEqual(loaded.records["222222"]["superseded_by"], "111111")
+        self.assertEqual(len(loaded.migrations), 1)
+
+        original = util_identity_registry.COMPACT_AFTER
+        util_identity_registry.COMPACT_AFTER = 3
+        try:
+            loaded.seed("333333", "fue", "ir")
+            loaded.save(self.path)
+        finally:
+            util_identity_registry.COMPACT_AFTER = original
+        self.assertFalse(journal_path(self.path).exists())
+        compacted = CardIdentityRegistry.load(self.path, "spanish")
+        self.assertEqual(compacted.to_dict(), loaded.to_dict())
+
+    def test_torn_final_journal_line_is_ignored(self):
+        registry = CardIdentityRegistry.load(self.path, "spanish")
+        registry.seed("222222", "pa'", "para")
+        registry.save(self.path)
+        with open(journal_path(self.path), "a", encoding="utf-8") as handle:
+            handle.write('{"op": "record", "key": "33')
+
+        loaded = CardIdentityRegistry.load(self.path, "spanish")
+
+        self.assertEqual(sorted(loaded.records), ["111111", "222222"])
+
+    def test_sequential_transactions_keep_both_updates(self):
+        with CardIdentityRegistry.transaction(self.path, "spanish") as registry:
+            registry.seed("222222", "pa'", "para")
+        with CardIdentityRegistry.transaction(self.path, "spanish") as registry:
+            registry.seed("333333", "fue", "ir")
+
+        loaded = CardIdentityRegistry.load(self.path, "spanish")
+        self.assertEqual(sorted(loaded.records), ["111111", "222222", "333333"])
+
+    def test_reader_looks_records_up_without_loading_the_snapshot(self):
+        registry = CardIdentityRegistry.load(self.path, "spanish")
+        registry.seed("222222", "pa'", "para", ["occ-\"2\""])
+        registry.compact(self.path)
+        self.assertEqual(self.path.read_text(encoding="utf-8"),
+                         canonical_json(registry.to_dict()) + "\n")
+        registry.seed("333333", "fue", "ir")
+        registry.save(self.path)
+
+        loads = []
+        original = CardIdentityRegistry.load
+        CardIdentityRegistry.load = classmethod(lambda cls, *a: loads.append(a))
+        try:
+            reader = CardIdentityRegistry.reader(self.path, "spanish")
+            self.assertEqual(reader.get("222222"), registry.records["222222"])
+            self.assertEqual(reader.get("333333"), registry.records["333333"])
+            self.assertIsNone(reader.get("999999"))
+        finally:
+            CardIdentityRegistry.load = original
+        self.assertEqual(loads, [])
+
+        # A snapshot written without its offset index is read in full.
+        registry.seed("444444", "era", "ser")
+        registry.compact(self.path)
+        offsets_path(self.path).unlink()
+        self.assertEqual(CardIdentityRegistry.reader(self.path, "spanish").get("444444"),
+                         registry.records["444444"])
+
+
 class SenseIdentityRegistryTests(unittest.TestCase):
     def test_gloss_change_with_same_occurrence_preserves_sense_id(self):
         registry = SenseIdentityRegistry("es")
@@ -0,0 +1,72 @@
+"""Leaf repair must read each word's own menu.
+
+Leaf selection runs after escalation, from the (sids, tuple ids, scores) kept
+for every word during scoring. Built anywhere but inside the word loop, every
+word sees the LAST word's menu: an empty-gloss pick is then left unrepaired
+(its id is not on the other menu) or indexed into a score row of the wrong
+length. Two words whose menus differ in size make either failure visible.
+"""
+
+import hashlib
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import step_6e_assign_senses_calibrated as step  # noqa: E402
+
+SENTENCE = "me senté en el banco del parque"
+
+
+def fake_embed(aliases):
+    """Deterministic vectors; each alias text shares its target's vector."""
+    def vector(text):
+        seed = int.from_bytes(hashlib.sha1(text.encode()).digest()[:4], "big")
+        v = np.random.default_rng(seed).normal(size=16).astype(np.float32)
+        return v / np.linalg.norm(v)
+
+    def embed(texts):
+        return {t: vector(aliases.get(t, t)) for t in texts}
+    return embed
+
+
+class LeafContextTests(unittest.TestCase):
+    def test_each_word_repairs_against_its_own_menu(self):
+        banco = {"b1": {"pos": "NOUN", "translation": ""},
+                 "b2": {"pos": "NOUN", "translation": "bench"},
+                 "b3": {"pos": "VERB", "translation": "to bank"}}
+        zeta = {"b1": {"pos": "NOUN", "translation": "zed"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            layers = Path(tmp) / "data" / "layers"
+            (layers / "sense_menu").mkdir(parents=True)
+            (layers / "examples_raw.json").write_text(json.dumps({
+                "banco": [{"target": SENTENCE}],
+                "zeta": [{"target": "la zeta es la última letra"}],
+            }), encoding="utf-8")
+            (layers / "sense_menu" / "spanishdict.json").write_text(json.dumps({
+                "banco": [{"senses": banco}], "zeta": [{"senses": zeta}],
+            }), encoding="utf-8")
+            out = Path(tmp) / "out.json"
+            # The sentence sits right on the empty-gloss leaf, so the argmax
+            # picks it and leaf repair has to move it to "bench".
+            embed = fake_embed({SENTENCE: step.gloss("banco", banco["b1"])})
+            argv = ["step_6e", "--artist-dir", tmp, "--no-token", "--pos-filter", "off",
+                    "--out", str(out)]
+            with mock.patch.object(sys, "argv", argv), \
+                    mock.patch.object(step, "embed", embed), \
+                    mock.patch.object(step, "LAYERS_DIR", Path(tmp) / "shared"):
+                step.main()
+            written = json.loads(out.read_text(encoding="utf-8"))
+
+        claims = {w: [e["sense"] for e in written[w][step.METHOD]] for w in written}
+        self.assertEqual(claims, {"banco": ["b2"], "zeta": ["b1"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
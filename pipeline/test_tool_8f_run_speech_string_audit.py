@@ -51,6 +51,24 @@ class SpeechStringAuditTests(unittest.TestCase):
             {"a lo mejor", "banco"},
         )
 
+    def test_token_trie_finds_overlapping_phrases_once_in_line_order(self):
+        trie = audit.TokenTrie()
+        ids = {phrase: trie.add(tuple(phrase.split()))
+               for phrase in ("used to", "used", "to go", "go")}
+        self.assertEqual(trie.add(("used", "to")), ids["used to"])
+        self.assertEqual(
+            trie.match(("i", "used", "to", "go", "and", "used", "to", "go")),
+            [ids["used"], ids["used to"], ids["to go"], ids["go"]],
+        )
+        self.assertEqual(trie.match(("unknown", "words")), [])
+        self.assertEqual(trie.phrases[ids["to go"]], "to go")
+
+    def test_conflicting_cues_are_listed_in_english_order(self):
+        senses = {"finance": {"translation": "bank"}, "seat": {"translation": "bench"}}
+        cues, _ = audit.build_cue_inventory({"banco": senses})
+        decision = audit.classify_english("A bench by the bank.", senses, cues["banco"])
+        self.assertEqual(list(decision["matched_cues"]), ["seat", "finance"])
+
     def test_weak_single_function_word_is_not_a_cue(self):
         self.assertEqual(audit.raw_cues("that"), set())
         self.assertIn(("used", "to"), audit.raw_cues("used to"))
@@ -61,6 +79,33 @@ class SpeechStringAuditTests(unittest.TestCase):
             ("think", "again"),
         )
 
+    def test_shard_states_merge_into_the_single_process_state(self):
+        senses = {
+            "banco": {"finance": {"translation": "bank"}, "seat": {"translation": "bench"}},
+            "hoja": {"leaf": {"translation": "leaf"}, "sheet": {"translation": "sheet"}},
+        }
+        cues, _ = audit.build_cue_inventory(senses)
+        trie = audit.TokenTrie()
+        cues = {surface: audit.index_cues(rows, trie) for surface, rows in cues.items()}
+        args = (senses, cues, trie, audit.build_surface_matcher(set(senses)), 2, 1, 7)
+        english = ["the bank", "a bench", "one leaf", "a sheet", "bank and bench", "nothing"]
+        lines = [
+            {"es": f"{surface} {n}\n", "en": english[n % len(english)] + "\n",
+             "ids": f"en/{n}\tes/{n}\t{n}\t{n}\n"}
+            for n, surface in enumerate(["banco", "hoja", "el banco y la hoja"] * 40, 1)
+        ]
+        whole = audit.AuditVisitor(*args)
+        for number, line in enumerate(lines, 1):
+            whole.visit(number, line)
+        merged = audit.AuditVisitor(*args)
+        for lo, hi in [(0, 37), (37, 38), (38, 120)]:
+            shard = audit.AuditVisitor(*args)
+            for number in range(lo + 1, hi + 1):
+                shard.visit(number, lines[number - 1])
+            merged.merge(shard.state())
+        self.assertEqual(merged.state(), whole.state())
+        self.assertEqual(list(merged.state()["samples"]), list(whole.state()["samples"]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,118 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import util_4a_lexicon as lexicon_module  # noqa: E402
+import util_4a_routing as routing  # noqa: E402
+from util_4a_clitic_memo import CliticVerdictMemo  # noqa: E402
+
+
+VERB_POS = {"dar": "verb", "cortar": "verb", "alejar": "verb", "parte": "noun,verb"}
+CONJ_REVERSE = {
+    "corta": [{"lemma": "cortar", "mood": "imperativo", "tense": "afirmativo",
+               "person": "2s"}],
+}
+
+
+class CliticSplitTests(unittest.TestCase):
+    def setUp(self):
+        self.saved = (routing._verb_lemmas, routing._verb_pos, routing._conj_reverse,
+                      routing._verb_data_loaded)
+        routing._verb_lemmas = {"dar", "cortar", "alejar"}
+        routing._verb_pos = VERB_POS
+        routing._conj_reverse = CONJ_REVERSE
+        routing._verb_data_loaded = True
+
+    def tearDown(self):
+        (routing._verb_lemmas, routing._verb_pos, routing._conj_reverse,
+         routing._verb_data_loaded) = self.saved
+
+    def test_splits_peel_at_most_two_pronouns(self):
+        self.assertEqual(routing.clitic_splits("dármelo"), (("dárme", "lo"), ("dár", "me")))
+        self.assertEqual(routing.clitic_splits("casa"), ())
+        self.assertEqual(routing.clitic_splits("me"), ())
+        self.assertEqual(routing.prime_clitic_splits(["Dármelo", "casa", "córtala"]), 2)
+
+    def test_decomposers_apply_their_own_stem_guards(self):
+        known = set(VERB_POS)
+        self.assertEqual(routing.decompose_gerund_clitic("dármelo", known), ("dar", ["me", "lo"]))
+        self.assertEqual(routing.decompose_gerund_clitic("alejarte", known), ("alejar", ["te"]))
+        self.assertEqual(routing.decompose_gerund_clitic("córtala", known), ("cortar", ["la"]))
+        self.assertIsNone(routing.decompose_gerund_clitic("parte", known))
+        self.assertIsNone(routing.decompose_gerund_clitic("casa", known))
+        self.assertEqual(routing.strip_clitic_pronouns("dándomelo"), "dando")
+
+
+class CliticVerdictMemoTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.cache_dir = root / "clitic_cache"
+        self.sources = {name: root / path.name
+                        for name, path in lexicon_module.SOURCES.items()}
+        self.sources["spanish_forms"].write_text(json.dumps(VERB_POS), encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def memo(self, version=9, routing_version=None):
+        return CliticVerdictMemo(cache_dir=self.cache_dir, version=version,
+                                 sources=self.sources, routing_version=routing_version)
+
+    def test_verdicts_round_trip_through_the_cache(self):
+        calls = []
+
+        def compute(result):
+            calls.append(result)
+            return result
+
+        first = self.memo()
+        self.assertEqual(first.get("decompose", "dármelo", lambda: compute(("dar", ["me", "lo"]))),
+                         ("dar", ["me", "lo"]))
+        self.assertEqual(first.get("strip", "dale", lambda: compute(("dar", "le"))), ("dar", "le"))
+        self.assertIsNone(first.get("strip", "parte", lambda: compute(None)))
+        first.get("strip", "dale", lambda: compute("recomputed"))
+        first.save()
+        self.assertEqual(len(calls), 3)
+
+        second = self.memo()
+        self.assertEqual(second.get("decompose", "dármelo", None), ("dar", ["me", "lo"]))
+        self.assertEqual(second.get("strip", "dale", None), ("dar", "le"))
+        self.assertIsNone(second.get("strip", "parte", None))
+        self.assertEqual(second.stats["cache_hits"], 3)
+
+    def test_changed_table_or_version_starts_a_fresh_cache(self):
+        first = self.memo()
+        first.get("strip", "dale", lambda: ("dar", "le"))
+        first.save()
+
+        self.assertNotEqual(self.memo(version=10).cache_path, first.cache_path)
+        self.assertIn(".r%d." % routing.ROUTING_VERSION, first.signature)
+        bumped = self.memo(routing_version=routing.ROUTING_VERSION + 1)
+        self.assertNotEqual(bumped.cache_path, first.cache_path)
+        self.assertIsNone(bumped.get("strip", "dale", lambda: None))
+        path = self.sources["spanish_forms"]
+        path.write_text(json.dumps(dict(VERB_POS, dame="verb")), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        fresh = self.memo()
+        self.assertNotEqual(fresh.cache_path, first.cache_path)
+        self.assertEqual(fresh.get("strip", "dale", lambda: None), None)
+
+    def test_torn_final_row_is_ignored(self):
+        first = self.memo()
+        first.get("strip", "dale", lambda: ("dar", "le"))
+        first.save()
+        with open(first.cache_path, "a", encoding="utf-8") as handle:
+            handle.write('["strip", "da')
+
+        self.assertEqual(self.memo().get("strip", "dale", None), ("dar", "le"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import util_4a_lexicon as lexicon_module  # noqa: E402
+import util_5c_spanishdict as spanishdict  # noqa: E402
+
+
+SPANISH_FORMS = {
+    "casa": "noun,verb", "casó": "verb", "casar": "verb", "cáscara": "noun",
+    "estás": "verb", "mai": "", "ver": "verb",
+}
+CONJUGATION_REVERSE = {
+    "casó": [{"lemma": "casar", "mood": "indicativo"}],
+    "estás": [{"lemma": "Estar"}, {"lemma": "estar"}],
+    "vio": [{"lemma": "ver"}, "not-a-dict"],
+}
+
+
+class SpanishLexiconTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.sources = {name: root / path.name
+                        for name, path in lexicon_module.SOURCES.items()}
+        self.sources["spanish_forms"].write_text(json.dumps(SPANISH_FORMS), encoding="utf-8")
+        self.sources["conjugation_reverse"].write_text(
+            json.dumps(CONJUGATION_REVERSE), encoding="utf-8")
+        self.sources["conjugations"].write_text(json.dumps({"Casar": {}, "ver": {}}),
+                                                encoding="utf-8")
+        self.sources["es_50k"].write_text("de 100\ncasa 7 extra\nsolo\n", encoding="utf-8")
+        self.path = root / "spanish_lexicon.bin"
+        lexicon_module.compile_lexicon(self.path, self.sources)
+
+    def tearDown(self):
+        lexicon_module._LOADED.pop(str(self.path), None)
+        self.temp_dir.cleanup()
+
+    def load(self):
+        lexicon_module._LOADED.pop(str(self.path), None)
+        return lexicon_module.load_lexicon(self.path, self.sources)
+
+    def test_membership_prefix_and_accent_insensitive_lookup(self):
+        lexicon = self.load()
+
+        self.assertIn("casó", lexicon)
+        self.assertNotIn("caso", lexicon)
+        self.assertEqual(lexicon.pos_tags("casa"), "noun,verb")
+        self.assertEqual(lexicon.with_prefix("cas"), ("casa", "casar", "casó"))
+        self.assertEqual(lexicon.with_prefix("zz"), ())
+        self.assertEqual(lexicon.accent_insensitive("CASO'"), ("casó",))
+        self.assertEqual(lexicon.verb_lemmas, frozenset({"casar", "ver"}))
+        self.assertEqual(lexicon.es_50k, (("de", "100"), ("casa", "7")))
+        self.assertEqual(lexicon.conj_reverse, CONJUGATION_REVERSE)
+        self.assertIsNone(lexicon.sd_parents)
+
+    def test_guard_tables_match_the_json_build(self):
+        lexicon = self.load()
+        saved = (spanishdict._spanish_forms_deac, spanishdict._conj_reverse_deac,
+                 spanishdict._conj_reverse_heads, spanishdict._guard_data_loaded)
+        try:
+            spanishdict._guard_data_loaded = False
+            spanishdict._load_guard_data(self.sources["spanish_forms"],
+                                         self.sources["conjugation_reverse"])
+            self.assertEqual(lexicon.deaccented_forms, spanishdict._spanish_forms_deac)
+            self.assertEqual(lexicon.conj_deac, spanishdict._conj_reverse_deac)
+            self.assertEqual(lexicon.conj_heads, spanishdict._conj_reverse_heads)
+        finally:
+            (spanishdict._spanish_forms_deac, spanishdict._conj_reverse_deac,
+             spanishdict._conj_reverse_heads, spanishdict._guard_data_loaded) = saved
+        for text in ("Estás", "adictivo'", "pa’", "", "Ñandú"):
+            self.assertEqual(lexicon_module.deaccent(text), spanishdict._deaccent(text))
+
+    def test_changed_source_makes_the_artifact_stale(self):
+        self.assertIsNotNone(self.load())
+
+        forms = dict(SPANISH_FORMS, nuevo="adj")
+        self.sources["spanish_forms"].write_text(json.dumps(forms), encoding="utf-8")
+        stat = self.sources["spanish_forms"].stat()
+        os.utime(self.sources["spanish_forms"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertIsNone(self.load())
+
+    def test_missing_or_foreign_artifact_loads_as_none(self):
+        self.assertIsNone(lexicon_module.load_lexicon(
+            Path(self.temp_dir.name) / "absent.bin", self.sources))
+        self.path.write_bytes(b"not a lexicon")
+        self.assertIsNone(self.load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from util_5a_sentence_bank import SentenceBank, index_path_for  # noqa: E402
+
+
+def _row(sid, es="hola"):
+    return {"id": sid, "es": es, "en": "hello", "score": 0.5}
+
+
+class SentenceBankTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "sentence_bank.jsonl"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open(self):
+        return SentenceBank(self.path, compact_min_tail=2, compact_fraction=0.5)
+
+    def test_legacy_bank_is_indexed_and_appends_only_new_rows(self):
+        self.path.write_text("".join(json.dumps(_row(s), ensure_ascii=False) + "\n"
+                                     for s in ("b2", "a1", "c3")), encoding="utf-8")
+        before = self.path.read_bytes()
+        with self.open() as bank:
+            self.assertTrue(index_path_for(self.path).exists())
+            self.assertEqual(len(bank), 3)
+            self.assertEqual(bank.append([_row("a1", "changed"), _row("d4", "año")]), 1)
+            self.assertEqual(bank.get("a1")["es"], "hola")
+        self.assertTrue(self.path.read_bytes().startswith(before))
+
+        with self.open() as bank:
+            self.assertEqual(len(bank), 4)
+            self.assertEqual(set(bank.get_many(["d4", "zz", "b2"])), {"d4", "b2"})
+            self.assertEqual(bank["d4"]["es"], "año")
+            self.assertNotIn("zz", bank)
+
+    def test_compaction_keeps_every_row_reachable(self):
+        with self.open() as bank:
+            for start in range(0, 40, 7):
+                bank.append(_row("id%02d" % i) for i in range(start, start + 7))
+            bank.append([_row("a-much-longer-id")])
+        with self.open() as bank:
+            self.assertEqual(len(bank), 43)
+            self.assertEqual(sorted(bank.ids()), sorted(
+                ["id%02d" % i for i in range(42)] + ["a-much-longer-id"]))
+            self.assertTrue(all(bank[sid]["id"] == sid for sid in bank.ids()))
+
+    def test_torn_final_row_is_ignored_and_closed_off(self):
+        with self.open() as bank:
+            bank.append([_row("a1")])
+        with self.path.open("ab") as f:
+            f.write(b'{"id": "b2", "es": "tor')
+        with self.open() as bank:
+            self.assertNotIn("b2", bank)
+            bank.append([_row("b2"), _row("c3")])
+        with self.open() as bank:
+            self.assertEqual(sorted(bank.ids()), ["a1", "b2", "c3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import step_5a_harvest_subtitles as harvest_step  # noqa: E402
+from step_5a_build_examples_v2 import Scorer  # noqa: E402
+
+_WORDS = ["casa", "perro", "tengo", "quiero", "vamos", "comer", "libro", "noche",
+          "gato", "mesa", "agua", "calle", "amigo", "puerta", "madre"]
+_FILLER = ["el", "la", "un", "una", "mi", "tu", "con", "para", "muy", "grande",
+           "zorro", "xilofón"]
+
+
+def _scorer():
+    sc = Scorer.__new__(Scorer)
+    sc.inv = [{"word": w} for w in _WORDS + _FILLER[:9]]
+    sc.rank = {r["word"]: i for i, r in enumerate(sc.inv)}
+    sc.conj = {w: [{"mood": "indicativo"}] for w in ("tengo", "quiero", "vamos")}
+    return sc
+
+
+def _line(rng):
+    words = rng.sample(_WORDS + _FILLER, rng.randint(3, 12))
+    if rng.random() < 0.2:
+        words[rng.randrange(1, len(words))] = rng.choice(_WORDS).capitalize()
+    es = " ".join(words)
+    es = es[0].upper() + es[1:] + rng.choice([".", ".", "!", "...", "", " (sí)."])
+    en = " ".join("w" for _ in range(max(1, len(words) + rng.randint(-3, 3))))
+    if rng.random() < 0.1:
+        en = ""
+    return es, en
+
+
+class SentenceFeaturesTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.corp = root / "opensubtitles"
+        self.corp.mkdir()
+        rng = random.Random(7)
+        lines = [_line(rng) for _ in range(3000)]
+        # Repeats, so one sentence id appears on several lines.
+        lines += [lines[i] for i in rng.sample(range(3000), 300)]
+        rng.shuffle(lines)
+        with open(self.corp / "OpenSubtitles.en-es.es", "w", encoding="utf-8") as es, \
+                open(self.corp / "OpenSubtitles.en-es.en", "w", encoding="utf-8") as en, \
+                open(self.corp / "OpenSubtitles.en-es.ids", "w", encoding="utf-8") as ids:
+            for n, (s, e) in enumerate(lines, 1):
+                es.write(s + "\n")
+                en.write(e + "\n")
+                ids.write("es/0/%d/%d.xml.gz\ten/0/%d/%d.xml.gz\t%d\t%d\n"
+                          % (n // 50, n // 10, n // 50, n // 10, n, n))
+        self.cache = root / "sentence_index"
+        self.sc = _scorer()
+        patcher = mock.patch.object(harvest_step, "CORP", self.corp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def assertSameHarvest(self, targets, **kwargs):
+        args = dict(max_lines=kwargs.pop("max_lines", 0), cap=kwargs.pop("cap", 4),
+                    taste_cap=kwargs.pop("taste_cap", 2), run_id="test")
+        streamed = harvest_step.harvest(self.sc, targets, compact_every=500,
+                                        **args, **kwargs)
+        features = harvest_step.open_features(self.sc, workers=1, cache_root=self.cache)
+        joined = harvest_step.harvest_features(features, self.sc, targets, **args, **kwargs)
+
+        for pools_a, pools_b in zip(streamed[:2], joined[:2]):
+            self.assertEqual({w: sorted(h) for w, h in pools_a.items()},
+                             {w: sorted(h) for w, h in pools_b.items()})
+        self.assertEqual(streamed[2], joined[2])
+        for a, b in zip(streamed[3:6], joined[3:6]):
+            self.assertEqual(dict(a), dict(b))
+            self.assertEqual([k for k, _ in a.most_common()],
+                             [k for k, _ in b.most_common()])
+        self.assertEqual(streamed[6], joined[6])
+        self.assertTrue(joined[2])
+
+    def test_join_matches_streaming_harvest(self):
+        self.assertSameHarvest(set(_WORDS))
+        self.assertSameHarvest({"casa", "tengo", "gato"}, cap=2, taste_cap=1,
+                               skip_lines=400, max_lines=2500)
+        self.assertSameHarvest(set(_WORDS), cap=6, cap_top=5, tail_cap=1,
+                               max_lines=5000)
+        self.assertEqual(len(list(self.cache.glob("subtitle_features-*"))), 1)
+
+    def test_table_is_rebuilt_when_the_corpus_changes(self):
+        first = harvest_step.open_features(self.sc, workers=1, cache_root=self.cache)
+        with open(self.corp / "OpenSubtitles.en-es.es", "a", encoding="utf-8") as f:
+            f.write("Tengo una casa muy grande.\n")
+        second = harvest_step.open_features(self.sc, workers=1, cache_root=self.cache)
+        self.assertNotEqual(first.path, second.path)
+        self.assertEqual([p.name for p in self.cache.glob("subtitle_features-*")],
+                         [second.path.name])
+
+    def test_key_ignores_rank_order_but_not_what_the_gates_read(self):
+        paths = sorted(self.corp.iterdir())
+        key = harvest_step.features_key(self.sc, paths)
+        reranked = _scorer()
+        reranked.rank = {w: len(reranked.rank) - 1 - r for w, r in reranked.rank.items()}
+        self.assertEqual(harvest_step.features_key(reranked, paths), key)
+
+        # Leaving the band changes naturalness and hard_words.
+        reranked.rank["casa"] = harvest_step.BAND
+        self.assertNotEqual(harvest_step.features_key(reranked, paths), key)
+        with mock.patch.object(harvest_step, "FEATURES_VERSION", "features-test"):
+            self.assertNotEqual(harvest_step.features_key(self.sc, paths), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sys
+import tempfile
+from array import array
+
+import numpy as np
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import step_5a_build_examples as step  # noqa: E402
+from util_5a_sentence_index import (  # noqa: E402
+    Postings, PostingsMerger, chunked, open_or_build)
+
+RANKS = {"el": 1, "la": 2, "que": 3, "gato": 400, "come": 350, "pescado": 900,
+         "perro": 450, "duerme": 800, "mucho": 120}
+INVENTORY = {"gato": 0, "perro": 1, "pescado": 2, "duerme": 3, "parce que": 4}
+PHRASES = {"parce que": 4}
+PAIRS = [
+    ("The cat eats fish.", "El gato come pescado."),
+    ("Hi.", "Hola."),                                  # short
+    ("The the the.", "el la que el la"),               # trivial
+    ("The dog sleeps a lot.", "El perro duerme mucho."),
+    ("Because the cat.", "Parce que el gato come."),
+    ("Nobody.", "nadie nunca jamás"),                  # no inventory
+    ("The cat and the dog.", "El gato y el perro duermen."),
+]
+
+
+def _reference(pairs):
+    """The sequential one-pass build, as records and {key: ids}."""
+    step._init_index_worker(RANKS, INVENTORY, PHRASES, False)
+    chunk = step.score_chunk(pairs)
+    spa = chunk["spa"].decode("utf-8")
+    postings, start = {}, 0
+    for key, count in zip(chunk["tokens"], chunk["token_count"]):
+        postings[key] = list(chunk["postings"][start:start + count])
+        start += count
+    return len(chunk["length"]), spa, postings
+
+
+class SentenceIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def build(self, workers, size=2, name="tatoeba", key="k1", pairs=PAIRS, keep=1):
+        return open_or_build(
+            self.root, name, key, lambda: chunked(pairs, size), step.score_chunk,
+            keep=keep, workers=workers, initializer=step._init_index_worker,
+            initargs=(RANKS, INVENTORY, PHRASES, False), total=len(pairs))
+
+    def test_chunked_parallel_build_matches_one_pass(self):
+        kept, spa, postings = _reference(PAIRS)
+        serial = self.build(workers=1, name="serial")
+        parallel = self.build(workers=2, name="parallel")
+        for index in (serial, parallel):
+            self.assertEqual(len(index), kept)
+            self.assertEqual("".join(r["spa"] for r in index.materialize()), spa)
+            self.assertEqual({k: index.postings.get(k) for k in postings}, postings)
+            self.assertEqual(len(index.postings), len(postings))
+        self.assertEqual(serial.postings.get("gato"), [0, 2, 3])
+        self.assertEqual(serial.postings.get("parce que"), [2])
+        self.assertEqual(serial.meta["drops"],
+                         {"short": 1, "long": 0, "trivial": 1, "no_inv": 1})
+        self.assertEqual(serial.records([3, 0]), [serial.materialize()[3], serial[0]])
+        self.assertEqual(serial[0]["inv_ranks"], (0, 2))
+
+    def test_index_is_reused_by_key_and_replaced_when_inputs_change(self):
+        self.build(workers=1)
+        calls = []
+
+        def counting(pairs):
+            calls.append(len(pairs))
+            return step.score_chunk(pairs)
+
+        reused = open_or_build(
+            self.root, "tatoeba", "k1", lambda: chunked(PAIRS, 2), counting, workers=1,
+            initializer=step._init_index_worker, initargs=(RANKS, INVENTORY, PHRASES, False))
+        self.assertEqual((calls, len(reused)), ([], 4))
+
+        self.build(workers=1, key="k2", pairs=PAIRS[:1])
+        self.assertEqual(sorted(p.name for p in self.root.iterdir()), ["tatoeba-k2"])
+
+    def test_keep_holds_the_most_recently_used_builds(self):
+        for key in ("k1", "k2"):
+            self.build(workers=1, key=key, pairs=PAIRS[:1], keep=3)
+        os.utime(self.root / "tatoeba-k1", ns=(1, 1))
+        os.utime(self.root / "tatoeba-k2", ns=(2, 2))
+        # k1 is reused, so k2 is now the least recently used.
+        open_or_build(self.root, "tatoeba", "k1", None, None)
+        for key in ("k3", "k4"):
+            self.build(workers=1, key=key, pairs=PAIRS[:1], keep=3)
+        self.assertEqual(sorted(p.name for p in self.root.iterdir()),
+                         ["tatoeba-k1", "tatoeba-k3", "tatoeba-k4"])
+
+    def test_postings_spilled_in_runs_match_one_sort(self):
+        _kept, _spa, expected = _reference(PAIRS)
+        merger = PostingsMerger(spill_dir=self.root, run_postings=3)
+        base = 0
+        step._init_index_worker(RANKS, INVENTORY, PHRASES, False)
+        for pairs in chunked(PAIRS, 2):
+            chunk = step.score_chunk(pairs)
+            merger.add(chunk["tokens"], chunk["token_count"], chunk["postings"], base,
+                       extra={"base": array("I", [base] * len(chunk["postings"]))})
+            base += len(chunk["length"])
+        self.assertTrue((self.root / "postings-runs").is_dir())
+        merger.save(self.root)
+        self.assertFalse((self.root / "postings-runs").exists())
+        postings = Postings.load(self.root)
+        self.assertEqual({k: postings.get(k) for k in expected}, expected)
+        # Extra columns follow their postings.
+        start, end = postings.span("gato")
+        self.assertEqual(np.load(self.root / "post_base.npy")[start:end].tolist(), [0, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
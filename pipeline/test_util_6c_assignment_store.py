@@ -0,0 +1,92 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from util_6c_assignment_store import AssignmentAnswerStore, record_keys  # noqa: E402
+
+
+def _record(word="bicho", lines=("Ese bicho no sabe", "me pica el bicho")):
+    return {"word": word, "lemma": word,
+            "senses": [{"pos": "NOUN", "translation": "bug"},
+                       {"pos": "NOUN", "translation": "guy"}],
+            "ids": ["s1", "s2"],
+            "examples": [{"spanish": line, "english": ""} for line in lines]}
+
+
+class AssignmentAnswerStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name) / "assignment_store"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def store(self, prompt_id="sd-test"):
+        return AssignmentAnswerStore(self.cache_dir, prompt_id)
+
+    def test_answers_are_reused_across_artists_and_renumbered(self):
+        first = self.store()
+        record = _record()
+        plan = first.plan(record)
+        self.assertEqual(plan["send"], [0, 1])
+        calls = first.merge_calls(record, plan, [
+            {"example": 1, "sense": "s2", "closest": "s2"},
+            {"example": 2, "sense": None, "abstain_reason": "insufficient_context"},
+        ])
+        self.assertEqual([c["example"] for c in calls], [1, 2])
+        first.save()
+
+        # Another artist: same menu, one shared line (case/spacing differ).
+        second = self.store()
+        other = _record(lines=("dime algo", "ese  BICHO no sabe"))
+        plan = second.plan(other)
+        self.assertEqual(plan["send"], [0])
+        self.assertEqual(second.request(other, plan)["examples"],
+                         [{"spanish": "dime algo", "english": ""}])
+        calls = second.merge_calls(other, plan, [{"example": 1, "sense": "1"}])
+        self.assertEqual(sorted((c["example"], c["sense"]) for c in calls),
+                         [(1, "1"), (2, "s2")])
+        self.assertIn("1/2 example answers reused", second.format_report())
+
+    def test_key_covers_menu_word_and_prompt(self):
+        keys = record_keys(_record(), "sd-test")
+        changed_menu = _record()
+        changed_menu["senses"][1]["translation"] = "dude"
+        self.assertNotEqual(record_keys(changed_menu, "sd-test"), keys)
+        self.assertNotEqual(record_keys(_record(word="bichote"), "sd-test"), keys)
+        self.assertNotEqual(record_keys(_record(), "sd-other"), keys)
+
+    def test_repeated_lines_are_sent_once_and_bad_output_is_not_stored(self):
+        store = self.store()
+        record = _record(lines=("ese bicho", "Ese bicho", "otro bicho"))
+        plan = store.plan(record)
+        self.assertEqual((plan["send"], plan["copies"]), ([0, 2], {1: 0}))
+        calls = store.merge_calls(record, plan, [
+            {"example": 1, "sense": "s1"},
+            {"example": 2, "sense": "s9"},  # not on the menu
+            {"example": 7, "sense": "s1"},  # out of range
+        ])
+        self.assertEqual(sorted(c["example"] for c in calls), [1, 2, 3])
+        store.save()
+
+        plan = self.store().plan(record)
+        self.assertEqual((plan["send"], sorted(plan["reused"])), ([2], [0, 1]))
+
+    def test_register_plan_counts_answers_shared_between_members(self):
+        from pipeline.artist.tool_6c_assign_register_senses import plan_register
+
+        rows = plan_register([
+            ("A", [_record(), _record(word="janguear", lines=("vamo a janguear",))]),
+            ("B", [_record(lines=("me pica el bicho",))]),
+        ], self.store(), "sd-test")
+
+        total = rows[-1]
+        self.assertEqual((total["examples"], total["shared"], total["sent"]), (4, 1, 3))
+        self.assertEqual((rows[1]["batches"], rows[1]["batches_without"]), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Tests for the columnar path of util_6d_wsd_features.
+
+The row functions (build, companion_features, structural_features) are the
+contract the calibrator was trained against. The columnar path is only allowed
+to be faster: every value it emits must equal the row path's, bit for bit.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from tool_6d_train_calibrator import featurise, featurise_all  # noqa: E402
+from util_6d_wsd_features import (FEATURES, build, companion_features,  # noqa: E402
+                                  construction_features, feature_matrix,
+                                  structural_features)
+
+
+def _tuple_of(word, sense):
+    return ((sense.get("headword") or word).strip().lower(), (sense.get("pos") or "").strip())
+
+
+def leaf(translation, context="", headword="", pos="VERB"):
+    return {"translation": translation, "context": context,
+            "headword": headword, "pos": pos}
+
+
+MENUS = {
+    "ir": {
+        "go": leaf("to go"),
+        "prog": leaf("to be", "used in progressive constructions"),
+        "part": leaf("to be", "used with a past participle"),
+        "irse": leaf("to leave", headword="irse"),
+        "inf": leaf("to be going to", 'used with "a" and infinitive'),
+    },
+    "de": {
+        "of": leaf("of", pos="ADP"),
+        "from": leaf("from", "used with de", pos="ADP"),
+        "empty": leaf("", pos="ADP"),
+    },
+    "acabar": {
+        "finish": leaf("to finish"),
+        "just": leaf("to have just", "used with de and infinitive"),
+        "end": leaf("to end up", "used with a gerund", pos="NOUN"),
+    },
+    "casa": {"house": leaf("house", pos="NOUN"), "home": leaf("home", pos="ADJ")},
+    "nada": {},
+}
+
+SENTENCES = [
+    "Nos fuimos calentando poco a poco",
+    "ir a comer y acabar de cantar",
+    "De la casa de mi madre",
+    "acabar hecho polvo",
+    "",
+    "¿Qué haremos esta noche?",
+    "ir ir ir de de de",
+    "la casa está cerrada y vuelto",
+    "Acabó durmiendo en casa",
+]
+
+
+def make_rows(n, seed):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        word = rng.choice(list(MENUS))
+        leaves = list(MENUS[word]) + [None, "missing"]
+        pred = rng.choice(leaves)
+        pred_sense = MENUS[word].get(pred) or {}
+        rows.append({
+            "word": word, "sent": rng.choice(SENTENCES), "pred_leaf": pred,
+            "pred_tup": list(_tuple_of(word, pred_sense)),
+            "tgap": rng.random(), "cgap": rng.choice([rng.random(), 0.999, 1.0]),
+            "n_tup": rng.randint(0, 4), "n_leaf": rng.randint(1, 9),
+        })
+    return rows
+
+
+class ColumnarFeatures(unittest.TestCase):
+    def test_construction_blocks_equal_the_row_functions(self):
+        rows = make_rows(400, 1)
+        comp, struct = construction_features(
+            [r["word"] for r in rows], [r["sent"] for r in rows],
+            [MENUS[r["word"]] for r in rows], [r["pred_leaf"] for r in rows], _tuple_of)
+        for i, r in enumerate(rows):
+            args = (r["word"], r["sent"], MENUS[r["word"]], r["pred_leaf"], _tuple_of)
+            self.assertEqual(comp[i].tolist(), companion_features(*args), r)
+            self.assertEqual(struct[i].tolist(), structural_features(*args), r)
+        # Every branch was exercised, not just the all-zeros one.
+        self.assertTrue(comp[:, 3].any() and struct[:, 2].any() and struct[:, 4].any())
+
+    def test_disabled_blocks_are_zero(self):
+        rows = make_rows(20, 2)
+        comp, struct = construction_features(
+            [r["word"] for r in rows], [r["sent"] for r in rows],
+            [MENUS[r["word"]] for r in rows], [r["pred_leaf"] for r in rows], _tuple_of,
+            companion=False, structural=False)
+        self.assertFalse(comp.any() or struct.any())
+        self.assertEqual(comp.shape, (20, 5))
+
+    def test_feature_matrix_equals_build_row_by_row(self):
+        rng = random.Random(3)
+        rows = [dict(tuple_gap=rng.random(), class_gap=rng.choice([0.2, 0.999, 1.0]),
+                     n_tup=rng.randint(0, 3), n_leaf=rng.randint(1, 7),
+                     sent_len=rng.randint(0, 12),
+                     pred_tuple=(rng.choice(["ir", "irse", "casa"]),
+                                 rng.choice(["VERB", "NOUN", "ADJ", "ADP", ""])),
+                     pred_empty=rng.random() < 0.3,
+                     token=(1.0, rng.random(), float(rng.random() < 0.5)),
+                     companion=[float(rng.random() < 0.5) for _ in range(5)],
+                     structural=[float(rng.random() < 0.5) for _ in range(5)])
+                for _ in range(200)]
+        X = feature_matrix(**{k: [r[k] for r in rows] for k in rows[0]})
+        self.assertEqual(X.shape, (200, len(FEATURES)))
+        for i, r in enumerate(rows):
+            self.assertEqual(X[i].tolist(), build(**r))
+        self.assertEqual(feature_matrix(**{k: [] for k in rows[0]}).shape,
+                         (0, len(FEATURES)))
+
+    def test_trainer_matrix_equals_featurise(self):
+        rows = make_rows(300, 4)
+        tok = {(r["word"], r["sent"]): {"gap": 0.25,
+                                         "pred": r["pred_tup"] if i % 2 else ["x", "NOUN"]}
+               for i, r in enumerate(rows[::3])}
+        for flags in [(False, False), (True, False), (False, True)]:
+            expected = np.array([featurise(r, tok.get((r["word"], r["sent"])), MENUS, *flags)
+                                 for r in rows])
+            np.testing.assert_array_equal(featurise_all(rows, tok, MENUS, *flags), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""The filter index must show exactly the cards bench_deck_quality.visible() shows."""
+
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_deck_quality import visible, visible_card_ids, visible_mask  # noqa: E402
+from util_8a_filter_index import (build_filter_index, filter_index_path,  # noqa: E402
+                                  FilterIndex, load_filter_index, write_filter_index)
+
+
+def random_deck(n, seed=3):
+    """An artist index and master with every flag the filters look at."""
+    rng = random.Random(seed)
+    index, master = [], {}
+    for i in range(n):
+        wid = "%06x" % i
+        senses = [{"pos": rng.choice(["NOUN", "VERB", "PROPN", "ADJ"]),
+                   "translation": rng.choice(["", " ", "thing", "to go"])}
+                  for _ in range(rng.randint(0, 3))]
+        entry = {"word": "w%d" % i, "senses": senses}
+        for flag in ("is_english", "is_noise", "is_interjection", "is_english_loanword",
+                     "is_propernoun", "is_propernoun_corpus", "is_transparent_cognate"):
+            if rng.random() < 0.08:
+                entry[flag] = True
+        if rng.random() < 0.5:
+            entry["cognate_score"] = rng.choice([0.0, 0.5, 0.75, 0.84, 0.85, 0.95, 1.0])
+        if rng.random() > 0.03:  # a few index cards have no master entry
+            master[wid] = entry
+        idx = {"id": wid, "corpus_count": rng.choice([0, 1, 2, 9]),
+               "sense_frequencies": [rng.choice([0, 0.01, 0.05, 0.5]) for _ in senses]}
+        if rng.random() < 0.2:
+            idx["cognate_score"] = rng.choice([None, 0.2, 0.9])
+        index.append(idx)
+    return index, master
+
+
+class FilterIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index, self.master = random_deck(1000)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index_path = Path(self.tmp.name) / "Deckvocabulary.index.json"
+        self.master_path = Path(self.tmp.name) / "vocabulary_master.json"
+        self.index_path.write_text(json.dumps(self.index))
+        self.master_path.write_text(json.dumps(self.master))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bitsets_match_the_per_card_scan(self):
+        fi = FilterIndex(build_filter_index(self.index, self.master))
+        expected = [idx["id"] for idx in self.index if visible(self.master.get(idx["id"]), idx)]
+        self.assertTrue(0 < len(expected) < len(self.index))
+        self.assertEqual(fi.ids_of(visible_mask(fi)), expected)
+        self.assertEqual(fi.ids, [idx["id"] for idx in self.index])
+
+    def test_written_index_is_used_while_current(self):
+        path = write_filter_index(self.index_path, self.index, self.master, self.master_path)
+        self.assertEqual(path, str(Path(self.tmp.name) / "Deckvocabulary.filter.json"))
+        self.assertEqual(filter_index_path(self.index_path), path)
+        fi = load_filter_index(path)
+        self.assertTrue(fi.is_current(self.index_path, self.master_path))
+        scan = {i["id"] for i in self.index if visible(self.master.get(i["id"]), i)}
+        self.assertEqual(visible_card_ids(self.index, self.master, str(self.index_path),
+                                          str(self.master_path)), scan)
+
+        # The master is stamped after assembly: the stale bitsets are ignored.
+        first = next(i for i in self.index if i["id"] in scan)
+        self.master[first["id"]]["is_english_loanword"] = True
+        self.master_path.write_text(json.dumps(self.master))
+        self.assertFalse(fi.is_current(self.index_path, self.master_path))
+        self.assertEqual(visible_card_ids(self.index, self.master, str(self.index_path),
+                                          str(self.master_path)), scan - {first["id"]})
+
+    def test_normal_decks_read_senses_from_the_index(self):
+        index = [
+            {"id": "a", "corpus_count": 5, "meanings": [{"pos": "NOUN", "translation": "house"}]},
+            {"id": "b", "corpus_count": 5, "meanings": [{"pos": "X", "translation": ""}]},
+            {"id": "c", "corpus_count": 5, "cognate_score": 0.9,
+             "meanings": [{"pos": "ADJ", "translation": "normal"}]},
+        ]
+        fi = FilterIndex(build_filter_index(index))
+        self.assertEqual(fi.ids_of(fi["has_translation"]), ["a", "c"])
+        self.assertEqual(fi.ids_of(fi["cognate@0.85"]), ["c"])
+        self.assertEqual(fi.ids_of(fi["cognate@0.95"]), [])
+        self.assertEqual(fi.ids_of(fi["pos:NOUN"] | fi["pos:ADJ"]), ["a", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
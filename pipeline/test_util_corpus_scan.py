@@ -0,0 +1,153 @@
+import random
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from util_corpus_scan import CorpusVisitor, read_state, scan_corpus, shard_path  # noqa: E402
+from util_subtitle_corpus import SubtitleCorpus  # noqa: E402
+
+_WORDS = ["casa", "perro", "tengo", "noche", "gato", "mesa", "agua", "calle"]
+
+
+class WordCounter(CorpusVisitor):
+    """Mergeable: counts are order-free."""
+
+    name = "words"
+    mergeable = True
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def visit(self, number, line):
+        self.counts.update(line["es"].split())
+
+    def state(self):
+        return {"counts": dict(self.counts)}
+
+    def restore(self, state):
+        self.counts = Counter(state.get("counts", {}))
+
+    def merge(self, state):
+        self.counts.update(state.get("counts", {}))
+
+
+class FirstLines(CorpusVisitor):
+    """Order-dependent: the first line numbers each English word was seen on."""
+
+    name = "first"
+
+    def __init__(self):
+        self.first = {}
+
+    def visit(self, number, line):
+        for word in line["en"].split():
+            self.first.setdefault(word, number)
+
+    def state(self):
+        return {"first": self.first}
+
+    def restore(self, state):
+        self.first = dict(state.get("first", {}))
+
+
+def make_counters():
+    return [WordCounter()]
+
+
+class CorpusScanTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.corp = self.root / "opensubtitles"
+        self.corp.mkdir()
+        rng = random.Random(3)
+        self.write({
+            "es": [" ".join(rng.choices(_WORDS, k=rng.randint(1, 6))) for _ in range(1000)],
+            "en": ["w%d x%d" % (rng.randrange(400), n % 7) for n in range(1000)],
+            "ids": ["es/%d.xml\ten/%d.xml\t%d\t%d" % (n, n, n, n) for n in range(1000)],
+        })
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, sides):
+        for side, lines in sides.items():
+            (self.corp / ("OpenSubtitles.en-es." + side)).write_text(
+                "".join(line + "\n" for line in lines), encoding="utf-8")
+
+    def corpus(self):
+        return SubtitleCorpus(self.corp)
+
+    def scan_alone(self, visitor, **kwargs):
+        scan_corpus(self.corpus(), [visitor], **kwargs)
+        return visitor.state()
+
+    def test_one_pass_feeds_every_visitor_what_it_would_see_alone(self):
+        words, first = WordCounter(), FirstLines()
+        result = scan_corpus(self.corpus(), [words, first], start=101, stop=900)
+        self.assertEqual(result, {"line_number": 900, "lines": 800, "complete": True,
+                                  "interrupted": False})
+        self.assertEqual(words.state(), self.scan_alone(WordCounter(), start=101, stop=900))
+        self.assertEqual(first.state(), self.scan_alone(FirstLines(), start=101, stop=900))
+
+    def test_paused_scan_resumes_where_it_stopped(self):
+        checkpoint = self.root / "run" / "checkpoint.json"
+        expected = self.scan_alone(FirstLines())
+        runs = []
+        while True:
+            visitor = FirstLines()
+            result = scan_corpus(self.corpus(), [visitor], checkpoint=checkpoint,
+                                 checkpoint_every=100, resume=True, max_lines=330)
+            runs.append(result["lines"])
+            if result["complete"]:
+                break
+        self.assertEqual(runs, [330, 330, 330, 10])
+        self.assertEqual(visitor.state(), expected)
+        self.assertEqual(read_state(checkpoint)["line_number"], 1000)
+
+        # Finished: a resume restores the result without reading anything.
+        again = FirstLines()
+        self.assertEqual(scan_corpus(self.corpus(), [again], checkpoint=checkpoint,
+                                     resume=True)["lines"], 0)
+        self.assertEqual(again.state(), expected)
+
+    def test_checkpoint_from_a_changed_corpus_is_refused(self):
+        checkpoint = self.root / "checkpoint.json"
+        scan_corpus(self.corpus(), [WordCounter()], stop=500, checkpoint=checkpoint,
+                    max_lines=200)
+        es = self.corp / "OpenSubtitles.en-es.es"
+        es.write_bytes(b"una casa nueva\n" + es.read_bytes())
+        with self.assertRaisesRegex(ValueError, "offsets"):
+            scan_corpus(self.corpus(), [WordCounter()], stop=500, checkpoint=checkpoint,
+                        resume=True)
+
+    def test_sharded_scan_merges_to_the_sequential_result(self):
+        checkpoint = self.root / "checkpoint.json"
+        words = WordCounter()
+        result = scan_corpus(self.corpus(), [words], workers=3, checkpoint=checkpoint,
+                             make_visitors=make_counters)
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["lines"], 1000)
+        self.assertEqual(words.state(), self.scan_alone(WordCounter()))
+        self.assertFalse(shard_path(checkpoint, 0, 3).exists())
+        self.assertEqual(read_state(checkpoint)["shards"], 3)
+
+        # The same checkpoint cannot be continued with another worker count.
+        paused = self.root / "paused.json"
+        scan_corpus(self.corpus(), [WordCounter()], workers=2, checkpoint=paused,
+                    max_lines=100, make_visitors=make_counters)
+        with self.assertRaises(ValueError):
+            scan_corpus(self.corpus(), [WordCounter()], workers=3, checkpoint=paused,
+                        resume=True, make_visitors=make_counters)
+
+        with self.assertRaises(ValueError):
+            scan_corpus(self.corpus(), [FirstLines()], workers=2,
+                        make_visitors=lambda: [FirstLines()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import util_layer_format as layers  # noqa: E402
+
+
+PAYLOAD = {
+    "que": [
+        {"id": "1:14", "spanish": "Pa' vivir el sueño", "title": "rookie", "surface": "que"},
+        {"id": "1:15", "spanish": "Pa' vivir el sueño", "title": "rookie", "surface": "que",
+         "vocalists": ["Young Miko"], "spotify_available": False, "score": 0.5},
+    ],
+    "_meta": {"step_version": 6, "empty": None},
+}
+
+
+class LayerFormatTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "examples_raw.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_shares_one_object_per_string(self):
+        decoded = layers.decode_layer(layers.encode_layer(PAYLOAD))
+
+        self.assertEqual(decoded, PAYLOAD)
+        self.assertEqual(list(decoded["que"][1]), list(PAYLOAD["que"][1]))
+        self.assertIs(decoded["que"][0]["spanish"], decoded["que"][1]["spanish"])
+
+    def test_non_json_shapes_encode_like_json_dump(self):
+        data = {"pair": ("a", "b"), "nested": {1: "one"}}
+        self.assertEqual(layers.decode_layer(layers.encode_layer(data)),
+                         json.loads(json.dumps(data)))
+
+    def test_read_layer_prefers_fresh_binary_and_ignores_stale_one(self):
+        with mock.patch.dict(os.environ, {layers.LAYER_FORMAT_ENV: "binary"}):
+            layers.write_layer(self.path, PAYLOAD)
+        binary = layers.binary_layer_path(self.path)
+        self.assertTrue(binary.is_file())
+        data, source = layers.read_layer(self.path)
+        self.assertEqual((data, source), (PAYLOAD, binary))
+
+        # A hand edit to the JSON makes the binary stale.
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"edited": []}, f)
+        stat = binary.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(layers.read_layer(self.path), ({"edited": []}, self.path))
+        self.assertFalse(binary.exists())
+
+    def test_edit_that_keeps_the_mtime_still_makes_binary_stale(self):
+        layers.write_layer(self.path, PAYLOAD, layer_fmt="binary")
+        stat = self.path.stat()
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"edited": []}, f)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(layers.read_layer(self.path), ({"edited": []}, self.path))
+
+    def test_binary_without_its_json_is_deleted_not_read(self):
+        layers.write_layer(self.path, PAYLOAD, layer_fmt="binary")
+        self.path.unlink()
+
+        self.assertFalse(layers.layer_exists(self.path))
+        self.assertFalse(layers.binary_layer_path(self.path).exists())
+        with self.assertRaises(FileNotFoundError):
+            layers.read_layer(self.path)
+
+    def test_json_mode_removes_binary_sibling(self):
+        layers.write_layer(self.path, PAYLOAD, layer_fmt="binary")
+        layers.write_layer(self.path, {"x": []}, layer_fmt="json")
+
+        self.assertFalse(layers.binary_layer_path(self.path).exists())
+        self.assertEqual(layers.read_layer(self.path)[0], {"x": []})
+
+    def test_export_rebuilds_json_without_shadowing_binary(self):
+        layers.write_layer(self.path, PAYLOAD, layer_fmt="binary")
+        binary = layers.binary_layer_path(self.path)
+        self.path.unlink()
+
+        layers.export_json(binary)
+
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), PAYLOAD)
+        self.assertEqual(layers.read_layer(self.path)[1],
+                         layers.binary_layer_path(self.path))
+
+    def test_rejects_unknown_format_flag(self):
+        with mock.patch.dict(os.environ, {layers.LAYER_FORMAT_ENV: "parquet"}):
+            with self.assertRaises(ValueError):
+                layers.layer_format()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import util_line_lid as lid_module  # noqa: E402
+from util_line_lid import LineLanguageIdentifier  # noqa: E402
+
+
+ENGLISH_WORDS = {"the", "you", "baby", "know", "i"}
+
+
+def _confidences(text):
+    words = text.lower().split()
+    english = sum(word in ENGLISH_WORDS for word in words) / max(len(words), 1)
+    values = [("ENGLISH", english), ("SPANISH", 1.0 - english)]
+    values.sort(key=lambda pair: -pair[1])
+    return [SimpleNamespace(language=SimpleNamespace(name=name), value=value)
+            for name, value in values]
+
+
+class FakeDetector:
+    """Stands in for a lingua detector; records what it was asked."""
+
+    def __init__(self):
+        self.batches = []
+        self.singles = []
+
+    def compute_language_confidence_values_in_parallel(self, texts):
+        self.batches.append(list(texts))
+        return [_confidences(text) for text in texts]
+
+    def compute_language_confidence_values(self, text):
+        self.singles.append(text)
+        return _confidences(text)
+
+
+class LineLanguageIdentifierTests(unittest.TestCase):
+    def test_prime_detects_each_unique_line_once_in_one_batch(self):
+        detector = FakeDetector()
+        lid = LineLanguageIdentifier(["spanish", "english"], detector=detector)
+
+        lid.prime(["you know the baby", "you  know the baby ", "dime que sí", ""])
+
+        self.assertEqual(detector.batches, [["you know the baby", "dime que sí"]])
+        self.assertEqual(lid.verdict("you know the baby"), ("english", 1.0))
+        self.assertTrue(lid.is_language("you know the baby", "english", 0.7))
+        self.assertFalse(lid.is_language("dime que sí", "english", 0.7))
+        self.assertEqual(detector.singles, [])
+        report = lid.report()
+        self.assertEqual((report["lines"], report["unique"], report["detected"]), (3, 2, 2))
+
+    def test_cache_is_keyed_by_language_set_and_reused(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = LineLanguageIdentifier(
+                ["spanish", "english"], cache_dir=cache_dir, detector=FakeDetector())
+            first.prime(["you know the baby", "dime que sí"])
+            first.save()
+
+            detector = FakeDetector()
+            second = LineLanguageIdentifier(
+                ["english", "spanish"], cache_dir=cache_dir, detector=detector)
+            second.prime(["dime que sí", "you know the baby"])
+            self.assertEqual(detector.batches, [])
+            self.assertEqual(second.report()["cache_hit_rate"], 1.0)
+            self.assertEqual(second.verdict("dime que sí")[0], "spanish")
+
+            other = LineLanguageIdentifier(
+                ["french", "english"], cache_dir=cache_dir, detector=FakeDetector())
+            self.assertNotEqual(other.cache_path, second.cache_path)
+            self.assertEqual(other.report()["unique"], 0)
+
+    def test_unprimed_verdict_falls_back_to_single_detection(self):
+        detector = FakeDetector()
+        lid = LineLanguageIdentifier(["spanish", "english"], detector=detector)
+
+        self.assertEqual(lid.verdict("I know")[0], "english")
+        self.assertEqual(lid.verdict("I know")[0], "english")
+        self.assertEqual(detector.singles, ["I know"])
+        self.assertEqual(lid.verdict("   "), (None, None))
+
+    def test_signature_separates_language_sets(self):
+        self.assertEqual(
+            lid_module.detector_signature(["Spanish", "english"]).split("@")[0],
+            "english+spanish")
+        self.assertEqual(
+            lid_module.detector_signature(lid_module.ALL_LANGUAGES).split("@")[0], "all")
+
+
+class CountWordsLidTests(unittest.TestCase):
+    def test_english_lines_are_excluded_with_one_batch_call(self):
+        from pipeline.artist.step_2a_count_words import build_counts_and_candidates
+
+        chorus = "You know the baby I know\n"
+        songs = [
+            {"id": "a", "title": "A",
+             "lyrics": "Lyrics\n" + chorus + "Dime que sí mi amor bonito\n" + chorus},
+            {"id": "b", "title": "B", "lyrics": "Lyrics\n" + chorus + "Hola\n"},
+        ]
+        detector = FakeDetector()
+
+        counts, _candidates, stats, _ngrams, _songs = build_counts_and_candidates(
+            songs, lid_detector=detector)
+
+        self.assertEqual(len(detector.batches), 1)
+        self.assertEqual(sorted(detector.batches[0]),
+                         ["Dime que sí mi amor bonito", "You know the baby I know"])
+        self.assertEqual(detector.singles, [])
+        self.assertEqual(counts["baby"], 0)
+        self.assertEqual(counts["amor"], 1)
+        self.assertEqual(stats["lines_skipped"], 3)
+        self.assertEqual(stats["lines_below_min_tokens"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
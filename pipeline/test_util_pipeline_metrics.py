@@ -0,0 +1,62 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import util_pipeline_metrics as metrics  # noqa: E402
+from util_evidence_store import archive_json_artifact  # noqa: E402
+from util_pipeline_meta import make_meta  # noqa: E402
+
+
+class StepMetricsTests(unittest.TestCase):
+    def setUp(self):
+        metrics.METRICS.reset()
+
+    def tearDown(self):
+        metrics.METRICS.reset()
+
+    def test_spans_and_counters_accumulate(self):
+        collector = metrics.StepMetrics()
+        for _ in range(2):
+            with collector.span("load"):
+                pass
+        collector.count("cache_hits", 3)
+        collector.count("cache_misses")
+
+        snap = collector.snapshot()
+
+        self.assertEqual(snap["spans"]["load"]["calls"], 2)
+        self.assertEqual(snap["counters"], {"cache_hits": 3, "cache_misses": 1})
+        self.assertEqual(snap["cache_hit_rate"], 0.75)
+
+    def test_make_meta_embeds_metrics_only_when_recorded(self):
+        self.assertNotIn("metrics", make_meta("demo", 1))
+
+        with metrics.span("work"):
+            metrics.count("items", 5)
+        meta = make_meta("demo", 1)
+
+        self.assertEqual(meta["metrics"]["counters"], {"items": 5})
+        self.assertIn("work", meta["metrics"]["spans"])
+        self.assertNotIn("metrics", make_meta("demo", 1, metrics=False))
+
+    def test_archived_meta_without_metrics_is_one_snapshot_across_runs(self):
+        def archived_run(evidence_dir, items):
+            metrics.METRICS.reset()
+            metrics.count("items", items)
+            payload = {"words": ["casa"], "_meta": make_meta("demo", 1, metrics=False)}
+            return archive_json_artifact(evidence_dir, "demo", payload)["run_id"]
+
+        with tempfile.TemporaryDirectory() as evidence_dir:
+            self.assertEqual(archived_run(evidence_dir, 5), archived_run(evidence_dir, 7))
+
+    def test_package_and_script_imports_share_one_collector(self):
+        from pipeline import util_pipeline_metrics as packaged
+
+        self.assertIs(packaged.METRICS, metrics.METRICS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from util_subtitle_corpus import SubtitleCorpus  # noqa: E402
+
+
+class SubtitleCorpusTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.corp = root / "opensubtitles"
+        self.corp.mkdir()
+        self.es = ["línea %d con ñ\n" % n for n in range(1, 501)]
+        self.en = ["line %d\n" % n for n in range(1, 501)]
+        self.ids = ["en/0/%d/1.xml.gz\tes/0/%d/1.xml.gz\t%d\t%d\n" % (n, n, n, n)
+                    for n in range(1, 501)]
+        self.es[6] = "con retorno\r\n"
+        self.write("es", self.es)
+        self.write("en", self.en)
+        self.write("ids", self.ids[:-1] + [self.ids[-1].rstrip("\n")])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, side, lines):
+        path = self.corp / ("OpenSubtitles.en-es." + side)
+        path.write_bytes("".join(lines).encode("utf-8"))
+
+    def corpus(self):
+        return SubtitleCorpus(self.corp)
+
+    def test_lines_match_text_mode_reading(self):
+        corpus = self.corpus()
+        self.assertEqual(len(corpus), 500)
+        self.assertEqual(corpus.line(7)["es"], "con retorno\n")
+        self.assertEqual(corpus.line(500)["ids"], self.ids[-1].rstrip("\n"))
+        with open(self.corp / "OpenSubtitles.en-es.en", encoding="utf-8") as f:
+            expected = list(enumerate(f, 1))[99:200]
+        self.assertEqual([(n, line["en"]) for n, line in corpus.iter_range(100, 200)],
+                         expected)
+        with self.assertRaises(IndexError):
+            corpus.line(501)
+
+    def test_sample_is_seeded_and_read_by_offset(self):
+        corpus = self.corpus()
+        numbers = corpus.sample(20, random.Random(3), start=101)
+        self.assertEqual(numbers, corpus.sample(20, random.Random(3), start=101))
+        self.assertEqual(len(set(numbers)), 20)
+        self.assertTrue(all(101 <= n <= 500 for n in numbers))
+        for n, line in corpus.lines(numbers, sides=("es", "ids")):
+            self.assertEqual(line["es"], self.es[n - 1].replace("\r\n", "\n"))
+            self.assertTrue(line["ids"].endswith("\t%d\t%d\n" % (n, n)) or n == 500)
+
+    def test_offsets_are_cached_and_rebuilt_when_a_file_changes(self):
+        self.corpus().line(1)
+        cache = self.corp.parent / "sentence_index" / "line_offsets"
+        before = sorted(p.name for p in cache.iterdir())
+        self.assertEqual(len(before), 3)
+        self.write("en", self.en[:400])
+        corpus = self.corpus()
+        self.assertEqual(len(corpus), 400)
+        after = sorted(p.name for p in cache.iterdir())
+        self.assertEqual(len(after), 3)
+        self.assertNotEqual(before, after)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""util_wsd_metrics must report exactly what the per-item loops reported."""
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from util_wsd_metrics import PrecisionCurve, bootstrap_yield, yield_at  # noqa: E402
+
+
+def loop_kept(scores, ok, target, kind="quicksort"):
+    """The loop every benchmark used to carry."""
+    order = np.argsort(-np.asarray(scores), kind=kind)
+    good = best = 0
+    for i, j in enumerate(order, 1):
+        good += ok[j]
+        if good / i >= target:
+            best = i
+    return best
+
+
+def loop_kept_under(ok_ranked, ceiling):
+    best = bad = 0
+    for i, acceptable in enumerate(ok_ranked, 1):
+        bad += not acceptable
+        if bad / i <= ceiling:
+            best = i
+    return best
+
+
+class PrecisionCurveTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.cases = []
+        for n, base in ((1, 0.9), (7, 1.0), (300, 0.97), (2000, 0.9), (2000, 0.999)):
+            # Rounded scores, so ties are common and ordering matters.
+            scores = np.round(rng.random(n), 2)
+            ok = (rng.random(n) < base * (0.5 + scores / 2)).astype(int)
+            self.cases.append((scores, ok))
+
+    def test_kept_matches_the_loop_at_every_target(self):
+        targets = [0.0, 0.5, 0.9, 0.95, 0.99, 1.0]
+        for scores, ok in self.cases:
+            for kind in ("quicksort", "stable"):
+                curve = PrecisionCurve(scores, ok, kind=kind)
+                self.assertEqual(curve.kept(targets).tolist(),
+                                 [loop_kept(scores, ok, t, kind) for t in targets])
+            self.assertEqual(yield_at(scores, ok, 0.95),
+                             loop_kept(scores, ok, 0.95) / len(ok))
+
+    def test_kept_under_matches_the_bad_rate_loop(self):
+        ceilings = [0.0, 0.02, 0.05, 0.1, 1.0]
+        for scores, ok in self.cases:
+            curve = PrecisionCurve(scores, ok, kind="stable")
+            self.assertEqual(curve.kept_under(ceilings).tolist(),
+                             [loop_kept_under(curve.ok, c) for c in ceilings])
+
+    def test_cut_and_top_read_the_same_ranking(self):
+        scores, ok = self.cases[3]
+        curve = PrecisionCurve(scores, ok)
+        order = np.argsort(-scores)
+        k = loop_kept(scores, ok, 0.9)
+        self.assertEqual(curve.cut_at(0.9), scores[order[k - 1]])
+        self.assertIsNone(PrecisionCurve([0.5, 0.4], [0, 0]).cut_at(0.5))
+        self.assertEqual(curve.top(100), ok[order[:100]].mean())
+
+    def test_empty_ranking_keeps_nothing(self):
+        curve = PrecisionCurve([], [])
+        self.assertEqual(curve.kept(0.99), 0)
+        self.assertEqual(curve.yield_at(0.99), 0.0)
+
+
+class BootstrapTests(unittest.TestCase):
+    def test_interval_brackets_the_point_estimate_and_is_reproducible(self):
+        rng = np.random.default_rng(2)
+        scores = rng.random(800)
+        ok = (rng.random(800) < 0.6 + 0.4 * scores).astype(int)
+        got = bootstrap_yield(scores, ok, [0.9, 0.99], n_boot=300, batch=64)
+        self.assertEqual(got, bootstrap_yield(scores, ok, [0.9, 0.99], n_boot=300))
+        for target, (low, high) in got.items():
+            self.assertLessEqual(low, high)
+            self.assertTrue(low <= yield_at(scores, ok, target) <= high, target)
+
+    def test_degenerate_rankings_have_no_spread(self):
+        scores = np.array([0.9, 0.8, 0.1, 0.4])
+        self.assertEqual(bootstrap_yield(scores, np.ones(4), [1.0], n_boot=50),
+                         {1.0: (1.0, 1.0)})
+        self.assertEqual(bootstrap_yield(scores, np.zeros(4), [0.5], n_boot=50),
+                         {0.5: (0.0, 0.0)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""The sweep must evaluate each config the way the trainer would on its own."""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from test_util_6d_wsd_features import MENUS, make_rows  # noqa: E402
+from tool_6d_train_calibrator import ablate, featurise_all  # noqa: E402
+from wsd_harness import sweep_calibrator as sweep  # noqa: E402
+
+HAVE_SKLEARN = importlib.util.find_spec("sklearn") is not None
+
+
+def labelled_rows(n, seed):
+    rng = random.Random(seed)
+    rows = make_rows(n, seed)
+    for r in rows:
+        r["ok_tup"] = rng.random() < 0.5 + r["tgap"] / 2
+        r["ok_leaf"] = r["ok_tup"] and rng.random() < 0.6
+    return rows
+
+
+class SweepTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work = Path(self.temp_dir.name)
+        self.rows = labelled_rows(600, 8)
+        sweep.write_arrays(self.work, self.rows, {}, MENUS)
+
+    def tearDown(self):
+        sweep._SHARED.clear()
+        self.temp_dir.cleanup()
+
+    def test_ablating_the_shared_matrix_equals_featurising_with_the_flag(self):
+        X = featurise_all(self.rows, {}, MENUS)
+        for no_companion, no_structural in sweep.ABLATIONS.values():
+            np.testing.assert_array_equal(
+                ablate(X, no_companion, no_structural),
+                featurise_all(self.rows, {}, MENUS, no_companion, no_structural))
+
+    def test_workers_map_the_arrays_read_only(self):
+        sweep.attach(self.work)
+        self.assertIsInstance(sweep._SHARED["X"], np.memmap)
+        self.assertFalse(sweep._SHARED["X"].flags.writeable)
+        np.testing.assert_array_equal(sweep._SHARED["X"], featurise_all(self.rows, {}, MENUS))
+        self.assertEqual(int(sweep._SHARED["ok_leaf"].sum()),
+                         sum(r["ok_leaf"] for r in self.rows))
+
+    def test_grid_fits_once_per_model_setting(self):
+        args = argparse.Namespace(ablation=["none", "both"], target=["tup", "leaf"],
+                                  learning_rate=[0.06], max_iter=[50, 100],
+                                  max_leaf_nodes=[15], band_high=[0.0, 0.98],
+                                  band_medium=[0.0])
+        configs = sweep.grid(args)
+        self.assertEqual(len(configs), 8)
+        self.assertEqual(configs[0]["bands"], [(0.0, 0.0), (0.98, 0.0)])
+        self.assertEqual(configs[1]["params"]["max_iter"], 100)
+
+    @unittest.skipUnless(HAVE_SKLEARN, "scikit-learn is not installed")
+    def test_pool_and_inline_sweeps_agree(self):
+        args = argparse.Namespace(ablation=["none", "structural"], target=["tup"],
+                                  learning_rate=[0.1], max_iter=[30], max_leaf_nodes=[7],
+                                  band_high=[0.0, 0.8], band_medium=[0.0])
+        configs = sweep.grid(args)
+        drop = ("fit_s",)
+        inline = [{k: v for k, v in r.items() if k not in drop}
+                  for r in sweep.sweep(configs, self.work)]
+        pooled = [{k: v for k, v in r.items() if k not in drop}
+                  for r in sweep.sweep(configs, self.work, workers=2)]
+        self.assertEqual(inline, pooled)
+        self.assertEqual(len(inline), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -210,7 +210,7 @@ def main():
     # ------------------------------------------------------------------
     # Backfill
     # ------------------------------------------------------------------
-    print(f"\nStreaming {opensubs_es.name} for new candidates...")
+    print(f"\nLooking up new candidates in {opensubs_es.name}...")
     _backfill_rare_examples(
         output, inventory,
         opensubs_es, opensubs_en,
@@ -22,10 +22,15 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 REPO = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from util_5a_sentence_bank import SentenceBank  # noqa: E402
+
 LAYERS = REPO / "Data/Spanish/layers"
 SUBS = LAYERS / "subtitles"
 
@@ -43,15 +48,6 @@ def main():
     subs.mkdir(parents=True, exist_ok=True)
 
     bank_path = subs / "sentence_bank.jsonl"
-    existing = {}
-    if bank_path.exists():
-        with bank_path.open(encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    row = json.loads(line)
-                    existing[row["id"]] = row
-
     rows, candidates, alignment = {}, {}, {}
     no_align = 0
     if (subs / "alignment.json").exists():
@@ -85,12 +81,9 @@ def main():
         if ids:
             candidates[word] = {"clean": ids, "held": []}
 
-    merged = dict(existing)
-    for sid, row in rows.items():
-        merged.setdefault(sid, row)
-    with bank_path.open("w", encoding="utf-8") as f:
-        for sid in sorted(merged):
-            f.write(json.dumps(merged[sid], ensure_ascii=False) + "\n")
+    with SentenceBank(bank_path) as bank:
+        bank.append(rows[sid] for sid in sorted(rows))
+        banked = len(bank)
 
     cand_path = subs / "word_candidates.json"
     if cand_path.exists():
@@ -109,14 +102,14 @@ def main():
         "source": str(args.examples),
         "words_with_examples": len(candidates),
         "sentences_seeded": len(rows),
-        "sentences_in_bank": len(merged),
+        "sentences_in_bank": banked,
         "alignment_scores": len(alignment),
         "missing_alignment": no_align,
     }, ensure_ascii=False, indent=2), encoding="utf-8")
 
     print("seeded from %s" % args.examples)
     print("  words with candidates: %d" % len(candidates))
-    print("  sentences into bank:   %d (bank now %d)" % (len(rows), len(merged)))
+    print("  sentences into bank:   %d (bank now %d)" % (len(rows), banked))
     print("  alignment scores:      %d (missing %d)" % (len(alignment), no_align))
     print("wrote %s" % subs)
 
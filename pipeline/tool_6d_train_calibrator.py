@@ -26,6 +26,9 @@ from `bench_token_prototypes.py --out`, and writes a joblib model plus a manifes
 recording exactly which feature order it expects.
 
     python3 pipeline/tool_6d_train_calibrator.py --rows ROWS.json --token TOK.json
+
+One configuration per run. Grids of ablations, targets, model settings and band
+targets go through pipeline/wsd_harness/sweep_calibrator.py, which featurises once.
 """
 from __future__ import annotations
 
@@ -44,7 +47,8 @@ import sys
 sys.path.insert(0, str(REPO))
 from pipeline.util_6d_wsd_features import (  # noqa: E402
     FEATURES, FEATURE_VERSION, build as build_features, companion_features,
-    structural_features)
+    construction_features, feature_matrix, structural_features)
+from pipeline.util_wsd_metrics import PrecisionCurve, bootstrap_yield  # noqa: E402
 
 
 def split_of(word: str) -> str:
@@ -76,14 +80,84 @@ def featurise(r: dict, tk: dict | None, menus: dict, no_companion=False,
         companion=comp, structural=struct, menu_pos=mpos)
 
 
-def yield_at(scores, ok, target=0.99):
-    order = np.argsort(-scores)
-    good = best = 0
-    for i, j in enumerate(order, 1):
-        good += ok[j]
-        if good / i >= target:
-            best = i
-    return best / len(ok)
+def featurise_all(rows: list[dict], tok: dict, menus: dict, no_companion=False,
+                  no_structural=False) -> np.ndarray:
+    """featurise() for every row at once: the same matrix, built by column.
+
+    Each word's menu is read once rather than once per row; see
+    util_6d_wsd_features.feature_matrix.
+    """
+    empty: dict = {}
+    row_menus = [menus.get(r["word"], empty) for r in rows]
+    preds = [r.get("pred_leaf") for r in rows]
+    comp, struct = construction_features(
+        [r["word"] for r in rows], [r["sent"] for r in rows], row_menus, preds,
+        _tuple_of, companion=not no_companion, structural=not no_structural)
+    token = []
+    for r in rows:
+        tk = tok.get((r["word"], r["sent"]))
+        token.append((0.0, 0.0, 0.0) if tk is None else
+                     (1.0, tk["gap"], float(tuple(tk["pred"]) == tuple(r["pred_tup"]))))
+    return feature_matrix(
+        tuple_gap=[r["tgap"] for r in rows], class_gap=[r["cgap"] for r in rows],
+        n_tup=[r["n_tup"] for r in rows], n_leaf=[r["n_leaf"] for r in rows],
+        sent_len=[len(r["sent"].split()) for r in rows],
+        pred_tuple=[tuple(r["pred_tup"]) for r in rows],
+        pred_empty=[not ((menu.get(pred) or {}).get("translation") or "").strip()
+                    for menu, pred in zip(row_menus, preds)],
+        token=token, companion=comp, structural=struct)
+
+
+def ablate(X: np.ndarray, no_companion=False, no_structural=False) -> np.ndarray:
+    """X with an ablated block zeroed: what featurise_all builds under the flags."""
+    if not (no_companion or no_structural):
+        return X
+    X = X.copy()
+    for off, prefix in ((no_companion, "companion_"), (no_structural, "struct_")):
+        if off:
+            X[:, [i for i, f in enumerate(FEATURES) if f.startswith(prefix)]] = 0.0
+    return X
+
+
+MODEL_PARAMS = dict(max_iter=300, learning_rate=0.06, max_leaf_nodes=15, random_state=0)
+
+
+def make_model(**params):
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    return HistGradientBoostingClassifier(**{**MODEL_PARAMS, **params})
+
+
+def band_precisions(target: str, band_high=0.0, band_medium=0.0) -> dict:
+    """Precision each band must hold; the defaults depend on the target."""
+    return {"high": band_high or (0.99 if target == "tup" else 0.90),
+            "medium": band_medium or (0.95 if target == "tup" else 0.70)}
+
+
+def band_cut(curve: PrecisionCurve, target: float) -> tuple[float, bool]:
+    """(cut, empty): the P(correct) threshold holding `target` on the curve.
+
+    When no prefix holds it, leaving the cut at 0 would put EVERY item in the
+    band -- for `high` that turns the escalation gate off without saying so.
+    The cut then sits above the best score instead, and `empty` says so.
+    """
+    cut = curve.cut_at(target) or 0
+    if cut:
+        return cut, False
+    return float(curve.scores.max()) + 1e-6, True
+
+
+def load_inputs(rows_path, token_path=""):
+    """(rows with >1 tuple, token predictions by (word, sent), menus)."""
+    menu_raw = json.loads((REPO / "Data/Spanish/layers/sense_menu/spanishdict.json")
+                          .read_text(encoding="utf-8"))
+    menus = {w: {sid: v for e in ent for sid, v in e.get("senses", {}).items()}
+             for w, ent in menu_raw.items()}
+    rows = [r for r in json.loads(Path(rows_path).read_text()) if r["n_tup"] > 1]
+    tok = {}
+    if token_path and Path(token_path).exists():
+        for t in json.loads(Path(token_path).read_text()):
+            tok[(t["word"], t["sent"])] = t
+    return rows, tok, menus
 
 
 def main():
@@ -108,24 +182,16 @@ def main():
                          "finds no cut at all and every item lands in high, which "
                          "silently switches escalation OFF.")
     ap.add_argument("--band-medium", type=float, default=0.0)
+    ap.add_argument("--bootstrap", type=int, default=0, metavar="N",
+                    help="also report a 95%% interval on held-out yield from N "
+                         "resamples of the test split")
     ap.add_argument("--dry-run", action="store_true")
     args = ap.parse_args()
 
-    menu_raw = json.loads((REPO / "Data/Spanish/layers/sense_menu/spanishdict.json")
-                          .read_text(encoding="utf-8"))
-    menus = {w: {sid: v for e in ent for sid, v in e.get("senses", {}).items()}
-             for w, ent in menu_raw.items()}
-
-    rows = [r for r in json.loads(Path(args.rows).read_text()) if r["n_tup"] > 1]
-    tok = {}
-    if args.token and Path(args.token).exists():
-        for t in json.loads(Path(args.token).read_text()):
-            tok[(t["word"], t["sent"])] = t
+    rows, tok, menus = load_inputs(args.rows, args.token)
     print(f"{len(rows):,} training items; {len(tok):,} carry token predictions")
 
-    X = np.array([featurise(r, tok.get((r["word"], r["sent"])), menus,
-                            args.no_companion, args.no_structural)
-                  for r in rows], np.float64)
+    X = featurise_all(rows, tok, menus, args.no_companion, args.no_structural)
     tgt = "ok_tup" if args.target == "tup" else "ok_leaf"
     y = np.array([int(r[tgt]) for r in rows])
     print(f"  target {tgt}: {y.mean():.2%} positive")
@@ -134,41 +200,33 @@ def main():
     tst = ~dev
     print(f"  dev {dev.sum():,}  test {tst.sum():,}  ({len(set(words)):,} words, frozen split)")
 
-    from sklearn.ensemble import HistGradientBoostingClassifier
-
-    model = HistGradientBoostingClassifier(max_iter=300, learning_rate=0.06,
-                                           max_leaf_nodes=15, random_state=0)
+    model = make_model()
     model.fit(X[dev], y[dev])
     p = model.predict_proba(X[tst])[:, 1]
-    base = yield_at(X[tst][:, 0], y[tst])
-    got = yield_at(p, y[tst])
+    gap_curve, cal_curve = PrecisionCurve(X[tst][:, 0], y[tst]), PrecisionCurve(p, y[tst])
+    base = gap_curve.yield_at(0.99)
+    got = cal_curve.yield_at(0.99)
     print(f"\n  tuple gap alone   yield@99% {base:>6.1%}")
     print(f"  calibrated        yield@99% {got:>6.1%}")
+    if args.bootstrap:
+        for lab, s in (("tuple gap alone", X[tst][:, 0]), ("calibrated", p)):
+            low, high = bootstrap_yield(s, y[tst], [0.99], n_boot=args.bootstrap)[0.99]
+            print(f"  {lab:<17} 95% CI     [{low:.1%}, {high:.1%}]  ({args.bootstrap} resamples)")
     print(f"\n  {'keep top':>9}{'tuple gap':>12}{'calibrated':>12}")
     for K in (10, 20, 30, 40, 50):
         k = max(1, int(tst.sum() * K / 100))
-        a = y[tst][np.argsort(-X[tst][:, 0])[:k]].mean()
-        b = y[tst][np.argsort(-p)[:k]].mean()
-        print(f"  {K:>8}%{a:>12.2%}{b:>12.2%}")
+        print(f"  {K:>8}%{gap_curve.top(k):>12.2%}{cal_curve.top(k):>12.2%}")
 
     # Band cuts are P(correct) thresholds read off the held-out curve, not
     # guessed. step_6e reads them from the manifest.
     band_cuts = {}
-    order = np.argsort(-p)
-    hi = args.band_high or (0.99 if args.target == "tup" else 0.90)
-    md = args.band_medium or (0.95 if args.target == "tup" else 0.70)
-    prec = {"high": hi, "medium": md}
-    for label, target in (("high", hi), ("medium", md)):
-        good = cut = 0
-        for i, j in enumerate(order, 1):
-            good += y[tst][j]
-            if good / i >= target:
-                cut = float(p[j])
-        if not cut:
-            # No prefix of the ranking holds that precision. Leaving the cut at
-            # 0 would put EVERY item in the band -- for `high` that turns the
-            # escalation gate off without saying so. Fail towards escalating.
-            cut = float(p.max()) + 1e-6
+    prec = band_precisions(args.target, args.band_high, args.band_medium)
+    hi, md = prec["high"], prec["medium"]
+    for label, target in prec.items():
+        cut, empty = band_cut(cal_curve, target)
+        if empty:
+            # No prefix of the ranking holds that precision: fail towards
+            # escalating rather than trusting everything.
             print(f"  !! no cut reaches {target:.0%} precision for `{label}`; "
                   f"band left EMPTY (cut {cut:.4f}) so nothing is silently trusted")
         band_cuts[label] = round(cut, 4)
@@ -181,8 +239,7 @@ def main():
 
     # Refit on everything for the shipped model — the split existed to get an
     # honest estimate, and that estimate is now recorded above.
-    final = HistGradientBoostingClassifier(max_iter=300, learning_rate=0.06,
-                                           max_leaf_nodes=15, random_state=0)
+    final = make_model()
     final.fit(X, y)
 
     import joblib
@@ -26,7 +26,7 @@ import os
 import time
 
 from bench_deck_quality import (
-    ARTISTS, DETECTOR_KNOWN_OK, MASTER, keynorm, norm, real_senses, visible,
+    ARTISTS, DETECTOR_KNOWN_OK, MASTER, keynorm, norm, real_senses, visible_card_ids,
     detect_blank_rows, detect_verbose_def, detect_cognate_leak, detect_menu_bloat,
     detect_code_switch_verbatim, detect_propernoun_caps,
 )
@@ -86,10 +86,11 @@ def build_candidates(master_path, suffix, detector_names):
     if want & set(MASTER_SIDE_DETECTORS):
         for artist, (ipath, _epath) in artists.items():
             idx_list = json.load(open(ipath))
+            shown = visible_card_ids(idx_list, m, ipath, master_path)
             for idx in idx_list:
                 mid = idx.get("id")
                 mst = m.get(mid)
-                if not visible(mst, idx):
+                if mid not in shown:
                     continue
                 if mid in visible_ids:
                     continue
@@ -139,7 +140,8 @@ def build_candidates(master_path, suffix, detector_names):
         for artist, (ipath, epath) in artists.items():
             idx_list = json.load(open(ipath))
             ex = json.load(open(epath))
-            vis = {idx["id"]: idx for idx in idx_list if visible(m.get(idx.get("id")), idx)}
+            shown = visible_card_ids(idx_list, m, ipath, master_path)
+            vis = {idx["id"]: idx for idx in idx_list if idx.get("id") in shown}
             for mid in vis:
                 node = ex.get(mid)
                 if not node:
@@ -4,7 +4,8 @@
 The v0.1 architecture has three deliberately separate phases:
 
 * ``prepare``: snapshot a SpanishDict inventory and reservoir-sample real,
-  provenance-bearing bilingual corpus occurrences.
+  provenance-bearing bilingual corpus occurrences (from every line, or from
+  a seeded uniform sample of ``sample_lines`` lines read by offset).
 * ``classify``: assign each occurrence directly to an allowed SpanishDict
   sense ID (or abstain) with a replaceable offline classifier.
 * ``summarize``: derive conservative prominence bands and a high-confidence
@@ -28,6 +29,9 @@ import re
 import subprocess
 from typing import Any, Iterable
 
+from util_corpus_scan import CorpusVisitor, scan_corpus
+from util_subtitle_corpus import SubtitleCorpus
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SPANISH = ROOT / "Data" / "Spanish"
@@ -128,6 +132,9 @@ def validate_config(config: dict[str, Any]) -> dict[str, Any]:
     sample_size = config.get("sample_size_per_target")
     if not isinstance(sample_size, int) or sample_size < 1:
         raise ValueError("sample_size_per_target must be a positive integer")
+    sample_lines = config.get("sample_lines", 0)
+    if not isinstance(sample_lines, int) or sample_lines < 0:
+        raise ValueError("sample_lines must be a non-negative integer")
     targets = config.get("targets")
     if not isinstance(targets, list) or not targets:
         raise ValueError("Config requires a non-empty targets list")
@@ -235,72 +242,108 @@ def source_record(source_ids: str) -> dict[str, Any]:
     }
 
 
+class ReservoirVisitor(CorpusVisitor):
+    """Seeded per-target reservoirs over the lines a corpus scan feeds it.
+
+    Not mergeable: which record a draw replaces depends on the order lines
+    arrive in, so the sample is only reproducible from one ordered pass.
+    """
+
+    name = "reservoir"
+
+    def __init__(
+        self, inventory: dict[str, Any], sample_size: int, seed: int, method: str
+    ) -> None:
+        self.patterns = compile_forms(inventory)
+        self.reservoirs: dict[str, list[dict[str, Any]]] = {
+            target_id: [] for target_id in self.patterns
+        }
+        self.seen: Counter[str] = Counter()
+        self.rng = random.Random(seed)
+        self.sample_size = sample_size
+        self.seed = seed
+        self.method = method
+        self.lines = 0
+
+    def visit(self, line_number: int, line: dict[str, str]) -> None:
+        self.lines += 1
+        spanish = line["es"].rstrip("\n")
+        english = line["en"].rstrip("\n")
+        ids = line["ids"].rstrip("\n")
+        for current_target_id, pattern in self.patterns.items():
+            match = pattern.search(spanish)
+            if not match:
+                continue
+            self.seen[current_target_id] += 1
+            record = {
+                "schema_version": SCHEMA_VERSION,
+                "occurrence_id": occurrence_id(
+                    "opensubtitles-en-es", current_target_id, line_number
+                ),
+                "target_id": current_target_id,
+                "matched_form": match.group(1),
+                "spanish": spanish,
+                "english": english,
+                "source": {
+                    "corpus": "OpenSubtitles en-es",
+                    "corpus_line": line_number,
+                    **source_record(ids),
+                },
+                "sampling": {
+                    "method": self.method,
+                    "seed": self.seed,
+                    "stratum": current_target_id,
+                },
+            }
+            reservoir = self.reservoirs[current_target_id]
+            if len(reservoir) < self.sample_size:
+                reservoir.append(record)
+            else:
+                replacement = self.rng.randrange(self.seen[current_target_id])
+                if replacement < self.sample_size:
+                    reservoir[replacement] = record
+
+    def records(self) -> list[dict[str, Any]]:
+        records = [record for rows in self.reservoirs.values() for record in rows]
+        records.sort(key=lambda row: (row["target_id"], row["source"]["corpus_line"]))
+        return records
+
+
+def report_scanned(line_number: int, lines_scanned: int) -> None:
+    print(f"scanned {lines_scanned:,} aligned lines", flush=True)
+
+
 def sample_occurrences(
-    inventory: dict[str, Any], corpus_dir: Path, sample_size: int, seed: int
+    inventory: dict[str, Any],
+    corpus_dir: Path,
+    sample_size: int,
+    seed: int,
+    sample_lines: int = 0,
 ) -> tuple[list[dict[str, Any]], dict[str, int], int]:
-    patterns = compile_forms(inventory)
-    reservoirs: dict[str, list[dict[str, Any]]] = {
-        target_id: [] for target_id in patterns
-    }
-    seen: Counter[str] = Counter()
-    rng = random.Random(seed)
-    paths = {
-        "spanish": corpus_dir / "OpenSubtitles.en-es.es",
-        "english": corpus_dir / "OpenSubtitles.en-es.en",
-        "ids": corpus_dir / "OpenSubtitles.en-es.ids",
-    }
-    for name, path in paths.items():
-        if not path.is_file():
-            raise FileNotFoundError(f"Missing {name} corpus file: {path}")
-    with (
-        paths["spanish"].open(encoding="utf-8", errors="replace") as spanish_handle,
-        paths["english"].open(encoding="utf-8", errors="replace") as english_handle,
-        paths["ids"].open(encoding="utf-8", errors="replace") as ids_handle,
-    ):
-        lines_scanned = 0
-        for lines_scanned, (spanish, english, ids) in enumerate(
-            zip(spanish_handle, english_handle, ids_handle), 1
-        ):
-            spanish = spanish.rstrip("\n")
-            english = english.rstrip("\n")
-            ids = ids.rstrip("\n")
-            for current_target_id, pattern in patterns.items():
-                match = pattern.search(spanish)
-                if not match:
-                    continue
-                seen[current_target_id] += 1
-                record = {
-                    "schema_version": SCHEMA_VERSION,
-                    "occurrence_id": occurrence_id(
-                        "opensubtitles-en-es", current_target_id, lines_scanned
-                    ),
-                    "target_id": current_target_id,
-                    "matched_form": match.group(1),
-                    "spanish": spanish,
-                    "english": english,
-                    "source": {
-                        "corpus": "OpenSubtitles en-es",
-                        "corpus_line": lines_scanned,
-                        **source_record(ids),
-                    },
-                    "sampling": {
-                        "method": "seeded_reservoir",
-                        "seed": seed,
-                        "stratum": current_target_id,
-                    },
-                }
-                reservoir = reservoirs[current_target_id]
-                if len(reservoir) < sample_size:
-                    reservoir.append(record)
-                else:
-                    replacement = rng.randrange(seen[current_target_id])
-                    if replacement < sample_size:
-                        reservoir[replacement] = record
-            if lines_scanned % 10_000_000 == 0:
-                print(f"scanned {lines_scanned:,} aligned lines", flush=True)
-    records = [record for rows in reservoirs.values() for record in rows]
-    records.sort(key=lambda row: (row["target_id"], row["source"]["corpus_line"]))
-    return records, dict(seen), lines_scanned
+    """Reservoir-sample occurrences per target.
+
+    By default every aligned line is read. With ``sample_lines`` the
+    reservoirs run over that many lines drawn uniformly at random (seeded),
+    read through the corpus line-offset index instead of a full scan.
+    """
+    corpus = SubtitleCorpus(corpus_dir, errors="replace")
+    for name, side in (("spanish", "es"), ("english", "en"), ("ids", "ids")):
+        if not corpus.paths[side].is_file():
+            raise FileNotFoundError(f"Missing {name} corpus file: {corpus.paths[side]}")
+    if sample_lines:
+        sampler = ReservoirVisitor(
+            inventory, sample_size, seed, "seeded_line_sample_reservoir"
+        )
+        for line_number, line in corpus.lines(corpus.sample(sample_lines, sampler.rng)):
+            sampler.visit(line_number, line)
+            if sampler.lines % 10_000_000 == 0:
+                report_scanned(line_number, sampler.lines)
+    else:
+        sampler = ReservoirVisitor(inventory, sample_size, seed, "seeded_reservoir")
+        scan_corpus(
+            corpus, [sampler], progress=report_scanned, progress_every=10_000_000
+        )
+    return sampler.records(), dict(sampler.seen), sampler.lines
 
 
 def load_api_key() -> str:
@@ -622,6 +665,7 @@ def prepare(args: argparse.Namespace) -> None:
             args.corpus_dir,
             config["sample_size_per_target"],
             int(config.get("seed", 20260803)),
+            sample_lines=config.get("sample_lines", 0),
         )
         write_jsonl(args.run_dir / "occurrences.jsonl", occurrences)
         update_manifest(
@@ -642,6 +686,7 @@ def prepare(args: argparse.Namespace) -> None:
                 "corpus": {
                     "path": relative_or_absolute(args.corpus_dir),
                     "aligned_lines_scanned": lines_scanned,
+                    "line_sample": config.get("sample_lines", 0) or None,
                 },
             },
             matching_occurrences=matches,
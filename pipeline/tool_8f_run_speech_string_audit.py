@@ -9,13 +9,19 @@ Everything else abstains.  This deliberately trades recall for auditability.
 No model, embedding service, API, or generated sentence is used.  The command
 writes only to a new Intermediates run directory and can resume from checkpoints.
 It does not modify the active deck or any immutable historical run.
+
+``run --workers N`` scans N contiguous line ranges in parallel. Each worker
+checkpoints its own counts and priority samples; the merged result is the
+same as a single-process run with the same seed.
 """
 
 from __future__ import annotations
 
 import argparse
+from bisect import bisect_right
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
+from functools import partial
 import hashlib
 import json
 import os
@@ -24,6 +30,9 @@ import re
 import time
 from typing import Any, Iterable
 
+from util_corpus_scan import SCAN_STATE_VERSION, CorpusVisitor, scan_corpus
+from util_subtitle_corpus import SubtitleCorpus
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SPANISH = ROOT / "Data" / "Spanish"
@@ -164,8 +173,8 @@ def sha256(path: Path) -> str:
 
 
 def normalize_tokens(text: str, pattern: re.Pattern[str]) -> tuple[str, ...]:
-    folded = text.casefold()
-    return tuple(match.group(0) for match in pattern.finditer(folded))
+    # Neither token pattern has a capturing group, so findall returns whole matches.
+    return tuple(pattern.findall(text.casefold()))
 
 
 def split_glosses(translation: str) -> list[str]:
@@ -252,27 +261,73 @@ def build_cue_inventory(
     return usable, audit
 
 
-def build_surface_matcher(surfaces: set[str]) -> dict[str, list[tuple[tuple[str, ...], str]]]:
-    by_first: dict[str, list[tuple[tuple[str, ...], str]]] = defaultdict(list)
-    for surface in surfaces:
+_END = -1  # TokenTrie node key: id of the phrase ending at that node
+
+
+class TokenTrie:
+    """Token sequences compiled to nested dicts over interned token ids.
+
+    ``add`` returns a phrase id, the same one for a repeated sequence.
+    ``match`` walks from every start position of a tokenised line, so a line
+    costs one lookup per token it shares with some phrase, however many
+    phrases begin with the same token.
+    """
+
+    def __init__(self) -> None:
+        self.vocab: dict[str, int] = {}
+        self.root: dict[int, Any] = {}
+        self.phrases: list[str] = []
+        self.values: list[list[Any]] = []
+
+    def add(self, tokens: tuple[str, ...], value: Any = None) -> int:
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(self.vocab.setdefault(token, len(self.vocab)), {})
+        if _END not in node:
+            node[_END] = len(self.phrases)
+            self.phrases.append(" ".join(tokens))
+            self.values.append([])
+        phrase_id = node[_END]
+        if value is not None:
+            self.values[phrase_id].append(value)
+        return phrase_id
+
+    def match(self, tokens: tuple[str, ...]) -> list[int]:
+        """Ids of the phrases occurring in `tokens`, in order of first occurrence."""
+        ids = list(map(self.vocab.get, tokens))
+        end = len(ids)
+        root = self.root
+        found: dict[int, None] = {}
+        for start, token_id in enumerate(ids):
+            node = root.get(token_id)
+            position = start + 1
+            while node is not None:
+                phrase_id = node.get(_END)
+                if phrase_id is not None:
+                    found[phrase_id] = None
+                if position == end:
+                    break
+                node = node.get(ids[position])
+                position += 1
+        return list(found)
+
+
+def build_surface_matcher(surfaces: set[str]) -> TokenTrie:
+    matcher = TokenTrie()
+    for surface in sorted(surfaces):
         tokens = normalize_tokens(surface, SPANISH_TOKEN_RE)
         if tokens:
-            by_first[tokens[0]].append((tokens, surface))
-    for rows in by_first.values():
-        rows.sort(key=lambda row: (-len(row[0]), row[1]))
-    return dict(by_first)
+            matcher.add(tokens, surface)
+    return matcher
 
 
-def matched_surfaces(
-    spanish: str, matcher: dict[str, list[tuple[tuple[str, ...], str]]]
-) -> set[str]:
-    tokens = normalize_tokens(spanish, SPANISH_TOKEN_RE)
-    found: set[str] = set()
-    for index, token in enumerate(tokens):
-        for form, surface in matcher.get(token, ()):
-            if tokens[index:index + len(form)] == form:
-                found.add(surface)
-    return found
+def matched_surfaces(spanish: str, matcher: TokenTrie) -> set[str]:
+    values = matcher.values
+    return {
+        surface
+        for phrase_id in matcher.match(normalize_tokens(spanish, SPANISH_TOKEN_RE))
+        for surface in values[phrase_id]
+    }
 
 
 def classify_english(
@@ -280,24 +335,28 @@ def classify_english(
     senses: dict[str, Any],
     cues: dict[tuple[str, ...], str],
 ) -> dict[str, Any]:
-    tokens = normalize_tokens(english, ENGLISH_TOKEN_RE)
-    return classify_english_tokens(tokens, senses, index_cues(cues))
+    trie = TokenTrie()
+    cue_senses = index_cues(cues, trie)
+    english_cues = trie.match(normalize_tokens(english, ENGLISH_TOKEN_RE))
+    return classify_english_cues(english_cues, senses, cue_senses, trie)
+
 
+def index_cues(cues: dict[tuple[str, ...], str], trie: TokenTrie) -> dict[int, str]:
+    """Add one surface's cues to the shared English cue trie.
 
-def index_cues(
-    cues: dict[tuple[str, ...], str]
-) -> dict[str, list[tuple[tuple[str, ...], str]]]:
-    by_first: dict[str, list[tuple[tuple[str, ...], str]]] = defaultdict(list)
-    for cue, sense_id in cues.items():
-        by_first[cue[0]].append((cue, sense_id))
-    return dict(by_first)
+    Returns phrase id -> sense id. Every surface shares the trie, so an
+    English line is matched once however many surfaces its Spanish side has.
+    """
+    return {trie.add(cue): sense_id for cue, sense_id in cues.items()}
 
 
-def classify_english_tokens(
-    english_tokens: tuple[str, ...],
+def classify_english_cues(
+    english_cues: Iterable[int],
     senses: dict[str, Any],
-    cues_by_first: dict[str, list[tuple[tuple[str, ...], str]]],
+    cue_senses: dict[int, str],
+    trie: TokenTrie,
 ) -> dict[str, Any]:
+    """Decide a surface's sense from the cue phrases found in its English line."""
     if len(senses) == 1:
         return {
             "status": "assigned",
@@ -305,14 +364,11 @@ def classify_english_tokens(
             "reason": "only_spanishdict_leaf_for_surface",
             "matched_cues": [],
         }
-    token_set = set(english_tokens)
     matches: dict[str, list[str]] = defaultdict(list)
-    padded = " " + " ".join(english_tokens) + " "
-    for first in token_set.intersection(cues_by_first):
-        for cue, sense_id in cues_by_first[first]:
-            phrase = " " + " ".join(cue) + " "
-            if phrase in padded:
-                matches[sense_id].append(" ".join(cue))
+    for phrase_id in english_cues:
+        sense_id = cue_senses.get(phrase_id)
+        if sense_id is not None:
+            matches[sense_id].append(trie.phrases[phrase_id])
     if not matches:
         return {"status": "abstain", "reason": "no_unique_english_cue"}
     if len(matches) > 1:
@@ -345,10 +401,13 @@ def retain_sample(
 ) -> None:
     if limit <= 0:
         return
-    candidate = {**record, "_priority": sample_priority(seed, key, record["corpus_line"])}
+    priority = sample_priority(seed, key, record["corpus_line"])
     rows = samples.setdefault(key, [])
-    rows.append(candidate)
-    rows.sort(key=lambda row: row["_priority"])
+    if len(rows) >= limit and priority >= rows[-1]["_priority"]:
+        return
+    # After any equal priority, as a stable sort of rows + [record] would put it.
+    position = bisect_right([row["_priority"] for row in rows], priority)
+    rows.insert(position, {**record, "_priority": priority})
     del rows[limit:]
 
 
@@ -363,17 +422,137 @@ def source_record(raw: str) -> dict[str, Any]:
     }
 
 
-def empty_state() -> dict[str, Any]:
+class AuditVisitor(CorpusVisitor):
+    """Counts and bounded samples for one scan of the corpus.
+
+    Mergeable: counts add up, and a sample keeps the lowest sample_priority
+    rows whatever order lines arrive in, so shards merged in order give
+    exactly the single-process state.
+    """
+
+    name = "audit"
+    mergeable = True
+
+    def __init__(
+        self,
+        senses_by_surface: dict[str, dict[str, Any]],
+        cue_senses_by_surface: dict[str, dict[int, str]],
+        cue_trie: TokenTrie,
+        matcher: TokenTrie,
+        examples_per_sense: int,
+        abstentions_per_surface: int,
+        seed: int,
+    ) -> None:
+        self.senses_by_surface = senses_by_surface
+        self.cue_senses_by_surface = cue_senses_by_surface
+        self.cue_trie = cue_trie
+        self.matcher = matcher
+        self.examples_per_sense = examples_per_sense
+        self.abstentions_per_surface = abstentions_per_surface
+        self.seed = seed
+        self.restore({})
+
+    def visit(self, number: int, line: dict[str, str]) -> None:
+        spanish = line["es"].rstrip("\r\n")
+        english = line["en"].rstrip("\r\n")
+        source_ids = line["ids"].rstrip("\r\n")
+        source = english_cues = None
+        for surface in matched_surfaces(spanish, self.matcher):
+            self.surface_total[surface] += 1
+            senses = self.senses_by_surface[surface]
+            if english_cues is None and len(senses) > 1:
+                english_cues = self.cue_trie.match(
+                    normalize_tokens(english, ENGLISH_TOKEN_RE)
+                )
+            decision = classify_english_cues(
+                english_cues or (), senses,
+                self.cue_senses_by_surface[surface], self.cue_trie,
+            )
+            if source is None:
+                source = source_record(source_ids)
+            record = {
+                "corpus_line": number,
+                "surface": surface,
+                "spanish": spanish,
+                "english": english,
+                "source": source,
+                "decision": decision,
+            }
+            if decision["status"] == "assigned":
+                sense_id = decision["sense_id"]
+                self.surface_assigned[surface] += 1
+                self.sense_counts[f"{surface}\t{sense_id}"] += 1
+                retain_sample(
+                    self.samples, f"assigned\t{surface}\t{sense_id}", record,
+                    self.examples_per_sense, self.seed,
+                )
+            else:
+                reason = decision["reason"]
+                self.abstentions[f"{surface}\t{reason}"] += 1
+                retain_sample(
+                    self.samples, f"abstain\t{surface}\t{reason}", record,
+                    self.abstentions_per_surface, self.seed,
+                )
+
+    def state(self) -> dict[str, Any]:
+        return {
+            "surface_total": dict(self.surface_total),
+            "surface_assigned": dict(self.surface_assigned),
+            "surface_abstentions": dict(self.abstentions),
+            "sense_counts": dict(self.sense_counts),
+            "samples": self.samples,
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        self.surface_total = Counter(state.get("surface_total") or {})
+        self.surface_assigned = Counter(state.get("surface_assigned") or {})
+        self.abstentions = Counter(state.get("surface_abstentions") or {})
+        self.sense_counts = Counter(state.get("sense_counts") or {})
+        self.samples: dict[str, list[dict[str, Any]]] = state.get("samples") or {}
+
+    def merge(self, state: dict[str, Any]) -> None:
+        self.surface_total.update(state.get("surface_total") or {})
+        self.surface_assigned.update(state.get("surface_assigned") or {})
+        self.abstentions.update(state.get("surface_abstentions") or {})
+        self.sense_counts.update(state.get("sense_counts") or {})
+        for key, rows in (state.get("samples") or {}).items():
+            limit = (
+                self.examples_per_sense if key.startswith("assigned\t")
+                else self.abstentions_per_surface
+            )
+            merged = self.samples.setdefault(key, [])
+            merged.extend(rows)
+            # Stable, like retain_sample: equal priorities keep line order.
+            merged.sort(key=lambda row: row["_priority"])
+            del merged[limit:]
+
+
+def audit_visitors(*args: Any) -> list[AuditVisitor]:
+    """A fresh AuditVisitor per worker process (scan_corpus make_visitors)."""
+    return [AuditVisitor(*args)]
+
+
+def upgrade_checkpoint(state: dict[str, Any], stop: int) -> dict[str, Any]:
+    """A checkpoint written before the shared corpus scan, in its format."""
+    if "visitors" in state:
+        return state
+    offsets = state.get("offsets") or {}
     return {
-        "schema_version": SCHEMA_VERSION,
-        "line_number": 0,
-        "offsets": {"spanish": 0, "english": 0, "ids": 0},
-        "surface_total": {},
-        "surface_assigned": {},
-        "surface_abstentions": {},
-        "sense_counts": {},
-        "samples": {},
-        "checkpointed_at": None,
+        "version": SCAN_STATE_VERSION,
+        "start": 1,
+        "stop": stop,
+        "line_number": int(state.get("line_number") or 0),
+        "offsets": {
+            "es": offsets.get("spanish", 0),
+            "en": offsets.get("english", 0),
+            "ids": offsets.get("ids", 0),
+        },
+        "visitors": {AuditVisitor.name: {
+            key: state.get(key) or {}
+            for key in ("surface_total", "surface_assigned", "surface_abstentions",
+                        "sense_counts", "samples")
+        }},
+        "completed_at": state.get("completed_at"),
     }
 
 
@@ -395,18 +574,9 @@ def progress_line(
     )
 
 
-def checkpoint(path: Path, state: dict[str, Any]) -> None:
-    state["checkpointed_at"] = utc_now()
-    atomic_json(path, state)
-
-
 def scan(args: argparse.Namespace) -> None:
-    paths = {
-        "spanish": args.corpus_dir / "OpenSubtitles.en-es.es",
-        "english": args.corpus_dir / "OpenSubtitles.en-es.en",
-        "ids": args.corpus_dir / "OpenSubtitles.en-es.ids",
-    }
-    for path in [args.index, args.menu, *paths.values()]:
+    corpus = SubtitleCorpus(args.corpus_dir, errors="replace")
+    for path in [args.index, args.menu, *corpus.paths.values()]:
         if not path.is_file():
             raise FileNotFoundError(path)
 
@@ -416,27 +586,30 @@ def scan(args: argparse.Namespace) -> None:
         )
     args.output_dir.mkdir(parents=True, exist_ok=True)
     checkpoint_path = args.output_dir / "checkpoint.json"
-    state = read_json(checkpoint_path) if args.resume and checkpoint_path.is_file() else empty_state()
-    if state.get("completed_at"):
+    saved = read_json(checkpoint_path) if args.resume and checkpoint_path.is_file() else None
+    if saved and saved.get("completed_at"):
         print(f"Audit is already complete: {args.output_dir}")
         return
+    if saved and "visitors" not in saved:
+        atomic_json(checkpoint_path, upgrade_checkpoint(saved, len(corpus)))
 
     index = read_json(args.index)
     menu = read_json(args.menu)
     app_surfaces = {str(row.get("word") or "").casefold() for row in index if row.get("word")}
     senses_by_surface = flatten_menu(menu, app_surfaces)
     cue_inventory, cue_audit = build_cue_inventory(senses_by_surface)
-    cues_by_surface = {
-        surface: index_cues(cues) for surface, cues in cue_inventory.items()
+    cue_trie = TokenTrie()
+    cue_senses_by_surface = {
+        surface: index_cues(cues, cue_trie) for surface, cues in cue_inventory.items()
     }
     matcher = build_surface_matcher(set(senses_by_surface))
+    visitor_args = (
+        senses_by_surface, cue_senses_by_surface, cue_trie, matcher,
+        args.examples_per_sense, args.abstentions_per_surface, args.seed,
+    )
+    audit = AuditVisitor(*visitor_args)
 
-    surface_total = Counter(state["surface_total"])
-    surface_assigned = Counter(state["surface_assigned"])
-    abstentions = Counter(state["surface_abstentions"])
-    sense_counts = Counter(state["sense_counts"])
-    samples: dict[str, list[dict[str, Any]]] = state["samples"]
-    start_line = int(state["line_number"])
+    start_line = int(saved["line_number"]) if saved else 0
     started = time.monotonic()
 
     print(
@@ -447,143 +620,39 @@ def scan(args: argparse.Namespace) -> None:
     )
     print("No API or model will be called. Ctrl-C is safe; rerun with --resume.", flush=True)
 
-    with (
-        paths["spanish"].open(encoding="utf-8", errors="replace") as spanish_handle,
-        paths["english"].open(encoding="utf-8", errors="replace") as english_handle,
-        paths["ids"].open(encoding="utf-8", errors="replace") as ids_handle,
-    ):
-        if start_line:
-            spanish_handle.seek(int(state["offsets"]["spanish"]))
-            english_handle.seek(int(state["offsets"]["english"]))
-            ids_handle.seek(int(state["offsets"]["ids"]))
-        line_number = start_line
-        try:
-            while True:
-                spanish = spanish_handle.readline()
-                english = english_handle.readline()
-                source_ids = ids_handle.readline()
-                if not spanish or not english or not source_ids:
-                    break
-                line_number += 1
-                spanish = spanish.rstrip("\r\n")
-                english = english.rstrip("\r\n")
-                source_ids = source_ids.rstrip("\r\n")
-                surfaces = matched_surfaces(spanish, matcher)
-                english_tokens = (
-                    normalize_tokens(english, ENGLISH_TOKEN_RE) if surfaces else ()
-                )
-                for surface in surfaces:
-                    surface_total[surface] += 1
-                    decision = classify_english_tokens(
-                        english_tokens, senses_by_surface[surface], cues_by_surface[surface]
-                    )
-                    record = {
-                        "corpus_line": line_number,
-                        "surface": surface,
-                        "spanish": spanish,
-                        "english": english,
-                        "source": source_record(source_ids),
-                        "decision": decision,
-                    }
-                    if decision["status"] == "assigned":
-                        sense_id = decision["sense_id"]
-                        surface_assigned[surface] += 1
-                        sense_counts[f"{surface}\t{sense_id}"] += 1
-                        retain_sample(
-                            samples, f"assigned\t{surface}\t{sense_id}", record,
-                            args.examples_per_sense, args.seed,
-                        )
-                    else:
-                        reason = decision["reason"]
-                        abstentions[f"{surface}\t{reason}"] += 1
-                        retain_sample(
-                            samples, f"abstain\t{surface}\t{reason}", record,
-                            args.abstentions_per_surface, args.seed,
-                        )
-
-                if line_number % args.progress_every == 0:
-                    print(
-                        "\r" + progress_line(
-                            line_number, started, start_line,
-                            sum(surface_assigned.values()), sum(surface_total.values()),
-                        ), end="", flush=True,
-                    )
-                if line_number % args.checkpoint_every == 0:
-                    state.update({
-                        "line_number": line_number,
-                        "offsets": {
-                            "spanish": spanish_handle.tell(),
-                            "english": english_handle.tell(),
-                            "ids": ids_handle.tell(),
-                        },
-                        "surface_total": dict(surface_total),
-                        "surface_assigned": dict(surface_assigned),
-                        "surface_abstentions": dict(abstentions),
-                        "sense_counts": dict(sense_counts),
-                        "samples": samples,
-                    })
-                    checkpoint(checkpoint_path, state)
-                if args.max_lines and line_number - start_line >= args.max_lines:
-                    state.update({
-                        "line_number": line_number,
-                        "offsets": {
-                            "spanish": spanish_handle.tell(),
-                            "english": english_handle.tell(),
-                            "ids": ids_handle.tell(),
-                        },
-                        "surface_total": dict(surface_total),
-                        "surface_assigned": dict(surface_assigned),
-                        "surface_abstentions": dict(abstentions),
-                        "sense_counts": dict(sense_counts),
-                        "samples": samples,
-                    })
-                    checkpoint(checkpoint_path, state)
-                    print(
-                        f"\nPaused after {args.max_lines:,} lines for this invocation; "
-                        "continue with --resume."
-                    )
-                    return
-        except KeyboardInterrupt:
-            state.update({
-                "line_number": line_number,
-                "offsets": {
-                    "spanish": spanish_handle.tell(),
-                    "english": english_handle.tell(),
-                    "ids": ids_handle.tell(),
-                },
-                "surface_total": dict(surface_total),
-                "surface_assigned": dict(surface_assigned),
-                "surface_abstentions": dict(abstentions),
-                "sense_counts": dict(sense_counts),
-                "samples": samples,
-            })
-            checkpoint(checkpoint_path, state)
-            print(f"\nCheckpoint saved at line {line_number:,}. Resume with --resume.")
-            return
-
-        final_offsets = {
-            "spanish": spanish_handle.tell(),
-            "english": english_handle.tell(),
-            "ids": ids_handle.tell(),
-        }
+    def progress(line_number: int, _read: int) -> None:
+        print(
+            "\r" + progress_line(
+                line_number, started, start_line,
+                sum(audit.surface_assigned.values()), sum(audit.surface_total.values()),
+            ), end="", flush=True,
+        )
+
+    result = scan_corpus(
+        corpus, [audit],
+        checkpoint=checkpoint_path, checkpoint_every=args.checkpoint_every,
+        resume=args.resume, max_lines=args.max_lines,
+        progress=progress, progress_every=args.progress_every,
+        workers=args.workers, make_visitors=partial(audit_visitors, *visitor_args),
+    )
+    line_number = result["line_number"]
+    if result["interrupted"]:
+        print(f"\nCheckpoint saved at line {line_number:,}. Resume with --resume.")
+        return
+    if not result["complete"]:
+        print(
+            f"\nPaused after {args.max_lines:,} lines for this invocation; "
+            "continue with --resume."
+        )
+        return
 
     print("\r" + progress_line(
         line_number, started, start_line,
-        sum(surface_assigned.values()), sum(surface_total.values()),
+        sum(audit.surface_assigned.values()), sum(audit.surface_total.values()),
     ))
-    state.update({
-        "line_number": line_number,
-        "offsets": final_offsets,
-        "surface_total": dict(surface_total),
-        "surface_assigned": dict(surface_assigned),
-        "surface_abstentions": dict(abstentions),
-        "sense_counts": dict(sense_counts),
-        "samples": samples,
-        "completed_at": utc_now(),
-    })
-    checkpoint(checkpoint_path, state)
     finalize(
-        args, index, senses_by_surface, cue_audit, state,
+        args, index, senses_by_surface, cue_audit,
+        {**audit.state(), "line_number": line_number},
         missing_surfaces=sorted(app_surfaces - set(senses_by_surface)),
     )
 
@@ -771,6 +840,12 @@ def parse_args() -> argparse.Namespace:
                 "--max-lines", type=int, default=0,
                 help="Pause after N additional lines (0 means scan to completion)",
             )
+            sub.add_argument(
+                "--workers", type=int, default=1,
+                help="Scan N contiguous line ranges in parallel processes; each "
+                "checkpoints on its own and the results merge exactly. "
+                "--max-lines then counts per worker; resume with the same N.",
+            )
     return parser.parse_args()
 
 
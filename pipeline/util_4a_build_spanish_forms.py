@@ -15,13 +15,21 @@ Output schema: {surface_form: pos_string}
     "casa" -> "noun,verb"
     "arrepentí" -> "verb"
 
+It then compiles Data/Spanish/layers/spanish_lexicon.bin (util_4a_lexicon),
+the pre-derived tables steps 3a/4a, util_4a_routing and the SpanishDict guards
+load instead of re-parsing the JSON layers. Recompile after changing
+conjugations, es_50k or the SpanishDict caches (a stale artifact is ignored):
+
 Run: .venv/bin/python3 pipeline/util_4a_build_spanish_forms.py
+     .venv/bin/python3 pipeline/util_4a_build_spanish_forms.py --lexicon-only
 """
 
+import argparse
 import gzip
 import json
 import os
 import sys
+import time
 
 def _resolve_spanish_vocab(path):
     """Data/Spanish/vocabulary.json is gitignored and absent on a fresh
@@ -35,6 +43,9 @@ def _resolve_spanish_vocab(path):
 
 _THIS_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(_THIS_DIR)
+if _THIS_DIR not in sys.path:
+    sys.path.insert(0, _THIS_DIR)
+from util_4a_lexicon import LEXICON_PATH, compile_lexicon  # noqa: E402
 
 WIKT_PATH = os.path.join(PROJECT_ROOT, "Data", "Spanish", "Senses", "wiktionary", "kaikki-spanish.jsonl.gz")
 CONJ_PATH = os.path.join(PROJECT_ROOT, "Data", "Spanish", "layers", "conjugation_reverse.json")
@@ -65,7 +76,23 @@ def _pos_to_pretty(raw):
     return mapping.get(raw, raw)
 
 
+def build_lexicon():
+    start = time.perf_counter()
+    path = compile_lexicon()
+    print(f"Compiled lexicon -> {path} "
+          f"({os.path.getsize(path) / 1_048_576:.1f} MB, {time.perf_counter() - start:.1f}s)")
+
+
 def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--lexicon-only", action="store_true",
+                    help=f"Only recompile {os.path.relpath(LEXICON_PATH, PROJECT_ROOT)} "
+                         "from the existing layer files")
+    args = ap.parse_args()
+    if args.lexicon_only:
+        build_lexicon()
+        return
+
     forms = {}
 
     # 1. Wiktionary — lemma entries + form-of inflections
@@ -134,6 +161,8 @@ def main():
     print(f"  total:      {len(out)}")
     print(f"File size: {os.path.getsize(OUT_PATH) / 1_048_576:.1f} MB")
 
+    build_lexicon()
+
 
 if __name__ == "__main__":
     main()
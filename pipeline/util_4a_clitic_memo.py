@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Persistent, cross-artist memo of step 4a's clitic verdicts.
+
+Step 4a asks ``strip_clitic`` and ``decompose_clitic_form`` about nearly every
+word of every artist: Phase 2's Wiktionary-only check, Phase 3a on the
+leftovers, and Phase 3a2's reclaim pass over the whole classifier bucket. Both
+answers depend only on the word and on Spanish-wide tables (spanish_forms,
+conjugation_reverse, conjugations, es_50k, the SpanishDict caches), so an
+artist re-derives every verdict a previous artist already paid for.
+
+    memo = CliticVerdictMemo(cache_dir=default_cache_dir(artist_dir), version=STEP_VERSION)
+    result = memo.get("strip", word, lambda: strip_clitic(word, ...))
+    memo.save()
+
+Verdicts persist in ``<cache_dir>/<signature>.jsonl`` as ``[kind, word,
+result]`` rows. The signature is the
+lexicon signature (``util_4a_lexicon.lexicon_signature``: LEXICON_VERSION plus
+the size/mtime of every source table), ``util_4a_routing.ROUTING_VERSION`` and
+the caller's version, so a rebuilt table, a change to the shared decomposers or
+a bumped STEP_VERSION starts a fresh file and a stale verdict is never served. Only use it where every input to the memoized function is one of those
+default tables.
+
+Results must be None or a tuple of JSON values; they come back as the same
+tuple (``("dar", ["me", "lo"])`` round-trips exactly).
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+try:  # Package import in tests/tools; script import in pipeline entry points.
+    from .util_4a_lexicon import lexicon_signature
+    from .util_4a_routing import ROUTING_VERSION
+    from .util_pipeline_metrics import count
+except ImportError:  # pragma: no cover - exercised by direct script execution
+    from util_4a_lexicon import lexicon_signature
+    from util_4a_routing import ROUTING_VERSION
+    from util_pipeline_metrics import count
+
+
+CACHE_VERSION = 1
+
+
+def _decode(value):
+    if value is None:
+        return None
+    return tuple(list(item) if isinstance(item, list) else item for item in value)
+
+
+class CliticVerdictMemo:
+    """Memoized, optionally disk-cached ``(kind, word) -> verdict`` lookups."""
+
+    def __init__(self, cache_dir=None, version=0, sources=None, routing_version=None):
+        if routing_version is None:
+            routing_version = ROUTING_VERSION
+        self.signature = "v%d.r%s.%s-%s" % (CACHE_VERSION, routing_version, version,
+                                             lexicon_signature(sources))
+        self.cache_path = (
+            Path(cache_dir) / ("%s.jsonl" % self.signature) if cache_dir else None)
+        self._verdicts = {}
+        self._unsaved = []
+        self.stats = {"lookups": 0, "cache_hits": 0, "computed": 0,
+                      "compute_seconds": 0.0}
+        if self.cache_path is not None:
+            self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+        except FileNotFoundError:
+            return
+        try:  # one parse for the whole file rather than one per row
+            rows = json.loads("[" + ",".join(lines) + "]")
+        except ValueError:  # torn final line from an interrupted run
+            rows = []
+            for line in lines:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+        for kind, word, result in rows:
+            self._verdicts[(kind, word)] = result
+
+    def get(self, kind, word, compute):
+        """Verdict for ``(kind, word)``; ``compute()`` runs only on a miss."""
+        self.stats["lookups"] += 1
+        key = (kind, word)
+        if key in self._verdicts:
+            self.stats["cache_hits"] += 1
+            return _decode(self._verdicts[key])
+        start = time.perf_counter()
+        result = compute()
+        self.stats["compute_seconds"] += time.perf_counter() - start
+        self.stats["computed"] += 1
+        self._verdicts[key] = None if result is None else list(result)
+        self._unsaved.append(key)
+        return _decode(self._verdicts[key])
+
+    def save(self):
+        """Append verdicts computed this session to the cache file."""
+        if self.cache_path is None or not self._unsaved:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, "a", encoding="utf-8") as handle:
+            for kind, word in self._unsaved:
+                handle.write(json.dumps([kind, word, self._verdicts[(kind, word)]],
+                                        ensure_ascii=False) + "\n")
+        self._unsaved = []
+
+    def report_counters(self):
+        """Add this session's hits/misses to the step's cache counters."""
+        count("cache_hits", self.stats["cache_hits"])
+        count("cache_misses", self.stats["computed"])
+
+    def format_report(self):
+        lookups = self.stats["lookups"]
+        hits = self.stats["cache_hits"]
+        return ("Clitic memo: %d lookups, %s cached, %d computed in %.2fs"
+                % (lookups, "%.1f%%" % (100.0 * hits / lookups) if lookups else "no",
+                   self.stats["computed"], self.stats["compute_seconds"]))
+
+
+def default_cache_dir(artist_dir):
+    """Shared per-language cache: Artists/<language>/clitic_cache/."""
+    return os.path.join(os.path.dirname(os.path.abspath(artist_dir)), "clitic_cache")
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Compiled Spanish morphology lexicon shared by steps 3a, 4a and the guards.
+
+Step 3a, step 4a, util_4a_routing and util_5c_spanishdict each used to
+json.load spanish_forms.json / conjugation_reverse.json (and re-parse
+es_50k_wordlist.txt and the SpanishDict caches) and rebuild their own sets and
+dicts from them, several hundred thousand entries per process per consumer.
+
+util_4a_build_spanish_forms.py now also compiles one artifact,
+Data/Spanish/layers/spanish_lexicon.bin:
+
+    b"FLEX" | format version | marshal version | u32 header length
+    | marshal({version, sources, sections: {table: (offset, length)}})
+    | one marshal blob per table
+
+Every derived table the consumers need is stored already in its final shape,
+with one shared object per distinct string / POS combination:
+
+    pos            {form: "noun,verb"}           spanish_forms.json as-is
+    sorted_forms   (form, ...)                   prefix lookup (bisect)
+    deaccented     {deaccented form: (form, ...)} accent-insensitive lookup
+    deaccented_forms  frozenset                  the SpanishDict guard's form set
+    verb_lemmas    frozenset                     conjugations.json keys
+    conj_reverse   {form: [{lemma, ...}, ...]}   conjugation_reverse.json as-is
+    conj_deac      {deaccented form: frozenset(deaccented lemma)}
+    conj_heads     {form: frozenset(lemma)}
+    es_50k         ((word, count_text), ...)     es_50k_wordlist.txt rows
+    sd_parents     {headword: sense_count}       load_spanishdict_parents()
+
+Opening it reads only the small header; each table is unmarshalled the first
+time a consumer touches it (no JSON parse, no per-consumer rebuild), and
+`load_lexicon` shares the result across every consumer in the process.
+
+The artifact records a fingerprint (size + mtime) of each source file. If any
+source changed since the compile, `load_lexicon` returns None and consumers
+fall back to reading the JSON themselves, so a stale artifact can never change
+a verdict. Bump LEXICON_VERSION when a derived table's construction changes.
+
+    python3 pipeline/util_4a_build_spanish_forms.py --lexicon-only
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import struct
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+
+
+LEXICON_VERSION = 1
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_SPANISH_DIR = _PROJECT_ROOT / "Data" / "Spanish"
+_LAYERS_DIR = _SPANISH_DIR / "layers"
+LEXICON_PATH = _LAYERS_DIR / "spanish_lexicon.bin"
+
+SOURCES = {
+    "spanish_forms": _LAYERS_DIR / "spanish_forms.json",
+    "conjugations": _LAYERS_DIR / "conjugations.json",
+    "conjugation_reverse": _LAYERS_DIR / "conjugation_reverse.json",
+    "es_50k": _SPANISH_DIR / "es_50k_wordlist.txt",
+    "sd_headword_cache": _SPANISH_DIR / "Senses" / "spanishdict" / "headword_cache.json",
+    "sd_surface_cache": _SPANISH_DIR / "Senses" / "spanishdict" / "surface_cache.json",
+}
+
+_MAGIC = b"FLEX"
+_HEADER_LEN = len(_MAGIC) + 2
+
+
+def deaccent(text):
+    """Lowercase, strip combining accents (NFD -> drop Mn), drop elision apostrophes.
+
+    Must match util_5c_spanishdict._deaccent: the guard looks up its own
+    deaccented keys in the tables built with this.
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    return "".join(c for c in decomposed
+                   if unicodedata.category(c) != "Mn" and c not in "'’")
+
+
+def _fingerprint(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def lexicon_signature(sources=None):
+    """Short digest of LEXICON_VERSION plus every source fingerprint.
+
+    Changes whenever any table the lexicon is built from changes, whether or
+    not the artifact itself has been compiled; caches of results derived from
+    these tables key on it.
+    """
+    sources = dict(SOURCES, **(sources or {}))
+    state = [LEXICON_VERSION] + [[name, _fingerprint(sources[name])]
+                                 for name in sorted(sources)]
+    return hashlib.sha1(json.dumps(state).encode("utf-8")).hexdigest()[:16]
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _read_es_50k(path):
+    """Whitespace-split rows with two or more fields; consumers parse counts
+    with their own (historically slightly different) rules."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return tuple((parts[0], parts[1]) for parts in map(str.split, f)
+                         if len(parts) >= 2)
+    except OSError:
+        return None
+
+
+def _shared(value, table):
+    return table.setdefault(value, value)
+
+
+def build_lexicon_payload(sources=None):
+    """Derive every lexicon table from the source files (missing → None)."""
+    sources = dict(SOURCES, **(sources or {}))
+    strings = {}
+    payload = {
+        "version": LEXICON_VERSION,
+        "sources": {name: _fingerprint(path) for name, path in sources.items()},
+    }
+
+    forms = _read_json(sources["spanish_forms"])
+    if forms is not None:
+        pos = {_shared(form, strings): _shared(tags, strings) for form, tags in forms.items()}
+        accentless = {}
+        for form in pos:
+            accentless.setdefault(deaccent(form), []).append(form)
+        payload["pos"] = pos
+        payload["sorted_forms"] = tuple(sorted(pos))
+        payload["deaccented"] = {key: tuple(values) for key, values in accentless.items()}
+        payload["deaccented_forms"] = frozenset(accentless)
+
+    conjugations = _read_json(sources["conjugations"])
+    if conjugations is not None:
+        payload["verb_lemmas"] = frozenset(k.lower() for k in conjugations)
+
+    reverse = _read_json(sources["conjugation_reverse"])
+    if reverse is not None:
+        conj_deac = {}
+        conj_heads = {}
+        for form, entries in reverse.items():
+            original_lemmas = {
+                e.get("lemma").strip().lower()
+                for e in (entries or [])
+                if isinstance(e, dict) and isinstance(e.get("lemma"), str)
+                and e.get("lemma").strip()
+            }
+            lemmas = {
+                deaccent(e.get("lemma"))
+                for e in (entries or [])
+                if isinstance(e, dict) and e.get("lemma")
+            }
+            if lemmas:
+                conj_deac.setdefault(deaccent(form), set()).update(lemmas)
+            if original_lemmas:
+                conj_heads.setdefault(form.strip().lower(), set()).update(original_lemmas)
+        payload["conj_reverse"] = reverse
+        payload["conj_deac"] = {k: frozenset(v) for k, v in conj_deac.items()}
+        payload["conj_heads"] = {k: frozenset(v) for k, v in conj_heads.items()}
+
+    es_50k = _read_es_50k(sources["es_50k"])
+    if es_50k is not None:
+        payload["es_50k"] = es_50k
+
+    sd_dir = Path(sources["sd_headword_cache"]).parent
+    if any(_fingerprint(sources[name]) for name in ("sd_headword_cache", "sd_surface_cache")):
+        try:
+            from util_4a_routing import load_spanishdict_parents
+        except ImportError:
+            from pipeline.util_4a_routing import load_spanishdict_parents
+        payload["sd_parents"] = load_spanishdict_parents(str(sd_dir))
+    return payload
+
+
+def compile_lexicon(out_path=None, sources=None):
+    """Build and write the compiled lexicon; return its path."""
+    out_path = Path(out_path or LEXICON_PATH)
+    payload = build_lexicon_payload(sources)
+    meta = {"version": payload.pop("version"), "sources": payload.pop("sources")}
+    blobs = []
+    offset = 0
+    sections = {}
+    for name, value in payload.items():
+        blob = marshal.dumps(value, marshal.version)
+        sections[name] = (offset, len(blob))
+        offset += len(blob)
+        blobs.append(blob)
+    meta["sections"] = sections
+    head = marshal.dumps(meta, marshal.version)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    temp = Path(str(out_path) + ".tmp")
+    with open(temp, "wb") as f:
+        f.write(_MAGIC + bytes((LEXICON_VERSION, marshal.version)))
+        f.write(struct.pack("<I", len(head)))
+        f.write(head)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(temp, out_path)
+    return out_path
+
+
+class SpanishLexicon:
+    """Read-only view over a compiled lexicon.
+
+    Each table is unmarshalled on first access, so a consumer pays only for
+    the tables it reads (step 3a never touches conj_reverse). A table whose
+    source was missing at compile time reads as None.
+    """
+
+    TABLES = ("pos", "sorted_forms", "deaccented", "deaccented_forms", "verb_lemmas",
+              "conj_reverse", "conj_deac", "conj_heads", "es_50k", "sd_parents")
+
+    def __init__(self, path, sections, data_offset):
+        self._path = path
+        self._sections = sections
+        self._data_offset = data_offset
+        self._tables = {}
+
+    def __getattr__(self, name):
+        if name not in self.TABLES:
+            raise AttributeError(name)
+        if name not in self._tables:
+            self._tables[name] = self._load_table(name)
+        return self._tables[name]
+
+    def _load_table(self, name):
+        if name not in self._sections:
+            return None
+        offset, length = self._sections[name]
+        with open(self._path, "rb") as f:
+            f.seek(self._data_offset + offset)
+            return marshal.loads(f.read(length))
+
+    def __contains__(self, form):
+        return self.pos is not None and form in self.pos
+
+    def __len__(self):
+        return len(self.pos or ())
+
+    def pos_tags(self, form):
+        """POS tag string for ``form`` ("noun,verb"), or None if unknown."""
+        return (self.pos or {}).get(form)
+
+    def with_prefix(self, prefix):
+        """Every known form starting with ``prefix``, in sorted order."""
+        forms = self.sorted_forms or ()
+        start = bisect_left(forms, prefix)
+        end = start
+        while end < len(forms) and forms[end].startswith(prefix):
+            end += 1
+        return forms[start:end]
+
+    def accent_insensitive(self, text):
+        """Known forms equal to ``text`` ignoring case, accents and apostrophes."""
+        return (self.deaccented or {}).get(deaccent(text), ())
+
+
+# Consumers import this module both as `util_4a_lexicon` and as
+# `pipeline.util_4a_lexicon`; share one cache so the artifact loads once.
+import sys as _sys
+_TWIN = _sys.modules.get(
+    "pipeline.util_4a_lexicon" if __name__ == "util_4a_lexicon" else "util_4a_lexicon")
+_LOADED = getattr(_TWIN, "_LOADED", None)
+if _LOADED is None:
+    _LOADED = {}
+
+
+def _read_lexicon(path, sources):
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_LEN + 4)
+            if len(header) < _HEADER_LEN + 4 or header[:len(_MAGIC)] != _MAGIC:
+                return None
+            version, marshal_version = header[len(_MAGIC)], header[len(_MAGIC) + 1]
+            if version != LEXICON_VERSION or marshal_version > marshal.version:
+                return None
+            (head_len,) = struct.unpack("<I", header[_HEADER_LEN:])
+            meta = marshal.loads(f.read(head_len))
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+    recorded = meta.get("sources") or {}
+    for name, source in sources.items():
+        fingerprint = _fingerprint(source)
+        if list(fingerprint or ()) != list(recorded.get(name) or ()):
+            return None
+    return SpanishLexicon(path, meta["sections"], _HEADER_LEN + 4 + head_len)
+
+
+def load_lexicon(path=None, sources=None):
+    """The process-wide compiled lexicon, or None if absent or stale."""
+    path = str(path or LEXICON_PATH)
+    if path not in _LOADED:
+        _LOADED[path] = _read_lexicon(path, dict(SOURCES, **(sources or {})))
+    return _LOADED[path]
+
+
+def is_default_source(name, path):
+    """True if ``path`` is the source the compiled lexicon was built from."""
+    return path is None or Path(path).resolve() == SOURCES[name].resolve()
@@ -1,7 +1,7 @@
 """Shared routing helpers for step_4a (normal + artist modes).
 
 Provides:
-  - Clitic pronoun stripping + gerund decomposition
+  - Clitic pronoun stripping + gerund decomposition (over memoized enclitic splits)
   - Wiktionary clitic-data loader (base + attached pronouns + their roles)
   - SpanishDict parent inventory (which lemmas may own a card)
   - Three-tier clitic classification (clitic_merge / clitic_keep)
@@ -25,6 +25,16 @@ import json
 import os
 import unicodedata
 
+try:  # Package import in tests/tools; script import in pipeline entry points.
+    from .util_4a_lexicon import load_lexicon
+except ImportError:  # pragma: no cover - exercised by direct script execution
+    from util_4a_lexicon import load_lexicon
+
+
+# Part of every persisted clitic verdict's key (util_4a_clitic_memo). Bump it
+# when a change here can change what a word decomposes to, so cached verdicts
+# from the old rules are not served.
+ROUTING_VERSION = 1
 
 # ---------------------------------------------------------------------------
 # Clitic pronouns
@@ -46,9 +56,75 @@ _DATIVE_CLITICS = frozenset({"le", "les"})
 CLITIC_PERSON = {"me": "1s", "te": "2s", "nos": "1p", "os": "2p"}
 
 
+_ACUTELESS = {}
+
+
 def _strip_acute(s):
     """Strip acute accents only (á→a), preserving ñ and ü."""
-    return "".join(c for c in unicodedata.normalize("NFD", s) if c != "\u0301")
+    plain = _ACUTELESS.get(s)
+    if plain is None:
+        plain = _ACUTELESS[s] = "".join(
+            c for c in unicodedata.normalize("NFD", s) if c != "\u0301")
+    return plain
+
+
+# ---------------------------------------------------------------------------
+# Enclitic splits
+# ---------------------------------------------------------------------------
+
+# Every decomposer below peels enclitics the same way — one pronoun at a time
+# off the end, at most two — and differs only in how long a stem it demands.
+# No two pronouns share an ending (`los` never ends in `lo`), so the peel
+# sequence of a surface is fixed; it is computed once per surface and each
+# decomposer applies its own length guard to it. Words that end in no pronoun
+# at all (the large majority) never get past `str.endswith`.
+_CLITIC_SPLITS = {}
+
+
+def clitic_splits(word):
+    """Enclitic peels of a lowercase surface, outermost first, at most two.
+
+    Returns a tuple of ``(host, pronoun)`` pairs where ``host`` is what is
+    left after that peel: 'dármelo' → (('dárme', 'lo'), ('dár', 'me')). No
+    stem-length guard is applied here.
+    """
+    splits = _CLITIC_SPLITS.get(word)
+    if splits is None:
+        splits = ()
+        remaining = word
+        while len(splits) < 2 and remaining.endswith(_CLITIC_PRONOUNS):
+            pron = next(p for p in _CLITIC_PRONOUNS if remaining.endswith(p))
+            if len(remaining) == len(pron):
+                break
+            remaining = remaining[:-len(pron)]
+            splits += ((remaining, pron),)
+        _CLITIC_SPLITS[word] = splits
+    return splits
+
+
+def prime_clitic_splits(words):
+    """Precompute `clitic_splits` for every clitic-final word in one pass.
+
+    Returns the number of words that carry at least one enclitic.
+    """
+    carriers = 0
+    for word in words:
+        wl = word.lower()
+        if wl.endswith(_CLITIC_PRONOUNS) and clitic_splits(wl):
+            carriers += 1
+    return carriers
+
+
+def _peels(word, min_stem):
+    """(host, [clitics]) after each peel that leaves at least `min_stem` chars."""
+    peels = []
+    clitics = []
+    for host, pron in clitic_splits(word):
+        if len(host) < min_stem:
+            break
+        clitics = [pron] + clitics
+        peels.append((host, clitics))
+    return peels
 
 
 def strip_clitic_pronouns(word, clitic_list=None):
@@ -64,11 +140,9 @@ def strip_clitic_pronouns(word, clitic_list=None):
             if remaining.endswith(cl) and len(remaining) > len(cl):
                 remaining = remaining[:-len(cl)]
     else:
-        for _ in range(2):
-            for cl in _CLITIC_PRONOUNS:
-                if remaining.endswith(cl) and len(remaining) > len(cl):
-                    remaining = remaining[:-len(cl)]
-                    break
+        splits = clitic_splits(remaining)
+        if splits:
+            remaining = splits[-1][0]
     return _strip_acute(remaining)
 
 
@@ -88,24 +162,15 @@ def decompose_gerund_clitic(word, known_words):
     accidental -te/-le nouns ('combate', 'animales') out.
     """
     wl = word.lower()
-    remaining = wl
-    clitics = []
-    for _ in range(2):  # max 2 clitics (e.g. haciéndomelo)
-        matched = False
-        for pron in _CLITIC_PRONOUNS:
-            if remaining.endswith(pron) and len(remaining) > len(pron) + 4:
-                remaining = remaining[:-len(pron)]
-                clitics.insert(0, pron)
-                matched = True
-                break
-        if not matched:
-            break
-
-    if not clitics:
+    if not clitic_splits(wl):
+        return None
+    peels = _peels(wl, 5)  # max 2 clitics (e.g. haciéndomelo)
+    if not peels:
         # The gerund stripper needs a 5+ char stem; short infinitives
         # ('verlo', 'darte') never get past it, so hand them straight over.
         return (decompose_infinitive_clitic(word, known_words)
                 or decompose_imperative_clitic(word, known_words))
+    remaining, clitics = peels[-1]
 
     clean = _strip_acute(remaining)
     if clean.endswith("ando"):
@@ -156,33 +221,45 @@ def _load_verb_evidence(conjugations_path=None, spanish_forms_path=None,
     if _verb_data_loaded:
         return
     _verb_data_loaded = True
+    lexicon = None
+    if not (conjugations_path or spanish_forms_path or conj_reverse_path):
+        lexicon = load_lexicon()
+    if lexicon is not None:
+        _verb_lemmas = lexicon.verb_lemmas
+        _verb_pos = lexicon.pos
+        _conj_reverse = lexicon.conj_reverse
+        if None not in (_verb_lemmas, _verb_pos, _conj_reverse):
+            return
     root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     layers = os.path.join(root, "Data", "Spanish", "layers")
     conj = conjugations_path or os.path.join(layers, "conjugations.json")
     forms = spanish_forms_path or os.path.join(layers, "spanish_forms.json")
     reverse = conj_reverse_path or os.path.join(layers,
                                                 "conjugation_reverse.json")
-    try:
-        with open(conj, encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            _verb_lemmas = {k.lower() for k in data}
-    except (OSError, ValueError):
-        pass
-    try:
-        with open(forms, encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            _verb_pos = data
-    except (OSError, ValueError):
-        pass
-    try:
-        with open(reverse, encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict):
-            _conj_reverse = data
-    except (OSError, ValueError):
-        pass
+    if _verb_lemmas is None:
+        try:
+            with open(conj, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                _verb_lemmas = {k.lower() for k in data}
+        except (OSError, ValueError):
+            pass
+    if _verb_pos is None:
+        try:
+            with open(forms, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                _verb_pos = data
+        except (OSError, ValueError):
+            pass
+    if _conj_reverse is None:
+        try:
+            with open(reverse, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                _conj_reverse = data
+        except (OSError, ValueError):
+            pass
 
 
 def _is_known_infinitive(candidate):
@@ -212,18 +289,7 @@ def decompose_infinitive_clitic(word, known_words):
     `_is_known_infinitive` must find actual verb evidence for it — surface-form
     membership alone admits `cuernos`→`cuer` and `fuerte`→`fuer`.
     """
-    remaining = word.lower()
-    clitics = []
-    for _ in range(2):  # max 2 clitics (e.g. dármelo)
-        matched = False
-        for pron in _CLITIC_PRONOUNS:
-            if remaining.endswith(pron) and len(remaining) - len(pron) >= 3:
-                remaining = remaining[:-len(pron)]
-                clitics.insert(0, pron)
-                matched = True
-                break
-        if not matched:
-            break
+    for remaining, clitics in _peels(word.lower(), 3):  # max 2 clitics (e.g. dármelo)
         candidate = _strip_acute(remaining)
         if not candidate.endswith(("ar", "er", "ir")):
             continue
@@ -337,19 +403,7 @@ def decompose_imperative_clitic(word, known_words):
     `conjugation_reverse` and restricted to the imperative mood; see
     `_imperative_host_allowed` for the false-positive guard.
     """
-    remaining = word.lower()
-    clitics = []
-    for _ in range(2):  # max 2 clitics (e.g. llévamelo)
-        matched = False
-        for pron in _CLITIC_PRONOUNS:
-            if (remaining.endswith(pron)
-                    and len(remaining) - len(pron) >= _MIN_IMPERATIVE_STEM):
-                remaining = remaining[:-len(pron)]
-                clitics.insert(0, pron)
-                matched = True
-                break
-        if not matched:
-            break
+    for remaining, clitics in _peels(word.lower(), _MIN_IMPERATIVE_STEM):  # max 2 (llévamelo)
         candidate = _strip_acute(remaining)
         lemma = _imperative_lemma(candidate)
         if not lemma:
@@ -436,6 +490,10 @@ def load_spanishdict_parents(sd_dir=None):
     previous behaviour.
     """
     root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if sd_dir is None:
+        lexicon = load_lexicon()
+        if lexicon is not None and lexicon.sd_parents is not None:
+            return lexicon.sd_parents
     sd_dir = sd_dir or os.path.join(root, "Data", "Spanish", "Senses", "spanishdict")
     if sd_dir in _SD_PARENTS_CACHE:
         return _SD_PARENTS_CACHE[sd_dir]
@@ -738,6 +796,7 @@ def classify_clitics(words, clitic_map, verbs_with_refl, known_for_gerund,
     # No Wiktionary entry means no tags, so roles are derived positionally and
     # person agreement is unknown — exactly the undecidable case.
     gerund_added = 0
+    prime_clitic_splits(words)
     for w in words:
         if w in clitic_merge or w in clitic_keep:
             continue
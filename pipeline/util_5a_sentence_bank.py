@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""util_5a_sentence_bank — the subtitle sentence bank as a log plus an index.
+
+sentence_bank.jsonl used to be rewritten whole on every harvest, and every
+reader (pick, embed, seed) loaded all of it into a dict to resolve the few
+sentence ids each word references. That is fine at a hundred thousand rows and
+not at tens of millions.
+
+The .jsonl file is now an append-only log, in the same row format as before,
+and ``sentence_bank.jsonl.idx`` next to it maps each id to the byte offset of
+its row:
+
+    b"SBIX" | version u8 | key width u8 | 2 pad | covered log bytes u64
+    | row count u64 | rows of (id, NUL-padded to key width) + offset u64
+
+sorted by id, so a lookup is a binary search over the memory-mapped file and
+only the rows actually asked for are read and parsed. Rows appended after the
+index was last written (the "tail") are scanned when the bank is opened; once
+the tail grows past a fraction of the bank, ``compact`` folds it in with a
+streaming merge. So appending N rows costs O(N) plus an amortised sequential
+rewrite of the index, and neither appending nor reading holds the bank in RAM.
+
+The first open of a bank without an index (any bank written before this)
+builds one from a single pass over the log. Ids are content hashes, so an id
+already in the bank is never written again and a row is never rewritten or
+dropped, as before.
+
+    bank = SentenceBank(SUBS / "sentence_bank.jsonl")
+    bank.append(rows)                     # skips ids already present
+    bank.get_many(ids)                    # {id: row}, read in file order
+    bank.close()
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import struct
+from pathlib import Path
+
+INDEX_VERSION = 1
+_MAGIC = b"SBIX"
+_HEADER = struct.Struct("<4sBBxxQQ")
+_OFFSET = struct.Struct("<Q")
+_ID_PREFIX = b'{"id": "'
+# One complete row; group 1 is its id when it leads the row, as every writer
+# here puts it.
+_ROW = re.compile(rb'(?:\{"id": "([^"\n]*)")?[^\n]*\n')
+_SCAN_CHUNK = 1 << 24
+
+COMPACT_MIN_TAIL = 50_000
+COMPACT_TAIL_FRACTION = 0.125
+
+
+def index_path_for(path):
+    return Path(str(path) + ".idx")
+
+
+def _row_id(line):
+    """The id of one encoded row, without parsing the rest of it."""
+    if line.startswith(_ID_PREFIX):
+        end = line.find(b'"', len(_ID_PREFIX))
+        if end > 0:
+            return line[len(_ID_PREFIX):end].decode("utf-8")
+    return json.loads(line)["id"]
+
+
+def encode_row(row):
+    return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class SentenceBank:
+    """Append-only sentence bank with an id -> offset index.
+
+    ``compact_min_tail`` / ``compact_fraction`` set when ``append`` folds the
+    tail into the sorted index (tests use small values).
+    """
+
+    def __init__(self, path, compact_min_tail=COMPACT_MIN_TAIL,
+                 compact_fraction=COMPACT_TAIL_FRACTION):
+        self.path = Path(path)
+        self.index_path = index_path_for(self.path)
+        self.compact_min_tail = compact_min_tail
+        self.compact_fraction = compact_fraction
+        self._log = None
+        self._index = None
+        self._index_file = None
+        self._width = 0
+        self._count = 0
+        self._covered = 0
+        self._tail = {}
+        self._open()
+
+    # ------------------------------------------------------------ open/close
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        self._log = open(self.path, "r+b")
+        if not self._load_index():
+            self._close_index()
+            self._width, self._count, self._covered = 0, 0, 0
+        self._scan_tail()
+        if not self.index_path.exists():
+            self.compact()
+
+    def _load_index(self):
+        try:
+            handle = open(self.index_path, "rb")
+        except FileNotFoundError:
+            return False
+        header = handle.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            handle.close()
+            return False
+        magic, version, width, covered, count = _HEADER.unpack(header)
+        size = os.path.getsize(self.path)
+        expected = _HEADER.size + count * (width + _OFFSET.size)
+        if (magic != _MAGIC or version != INDEX_VERSION or covered > size
+                or os.path.getsize(self.index_path) != expected):
+            # Foreign, partial, or describing a log that has since shrunk.
+            handle.close()
+            os.remove(self.index_path)
+            return False
+        self._index_file = handle
+        self._width, self._count, self._covered = width, count, covered
+        if count:
+            self._index = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return True
+
+    def _scan_tail(self):
+        """Index the rows appended since the index was written."""
+        self._tail = {}
+        tail = self._tail
+        indexed = self._indexed if self._count else None
+        offset = self._covered
+        self._log.seek(offset)
+        carry = b""
+        while True:
+            chunk = self._log.read(_SCAN_CHUNK)
+            if not chunk:
+                break
+            buf = carry + chunk
+            base = offset - len(carry)
+            end = 0
+            for match in _ROW.finditer(buf):
+                sid = match.group(1)
+                if sid is not None:
+                    sid = sid.decode("utf-8")
+                elif match.end() - match.start() > 1:
+                    try:
+                        sid = _row_id(match.group(0))
+                    except (ValueError, KeyError):
+                        sid = None
+                if sid is not None and sid not in tail and (
+                        indexed is None or indexed(sid) is None):
+                    tail[sid] = base + match.start()
+                end = match.end()
+            carry = buf[end:]
+            offset += len(chunk)
+
+    def _close_index(self):
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def close(self):
+        self._close_index()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------ lookup
+
+    def _key(self, i):
+        start = _HEADER.size + i * (self._width + _OFFSET.size)
+        return self._index[start:start + self._width]
+
+    def _indexed(self, sid):
+        if not self._count:
+            return None
+        key = sid.encode("utf-8")
+        if len(key) > self._width:
+            return None
+        key = key.ljust(self._width, b"\0")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key(lo) == key:
+            start = _HEADER.size + lo * (self._width + _OFFSET.size) + self._width
+            return _OFFSET.unpack_from(self._index, start)[0]
+        return None
+
+    def offset(self, sid):
+        """Byte offset of ``sid``'s row in the log, or None."""
+        found = self._tail.get(sid)
+        return found if found is not None else self._indexed(sid)
+
+    def __contains__(self, sid):
+        return self.offset(sid) is not None
+
+    def __len__(self):
+        return self._count + len(self._tail)
+
+    def _read_at(self, offset):
+        self._log.seek(offset)
+        return json.loads(self._log.readline())
+
+    def get(self, sid, default=None):
+        offset = self.offset(sid)
+        return default if offset is None else self._read_at(offset)
+
+    def __getitem__(self, sid):
+        offset = self.offset(sid)
+        if offset is None:
+            raise KeyError(sid)
+        return self._read_at(offset)
+
+    def get_many(self, sids):
+        """{id: row} for every id present, read in log order."""
+        offsets = sorted((offset, sid) for sid in set(sids)
+                         for offset in (self.offset(sid),) if offset is not None)
+        return {sid: self._read_at(offset) for offset, sid in offsets}
+
+    def ids(self):
+        """Every id in the bank (index order, then tail)."""
+        for i in range(self._count):
+            yield self._key(i).rstrip(b"\0").decode("utf-8")
+        yield from self._tail
+
+    # ------------------------------------------------------------ writes
+
+    def append(self, rows):
+        """Append rows whose id is not in the bank yet; return how many."""
+        self._log.seek(0, os.SEEK_END)
+        end = self._log.tell()
+        if end:
+            self._log.seek(end - 1)
+            if self._log.read(1) != b"\n":
+                # Torn final row from an interrupted append: end it so the
+                # next row starts on its own line (the torn one never parses).
+                self._log.write(b"\n")
+                end += 1
+        added = 0
+        for row in rows:
+            sid = row["id"]
+            if sid in self:
+                continue
+            data = encode_row(row)
+            self._log.write(data)
+            self._tail[sid] = end
+            end += len(data)
+            added += 1
+        self._log.flush()
+        if len(self._tail) > max(self.compact_min_tail, self._count * self.compact_fraction):
+            self.compact()
+        return added
+
+    def compact(self):
+        """Fold the tail into the sorted index (streaming merge)."""
+        self._log.flush()
+        covered = os.path.getsize(self.path)
+        if self._tail:
+            # Rows past the last complete line stay in the tail scan.
+            last = max(self._tail.values())
+            self._log.seek(last)
+            covered = last + len(self._log.readline())
+        # str order is code point order, which is UTF-8 byte order.
+        tail = [(sid.encode("utf-8"), self._tail[sid]) for sid in sorted(self._tail)]
+        width = max([self._width] + [len(key) for key, _ in tail])
+        record = self._width + _OFFSET.size
+        pack = _OFFSET.pack
+        tmp = Path(str(self.index_path) + ".tmp")
+        with open(tmp, "wb") as out:
+            out.write(_HEADER.pack(_MAGIC, INDEX_VERSION, width,
+                                   max(covered, self._covered), self._count + len(tail)))
+            pending = iter(tail)
+            nxt = next(pending, None)
+            block = []
+            for i in range(self._count):
+                start = _HEADER.size + i * record
+                key = self._index[start:start + self._width].rstrip(b"\0")
+                while nxt is not None and nxt[0] < key:
+                    block.append(nxt[0].ljust(width, b"\0") + pack(nxt[1]))
+                    nxt = next(pending, None)
+                block.append(key.ljust(width, b"\0")
+                             + self._index[start + self._width:start + record])
+                if len(block) >= 65536:
+                    out.write(b"".join(block))
+                    block = []
+            while nxt is not None:
+                block.append(nxt[0].ljust(width, b"\0") + pack(nxt[1]))
+                nxt = next(pending, None)
+            out.write(b"".join(block))
+        self._close_index()
+        os.replace(tmp, self.index_path)
+        if not self._load_index():
+            raise RuntimeError("sentence bank index did not reload: %s" % self.index_path)
+        self._scan_tail()
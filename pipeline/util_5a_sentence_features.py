@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""util_5a_sentence_features — per-line harvest features for the subtitle corpus.
+
+step_5a_harvest_subtitles gates and scores a line the same way whichever
+words it is harvesting for: 13 of the 15 gate checks and the whole structural
+score are properties of the sentence. This table computes them once per corpus
+(in worker processes) for every line that passes the byte-length prefilter
+and contains an inventory word, so a re-harvest with new targets, caps or line
+range is a join over arrays rather than another tokenising pass:
+
+    <cache_root>/subtitle_features-<fingerprint>/
+        meta.json             gate names, which are "broken", line count
+        line.npy              uint64  1-based corpus line number
+        gate.npy              uint8   index into meta["gates"]; 0 = clean
+        score.npy             float64 structural score (unrounded)
+        naturalness.npy       float64 as Scorer.structural rounds it
+        hard_words.npy        uint16
+        tokens.npy            uint16
+        sid.npy               S12     example_id(es, en); empty if broken
+        es_off/en_off/ids_off.npy  uint64  byte offsets of the line in each file
+        tokens.json, post_off.npy, postings.npy
+                              inventory word -> rows containing it
+        post_word.npy         uint8   gate_word verdict for that (row, word):
+                              WORD_OK, WORD_ABSENT or WORD_PROPER
+
+Rows are in corpus order and postings are ascending, so a word's rows come
+out in the order a streaming pass would meet them. Text is not stored: the
+harvest reads the few surviving lines back through the byte offsets.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .util_5a_sentence_index import (
+        PostingsMerger, Postings, ordered_results, save_array,
+    )
+except ImportError:
+    from util_5a_sentence_index import (
+        PostingsMerger, Postings, ordered_results, save_array,
+    )
+
+FEATURES_VERSION = 1
+CHUNK_LINES = 50_000
+
+WORD_OK, WORD_ABSENT, WORD_PROPER = 0, 1, 2
+WORD_REASONS = {WORD_ABSENT: "target absent", WORD_PROPER: "proper noun"}
+
+_COLUMNS = {"line": np.uint64, "gate": np.uint8, "score": np.float64,
+            "naturalness": np.float64, "hard_words": np.uint16,
+            "tokens": np.uint16, "es_off": np.uint64, "en_off": np.uint64,
+            "ids_off": np.uint64}
+
+
+def line_chunks(es_path, en_path, ids_path, min_bytes=0, size=CHUNK_LINES):
+    """The three aligned files as chunks of candidate lines with offsets.
+
+    Lines shorter than `min_bytes` in the .es file are skipped here (a line
+    can have no more characters than bytes). Files are split on b"\\n" only.
+    """
+    chunk = _new_chunk()
+    es_off = en_off = ids_off = 0
+    line = 0
+    with open(es_path, "rb") as es_f, open(en_path, "rb") as en_f, \
+            open(ids_path, "rb") as ids_f:
+        for es, en, ids in zip(es_f, en_f, ids_f):
+            line += 1
+            if len(es) >= min_bytes:
+                chunk["line"].append(line)
+                chunk["es_off"].append(es_off)
+                chunk["en_off"].append(en_off)
+                chunk["ids_off"].append(ids_off)
+                chunk["es"].append(es)
+                chunk["en"].append(en)
+                if len(chunk["es"]) >= size:
+                    chunk["seen"] = line
+                    yield chunk
+                    chunk = _new_chunk()
+            es_off += len(es)
+            en_off += len(en)
+            ids_off += len(ids)
+    chunk["seen"] = line
+    yield chunk
+
+
+def _new_chunk():
+    return {"line": [], "es_off": [], "en_off": [], "ids_off": [], "es": [], "en": []}
+
+
+def build_features(path, chunks, score_lines, *, workers, initializer, initargs,
+                   meta=None, total=None):
+    """Run `score_lines` over `chunks` and write a features table at `path`.
+
+    A scored chunk carries ``seen`` (corpus lines read so far), the kept
+    rows' columns (arrays keyed as _COLUMNS), ``gates`` [(name, broken)] for
+    its local gate codes, ``sid`` (12 bytes per row), and postings as
+    ``post_keys``/``post_count``/``post_rows`` with a ``post_word`` verdict
+    per posting.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    columns = {name: [] for name in _COLUMNS}
+    sids = []
+    gates, broken = ["clean"], set()
+    postings = PostingsMerger(spill_dir=tmp)
+    seen = kept = 0
+    t0 = time.time()
+    for chunk in ordered_results(score_lines, chunks, workers, initializer, initargs):
+        seen = chunk["seen"]
+        remap = np.zeros(max(1, len(chunk["gates"])), dtype=np.uint8)
+        for local, (name, is_broken) in enumerate(chunk["gates"]):
+            if name not in gates:
+                gates.append(name)
+            remap[local] = gates.index(name)
+            if is_broken:
+                broken.add(name)
+        for name in _COLUMNS:
+            values = np.frombuffer(chunk[name], dtype=chunk[name].typecode)
+            columns[name].append(remap[values] if name == "gate" else values)
+        sids.append(chunk["sid"])
+        postings.add(chunk["post_keys"], chunk["post_count"], chunk["post_rows"], kept,
+                     extra={"word": chunk["post_word"]})
+        kept += len(chunk["line"])
+        if total:
+            sys.stdout.write(f"\r    {100 * seen / total:5.1f}%  {kept:,} rows   ")
+        else:
+            sys.stdout.write(f"\r    {seen:,} lines  {kept:,} rows   ")
+        sys.stdout.flush()
+
+    for name, dtype in _COLUMNS.items():
+        parts = columns.pop(name)
+        save_array(tmp, name, np.concatenate(parts).astype(dtype) if parts
+                   else np.zeros(0, dtype))
+    save_array(tmp, "sid", np.frombuffer(b"".join(sids), dtype="S12"))
+    postings.save(tmp)
+
+    info = dict(meta or {}, version=FEATURES_VERSION, lines=seen, kept=kept,
+                gates=gates, broken=sorted(broken), keys=len(postings.keys),
+                seconds=round(time.time() - t0, 1))
+    with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    print(f"\r    Features for {kept:,} of {seen:,} lines in {time.time() - t0:.1f}s"
+          + " " * 20)
+    return SentenceFeatures(path)
+
+
+class SentenceFeatures:
+    """A built features table, memory-mapped."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        for name in list(_COLUMNS) + ["sid", "post_word"]:
+            setattr(self, name, np.load(self.path / ("%s.npy" % name),
+                                        mmap_mode="r", allow_pickle=False))
+        self.postings = Postings.load(self.path)
+        self.gates = self.meta["gates"]
+        self.is_broken = np.array([name in set(self.meta["broken"]) for name in self.gates])
+
+    def __len__(self):
+        return len(self.line)
+
+    def word_rows(self, word):
+        """(rows, gate_word verdicts) for every row containing `word`."""
+        start, end = self.postings.span(word)
+        return (np.asarray(self.postings.array(word)),
+                np.asarray(self.post_word[start:end]))
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""util_5a_sentence_index — step 5a's sentence index, built in chunks and kept.
+
+step_5a_build_examples scored and tokenized every corpus pair in one Python
+loop on every run, and its rare-word backfill streamed the raw 3 GB
+OpenSubtitles files again on top of that. The index it builds depends only on
+the corpus, the rank table and the inventory lookups, so this module builds
+it once from chunks scored in worker processes and keeps it on disk:
+
+    <cache_root>/<name>-<fingerprint>/
+        meta.json             counts, drop histogram, fingerprint inputs
+        length.npy            uint8   tokens per kept sentence
+        easiness.npy          int32   median corpus rank
+        inv_off.npy           int64   n+1 offsets into inv_ranks.npy
+        inv_ranks.npy         int32   sorted inventory ranks per sentence
+        spa_off.npy, spa.bin  int64 offsets + UTF-8 target text
+        eng_off.npy, eng.bin  int64 offsets + UTF-8 English text
+        tokens.json           index keys (tokens and matched phrases)
+        post_off.npy          int64   len(tokens)+1 offsets into postings.npy
+        postings.npy          uint32  record ids per key, ascending
+
+A chunk scorer (``score_chunk`` in step_5a_build_examples) turns a list of
+pairs into one compact chunk: the kept rows' columns as arrays, and postings
+as (keys, counts, local record ids). Chunks are merged in input order and the
+postings are grouped by key through sorted runs spilled next to the build
+(PostingsMerger), so the result is identical to the sequential one-pass build
+whatever the worker count, without holding every posting in memory.
+
+Everything is opened memory-mapped, so looking up a few thousand rare words
+in the full-corpus index reads only their rows (``records``). ``materialize``
+turns an index back into the list of record dicts the matching loop iterates
+over.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+INDEX_VERSION = 1
+CHUNK_PAIRS = 50_000
+# Postings held in memory before PostingsMerger sorts them into a run on disk.
+RUN_POSTINGS = 20_000_000
+
+_COLUMNS = ("length", "easiness", "inv_off", "inv_ranks", "spa_off", "eng_off")
+
+
+def fingerprint(*parts):
+    """Stable digest of JSON-serialisable build inputs."""
+    digest = hashlib.sha1()
+    for part in (INDEX_VERSION,) + parts:
+        digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def pairs_fingerprint(pairs):
+    """Digest of an in-memory pair list (the corpus content itself)."""
+    digest = hashlib.sha1()
+    for start in range(0, len(pairs), CHUNK_PAIRS):
+        digest.update("\n".join("%s\t%s" % pair for pair in pairs[start:start + CHUNK_PAIRS])
+                      .encode("utf-8"))
+    return "%d:%s" % (len(pairs), digest.hexdigest())
+
+
+def file_fingerprint(*paths):
+    """Cheap identity of on-disk corpora (path, size, mtime)."""
+    out = []
+    for path in paths:
+        stat = os.stat(path)
+        out.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return out
+
+
+def chunked(pairs, size=CHUNK_PAIRS):
+    for start in range(0, len(pairs), size):
+        yield pairs[start:start + size]
+
+
+def ordered_results(fn, chunks, workers, initializer, initargs):
+    """fn(chunk) for each chunk, in order, at most 2*workers chunks in flight.
+
+    Executor.map would consume the whole chunk iterator up front, which for
+    the raw corpus means reading every line before the first result.
+    """
+    if workers <= 1:
+        initializer(*initargs)
+        for chunk in chunks:
+            yield fn(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=initargs) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(fn, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def save_array(path, name, array):
+    np.save(path / ("%s.npy" % name), array, allow_pickle=False)
+
+
+def offsets_from_counts(counts):
+    """n+1 int64 offsets for n counts."""
+    out = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=out[1:])
+    return out
+
+
+class PostingsMerger:
+    """Merge per-chunk postings into one key-grouped table.
+
+    A chunk contributes (keys, counts, local ids) plus optional per-posting
+    columns (``extra``); ids are shifted by the chunk's first record id.
+    Postings are buffered up to ``run_postings``, sorted by key into a run
+    and, given a ``spill_dir``, written there, so memory holds one run rather
+    than the whole corpus. ``save`` scatters the runs, in input order, into
+    memory-mapped outputs at their key's offsets: each key's ids stay in
+    input order whatever the chunking, as a stable sort of everything gives.
+    """
+
+    def __init__(self, spill_dir=None, run_postings=RUN_POSTINGS):
+        self.keys = {}
+        self._spill_dir = Path(spill_dir) / "postings-runs" if spill_dir else None
+        self._run_postings = run_postings
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._runs = []
+        self._key_ids, self._records = [], []
+        self._extra = {}
+        self._buffered = 0
+
+    def add(self, keys, counts, local_ids, base, extra=None):
+        ids = np.array([self.keys.setdefault(key, len(self.keys)) for key in keys],
+                       dtype=np.uint32)
+        self._key_ids.append(np.repeat(ids, np.frombuffer(counts, dtype=np.uint32)))
+        self._records.append(np.frombuffer(local_ids, dtype=np.uint32) + np.uint32(base))
+        for name, values in (extra or {}).items():
+            self._extra.setdefault(name, []).append(
+                np.frombuffer(values, dtype=values.typecode))
+        self._buffered += len(self._records[-1])
+        if self._buffered >= self._run_postings:
+            self._flush()
+
+    def _flush(self):
+        """Sort the buffered postings by key into one run."""
+        if not self._key_ids:
+            return
+        key_ids = np.concatenate(self._key_ids)
+        # Stable: within a key, records stay in input order (ascending ids).
+        order = np.argsort(key_ids, kind="stable")
+        run = {"key_ids": key_ids[order], "records": np.concatenate(self._records)[order]}
+        for name, parts in self._extra.items():
+            run["post_" + name] = np.concatenate(parts)[order]
+        counts = np.bincount(key_ids, minlength=len(self.keys))
+        counts[:len(self._counts)] += self._counts
+        self._counts = counts
+        self._key_ids, self._records, self._extra, self._buffered = [], [], {}, 0
+        if self._spill_dir is not None:
+            run_dir = self._spill_dir / ("run-%05d" % len(self._runs))
+            run_dir.mkdir(parents=True)
+            for name, values in run.items():
+                save_array(run_dir, name, values)
+            run = run_dir
+        self._runs.append(run)
+
+    def _run_arrays(self, run):
+        if isinstance(run, dict):
+            return run
+        return {p.stem: np.load(p, mmap_mode="r") for p in sorted(run.glob("*.npy"))}
+
+    def save(self, path):
+        """Write post_off.npy, postings.npy, post_<extra>.npy and tokens.json."""
+        self._flush()
+        counts = np.zeros(len(self.keys), dtype=np.int64)
+        counts[:len(self._counts)] = self._counts
+        offsets = offsets_from_counts(counts)
+        save_array(path, "post_off", offsets)
+        total = int(offsets[-1])
+        runs = [self._run_arrays(run) for run in self._runs]
+        names = ["records"] + [name for name in (runs[0] if runs else {})
+                               if name not in ("key_ids", "records")]
+        outputs = {}
+        for name in names:
+            target = path / ("%s.npy" % ("postings" if name == "records" else name))
+            dtype = runs[0][name].dtype if runs else np.uint32
+            outputs[name] = (np.lib.format.open_memmap(target, mode="w+", dtype=dtype,
+                                                       shape=(total,))
+                             if total else None)
+            if not total:
+                np.save(target, np.zeros(0, dtype), allow_pickle=False)
+        cursor = offsets[:-1].copy()
+        for run in runs:
+            key_ids = np.asarray(run["key_ids"])
+            run_counts = np.bincount(key_ids, minlength=len(self.keys))
+            run_starts = offsets_from_counts(run_counts)[:-1]
+            dest = cursor[key_ids] + (np.arange(len(key_ids)) - run_starts[key_ids])
+            for name, out in outputs.items():
+                out[dest] = run[name]
+            cursor += run_counts
+        for out in outputs.values():
+            if out is not None:
+                out.flush()
+        del runs, outputs
+        self._runs = []
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+        with open(path / "tokens.json", "w", encoding="utf-8") as f:
+            json.dump(list(self.keys), f, ensure_ascii=False)
+
+
+def build_index(path, chunks, score_chunk, *, workers, initializer, initargs,
+                meta=None, total=None):
+    """Score `chunks` (possibly in worker processes) and write an index at `path`.
+
+    `total` (input pairs) only drives the progress line. Returns the opened
+    SentenceIndex.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    columns = {name: [] for name in ("length", "easiness", "inv_count", "inv_ranks",
+                                     "spa_len", "eng_len")}
+    postings = PostingsMerger(spill_dir=tmp)
+    drops = [0, 0, 0, 0]
+    seen = kept = 0
+    t0 = time.time()
+    with open(tmp / "spa.bin", "wb") as spa_out, open(tmp / "eng.bin", "wb") as eng_out:
+        for chunk in ordered_results(score_chunk, chunks, workers, initializer, initargs):
+            seen += chunk["seen"]
+            drops = [a + b for a, b in zip(drops, chunk["drops"])]
+            for name in columns:
+                columns[name].append(np.frombuffer(chunk[name], dtype=chunk[name].typecode))
+            spa_out.write(chunk["spa"])
+            eng_out.write(chunk["eng"])
+            postings.add(chunk["tokens"], chunk["token_count"], chunk["postings"], kept)
+            kept += len(chunk["length"])
+            if total:
+                elapsed = time.time() - t0
+                rate = seen / elapsed if elapsed > 0 else 0
+                remaining = (total - seen) / rate if rate > 0 else 0
+                sys.stdout.write(f"\r    {100 * seen / total:5.1f}%  {kept:,} kept  "
+                                 f"~{remaining:.0f}s remaining   ")
+            else:
+                sys.stdout.write(f"\r    {seen:,} lines  {kept:,} kept   ")
+            sys.stdout.flush()
+
+    def joined(name, dtype):
+        parts = columns.pop(name)
+        return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype)
+
+    save_array(tmp, "length", joined("length", np.uint8))
+    save_array(tmp, "easiness", joined("easiness", np.int32))
+    save_array(tmp, "inv_off", offsets_from_counts(joined("inv_count", np.int64)))
+    save_array(tmp, "inv_ranks", joined("inv_ranks", np.int32))
+    for side in ("spa", "eng"):
+        save_array(tmp, side + "_off", offsets_from_counts(joined(side + "_len", np.int64)))
+    postings.save(tmp)
+
+    info = dict(meta or {}, version=INDEX_VERSION, seen=seen, kept=kept,
+                drops=dict(zip(("short", "long", "trivial", "no_inv"), drops)),
+                keys=len(postings.keys), seconds=round(time.time() - t0, 1))
+    with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    print(f"\r    Indexed in {time.time() - t0:.1f}s — kept {kept:,} of {seen:,} "
+          f"(dropped: {drops[0]} short, {drops[1]} long, "
+          f"{drops[2]} trivial, {drops[3]} no-inv)" + " " * 10)
+    return SentenceIndex(path)
+
+
+class Postings:
+    """Read-only {key: [record ids]} view, as the dict inv_index was."""
+
+    def __init__(self, keys, offsets, postings):
+        self._keys = keys
+        self._offsets = offsets
+        self._postings = postings
+
+    @classmethod
+    def load(cls, path):
+        with open(Path(path) / "tokens.json", encoding="utf-8") as f:
+            keys = {key: i for i, key in enumerate(json.load(f))}
+        return cls(keys, np.load(Path(path) / "post_off.npy", mmap_mode="r"),
+                   np.load(Path(path) / "postings.npy", mmap_mode="r"))
+
+    def span(self, key):
+        """(start, end) of `key`'s ids in postings.npy (and post_*.npy)."""
+        i = self._keys.get(key)
+        if i is None:
+            return 0, 0
+        return int(self._offsets[i]), int(self._offsets[i + 1])
+
+    def array(self, key):
+        start, end = self.span(key)
+        return self._postings[start:end]
+
+    def get(self, key, default=None):
+        if key not in self._keys:
+            return default
+        return self.array(key).tolist()
+
+    def __getitem__(self, key):
+        found = self.get(key)
+        if found is None:
+            raise KeyError(key)
+        return found
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class SentenceIndex:
+    """A built index, memory-mapped. ``index[i]`` is a record dict."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        for name in _COLUMNS:
+            setattr(self, "_" + name, np.load(self.path / ("%s.npy" % name),
+                                              mmap_mode="r", allow_pickle=False))
+        self._text = {}
+        for side in ("spa", "eng"):
+            with open(self.path / ("%s.bin" % side), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                self._text[side] = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                                    if size else b"")
+        self.postings = Postings.load(self.path)
+
+    def __len__(self):
+        return len(self._length)
+
+    def __getitem__(self, i):
+        return self.records([i])[0]
+
+    def records(self, ids):
+        """Record dicts for `ids`, in that order."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return []
+        texts = {}
+        for side in ("spa", "eng"):
+            offsets, blob = getattr(self, "_%s_off" % side), self._text[side]
+            texts[side] = [blob[a:b].decode("utf-8") for a, b in zip(
+                offsets[ids].tolist(), offsets[ids + 1].tolist())]
+        inv_ranks = self._inv_ranks
+        return [
+            {"eng": eng, "spa": spa, "length": length, "easiness": easiness,
+             "inv_ranks": tuple(inv_ranks[a:b].tolist())}
+            for eng, spa, length, easiness, a, b in zip(
+                texts["eng"], texts["spa"], self._length[ids].tolist(),
+                self._easiness[ids].tolist(), self._inv_off[ids].tolist(),
+                self._inv_off[ids + 1].tolist())
+        ]
+
+    def materialize(self):
+        """Every record as a dict, for loops that touch most of them."""
+        def texts(side):
+            offsets = getattr(self, "_%s_off" % side).tolist()
+            blob = bytes(self._text[side])
+            return [blob[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+        inv_off = self._inv_off.tolist()
+        inv_ranks = self._inv_ranks.tolist()
+        return [
+            {"eng": eng, "spa": spa, "length": length, "easiness": easiness,
+             "inv_ranks": tuple(inv_ranks[a:b])}
+            for eng, spa, length, easiness, a, b in zip(
+                texts("eng"), texts("spa"), self._length.tolist(),
+                self._easiness.tolist(), inv_off, inv_off[1:])
+        ]
+
+
+def open_or_build(cache_root, name, key, chunks, score_chunk, opener=None,
+                  builder=None, keep=1, **build_kwargs):
+    """Reuse ``<cache_root>/<name>-<key>/`` or build it from ``chunks()``.
+
+    Once a new build is written, other builds under the same name are removed
+    beyond the ``keep`` most recently used (a reuse counts as a use), so by
+    default the cache holds one index per corpus. ``opener``/``builder``
+    default to SentenceIndex/build_index; other tables in the same layout
+    (util_5a_sentence_features) pass their own.
+    """
+    opener = opener or SentenceIndex
+    builder = builder or build_index
+    cache_root = Path(cache_root)
+    path = cache_root / ("%s-%s" % (name, key))
+    if (path / "meta.json").exists():
+        try:
+            index = opener(path)
+        except (OSError, ValueError) as exc:
+            print(f"    Cached index {path.name} unreadable ({exc}); rebuilding")
+        else:
+            print(f"    Reusing sentence index {path.name} "
+                  f"({index.meta['kept']:,} sentences)")
+            os.utime(path)
+            return index
+    cache_root.mkdir(parents=True, exist_ok=True)
+    index = builder(path, chunks(), score_chunk, **build_kwargs)
+    others = sorted((p for p in cache_root.glob(name + "-*")
+                     if p != path and p.is_dir() and p.name.rsplit("-", 1)[0] == name),
+                    key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for stale in others[max(0, keep - 1):]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return index
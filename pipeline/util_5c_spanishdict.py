@@ -13,6 +13,10 @@ from urllib.parse import quote
 
 import requests
 
+try:  # Package import in tests/tools; script import in pipeline entry points.
+    from .util_4a_lexicon import load_lexicon
+except ImportError:  # pragma: no cover - exercised by direct script execution
+    from util_4a_lexicon import load_lexicon
 
 _PROJECT_ROOT = Path(__file__).resolve().parents[1]
 _LAYERS_DIR = _PROJECT_ROOT / "Data" / "Spanish" / "layers"
@@ -257,6 +261,14 @@ def _load_guard_data(spanish_forms_path=None, conj_reverse_path=None):
     global _spanish_forms_deac, _conj_reverse_deac, _conj_reverse_heads, _guard_data_loaded
     if _guard_data_loaded:
         return
+    lexicon = None if (spanish_forms_path or conj_reverse_path) else load_lexicon()
+    if lexicon is not None and lexicon.deaccented_forms is not None:
+        # Same tables, precomputed by util_4a_build_spanish_forms.
+        _spanish_forms_deac = lexicon.deaccented_forms
+        _conj_reverse_deac = lexicon.conj_deac or {}
+        _conj_reverse_heads = lexicon.conj_heads or {}
+        _guard_data_loaded = True
+        return
     forms_path = Path(spanish_forms_path) if spanish_forms_path else SPANISH_FORMS_PATH
     conj_path = Path(conj_reverse_path) if conj_reverse_path else CONJ_REVERSE_PATH
 
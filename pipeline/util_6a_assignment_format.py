@@ -24,7 +24,6 @@ Buckets:
                                senses inline (gap-fill*).
 """
 
-import json
 import re
 from pathlib import Path
 
@@ -32,10 +31,12 @@ try:  # Package import in tests/tools; script import in pipeline entry points.
     from .util_6a_method_priority import METHOD_PRIORITY
     from .util_6a_prompt_registry import capability_tier, load_registry
     from .util_evidence_store import archive_json_artifact
+    from .util_layer_format import read_layer, write_layer
 except ImportError:  # pragma: no cover - exercised by direct script execution
     from util_6a_method_priority import METHOD_PRIORITY
     from util_6a_prompt_registry import capability_tier, load_registry
     from util_evidence_store import archive_json_artifact
+    from util_layer_format import read_layer, write_layer
 
 
 # A proposed gloss is a proper-noun *label* — not a translation — when Gemini
@@ -175,10 +176,10 @@ def load_assignments(path):
     Auto-detects on-disk format so old files still read cleanly:
       - new:    payload is a list of entries.
       - legacy: payload is a {method: [items]} dict.
-    Empty / malformed payloads become {}.
+    Empty / malformed payloads become {}. A fresh binary sibling
+    (util_layer_format) is read in place of the JSON.
     """
-    with open(path, encoding="utf-8") as f:
-        raw = json.load(f)
+    raw, _source = read_layer(path)
     out = {}
     for word, payload in raw.items():
         if isinstance(payload, list):
@@ -220,9 +221,7 @@ def dump_assignments(word_dict, path):
                 methods[method] = clean
         if methods:
             serialized[word] = methods
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(serialized, f, ensure_ascii=False, indent=2)
+    write_layer(path, serialized)
     path_obj = Path(path).resolve()
     if (path_obj.parent.name in ("sense_assignments", "sense_assignments_lemma")
             and path_obj.parent.parent.name == "layers"):
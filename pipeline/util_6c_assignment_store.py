@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Cross-artist store of step 6c's per-example classify-or-propose answers.
+
+Artists in a register share collaborations and featured verses, so the same
+word in the same line under the same SpanishDict menu is sent to Gemini once
+per artist. The shared sense registers (util_5d_shared_sense_register) reuse
+proposed *senses*; this reuses the per-example *decision*.
+
+An answer is keyed by
+
+    (menu fingerprint, normalized line, target surface, prompt_id)
+
+where the menu fingerprint covers exactly the menu rows the prompt renders
+(id, POS, translation, context) and the line is the example's Spanish text,
+casefolded with whitespace collapsed. Everything else the prompt carries (the
+artist context, the English aid, the POS hint) is treated as not changing the
+answer.
+
+    store = AssignmentAnswerStore(default_cache_dir(artist_dir), prompt_id)
+    plan = store.plan(record)                 # before batching
+    request = store.request(record, plan)     # only the unanswered examples
+    calls = store.merge_calls(record, plan, api_calls)
+    store.save()
+
+Answers persist in ``<cache_dir>/<prompt_id>.jsonl`` as ``[key, answer]``
+rows, appended after each batch; a torn final row is ignored. Only usable
+answers are stored (a menu id, a proposed gloss or an abstain reason), so an
+invalid output is retried by the next run rather than replayed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+
+STORE_VERSION = 1
+
+ANSWER_FIELDS = ("sense", "closest", "proposed", "why_not_menu",
+                 "proposed_pos", "abstain_reason")
+
+
+def _digest(value, length):
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:length]
+
+
+def menu_fingerprint(senses, ids):
+    """Digest of the menu rows build_classify_or_propose_prompt renders."""
+    rows = [[sid, sense.get("pos", ""), sense.get("translation", ""),
+             (sense.get("context") or "")[:80]]
+            for sid, sense in zip(ids or [], senses or [])]
+    return _digest(rows, 16)
+
+
+def normalize_line(text):
+    return " ".join(str(text or "").casefold().split())
+
+
+def answer_key(fingerprint, line, surface, prompt_id):
+    return _digest([STORE_VERSION, fingerprint, normalize_line(line), surface, prompt_id], 24)
+
+
+def record_keys(record, prompt_id):
+    """One answer key per example of a step 6c classify-or-propose record."""
+    fingerprint = menu_fingerprint(record.get("senses"), record.get("ids"))
+    return [answer_key(fingerprint, example.get("spanish"), record["word"], prompt_id)
+            for example in record.get("examples") or []]
+
+
+def reusable_answer(call, ids):
+    """The storable part of one model call, or None if it isn't usable.
+
+    A numeric sense index is resolved to its menu id, as step 6c does, so the
+    stored answer survives a reordered menu with the same rows.
+    """
+    sense = call.get("sense")
+    if sense not in (None, "null", "", "None"):
+        sense = str(sense)
+        if sense not in ids:
+            if sense.lstrip("-").isdigit() and 0 <= int(sense) < len(ids):
+                sense = ids[int(sense)]
+            else:
+                return None
+    else:
+        sense = None
+    answer = {field: call.get(field) for field in ANSWER_FIELDS[1:]
+              if call.get(field) not in (None, "")}
+    if sense is not None:
+        answer["sense"] = sense
+    elif not (str(answer.get("proposed") or "").strip() or answer.get("abstain_reason")):
+        return None
+    return answer
+
+
+class AssignmentAnswerStore:
+    """Per-example answers shared across artists and runs (thread-safe)."""
+
+    def __init__(self, cache_dir=None, prompt_id=""):
+        self.prompt_id = prompt_id
+        self.cache_path = (
+            Path(cache_dir) / ("%s.jsonl" % prompt_id) if cache_dir else None)
+        self._answers = {}
+        self._unsaved = []
+        self._lock = threading.Lock()
+        self.stats = {"examples": 0, "reused": 0, "deduplicated": 0,
+                      "sent": 0, "recorded": 0}
+        if self.cache_path is not None:
+            self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+        except FileNotFoundError:
+            return
+        try:  # one parse for the whole file rather than one per row
+            rows = json.loads("[" + ",".join(lines) + "]")
+        except ValueError:  # torn final line from an interrupted run
+            rows = []
+            for line in lines:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+        for key, answer in rows:
+            self._answers[key] = answer
+
+    def __contains__(self, key):
+        return key in self._answers
+
+    def __len__(self):
+        return len(self._answers)
+
+    def plan(self, record):
+        """Split a record's examples into reused, duplicate and to-send.
+
+        Returns ``{"keys", "send", "reused", "copies"}``: ``send`` lists the
+        local example indices the model must see, ``reused`` maps local index
+        to a stored answer, and ``copies`` maps a repeated line's local index
+        to the index of its first occurrence in this record.
+        """
+        keys = record_keys(record, self.prompt_id)
+        plan = {"keys": keys, "send": [], "reused": {}, "copies": {}}
+        first = {}
+        for local, key in enumerate(keys):
+            if key in self._answers:
+                plan["reused"][local] = self._answers[key]
+            elif key in first:
+                plan["copies"][local] = first[key]
+            else:
+                first[key] = local
+                plan["send"].append(local)
+        with self._lock:
+            self.stats["examples"] += len(keys)
+            self.stats["reused"] += len(plan["reused"])
+            self.stats["deduplicated"] += len(plan["copies"])
+            self.stats["sent"] += len(plan["send"])
+        return plan
+
+    @staticmethod
+    def request(record, plan):
+        """The record as the model should see it: only the examples to send."""
+        return dict(record, examples=[record["examples"][i] for i in plan["send"]])
+
+    def merge_calls(self, record, plan, api_calls):
+        """Full-record calls from the model's answers plus reused ones.
+
+        ``api_calls`` number examples within the sent subset; the result
+        numbers them within the whole record, exactly as if every example had
+        been sent. New usable answers are added to the store.
+        """
+        calls = []
+        answered = {}
+        for call in api_calls or []:
+            if not isinstance(call, dict):
+                continue
+            try:
+                position = int(call.get("example")) - 1
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= position < len(plan["send"]):
+                continue
+            local = plan["send"][position]
+            calls.append(dict(call, example=local + 1))
+            answered.setdefault(local, call)
+        for local, answer in sorted(plan["reused"].items()):
+            calls.append(dict(answer, example=local + 1))
+        for local, source in sorted(plan["copies"].items()):
+            if source in answered:
+                calls.append(dict(answered[source], example=local + 1))
+
+        ids = record.get("ids") or []
+        with self._lock:
+            for local, call in answered.items():
+                answer = reusable_answer(call, ids)
+                key = plan["keys"][local]
+                if answer is not None and key not in self._answers:
+                    self._answers[key] = answer
+                    self._unsaved.append(key)
+                    self.stats["recorded"] += 1
+        return calls
+
+    def save(self):
+        """Append answers recorded this session to the store file."""
+        with self._lock:
+            if self.cache_path is None or not self._unsaved:
+                return
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, "a", encoding="utf-8") as handle:
+                for key in self._unsaved:
+                    handle.write(json.dumps([key, self._answers[key]],
+                                            ensure_ascii=False) + "\n")
+            self._unsaved = []
+
+    def format_report(self, batches=None, batches_without=None):
+        examples = self.stats["examples"]
+        avoided = self.stats["reused"] + self.stats["deduplicated"]
+        text = ("Assignment store: %d/%d example answers reused (%s; %d stored, "
+                "%d repeated lines), %d sent, %d new answers recorded"
+                % (avoided, examples,
+                   "%.1f%%" % (100.0 * avoided / examples) if examples else "n/a",
+                   self.stats["reused"], self.stats["deduplicated"],
+                   self.stats["sent"], self.stats["recorded"]))
+        if batches_without:
+            text += "; %d/%d API batches avoided (%.1f%%)" % (
+                batches_without - batches, batches_without,
+                100.0 * (batches_without - batches) / batches_without)
+        return text
+
+
+def default_cache_dir(artist_dir):
+    """Shared per-language store: Artists/<language>/assignment_store/."""
+    return os.path.join(os.path.dirname(os.path.abspath(artist_dir)), "assignment_store")
@@ -13,6 +13,8 @@ from __future__ import annotations
 
 import re
 
+import numpy as np
+
 FEATURE_VERSION = 5
 
 FEATURES = [
@@ -186,11 +188,18 @@ def structural_satisfied(kind, word, sentence):
     toks = _TOKEN.findall((sentence or "").lower())
     if not toks:
         return False
+    return _window_satisfies(kind, _window(toks, word.lower()))
+
+
+def _window(toks, word):
     try:
-        i = toks.index(word.lower())
-        window = toks[i + 1:i + 4]
+        i = toks.index(word)
+        return toks[i + 1:i + 4]
     except ValueError:
-        window = toks
+        return toks
+
+
+def _window_satisfies(kind, window):
     if kind == "gerund":
         return any(_GERUND.match(t) for t in window)
     if kind == "participle":
@@ -232,3 +241,131 @@ def structural_features(word, sentence, menu, pred_sense_id, tuple_of):
                 alt = 1.0
                 break
     return [1.0, float(pred_kind is not None), satisfied, discriminates, alt]
+
+
+# ---------------------------------------------------------------------------
+# Columnar path
+# ---------------------------------------------------------------------------
+# The functions above build one row at a time, and companion_features /
+# structural_features re-read the whole menu (every context note through both
+# regexes, every sense's tuple) for each row -- though every example of a word
+# shares its menu. MenuFeatures reads a menu once; construction_features and
+# feature_matrix then fill all rows' vectors as arrays. The row functions stay
+# the reference: test_util_6d_wsd_features checks the two agree value for value.
+
+class MenuFeatures:
+    """What the companion and construction blocks need from one word's menu."""
+
+    def __init__(self, word, menu, tuple_of):
+        menu = menu or {}
+        self.word = word.lower()
+        self.tuples = {sid: tuple_of(word, s) for sid, s in menu.items()}
+        all_t = set(self.tuples.values())
+        self.comps = {sid: c for sid, c in
+                      ((sid, companion_of(s)) for sid, s in menu.items()) if c}
+        with_c = {self.tuples[sid] for sid in self.comps}
+        self.comp_discriminates = float(bool(with_c) and with_c != all_t)
+        self.kinds = {sid: structural_of(s) for sid, s in menu.items()}
+        with_k = {self.tuples[sid] for sid, k in self.kinds.items() if k}
+        self.struct_discriminates = float(bool(with_k) and with_k != all_t)
+        self._alt_kinds = {}
+
+    def alt_kinds(self, pred_sense_id):
+        """Constructions demanded by the pick's same-tuple siblings."""
+        if pred_sense_id not in self._alt_kinds:
+            tup = self.tuples[pred_sense_id]
+            self._alt_kinds[pred_sense_id] = {
+                k for sid, k in self.kinds.items()
+                if k and sid != pred_sense_id and self.tuples[sid] == tup}
+        return self._alt_kinds[pred_sense_id]
+
+    def companion(self, pred_sense_id, toks, tokset):
+        """companion_features for one row, from its sentence's tokens."""
+        if not self.comps:
+            return [0.0, 0.0, 0.0, 0.0, 0.0]
+        pred_comp = self.comps.get(pred_sense_id)
+        present = adjacent = 0.0
+        if pred_comp:
+            parts = pred_comp.split()
+            present = float(all(p in tokset for p in parts))
+            if present and self.word in tokset:
+                wi = toks.index(self.word)
+                adjacent = float(any(abs(i - wi) <= 2
+                                     for i, t in enumerate(toks) if t == parts[0]))
+        return [1.0, float(pred_comp is not None), present, adjacent,
+                self.comp_discriminates]
+
+    def structural(self, pred_sense_id, toks):
+        """structural_features for one row, from its sentence's tokens."""
+        if not any(self.kinds.values()):
+            return [0.0, 0.0, 0.0, 0.0, 0.0]
+        pred_kind = self.kinds.get(pred_sense_id)
+        window = _window(toks, self.word) if toks else None
+        sat = (lambda kind: bool(toks) and _window_satisfies(kind, window))
+        satisfied = float(bool(pred_kind) and sat(pred_kind))
+        alt = 0.0
+        if pred_sense_id in self.tuples and not satisfied:
+            alt = float(any(sat(k) for k in self.alt_kinds(pred_sense_id)))
+        return [1.0, float(pred_kind is not None), satisfied,
+                self.struct_discriminates, alt]
+
+
+def construction_features(words, sentences, menus, preds, tuple_of, *,
+                          companion=True, structural=True):
+    """(companion, structural) blocks for many rows, as two (n, 5) arrays.
+
+    Rows of the same word must pass the same menu object: menus are read once
+    per (word, menu). A disabled block is all zeros, as the ablations expect.
+    """
+    n = len(words)
+    comp = np.zeros((n, 5), np.float64)
+    struct = np.zeros((n, 5), np.float64)
+    if not (companion or structural):
+        return comp, struct
+    readers, tokens = {}, {}
+    for i, (word, sentence, menu, pred) in enumerate(zip(words, sentences, menus, preds)):
+        key = (word, id(menu))
+        reader = readers.get(key)
+        if reader is None:
+            reader = readers[key] = MenuFeatures(word, menu, tuple_of)
+        got = tokens.get(sentence)
+        if got is None:
+            toks = _TOKEN.findall((sentence or "").lower())
+            got = tokens[sentence] = (toks, set(toks))
+        if companion:
+            comp[i] = reader.companion(pred, *got)
+        if structural:
+            struct[i] = reader.structural(pred, got[0])
+    return comp, struct
+
+
+def feature_matrix(*, tuple_gap, class_gap, n_tup, n_leaf, sent_len, pred_tuple,
+                   pred_empty, token, companion, structural):
+    """build() for many rows at once: an (n, len(FEATURES)) float64 array.
+
+    Every argument is a per-row sequence; `token` is (n, 3) and `companion` /
+    `structural` are (n, 5), as construction_features returns them.
+    """
+    n = len(tuple_gap)
+    X = np.empty((n, len(FEATURES)), np.float64)
+    if not n:
+        return X
+    n_tup = np.asarray(n_tup, np.float64)
+    n_leaf = np.asarray(n_leaf, np.float64)
+    class_gap = np.asarray(class_gap, np.float64)
+    pos = np.array([p for _, p in pred_tuple], dtype=object)
+    X[:, 0] = tuple_gap
+    X[:, 1] = class_gap
+    X[:, 2] = class_gap >= 0.999
+    X[:, 3] = n_tup
+    X[:, 4] = n_leaf
+    X[:, 5] = n_leaf / np.maximum(n_tup, 1)
+    X[:, 6] = sent_len
+    X[:, 7] = [str(hw).endswith("se") for hw, _ in pred_tuple]
+    X[:, 8] = pos == "VERB"
+    X[:, 9] = (pos == "NOUN") | (pos == "ADJ")
+    X[:, 10] = pred_empty
+    X[:, 11:14] = token
+    X[:, 14:19] = companion
+    X[:, 19:24] = structural
+    return X
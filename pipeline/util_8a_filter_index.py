@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""util_8a_filter_index — the deck's filter flags as rank-ordered bitsets.
+
+Deciding which cards a deck shows used to mean a pass over every joined entry:
+js/vocab.js buildFilteredVocab() checks the flags card by card, and
+bench_deck_quality.visible() re-implements the same checks over the full index
+and master. Steps 8a and 8b now also write `<base>.filter.json` next to each
+`<base>.index.json`:
+
+    {"version": 1, "count": N, "ids": [...rank order...],
+     "cognateThresholds": [0.75, 0.85, 0.95],
+     "bits": {"english": "<base64>", "cognate@0.85": ..., "pos:NOUN": ...},
+     "sources": {"index": "<sha256>", "master": "<sha256>"}}
+
+Bit i of a bitset is the card at ids[i], the card at rank i + 1. Each bitset is
+little-endian 32-bit words in base64, so the app decodes it straight into a
+Uint32Array (js/filter-index-core.js) and both sides get a visible set with a
+few ANDs instead of a scan.
+
+`sources` holds the sha256 of the index and master files the bitsets were
+built from. The master is shared between artists and stamped after assembly
+(tool_8a_stamp_loanword_flag.py), so a reader checks `is_current()` and falls
+back to the full scan when the files have moved on. The app hashes the bytes
+it fetched and makes the same check (js/filter-index-core.js isCurrent()).
+
+    python3 pipeline/util_8a_filter_index.py INDEX [--master MASTER]
+rebuilds a filter index from files already on disk.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+
+FILTER_INDEX_VERSION = 1
+# The cognate sensitivities the app offers (index.html #cognateSensitivitySelector).
+COGNATE_THRESHOLDS = (0.75, 0.85, 0.95)
+# js/vocab.js ARTIST_MIN_SENSE_FREQ: an artist card needs a sense at least this
+# strongly assigned to count as a main-deck card.
+ARTIST_MIN_SENSE_FREQ = 0.05
+
+
+def filter_index_path(index_path):
+    """`X.index.json` -> `X.filter.json`."""
+    base = str(index_path)
+    if base.endswith(".index.json"):
+        base = base[:-len(".index.json")]
+    else:
+        base = base.rsplit(".", 1)[0]
+    return base + ".filter.json"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cognate_bit(threshold):
+    return "cognate@%g" % threshold
+
+
+def entry_bits(idx, mst):
+    """Names of the bitsets one card belongs to.
+
+    `mst` is the card's master entry for an artist deck, or None for a normal
+    deck, whose index entries carry their own senses. Flags follow the joined
+    entry js/vocab.js joinWithMaster() builds.
+    """
+    if mst is None:
+        mst = idx
+    if not mst:
+        return []
+    bits = ["present"]
+    if mst.get("is_english"):
+        bits.append("english")
+    if mst.get("is_noise") or mst.get("is_interjection"):
+        bits.append("noise")
+    if mst.get("is_english_loanword"):
+        bits.append("english_loanword")
+    if mst.get("is_propernoun") or mst.get("is_propernoun_corpus"):
+        bits.append("propernoun")
+
+    senses = mst.get("senses", mst.get("meanings")) or []
+    real = [(i, s) for i, s in enumerate(senses) if (s.get("translation") or "").strip()]
+    if real:
+        bits.append("has_translation")
+        if all(s.get("pos") == "PROPN" for _, s in real):
+            bits.append("all_propn")
+        bits.extend(sorted({"pos:%s" % s["pos"] for _, s in real if s.get("pos")}))
+    freqs = idx.get("sense_frequencies") or []
+    if any(i < len(freqs) and float(freqs[i] or 0) >= ARTIST_MIN_SENSE_FREQ for i, _ in real):
+        bits.append("artist_sense")
+
+    if (idx.get("corpus_count", 0) or 0) > 1:
+        bits.append("multi_occurrence")
+    score = idx.get("cognate_score")
+    if score is None:
+        score = mst.get("cognate_score")
+    if score is None:
+        score = 1 if mst.get("is_transparent_cognate") else 0
+    bits.extend(cognate_bit(t) for t in COGNATE_THRESHOLDS if score >= t)
+    return bits
+
+
+def encode_bitset(ranks, count):
+    """The bitset of the given ranks as base64 little-endian 32-bit words."""
+    words = bytearray((count + 31) // 32 * 4)
+    for rank in ranks:
+        words[rank >> 3] |= 1 << (rank & 7)
+    return base64.b64encode(bytes(words)).decode("ascii")
+
+
+def decode_bitset(text):
+    return int.from_bytes(base64.b64decode(text), "little")
+
+
+def build_filter_index(index, master=None, sources=None):
+    """The filter index of one deck, as the dict written to disk."""
+    members = {}
+    for rank, idx in enumerate(index):
+        # A card missing from the master is dropped by the join: no bits,
+        # not even "present".
+        mst = None if master is None else master.get(idx.get("id")) or {}
+        for name in entry_bits(idx, mst):
+            members.setdefault(name, []).append(rank)
+    count = len(index)
+    return {
+        "version": FILTER_INDEX_VERSION,
+        "count": count,
+        "ids": [idx.get("id") for idx in index],
+        # A threshold listed here with no bitset means no card reaches it.
+        "cognateThresholds": list(COGNATE_THRESHOLDS),
+        "bits": {name: encode_bitset(members[name], count) for name in sorted(members)},
+        "sources": sources or {},
+    }
+
+
+def write_filter_index(index_path, index, master=None, master_path=None):
+    """Write the filter index for an index file already on disk; returns its path."""
+    sources = {"index": file_sha256(index_path)}
+    if master_path:
+        sources["master"] = file_sha256(master_path)
+    path = filter_index_path(index_path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_filter_index(index, master, sources), f, separators=(",", ":"))
+    return path
+
+
+class FilterIndex:
+    """A filter index read back: rank-ordered ids and int bitsets by name."""
+
+    def __init__(self, data):
+        if data.get("version") != FILTER_INDEX_VERSION:
+            raise ValueError("unsupported filter index version %r" % data.get("version"))
+        self.count = data["count"]
+        self.ids = data["ids"]
+        self.sources = data.get("sources") or {}
+        self.cognate_thresholds = tuple(data.get("cognateThresholds") or ())
+        self.bits = {name: decode_bitset(text) for name, text in data["bits"].items()}
+        self.all = (1 << self.count) - 1
+
+    def __getitem__(self, name):
+        """A bitset by name; empty when no card has the flag."""
+        return self.bits.get(name, 0)
+
+    def ids_of(self, mask):
+        """Ids of the cards in a bitset, in rank order."""
+        return [self.ids[i] for i, bit in enumerate(reversed(bin(mask)[2:])) if bit == "1"]
+
+    def is_current(self, index_path, master_path=None):
+        """True when the bitsets were built from these exact files."""
+        if self.sources.get("index") != file_sha256(index_path):
+            return False
+        if master_path is not None and self.sources.get("master") != file_sha256(master_path):
+            return False
+        return True
+
+
+def load_filter_index(path):
+    with open(path, encoding="utf-8") as f:
+        return FilterIndex(json.load(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild a deck's filter index")
+    parser.add_argument("index", help="<base>.index.json")
+    parser.add_argument("--master", help="Shared master vocabulary (artist decks)")
+    args = parser.parse_args()
+    with open(args.index, encoding="utf-8") as f:
+        index = json.load(f)
+    master = None
+    if args.master:
+        with open(args.master, encoding="utf-8") as f:
+            master = json.load(f)
+    path = write_filter_index(args.index, index, master, args.master)
+    print("%s: %d cards, %s bytes" % (path, len(index), "{:,}".format(os.path.getsize(path))))
+
+
+if __name__ == "__main__":
+    main()
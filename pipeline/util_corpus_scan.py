@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""util_corpus_scan — one pass over the OpenSubtitles files, many analyses.
+
+The speech string audit (tool_8f), the evidence sampler (tool_8e) and the
+streaming harvest (step_5a_harvest_subtitles) each used to open the three
+aligned files and read all 4 GB with their own loop, checkpoint format and
+progress line. Here the reading is done once and each analysis is a
+*visitor* fed the same decoded lines:
+
+    class Visitor(CorpusVisitor):
+        name = "my_analysis"           # its key in checkpoints
+        def visit(self, number, line): # line = {"es": ..., "en": ..., "ids": ...}
+            ...
+        def state(self):               # JSON-able, for checkpoints
+        def restore(self, state):
+
+    scan_corpus(SubtitleCorpus(CORP), [audit, sampler, harvester],
+                checkpoint=run_dir / "checkpoint.json", checkpoint_every=2_000_000)
+
+Lines come from util_subtitle_corpus exactly as it returns them (1-based
+numbers, trailing newline kept), so several visitors in one scan see what
+each would have seen alone.
+
+Checkpoints record the last line read and, per file, the byte offset just
+past it — checked against the line-offset index on resume, so a checkpoint
+taken against a different corpus file is refused rather than silently
+misaligned. Ctrl-C and ``max_lines`` both checkpoint and return.
+
+``workers`` > 1 splits the range into that many contiguous shards scanned in
+worker processes. Each shard checkpoints on its own
+(``<checkpoint>.shard-<i>-of-<n>.json``), so an interrupted sharded scan
+resumes shard by shard; when all are complete their visitor states are
+merged in shard order with ``CorpusVisitor.merge``. Only visitors whose
+merge reproduces the sequential result may be sharded (``mergeable``); a
+seeded reservoir, whose random draws depend on arrival order, is not.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCAN_STATE_VERSION = 1
+
+
+class CorpusVisitor:
+    """One analysis in a corpus scan. Subclasses implement ``visit``."""
+
+    name = "visitor"
+    mergeable = False
+
+    def visit(self, number, line):
+        raise NotImplementedError
+
+    def state(self):
+        return {}
+
+    def restore(self, state):
+        if state:
+            raise ValueError("%s cannot resume from a checkpoint" % self.name)
+
+    def merge(self, state):
+        """Fold in the state of a later shard (see ``mergeable``)."""
+        raise NotImplementedError("%s cannot be merged across shards" % self.name)
+
+
+def utc_now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def shard_path(checkpoint, index, count):
+    checkpoint = Path(checkpoint)
+    return checkpoint.with_name("%s.shard-%d-of-%d%s" % (
+        checkpoint.stem, index + 1, count, checkpoint.suffix))
+
+
+def shard_ranges(start, stop, count):
+    """`count` contiguous (start, stop) ranges covering start..stop."""
+    total = stop - start + 1
+    bounds = [start + total * i // count for i in range(count + 1)]
+    return [(lo, hi - 1) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+
+def write_state(path, state):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    state["checkpointed_at"] = utc_now()
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    with temporary.open("w", encoding="utf-8") as handle:
+        json.dump(state, handle, ensure_ascii=False, separators=(",", ":"))
+        handle.write("\n")
+    temporary.replace(path)
+
+
+def read_state(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _offsets_after(corpus, sides, number):
+    return {side: int(corpus.offsets(side)[number]) for side in sides}
+
+
+def _resume_line(corpus, sides, state, start, stop):
+    """The line after the checkpointed one, after checking it still fits."""
+    if state.get("version") != SCAN_STATE_VERSION:
+        raise ValueError("unsupported scan checkpoint version: %r" % state.get("version"))
+    if (state["start"], state["stop"]) != (start, stop):
+        raise ValueError("checkpoint covers lines %s..%s, not %s..%s"
+                         % (state["start"], state["stop"], start, stop))
+    number = int(state["line_number"])
+    if number >= start and _offsets_after(corpus, sides, number) != {
+            side: int(state["offsets"][side]) for side in sides}:
+        raise ValueError("checkpoint offsets do not match the corpus files; "
+                         "they changed since the scan started")
+    return number + 1
+
+
+def _scan_range(corpus, visitors, sides, start, stop, checkpoint, checkpoint_every,
+                resume, max_lines, progress, progress_every):
+    """Scan start..stop into `visitors`; the worker behind scan_corpus."""
+    state = {"version": SCAN_STATE_VERSION, "start": start, "stop": stop,
+             "line_number": start - 1, "offsets": {}, "visitors": {},
+             "completed_at": None}
+    first = start
+    if resume and checkpoint and Path(checkpoint).is_file():
+        saved = read_state(checkpoint)
+        first = _resume_line(corpus, sides, saved, start, stop)
+        for visitor in visitors:
+            visitor.restore(saved["visitors"].get(visitor.name) or {})
+        state.update(line_number=first - 1, completed_at=saved.get("completed_at"))
+
+    def save(number, complete=False):
+        state.update(
+            line_number=number,
+            offsets=_offsets_after(corpus, sides, number) if number >= start else {},
+            visitors={visitor.name: visitor.state() for visitor in visitors})
+        if complete:
+            state["completed_at"] = utc_now()
+        if checkpoint:
+            write_state(checkpoint, state)
+
+    if state["completed_at"]:
+        return {"line_number": state["line_number"], "lines": 0, "complete": True,
+                "interrupted": False, "visitors": state["visitors"]}
+
+    number = first - 1
+    read = 0
+    interrupted = False
+    try:
+        for number, line in corpus.iter_range(first, stop, sides):
+            for visitor in visitors:
+                visitor.visit(number, line)
+            read += 1
+            if progress and progress_every and number % progress_every == 0:
+                progress(number, read)
+            if checkpoint and checkpoint_every and number % checkpoint_every == 0:
+                save(number)
+            if max_lines and read >= max_lines and number < stop:
+                save(number)
+                return {"line_number": number, "lines": read, "complete": False,
+                        "interrupted": False, "visitors": state["visitors"]}
+    except KeyboardInterrupt:
+        interrupted = True
+    if not interrupted:
+        number = stop
+    save(number, complete=not interrupted)
+    return {"line_number": number, "lines": read, "complete": not interrupted,
+            "interrupted": interrupted, "visitors": state["visitors"]}
+
+
+def _scan_shard(corpus, make_visitors, sides, start, stop, checkpoint,
+                checkpoint_every, resume, max_lines, progress_every, label):
+    def progress(number, read):
+        print("  shard %s: line %s of %s..%s" % (
+            label, "{:,}".format(number), "{:,}".format(start), "{:,}".format(stop)),
+            flush=True)
+
+    return _scan_range(corpus, make_visitors(), sides, start, stop, checkpoint,
+                       checkpoint_every, resume, max_lines, progress, progress_every)
+
+
+def scan_corpus(corpus, visitors, *, sides=None, start=1, stop=None,
+                checkpoint=None, checkpoint_every=0, resume=False, max_lines=0,
+                progress=None, progress_every=0, workers=1, make_visitors=None):
+    """Feed lines start..stop of `corpus` to every visitor, in line order.
+
+    Returns {"line_number", "lines", "complete", "interrupted"}: the last line
+    read, how many this call read, and whether the range was finished. With
+    ``resume`` a checkpoint at ``checkpoint`` is continued (and visitor state
+    restored) instead of starting over.
+
+    ``workers`` > 1 needs ``make_visitors``, a picklable callable building
+    fresh visitors like `visitors` in each worker process; `visitors` then
+    receive the merged shard states. ``progress`` is only called when
+    unsharded; shards print their own line every ``progress_every`` lines.
+    ``max_lines`` then applies to each shard.
+    """
+    sides = tuple(sides or corpus.paths)
+    total = corpus.count(sides)  # builds the line offsets before any fork
+    stop = total if stop is None else min(stop, total)
+    start = max(1, start)
+    sharded = workers > 1 and stop - start + 1 >= 2 * workers
+    ranges = shard_ranges(start, stop, workers) if sharded else [(start, stop)]
+    paths = [shard_path(checkpoint, i, len(ranges)) if checkpoint else None
+             for i in range(len(ranges))] if sharded else [checkpoint]
+
+    if resume and checkpoint:
+        checkpoint = Path(checkpoint)
+        saved = read_state(checkpoint) if checkpoint.is_file() else None
+        if saved and saved.get("completed_at"):
+            # Finished (and, if sharded, merged) already: nothing to read.
+            _resume_line(corpus, sides, saved, start, stop)
+            for visitor in visitors:
+                visitor.restore(saved["visitors"].get(visitor.name) or {})
+            return {"line_number": stop, "lines": 0, "complete": True,
+                    "interrupted": False}
+        stale = [p for p in checkpoint.parent.glob(checkpoint.stem + ".shard-*")
+                 if p.suffix == checkpoint.suffix and p not in paths]
+        if stale or (sharded and saved):
+            raise ValueError("checkpoint %s was written with a different --workers "
+                             "count" % (stale[0] if stale else checkpoint))
+
+    if not sharded:
+        result = _scan_range(corpus, visitors, sides, start, stop, checkpoint,
+                             checkpoint_every, resume, max_lines, progress, progress_every)
+        del result["visitors"]
+        return result
+
+    if make_visitors is None:
+        raise ValueError("a sharded scan needs make_visitors")
+    unmergeable = [v.name for v in visitors if not v.mergeable]
+    if unmergeable:
+        raise ValueError("cannot shard a scan with %s" % ", ".join(unmergeable))
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [pool.submit(_scan_shard, corpus, make_visitors, sides, lo, hi, path,
+                               checkpoint_every, resume, max_lines, progress_every,
+                               "%d/%d" % (i + 1, len(ranges)))
+                   for i, ((lo, hi), path) in enumerate(zip(ranges, paths))]
+        try:
+            results = [future.result() for future in futures]
+        except KeyboardInterrupt:
+            pool.shutdown(wait=True, cancel_futures=True)
+            return {"line_number": start - 1, "lines": 0, "complete": False,
+                    "interrupted": True}
+    lines = sum(result["lines"] for result in results)
+    if not all(result["complete"] for result in results):
+        return {"line_number": min(r["line_number"] for r in results if not r["complete"]),
+                "lines": lines, "complete": False,
+                "interrupted": any(r["interrupted"] for r in results)}
+
+    for result in results:
+        for visitor in visitors:
+            visitor.merge(result["visitors"].get(visitor.name) or {})
+    if checkpoint:
+        write_state(checkpoint, {
+            "version": SCAN_STATE_VERSION, "start": start, "stop": stop,
+            "line_number": stop, "offsets": _offsets_after(corpus, sides, stop),
+            "visitors": {visitor.name: visitor.state() for visitor in visitors},
+            "shards": len(ranges), "completed_at": utc_now()})
+        for path in paths:
+            os.remove(path)
+    return {"line_number": stop, "lines": lines, "complete": True, "interrupted": False}
@@ -5,18 +5,46 @@ claims, not primary keys. The registry preserves an existing card ID across an
 exact alias change when occurrence evidence (or an unambiguous surface alias)
 shows that the logical card is the same. Ambiguous splits require an explicit
 reconciliation instead of silently moving learner progress.
+
+On disk a registry is a canonical JSON snapshot (``cards.json``) plus an
+append-only mutation journal beside it (``cards.journal.jsonl``). ``save``
+appends one full-record line per changed record instead of rewriting the
+snapshot, and folds the journal into a fresh snapshot once it passes
+COMPACT_AFTER lines. Lookup indexes (alias, surface, evidence, per-card senses)
+are built once per load and then maintained incrementally by every mutation.
+
+Compaction also writes ``cards.offsets.json``: the byte span of every record
+in the snapshot, stamped with the snapshot's size and mtime. ``reader`` uses
+it to look single records up without loading the snapshot: it reads the
+offset index and the journal (at most COMPACT_AFTER lines), and falls back to
+a full load when the offset index is missing or does not match the snapshot.
+
+Steps that stabilize IDs should use ``transaction``: it holds an exclusive
+lock on the registry for the load -> mutate -> save cycle, so several artists
+stabilized at once against one language registry serialize instead of
+overwriting each other's updates.
 """
 
 import json
+import os
 from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
 
 from pipeline.util_evidence_store import canonical_json
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; transactions don't serialize.
+    fcntl = None
+
 
 SCHEMA = "fluency.card_identity_registry.v1"
 SENSE_SCHEMA = "fluency.sense_identity_registry.v1"
 
+# Journal lines tolerated before save() rewrites the snapshot.
+COMPACT_AFTER = 2000
+
 
 def _alias(surface, lemma):
     return {
@@ -30,26 +58,270 @@ def _alias_key(surface, lemma):
     return value["surface"], value["lemma"]
 
 
-class CardIdentityRegistry:
+def journal_path(path):
+    """cards.json -> cards.journal.jsonl"""
+    path = Path(path)
+    return path.with_name(path.stem + ".journal.jsonl")
+
+
+def offsets_path(path):
+    """cards.json -> cards.offsets.json"""
+    path = Path(path)
+    return path.with_name(path.stem + ".offsets.json")
+
+
+def _snapshot_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_offsets(path):
+    """{key: [offset, length]} for the snapshot at `path`, or None when the
+    offset index is missing or was written for a different snapshot."""
+    try:
+        with open(offsets_path(path), encoding="utf-8") as handle:
+            index = json.load(handle)
+        stamp = _snapshot_stamp(path)
+    except (OSError, ValueError):
+        return None
+    if index.get("snapshot") != stamp:
+        return None
+    return index.get("records") or {}
+
+
+def _write_snapshot(handle, payload):
+    """Write canonical_json(payload) to a binary `handle`, byte for byte, and
+    return {record key: [offset, length]} within it."""
+    records = payload["records"]
+    head, tail = canonical_json(dict(payload, records={})).split('"records":{}', 1)
+    offset = handle.write((head + '"records":{').encode("utf-8"))
+    spans = {}
+    for n, key in enumerate(sorted(records)):
+        prefix = ("," if n else "") + canonical_json(key) + ":"
+        offset += handle.write(prefix.encode("utf-8"))
+        body = canonical_json(records[key]).encode("utf-8")
+        spans[key] = [offset, len(body)]
+        offset += handle.write(body)
+    handle.write(("}" + tail + "\n").encode("utf-8"))
+    return spans
+
+
+class RegistryReader:
+    """Read-only point lookups on a saved registry: ``reader.get(key)``.
+
+    Journal records override the snapshot, as they do on load.
+    """
+
+    def __init__(self, path, offsets=None, journal=None, records=None):
+        self._path = Path(path)
+        self._offsets = offsets or {}
+        self._journal = journal or {}
+        self._records = records
+
+    def get(self, key, default=None):
+        if self._records is not None:
+            return self._records.get(key, default)
+        if key in self._journal:
+            return self._journal[key]
+        span = self._offsets.get(key)
+        if span is None:
+            return default
+        with open(self._path, "rb") as handle:
+            handle.seek(span[0])
+            return json.loads(handle.read(span[1]).decode("utf-8"))
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+
+def _lock_path(path):
+    path = Path(path)
+    return path.with_name(path.name + ".lock")
+
+
+@contextmanager
+def _exclusive_lock(path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(_lock_path(path), "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _read_journal(path):
+    """Return the journal's entries; a torn final line (crash mid-append) is dropped."""
+    try:
+        with open(journal_path(path), encoding="utf-8") as handle:
+            lines = handle.read().split("\n")
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            if line_no == len(lines):
+                break
+            raise ValueError("invalid registry journal line %s:%d"
+                             % (journal_path(path), line_no))
+    return entries
+
+
+def _append_journal(path, entries):
+    payload = "".join(canonical_json(entry) + "\n" for entry in entries).encode("utf-8")
+    fd = os.open(str(journal_path(path)), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _JournaledRegistry:
+    """Snapshot + journal persistence shared by the card and sense registries.
+
+    Subclasses mark changed records with ``_touch`` and provide the snapshot
+    payload; the base class decides between a journal append and compaction.
+    """
+
+    _schema = None
+
+    def _init_journal(self):
+        self._dirty = set()
+        self._new_migrations = []
+        self._source = None
+        self._journal_lines = 0
+
+    @classmethod
+    def _read_payload(cls, path, language):
+        path = Path(path)
+        payload = None
+        if path.exists():
+            with open(path, encoding="utf-8") as file:
+                payload = json.load(file)
+            if payload.get("schema") != cls._schema:
+                raise ValueError("Unsupported %s schema" % cls._label)
+            stored_language = payload.get("language") or language
+            if str(stored_language).lower() != str(language).lower():
+                raise ValueError("%s language mismatch" % cls._label.capitalize())
+        return payload, _read_journal(path)
+
+    @classmethod
+    @contextmanager
+    def transaction(cls, path, language):
+        """Load, yield, and save the registry under an exclusive file lock."""
+        with _exclusive_lock(path):
+            registry = cls.load(path, language)
+            yield registry
+            registry.save(path)
+
+    @classmethod
+    def reader(cls, path, language):
+        """A RegistryReader for the registry saved at `path`."""
+        path = Path(path)
+        offsets = _read_offsets(path) if path.exists() else None
+        if offsets is None:
+            return RegistryReader(path, records=cls.load(path, language).records)
+        journal = {entry["key"]: entry["record"] for entry in _read_journal(path)
+                   if entry.get("op") == "record"}
+        return RegistryReader(path, offsets, journal)
+
+    def _touch(self, key):
+        self._dirty.add(key)
+
+    def _loaded_from(self, path, journal_lines):
+        self._source = Path(path).resolve()
+        self._journal_lines = journal_lines
+        self._dirty = set()
+        self._new_migrations = []
+
+    def _journal_entries(self):
+        entries = [
+            {"op": "record", "key": key, "record": self.records[key]}
+            for key in sorted(self._dirty) if key in self.records
+        ]
+        entries.extend({"op": "migration", "migration": migration}
+                       for migration in self._new_migrations)
+        return entries
+
+    def save(self, path):
+        """Append this session's changes to the journal, compacting when due."""
+        path = Path(path)
+        if (self._source != path.resolve() or not path.exists()
+                or self._journal_lines >= COMPACT_AFTER):
+            self.compact(path)
+            return
+        entries = self._journal_entries()
+        if not entries:
+            return
+        if self._journal_lines + len(entries) > COMPACT_AFTER:
+            self.compact(path)
+            return
+        _append_journal(path, entries)
+        self._loaded_from(path, self._journal_lines + len(entries))
+
+    def compact(self, path):
+        """Rewrite the full snapshot and drop the journal it now contains."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(temp_path, "wb") as file:
+            spans = _write_snapshot(file, self.to_dict())
+        temp_path.replace(path)
+        # A crash between these steps leaves journal entries the snapshot
+        # already holds; replaying them is idempotent. An offset index left
+        # from the previous snapshot fails its stamp check and is ignored.
+        try:
+            journal_path(path).unlink()
+        except FileNotFoundError:
+            pass
+        temp_offsets = offsets_path(path).with_suffix(".json.tmp")
+        with open(temp_offsets, "w", encoding="utf-8") as file:
+            json.dump({"snapshot": _snapshot_stamp(path), "records": spans}, file,
+                      separators=(",", ":"))
+        temp_offsets.replace(offsets_path(path))
+        self._loaded_from(path, 0)
+
+
+class CardIdentityRegistry(_JournaledRegistry):
+    _schema = SCHEMA
+    _label = "card identity registry"
+
     def __init__(self, language, records=None, migrations=None):
         self.language = str(language or "und").strip().lower()
         self.records = records or {}
         self.migrations = migrations or []
+        self._migration_keys = {canonical_json(m) for m in self.migrations}
         self._indexes = None
+        self._init_journal()
 
     @classmethod
     def load(cls, path, language):
-        path = Path(path)
-        if not path.exists():
+        payload, journal = cls._read_payload(path, language)
+        if payload is None and not journal:
             return cls(language)
-        with open(path, encoding="utf-8") as file:
-            payload = json.load(file)
-        if payload.get("schema") != SCHEMA:
-            raise ValueError("Unsupported card identity registry schema")
-        stored_language = payload.get("language") or language
-        if str(stored_language).lower() != str(language).lower():
-            raise ValueError("Card identity registry language mismatch")
-        return cls(stored_language, payload.get("records"), payload.get("migrations"))
+        payload = payload or {}
+        registry = cls(payload.get("language") or language,
+                       payload.get("records"), payload.get("migrations"))
+        for entry in journal:
+            if entry.get("op") == "record":
+                registry.records[entry["key"]] = entry["record"]
+            elif entry.get("op") == "migration":
+                # A crash between compaction and journal removal leaves
+                # entries the snapshot already holds; skip those on replay.
+                key = canonical_json(entry["migration"])
+                if key not in registry._migration_keys:
+                    registry._migration_keys.add(key)
+                    registry.migrations.append(entry["migration"])
+        registry._loaded_from(path, len(journal))
+        return registry
 
     def invalidate_indexes(self):
         """Invalidate lookup caches after a caller performs a bulk mutation."""
@@ -58,26 +330,37 @@ class CardIdentityRegistry:
     def _ensure_indexes(self):
         if self._indexes is not None:
             return
-        active = {
-            card_id: record for card_id, record in self.records.items()
-            if record.get("status", "active") == "active"
-        }
-        aliases = {}
-        surfaces = {}
-        evidence = {}
-        for card_id, record in active.items():
-            for value in record.get("aliases") or []:
-                key = _alias_key(value.get("surface"), value.get("lemma"))
-                aliases[key] = card_id
-                surfaces.setdefault(key[0], set()).add(card_id)
-            for evidence_id in record.get("evidence_ids") or []:
-                evidence.setdefault(evidence_id, set()).add(card_id)
         self._indexes = {
-            "active": active,
-            "aliases": aliases,
-            "surfaces": surfaces,
-            "evidence": evidence,
+            "active": {},
+            "aliases": {},
+            "surfaces": {},
+            "evidence": {},
         }
+        for card_id, record in self.records.items():
+            if record.get("status", "active") == "active":
+                self._index_record(card_id, record)
+
+    def _index_record(self, card_id, record):
+        self._indexes["active"][card_id] = record
+        for value in record.get("aliases") or []:
+            key = _alias_key(value.get("surface"), value.get("lemma"))
+            self._indexes["aliases"][key] = card_id
+            self._indexes["surfaces"].setdefault(key[0], set()).add(card_id)
+        for evidence_id in record.get("evidence_ids") or []:
+            self._indexes["evidence"].setdefault(evidence_id, set()).add(card_id)
+
+    def _unindex_record(self, card_id, record):
+        """Drop a record that stopped being active from the lookup indexes."""
+        if self._indexes is None:
+            return
+        self._indexes["active"].pop(card_id, None)
+        for value in record.get("aliases") or []:
+            key = _alias_key(value.get("surface"), value.get("lemma"))
+            if self._indexes["aliases"].get(key) == card_id:
+                del self._indexes["aliases"][key]
+            self._indexes["surfaces"].get(key[0], set()).discard(card_id)
+        for evidence_id in record.get("evidence_ids") or []:
+            self._indexes["evidence"].get(evidence_id, set()).discard(card_id)
 
     def _active_records(self):
         self._ensure_indexes()
@@ -87,6 +370,26 @@ class CardIdentityRegistry:
         self._ensure_indexes()
         return self._indexes["aliases"]
 
+    def _add_migration(self, migration):
+        self._migration_keys.add(canonical_json(migration))
+        self.migrations.append(migration)
+        self._new_migrations.append(migration)
+
+    def ensure_card(self, card_id):
+        """Create an empty active record for ``card_id`` if it has none."""
+        card_id = str(card_id)
+        if card_id not in self.records:
+            self.records[card_id] = {
+                "card_id": card_id,
+                "status": "active",
+                "aliases": [],
+                "evidence_ids": [],
+            }
+            self._ensure_indexes()
+            self._indexes["active"][card_id] = self.records[card_id]
+            self._touch(card_id)
+        return self.records[card_id]
+
     def seed(self, card_id, surface, lemma, evidence_ids=None):
         """Register an existing externally visible ID without renumbering it."""
         card_id = str(card_id)
@@ -103,15 +406,17 @@ class CardIdentityRegistry:
         alias_value = _alias(surface, lemma)
         if alias_value not in record["aliases"]:
             record["aliases"].append(alias_value)
-            self._ensure_indexes()
             self._indexes["aliases"][key] = card_id
             self._indexes["surfaces"].setdefault(key[0], set()).add(card_id)
-        self._ensure_indexes()
-        self._indexes["active"][card_id] = record
+            self._touch(card_id)
+        if self._indexes["active"].get(card_id) is not record:
+            self._indexes["active"][card_id] = record
+            self._touch(card_id)
         for evidence_id in evidence_ids or []:
             if evidence_id and evidence_id not in record["evidence_ids"]:
                 record["evidence_ids"].append(evidence_id)
                 self._indexes["evidence"].setdefault(evidence_id, set()).add(card_id)
+                self._touch(card_id)
         return card_id
 
     def resolve(self, surface, lemma, evidence_ids=None, claimed_ids=None,
@@ -155,6 +460,28 @@ class CardIdentityRegistry:
         self.seed(card_id, surface, lemma, evidence_ids=evidence_ids)
         return card_id
 
+    def retire(self, card_id, superseded_by, migration):
+        """Mark ``card_id`` merged into ``superseded_by`` and record why.
+
+        Unlike ``merge`` the retired record's aliases are not rebound; this is
+        for IDs that never owned a live alias (legacy master duplicates).
+        """
+        card_id = str(card_id)
+        record = self.records.setdefault(card_id, {
+            "card_id": card_id,
+            "aliases": [],
+            "evidence_ids": [],
+        })
+        if (record.get("status") != "merged"
+                or record.get("superseded_by") != superseded_by):
+            if record.get("status", "active") == "active":
+                self._unindex_record(card_id, record)
+            record["status"] = "merged"
+            record["superseded_by"] = superseded_by
+            self._touch(card_id)
+        if canonical_json(migration) not in self._migration_keys:
+            self._add_migration(migration)
+
     def merge(self, source_id, target_id, reason):
         """Explicitly merge identities while retaining a progress migration."""
         if source_id == target_id:
@@ -163,15 +490,19 @@ class CardIdentityRegistry:
         target = self.records[target_id]
         # Retire the source before rebinding its aliases so the active alias
         # index no longer reports the source as their owner.
+        self._unindex_record(source_id, source)
         source["status"] = "merged"
         source["superseded_by"] = target_id
-        self.invalidate_indexes()
+        self._touch(source_id)
+        self._touch(target_id)
         for value in source.get("aliases") or []:
             self.seed(target_id, value.get("surface"), value.get("lemma"))
         for evidence_id in source.get("evidence_ids") or []:
             if evidence_id not in target.setdefault("evidence_ids", []):
                 target["evidence_ids"].append(evidence_id)
-        self.migrations.append({
+                if self._indexes is not None:
+                    self._indexes["evidence"].setdefault(evidence_id, set()).add(target_id)
+        self._add_migration({
             "kind": "merge",
             "from": source_id,
             "to": target_id,
@@ -186,15 +517,6 @@ class CardIdentityRegistry:
             "migrations": self.migrations,
         }
 
-    def save(self, path):
-        path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        temp_path = path.with_suffix(path.suffix + ".tmp")
-        with open(temp_path, "w", encoding="utf-8") as file:
-            file.write(canonical_json(self.to_dict()))
-            file.write("\n")
-        temp_path.replace(path)
-
 
 def _sense_descriptor(card_id, pos, translation, context):
     normalize = lambda value: " ".join(str(value or "").strip().casefold().split())
@@ -206,60 +528,79 @@ def _sense_descriptor(card_id, pos, translation, context):
     }
 
 
-class SenseIdentityRegistry:
+class SenseIdentityRegistry(_JournaledRegistry):
     """Persist sense IDs while treating gloss/POS/context as mutable labels."""
 
+    _schema = SENSE_SCHEMA
+    _label = "sense identity registry"
+
     def __init__(self, language, records=None):
         self.language = str(language or "und").strip().lower()
         self.records = records or {}
+        self._by_card = None
+        self._init_journal()
 
     @classmethod
     def load(cls, path, language):
-        path = Path(path)
-        if not path.exists():
+        payload, journal = cls._read_payload(path, language)
+        if payload is None and not journal:
             return cls(language)
-        with open(path, encoding="utf-8") as file:
-            payload = json.load(file)
-        if payload.get("schema") != SENSE_SCHEMA:
-            raise ValueError("Unsupported sense identity registry schema")
-        if str(payload.get("language") or language).lower() != str(language).lower():
-            raise ValueError("Sense identity registry language mismatch")
-        return cls(payload.get("language") or language, payload.get("records"))
+        payload = payload or {}
+        registry = cls(payload.get("language") or language, payload.get("records"))
+        for entry in journal:
+            if entry.get("op") == "record":
+                registry.records[entry["key"]] = entry["record"]
+        registry._loaded_from(path, len(journal))
+        return registry
 
     @staticmethod
     def _entity_key(card_id, sense_id):
         return "%s::%s" % (card_id, sense_id)
 
+    def _card_index(self):
+        if self._by_card is None:
+            self._by_card = {}
+            for key, record in self.records.items():
+                self._by_card.setdefault(str(record.get("card_id")), {})[key] = None
+        return self._by_card
+
     def _active_for_card(self, card_id):
+        keys = self._card_index().get(str(card_id), ())
         return {
-            key: record for key, record in self.records.items()
-            if record.get("status", "active") == "active"
-            and record.get("card_id") == str(card_id)
+            key: self.records[key] for key in keys
+            if self.records[key].get("status", "active") == "active"
         }
 
     def seed(self, sense_id, card_id, pos, translation, context=None,
              external_ids=None, evidence_ids=None):
         sense_id = str(sense_id)
         key = self._entity_key(card_id, sense_id)
-        record = self.records.setdefault(key, {
-            "sense_id": sense_id,
-            "card_id": str(card_id),
-            "status": "active",
-            "labels": [],
-            "external_ids": [],
-            "evidence_ids": [],
-        })
+        if key not in self.records:
+            self.records[key] = {
+                "sense_id": sense_id,
+                "card_id": str(card_id),
+                "status": "active",
+                "labels": [],
+                "external_ids": [],
+                "evidence_ids": [],
+            }
+            self._card_index().setdefault(str(card_id), {})[key] = None
+            self._touch(key)
+        record = self.records[key]
         descriptor = _sense_descriptor(card_id, pos, translation, context)
         label = {key: value for key, value in descriptor.items() if key != "card_id"}
         if label not in record["labels"]:
             record["labels"].append(label)
+            self._touch(key)
         for external_id in [sense_id] + list(external_ids or []):
             external_id = str(external_id or "").strip()
             if external_id and external_id not in record["external_ids"]:
                 record["external_ids"].append(external_id)
+                self._touch(key)
         for evidence_id in evidence_ids or []:
             if evidence_id and evidence_id not in record["evidence_ids"]:
                 record["evidence_ids"].append(evidence_id)
+                self._touch(key)
         return sense_id
 
     def _resolve_exact(self, candidate):
@@ -345,14 +686,9 @@ class SenseIdentityRegistry:
             results.append(sense_id)
         return results
 
-    def save(self, path):
-        path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        payload = {
+    def to_dict(self):
+        return {
             "schema": SENSE_SCHEMA,
             "language": self.language,
             "records": self.records,
         }
-        temp_path = path.with_suffix(path.suffix + ".tmp")
-        temp_path.write_text(canonical_json(payload) + "\n", encoding="utf-8")
-        temp_path.replace(path)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Optional binary encoding for the large intermediate layer files.
+
+examples_raw.json, sense_assignments/*.json, sense_menu/*.json and
+vocab_evidence_merged.json run to several MB per artist, and step 8b
+`json.load`s a dozen of them at once. json.load builds a fresh str object for
+every occurrence of every value, so the same lyric line, song title or method
+name is duplicated thousands of times in memory.
+
+With FLUENCY_LAYER_FORMAT=binary (or run_artist_pipeline --layer-format
+binary) the writers converted to `write_layer` also write a `<name>.layer`
+sibling next to each JSON file:
+
+    b"FLYR" | format version | marshal version | JSON size, mtime_ns (<QQ)
+           | marshal(interned tree)
+
+Every distinct string is stored once (the string table) and referenced by
+index everywhere else, so loading is roughly 2x faster than json.load and the
+loaded tree shares one object per distinct string. The header records the
+size and mtime of the JSON file the payload was written next to. `read_layer`
+picks the binary sibling only while the JSON still has that size and mtime, so
+readers don't care which format is on disk; a sibling whose JSON was deleted
+or rewritten since is removed instead of read.
+
+The JSON file is still written: dozens of tools `json.load` layers directly and
+it is the copy you diff while debugging. To rebuild JSON from a binary layer
+(or pack existing JSON without re-running steps):
+
+    python3 pipeline/util_layer_format.py export Artists/.../examples_raw.layer
+    python3 pipeline/util_layer_format.py pack Artists/spanish/Rosalía/data/layers
+"""
+
+import argparse
+import json
+import marshal
+import os
+import struct
+import sys
+from pathlib import Path
+
+
+LAYER_FORMAT_ENV = "FLUENCY_LAYER_FORMAT"
+LAYER_FORMATS = ("json", "binary")
+BINARY_SUFFIX = ".layer"
+
+_MAGIC = b"FLYR"
+_FORMAT_VERSION = 2
+_STAMP = struct.Struct("<QQ")
+_HEADER_LEN = len(_MAGIC) + 2 + _STAMP.size
+
+
+def layer_format():
+    """Return the active layer format ("json" unless the env flag says otherwise)."""
+    value = (os.environ.get(LAYER_FORMAT_ENV) or "json").strip().lower()
+    if value not in LAYER_FORMATS:
+        raise ValueError("%s must be one of %s, got %r"
+                         % (LAYER_FORMAT_ENV, ", ".join(LAYER_FORMATS), value))
+    return value
+
+
+def binary_layer_path(path):
+    """examples_raw.json -> examples_raw.layer"""
+    return Path(path).with_suffix(BINARY_SUFFIX)
+
+
+class _NotJsonShaped(Exception):
+    pass
+
+
+def _intern(value, table):
+    """Copy ``value`` with one shared object per distinct string.
+
+    Raises _NotJsonShaped for anything json.dump would coerce (tuples,
+    non-string keys) so the caller can normalize through JSON first.
+    """
+    kind = type(value)
+    if kind is str:
+        return table.setdefault(value, value)
+    if kind is dict:
+        out = {}
+        for key, item in value.items():
+            if type(key) is not str:
+                raise _NotJsonShaped
+            out[table.setdefault(key, key)] = _intern(item, table)
+        return out
+    if kind is list:
+        return [_intern(item, table) for item in value]
+    if value is None or kind in (bool, int, float):
+        return value
+    raise _NotJsonShaped
+
+
+def _source_stamp(path):
+    """(size, mtime_ns) of a JSON layer, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _header(source_stamp):
+    return (_MAGIC + bytes((_FORMAT_VERSION, marshal.version))
+            + _STAMP.pack(*(source_stamp or (0, 0))))
+
+
+def encode_layer(data, source_stamp=None):
+    """Return the binary encoding of a JSON-shaped layer payload.
+
+    ``source_stamp`` is the (size, mtime_ns) of the JSON file written with the
+    same payload; a sibling is only read while the JSON still matches it.
+    """
+    try:
+        tree = _intern(data, {})
+    except _NotJsonShaped:
+        tree = _intern(json.loads(json.dumps(data, ensure_ascii=False)), {})
+    return _header(source_stamp) + marshal.dumps(tree, marshal.version)
+
+
+def decode_layer(blob):
+    """Inverse of encode_layer."""
+    if blob[:len(_MAGIC)] != _MAGIC:
+        raise ValueError("Not a binary layer (bad magic)")
+    fmt, marshal_version = blob[len(_MAGIC)], blob[len(_MAGIC) + 1]
+    if fmt != _FORMAT_VERSION:
+        raise ValueError("Unsupported binary layer version %d" % fmt)
+    if marshal_version > marshal.version:
+        raise ValueError("Binary layer written by a newer Python (marshal v%d > v%d); "
+                         "re-export it as JSON there" % (marshal_version, marshal.version))
+    return marshal.loads(memoryview(blob)[_HEADER_LEN:])
+
+
+def _recorded_stamp(header):
+    """The source stamp in a binary layer header; None for an unreadable one."""
+    if len(header) < _HEADER_LEN or header[:len(_MAGIC)] != _MAGIC:
+        return None
+    if header[len(_MAGIC)] != _FORMAT_VERSION:
+        return None
+    return _STAMP.unpack_from(header, len(_MAGIC) + 2)
+
+
+def _discard(path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def fresh_binary_layer(path):
+    """Return the binary sibling of ``path`` if it can stand in for the JSON.
+
+    The sibling must record the size and mtime the JSON has now. One whose
+    JSON was deleted, rewritten by a JSON-only run or edited by hand can never
+    match again, so it is deleted rather than left to shadow anything.
+    """
+    binary = binary_layer_path(path)
+    try:
+        with open(binary, "rb") as f:
+            header = f.read(_HEADER_LEN)
+    except OSError:
+        return None
+    source = _source_stamp(path)
+    if source is None or _recorded_stamp(header) != source:
+        _discard(binary)
+        return None
+    return binary
+
+
+def layer_exists(path):
+    return os.path.isfile(path) or fresh_binary_layer(path) is not None
+
+
+def read_layer(path):
+    """Load a layer from its fresh binary sibling, else from the JSON file.
+
+    Returns ``(data, source_path)``; raises FileNotFoundError when neither
+    exists.
+    """
+    binary = fresh_binary_layer(path)
+    if binary is not None:
+        with open(binary, "rb") as f:
+            return decode_layer(f.read()), binary
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f), Path(path)
+
+
+def _write_atomic(path, blob):
+    temp = Path(str(path) + ".tmp")
+    with open(temp, "wb") as f:
+        f.write(blob)
+    os.replace(temp, path)
+
+
+def write_layer(path, data, indent=2, layer_fmt=None):
+    """Write ``data`` as JSON, plus the binary sibling when binary layers are on.
+
+    In JSON mode a binary sibling from an earlier run is removed so it can
+    never shadow the new JSON.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    binary = binary_layer_path(path)
+    if (layer_fmt or layer_format()) == "binary":
+        _write_atomic(binary, encode_layer(data, _source_stamp(path)))
+    else:
+        _discard(binary)
+
+
+def export_json(binary_path, out_path=None, indent=2):
+    """Write a binary layer back out as JSON (default: the sibling .json path)."""
+    binary_path = Path(binary_path)
+    with open(binary_path, "rb") as f:
+        blob = f.read()
+    data = decode_layer(blob)
+    out_path = Path(out_path) if out_path else binary_path.with_suffix(".json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    if out_path == binary_path.with_suffix(".json"):
+        # The export is a copy of the same payload, not a newer edit.
+        _write_atomic(binary_path, _header(_source_stamp(out_path)) + blob[_HEADER_LEN:])
+    return out_path
+
+
+def pack_json(json_path):
+    """Write the binary sibling for an existing JSON layer."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    binary = binary_layer_path(json_path)
+    _write_atomic(binary, encode_layer(data, _source_stamp(json_path)))
+    return binary
+
+
+def _iter_json_layers(target):
+    target = Path(target)
+    if target.is_file():
+        yield target
+        return
+    for path in sorted(target.rglob("*.json")):
+        if path.name.endswith(".meta.json") or "archive" in path.parts:
+            continue
+        yield path
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Pack / export binary layer files")
+    sub = ap.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="Write .layer siblings for JSON layers")
+    pack.add_argument("paths", nargs="+", help="JSON layer files or layers/ directories")
+    export = sub.add_parser("export", help="Write a .layer file back out as JSON")
+    export.add_argument("path")
+    export.add_argument("--out", default=None, help="Output JSON path (default: sibling .json)")
+    args = ap.parse_args()
+
+    if args.command == "export":
+        out = export_json(args.path, args.out)
+        print("Exported %s -> %s" % (args.path, out))
+        return
+    for target in args.paths:
+        for json_path in _iter_json_layers(target):
+            try:
+                binary = pack_json(json_path)
+            except (OSError, ValueError) as exc:
+                print("  skip %s (%s)" % (json_path, exc), file=sys.stderr)
+                continue
+            print("  %s: %.1f MB -> %.1f MB" % (
+                json_path, json_path.stat().st_size / 1e6, binary.stat().st_size / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Batched, cached lingua language ID for lyric lines.
+
+Step 2a used to call ``compute_language_confidence_values`` once per lyric
+line inside its corpus loop, so every repeat of a chorus and every line shared
+between songs was re-detected; the research language filter and the split
+audit tool each built their own detector and did the same. They now share one
+stage:
+
+    lid = LineLanguageIdentifier(["spanish", "english"], cache_dir=...)
+    lid.prime(all_lines)            # unique lines, one batch lingua call
+    language, confidence = lid.verdict(line)
+
+``prime`` normalizes whitespace, drops duplicates and cache hits, and sends the
+remaining lines through lingua's parallel batch API in one call. Verdicts
+(top language + its confidence) persist in ``<cache_dir>/<signature>.jsonl``
+keyed by line text, where the signature is the detector's language set plus
+the lingua version, so a detector built over different languages never reads
+another's verdicts.
+
+``verdict`` on a line that was not primed falls back to a single detection, so
+callers that cannot pre-collect their lines still get the memo and the cache.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+try:  # Package import in tests/tools; script import in pipeline entry points.
+    from .util_pipeline_metrics import count, span
+except ImportError:  # pragma: no cover - exercised by direct script execution
+    from util_pipeline_metrics import count, span
+
+try:
+    from lingua import Language, LanguageDetectorBuilder
+    LINGUA_AVAILABLE = True
+except ImportError:
+    Language = LanguageDetectorBuilder = None
+    LINGUA_AVAILABLE = False
+
+
+ALL_LANGUAGES = "all"
+_PARALLEL_BATCH = 4096
+
+
+def normalize_lid_line(text):
+    """Cache key for a line: stripped, internal whitespace collapsed."""
+    return " ".join(str(text or "").split())
+
+
+def _lingua_version():
+    try:
+        from importlib.metadata import version
+        return version("lingua-language-detector")
+    except Exception:
+        return "unknown"
+
+
+def detector_signature(languages):
+    """``["spanish", "english"]`` -> ``"english+spanish@lingua-2.0.2"``"""
+    if languages == ALL_LANGUAGES:
+        names = ALL_LANGUAGES
+    else:
+        names = "+".join(sorted({str(name).strip().lower() for name in languages}))
+    return "%s@lingua-%s" % (names, _lingua_version())
+
+
+def build_lingua_detector(languages):
+    """Build a lingua detector for language names, or ``ALL_LANGUAGES``."""
+    if not LINGUA_AVAILABLE:
+        raise RuntimeError("lingua not installed: pip install lingua-language-detector")
+    if languages == ALL_LANGUAGES:
+        return LanguageDetectorBuilder.from_all_languages().build()
+    return LanguageDetectorBuilder.from_languages(
+        *(getattr(Language, str(name).strip().upper()) for name in languages)
+    ).build()
+
+
+def _top_verdict(confidences):
+    if not confidences:
+        return None, None
+    top = confidences[0]
+    return top.language.name.lower(), float(top.value)
+
+
+class LineLanguageIdentifier:
+    """Memoized, optionally disk-cached top-language verdicts for text lines."""
+
+    def __init__(self, languages, cache_dir=None, detector=None):
+        self.languages = languages
+        self.signature = detector_signature(languages)
+        self.cache_path = (
+            Path(cache_dir) / ("%s.jsonl" % self.signature) if cache_dir else None)
+        self._detector = detector
+        self._verdicts = {}
+        self._unsaved = []
+        self._seen = set()
+        self.stats = {"lines": 0, "unique": 0, "cache_hits": 0, "detected": 0,
+                      "detect_seconds": 0.0}
+        if self.cache_path is not None:
+            self._load_cache()
+
+    @property
+    def detector(self):
+        if self._detector is None:
+            self._detector = build_lingua_detector(self.languages)
+        return self._detector
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:  # torn final line from an interrupted run
+                        continue
+                    self._verdicts[row["text"]] = (row["language"], row["confidence"])
+        except FileNotFoundError:
+            pass
+
+    def _detect(self, texts):
+        start = time.perf_counter()
+        with span("lid_detect"):
+            detector = self.detector
+            if len(texts) > 1 and hasattr(
+                    detector, "compute_language_confidence_values_in_parallel"):
+                results = []
+                for offset in range(0, len(texts), _PARALLEL_BATCH):
+                    results.extend(detector.compute_language_confidence_values_in_parallel(
+                        texts[offset:offset + _PARALLEL_BATCH]))
+            else:
+                results = [detector.compute_language_confidence_values(text)
+                           for text in texts]
+        self.stats["detect_seconds"] += time.perf_counter() - start
+        self.stats["detected"] += len(texts)
+        for text, confidences in zip(texts, results):
+            verdict = _top_verdict(confidences)
+            self._verdicts[text] = verdict
+            self._unsaved.append(text)
+
+    def _note(self, key):
+        """Count a line; return True if it is a first sighting with no verdict yet."""
+        self.stats["lines"] += 1
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self.stats["unique"] += 1
+        if key in self._verdicts:
+            self.stats["cache_hits"] += 1
+            count("cache_hits")
+            return False
+        count("cache_misses")
+        return True
+
+    def prime(self, lines):
+        """Detect every unique line without a cached verdict in one batch call."""
+        pending = [key for key in map(normalize_lid_line, lines)
+                   if key and self._note(key)]
+        if pending:
+            self._detect(pending)
+
+    def verdict(self, line):
+        """Return ``(language_name, confidence)``; ``(None, None)`` if undetectable."""
+        key = normalize_lid_line(line)
+        if key not in self._verdicts:
+            if not key:
+                return None, None
+            self._note(key)
+            self._detect([key])
+        return self._verdicts[key]
+
+    def is_language(self, line, language, threshold):
+        """True if ``language`` is the top verdict for ``line`` at ``threshold`` or above."""
+        name, confidence = self.verdict(line)
+        return name == language and confidence is not None and confidence >= threshold
+
+    def save(self):
+        """Append verdicts detected this session to the cache file."""
+        if self.cache_path is None or not self._unsaved:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, "a", encoding="utf-8") as handle:
+            for text in self._unsaved:
+                language, confidence = self._verdicts[text]
+                handle.write(json.dumps(
+                    {"text": text, "language": language, "confidence": confidence},
+                    ensure_ascii=False) + "\n")
+        self._unsaved = []
+
+    def report(self):
+        """Summary of this session: unique lines, cache hit rate, detection throughput."""
+        unique = self.stats["unique"]
+        seconds = self.stats["detect_seconds"]
+        return {
+            "signature": self.signature,
+            "lines": self.stats["lines"],
+            "unique": unique,
+            "cache_hits": self.stats["cache_hits"],
+            "cache_hit_rate": round(self.stats["cache_hits"] / unique, 4) if unique else None,
+            "detected": self.stats["detected"],
+            "detect_seconds": round(seconds, 3),
+            "lines_per_second": round(self.stats["detected"] / seconds, 1) if seconds else None,
+        }
+
+    def format_report(self):
+        report = self.report()
+        rate = report["cache_hit_rate"]
+        speed = report["lines_per_second"]
+        return ("LID: %d lines (%d unique), %s cached, %d detected in %.1fs%s"
+                % (report["lines"], report["unique"],
+                   "%.1f%%" % (rate * 100) if rate is not None else "no",
+                   report["detected"], report["detect_seconds"],
+                   " (%.0f lines/s)" % speed if speed else ""))
+
+
+def default_cache_dir(artist_dir):
+    """Shared per-language cache: Artists/<language>/lid_cache/."""
+    return os.path.join(os.path.dirname(os.path.abspath(artist_dir)), "lid_cache")
@@ -13,6 +13,8 @@ Convention:
   key holding {step_name, step_version, generated_at, tool_versions, ...}.
 - Per-entry status files (spanishdict/status.json): add `step_version` alongside
   the existing `updated_at` / `status` fields on each entry.
+- Steps instrumented with util_pipeline_metrics get a `metrics` block (spans,
+  counters, wall/CPU time, peak RSS) in every meta built after the work ran.
 """
 
 import hashlib
@@ -20,12 +22,25 @@ import json
 import time
 from pathlib import Path
 
+try:  # Package import in tests/tools; script import in pipeline entry points.
+    from .util_pipeline_metrics import metrics_snapshot
+except ImportError:  # pragma: no cover - exercised by direct script execution
+    from util_pipeline_metrics import metrics_snapshot
+
 
 META_KEY = "_meta"
 
 
-def make_meta(step_name, step_version, tool_versions=None, extra=None):
-    """Build a `_meta` dict for stamping into a dict-keyed output file or sidecar."""
+def make_meta(step_name, step_version, tool_versions=None, extra=None,
+              metrics=True):
+    """Build a `_meta` dict for stamping into a dict-keyed output file or sidecar.
+
+    When the step recorded spans or counters (util_pipeline_metrics), their
+    snapshot is embedded under `metrics`; pass metrics=False to suppress it for
+    outputs whose meta must stay byte-stable, such as a payload archived with
+    util_evidence_store.archive_json_artifact (step 4a's word_routing), and
+    write the metrics to the output's sidecar instead.
+    """
     meta = {
         "step_name": step_name,
         "step_version": step_version,
@@ -35,6 +50,10 @@ def make_meta(step_name, step_version, tool_versions=None, extra=None):
         meta["tool_versions"] = dict(tool_versions)
     if extra:
         meta.update(extra)
+    if metrics:
+        snapshot = metrics_snapshot()
+        if snapshot:
+            meta["metrics"] = snapshot
     return meta
 
 
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Per-step timing and resource counters, stamped into output `_meta` blocks.
+
+Every step used to print its own progress (`lines/s`, ETAs, embed rates) and
+forget it. This module gives them one process-wide collector instead:
+
+    from util_pipeline_metrics import count, span
+
+    with span("load_layers"):
+        ...
+    count("api_calls")
+    count("cache_hits", len(hits))
+
+`util_pipeline_meta.make_meta` embeds a snapshot of the collector whenever the
+step recorded anything, so the numbers land in the same `.meta.json` sidecar as
+the step_version. `run_artist_pipeline` collects those blocks into a per-run
+report and `scripts/pipeline_status.py` shows the trend per step.
+
+Counter names are free-form; the conventional ones are listed in
+STANDARD_COUNTERS so reports can line them up across steps.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is simply omitted.
+    resource = None
+
+
+STANDARD_COUNTERS = (
+    "items", "cache_hits", "cache_misses", "api_calls",
+    "bytes_read", "bytes_written",
+)
+
+
+def peak_rss_mb(children=False):
+    """Peak resident set size of this process (or its reaped children), MB."""
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / scale, 1)
+
+
+def cpu_seconds(children=False):
+    """User + system CPU time of this process (or its reaped children)."""
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+class StepMetrics:
+    """Thread-safe named spans and counters for one step process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.spans = {}
+        self.counters = Counter()
+
+    def __bool__(self):
+        return bool(self.spans or self.counters)
+
+    @contextmanager
+    def span(self, name):
+        """Time a block; nested or repeated spans accumulate under `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.spans.setdefault(name, {"seconds": 0.0, "calls": 0})
+                entry["seconds"] += elapsed
+                entry["calls"] += 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def note_read(self, path):
+        """Count the size of an input file under `bytes_read`."""
+        try:
+            self.count("bytes_read", os.path.getsize(path))
+        except OSError:
+            pass
+
+    def note_write(self, path):
+        """Count the size of an output file under `bytes_written`."""
+        try:
+            self.count("bytes_written", os.path.getsize(path))
+        except OSError:
+            pass
+
+    def snapshot(self):
+        """Return a JSON-ready dict of everything recorded so far."""
+        with self._lock:
+            spans = {name: {"seconds": round(v["seconds"], 3), "calls": v["calls"]}
+                     for name, v in self.spans.items()}
+            counters = dict(self.counters)
+        snap = {
+            "wall_seconds": round(time.time() - self.started, 3),
+            "spans": spans,
+            "counters": counters,
+        }
+        cpu = cpu_seconds()
+        if cpu is not None:
+            snap["cpu_seconds"] = round(cpu, 3)
+        rss = peak_rss_mb()
+        if rss is not None:
+            snap["peak_rss_mb"] = rss
+        hits = counters.get("cache_hits", 0)
+        misses = counters.get("cache_misses", 0)
+        if hits or misses:
+            snap["cache_hit_rate"] = round(hits / (hits + misses), 4)
+        return snap
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.spans = {}
+            self.counters = Counter()
+
+
+# Steps import this module both as `util_pipeline_metrics` (pipeline/ on
+# sys.path) and as `pipeline.util_pipeline_metrics`. Those are two module
+# objects; share one collector between them so a span opened through one name
+# is visible to a make_meta imported through the other.
+_TWIN = sys.modules.get(
+    "pipeline.util_pipeline_metrics" if __name__ == "util_pipeline_metrics"
+    else "util_pipeline_metrics")
+METRICS = getattr(_TWIN, "METRICS", None)
+if METRICS is None:
+    METRICS = StepMetrics()
+
+
+def span(name):
+    return METRICS.span(name)
+
+
+def count(name, n=1):
+    METRICS.count(name, n)
+
+
+def note_read(path):
+    METRICS.note_read(path)
+
+
+def note_write(path):
+    METRICS.note_write(path)
+
+
+def metrics_snapshot():
+    """Snapshot of the process collector, or None if the step recorded nothing."""
+    return METRICS.snapshot() if METRICS else None
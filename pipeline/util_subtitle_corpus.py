@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""util_subtitle_corpus — line-addressed access to the OpenSubtitles files.
+
+OpenSubtitles ships three files aligned line-for-line (target language,
+English, and the .ids provenance), and every tool that wanted line N read the
+first N-1 lines of all three to get there. They cannot simply be byte-seeked
+together — .ids lines are about twice as long — so this keeps, per file, the
+byte offset at which each line starts:
+
+    <cache_root>/line_offsets/<file name>-<fingerprint>.npy
+        uint64, n + 1 entries: offsets[i] is where line i + 1 starts,
+        offsets[n] is the file size
+
+built once with a vectorised newline scan (about a second per GB) and
+rebuilt when the file's size or mtime changes. With them:
+
+    corpus = SubtitleCorpus(CORP)               # .es / .en / .ids, offsets cached
+    corpus.line(1_234_567)                      # {"es": ..., "en": ..., "ids": ...}
+    corpus.iter_range(32_000_001)               # aligned lines from there on
+    corpus.lines(corpus.sample(10_000, rng))    # uniform sample, no full scan
+
+Line numbers are 1-based, as the corpus_line / provenance fields already are.
+Lines are returned as iterating the file in text mode would return them,
+trailing "\\n" included, except that only "\\n" ends a line ("\\r\\n" is folded,
+a lone "\\r" is kept).
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .util_5a_sentence_index import file_fingerprint, fingerprint
+except ImportError:
+    from util_5a_sentence_index import file_fingerprint, fingerprint
+
+_SCAN_BLOCK = 1 << 26
+
+
+def decode_line(raw, errors="ignore"):
+    """One corpus line as the text-mode readers see it."""
+    text = raw.decode("utf-8", errors)
+    if text.endswith("\r\n"):
+        text = text[:-2] + "\n"
+    return text
+
+
+def scan_offsets(path, out_path):
+    """Write the line-start offsets of `path` to `out_path` (.npy)."""
+    size = os.path.getsize(path)
+    raw_path = Path(str(out_path) + ".raw")
+    count = 1
+    with open(path, "rb") as f, open(raw_path, "wb") as raw:
+        np.zeros(1, dtype="<u8").tofile(raw)
+        base = 0
+        while True:
+            block = f.read(_SCAN_BLOCK)
+            if not block:
+                break
+            ends = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+            starts = ends.astype("<u8") + np.uint64(base + 1)
+            starts.tofile(raw)
+            count += len(starts)
+            base += len(block)
+    # A last line without a newline still counts; the file size closes it.
+    closed = size == 0 or _last_byte(path) == b"\n"
+    n = count - 1 if closed else count
+    offsets = np.lib.format.open_memmap(out_path, mode="w+", dtype="<u8", shape=(n + 1,))
+    offsets[:count] = np.fromfile(raw_path, dtype="<u8")
+    if not closed:
+        offsets[n] = size
+    offsets.flush()
+    del offsets
+    os.remove(raw_path)
+
+
+def _last_byte(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1)
+
+
+def load_offsets(path, cache_root):
+    """Cached line offsets of `path`, scanned on first use."""
+    path = Path(path)
+    cache = Path(cache_root) / "line_offsets"
+    target = cache / ("%s-%s.npy" % (path.name, fingerprint(file_fingerprint(path))))
+    if not target.exists():
+        cache.mkdir(parents=True, exist_ok=True)
+        print(f"    Indexing lines of {path.name}...", flush=True)
+        tmp = target.with_name(target.name + ".tmp.npy")
+        scan_offsets(path, tmp)
+        os.replace(tmp, target)
+        for stale in cache.glob(path.name + "-*.npy"):
+            if stale != target and stale.name.rsplit("-", 1)[0] == path.name:
+                stale.unlink()
+    return np.load(target, mmap_mode="r")
+
+
+class SubtitleCorpus:
+    """The aligned OpenSubtitles files for one language pair.
+
+    ``sides`` name the files: the target language (``lang``), "en" and
+    "ids". ``errors`` is the decode policy, as the text-mode readers passed it.
+    """
+
+    def __init__(self, corpus_dir, lang="es", cache_root=None, errors="ignore"):
+        self.corpus_dir = Path(corpus_dir)
+        self.lang = lang
+        self.errors = errors
+        self.cache_root = (Path(cache_root) if cache_root
+                           else self.corpus_dir.parent / "sentence_index")
+        self.paths = {side: self.corpus_dir / ("OpenSubtitles.en-%s.%s" % (lang, side))
+                      for side in (lang, "en", "ids")}
+        self._offsets = {}
+
+    def __getstate__(self):
+        # Worker processes reopen the offsets rather than receive a copy.
+        return {**self.__dict__, "_offsets": {}}
+
+    def require(self, sides=None):
+        for side in sides or self.paths:
+            if not self.paths[side].exists():
+                raise SystemExit("missing corpus file: %s" % self.paths[side])
+        return self
+
+    def offsets(self, side):
+        if side not in self._offsets:
+            self._offsets[side] = load_offsets(self.paths[side], self.cache_root)
+        return self._offsets[side]
+
+    def line_count(self, side):
+        return len(self.offsets(side)) - 1
+
+    def __len__(self):
+        return self.count()
+
+    def count(self, sides=None):
+        """Aligned lines: zip() over the files stops at the shortest, and so
+        does this."""
+        return min(self.line_count(side) for side in self._sides(sides))
+
+    def _sides(self, sides):
+        return tuple(sides or self.paths)
+
+    def line(self, number, sides=None):
+        """{side: text} for one 1-based line number."""
+        for _, texts in self.lines([number], sides):
+            return texts
+        raise IndexError(number)
+
+    def lines(self, numbers, sides=None):
+        """(number, {side: text}) for each of `numbers`, reading by offset.
+
+        Consecutive numbers are read without seeking, so a dense ascending
+        selection costs about what iterating the files does.
+        """
+        sides = self._sides(sides)
+        total = self.count(sides)
+        offsets = {side: self.offsets(side) for side in sides}
+        # Default (small) buffers: a sparse sample refills one per line read.
+        handles = {side: open(self.paths[side], "rb") for side in sides}
+        try:
+            at = None
+            for number in numbers:
+                if not 1 <= number <= total:
+                    raise IndexError("line %d outside 1..%d" % (number, total))
+                if number != at:
+                    for side in sides:
+                        handles[side].seek(int(offsets[side][number - 1]))
+                yield number, {side: decode_line(handles[side].readline(), self.errors)
+                               for side in sides}
+                at = number + 1
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+    def iter_range(self, start=1, stop=None, sides=None):
+        """(number, {side: text}) for lines start..stop inclusive, in lockstep."""
+        total = self.count(sides)
+        stop = total if stop is None else min(stop, total)
+        if start > stop:
+            return iter(())
+        return self.lines(range(max(1, start), stop + 1), sides)
+
+    def sample(self, k, rng, start=1, stop=None):
+        """`k` distinct line numbers drawn uniformly from start..stop, ascending."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        population = range(max(1, start), stop + 1)
+        return sorted(rng.sample(population, min(k, len(population))))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""util_wsd_metrics — yield at a precision target, computed once per ranking.
+
+Every WSD benchmark in this project reports the same number: rank the items by a
+confidence score, and find the largest prefix whose accuracy still holds the
+target ("yield at 99%"). It used to be a Python loop over every sorted item,
+copied into the trainer, bench_calibrator, bench_tuple_accuracy and score2, and
+re-run per target, per signal, per ablation.
+
+PrecisionCurve sorts once and takes a cumulative sum; every target after that
+is a binary search. The counts are exactly the loop's, including ties: the
+ranking is `np.argsort(-scores, kind=kind)`, and callers that ranked with
+Python's stable `sorted` pass kind="stable".
+
+    curve = PrecisionCurve(p, y)
+    curve.yield_at(0.99)              # the headline
+    curve.kept([0.99, 0.95])          # band sizes, one pass
+    bootstrap_yield(p, y, [0.99])     # how much of that is sampling noise
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+class PrecisionCurve:
+    """Accuracy of every prefix of one ranking.
+
+    `precision[i]` is the accuracy of the top i+1 items. `reach[i]` is the best
+    precision any prefix at least that long attains, so it never increases and
+    "the largest prefix holding t" is the number of positions with reach >= t.
+    The error-rate side is the mirror image: the lowest error rate of any prefix
+    at least that long, which never decreases.
+    """
+
+    def __init__(self, scores, ok, kind="quicksort"):
+        scores = np.asarray(scores)
+        self.order = np.argsort(-scores, kind=kind)
+        self.scores = scores[self.order]
+        self.ok = np.asarray(ok)[self.order]
+        self.n = len(self.order)
+        self.good = np.cumsum(self.ok, dtype=np.int64)
+        self.size = np.arange(1, self.n + 1)
+        self.precision = self.good / self.size if self.n else np.zeros(0)
+        self.reach = np.maximum.accumulate(self.precision[::-1])[::-1]
+        bad = (self.size - self.good) / self.size if self.n else np.zeros(0)
+        self._error_reach = np.minimum.accumulate(bad[::-1])[::-1]
+
+    def kept(self, targets):
+        """Largest prefix holding each precision target (0 where none does)."""
+        t = np.asarray(targets, np.float64)
+        return self.n - np.searchsorted(self.reach[::-1], t, side="left")
+
+    def kept_under(self, ceilings):
+        """Largest prefix whose error rate stays at or below each ceiling.
+
+        Not kept(1 - ceiling): `bad / i <= c` and `good / i >= 1 - c` round
+        differently, and score2 has always reported the former.
+        """
+        c = np.asarray(ceilings, np.float64)
+        return np.searchsorted(self._error_reach, c, side="right")
+
+    def yield_at(self, target=0.99):
+        """Fraction of all items in the largest prefix holding `target`."""
+        return float(self.kept(target)) / self.n if self.n else 0.0
+
+    def cut_at(self, target):
+        """Score of the last item kept at `target`, or None when nothing is."""
+        k = int(self.kept(target))
+        return float(self.scores[k - 1]) if k else None
+
+    def top(self, k):
+        """Accuracy of the top k items."""
+        return self.good[k - 1] / k
+
+
+def yield_at(scores, ok, target=0.99):
+    """Share of items in the largest top-ranked prefix at least `target` accurate."""
+    return PrecisionCurve(scores, ok).yield_at(target)
+
+
+def bootstrap_yield(scores, ok, targets=(0.99,), n_boot=1000, alpha=0.05, seed=0,
+                    batch=200):
+    """Percentile bootstrap interval for yield at each target.
+
+    Resamples items with replacement, `batch` replicates at a time as one 2-D
+    sort and cumsum. Returns {target: (low, high)}.
+    """
+    scores = np.asarray(scores, np.float64)
+    ok = np.asarray(ok, np.float64)
+    targets = np.asarray(targets, np.float64)
+    n = len(scores)
+    if not n:
+        return {float(t): (0.0, 0.0) for t in targets}
+    rng = np.random.default_rng(seed)
+    size = np.arange(1, n + 1)
+    out = []
+    for lo in range(0, n_boot, batch):
+        idx = rng.integers(0, n, size=(min(batch, n_boot - lo), n))
+        order = np.argsort(-scores[idx], axis=1)
+        good = np.cumsum(np.take_along_axis(ok[idx], order, axis=1), axis=1)
+        reach = np.maximum.accumulate((good / size)[:, ::-1], axis=1)
+        out.append((reach[:, :, None] >= targets).sum(axis=1) / n)
+    yields = np.concatenate(out)
+    low, high = np.quantile(yields, [alpha / 2, 1 - alpha / 2], axis=0)
+    return {float(t): (float(a), float(b)) for t, a, b in zip(targets, low, high)}
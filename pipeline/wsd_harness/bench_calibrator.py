@@ -18,10 +18,14 @@ import argparse
 import collections
 import hashlib
 import json
+import sys
 from pathlib import Path
 
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from pipeline.util_wsd_metrics import PrecisionCurve, bootstrap_yield, yield_at  # noqa: E402
+
 S = Path("/private/tmp/claude-501/-Users-joshuathomasamar-PycharmProjects-Fluency"
          "/3fbda742-82e7-4ae2-9ed3-d7fe8df59759/scratchpad")
 
@@ -30,16 +34,6 @@ def split_of(word):
     return "dev" if int(hashlib.sha1(word.encode()).hexdigest()[:8], 16) % 100 < 35 else "test"
 
 
-def yield_at(scores, ok, target=0.99):
-    order = np.argsort(-scores)
-    good = best = 0
-    for i, j in enumerate(order, 1):
-        good += ok[j]
-        if good / i >= target:
-            best = i
-    return best / len(ok)
-
-
 def build(rows, tokmap):
     X, y, w, grp = [], [], [], []
     for r in rows:
@@ -78,6 +72,8 @@ def main():
                          "— the control that isolates what mBERT actually adds")
     ap.add_argument("--with-token", action="store_true",
                     help="restrict to items the token method also scored")
+    ap.add_argument("--bootstrap", type=int, default=0, metavar="N",
+                    help="add a 95%% interval on each yield from N resamples of test")
     args = ap.parse_args()
 
     rows = [r for r in json.loads(Path(args.rows).read_text()) if r["n_tup"] > 1]
@@ -101,28 +97,34 @@ def main():
     from sklearn.linear_model import LogisticRegression
     from sklearn.preprocessing import StandardScaler
 
+    def ci(scores):
+        if not args.bootstrap:
+            return ""
+        low, high = bootstrap_yield(scores, y[tst], [0.99], n_boot=args.bootstrap)[0.99]
+        return f"  [{low:.1%}, {high:.1%}]"
+
     base = yield_at(tgap[tst], y[tst])
     print(f"\n{'model':<34}{'test acc':>10}{'yield@99%':>12}")
-    print(f"{'tuple gap alone (incumbent)':<34}{y[tst].mean():>10.2%}{base:>12.1%}")
+    print(f"{'tuple gap alone (incumbent)':<34}{y[tst].mean():>10.2%}{base:>12.1%}"
+          f"{ci(tgap[tst])}")
 
     sc = StandardScaler().fit(X[dev])
     lr = LogisticRegression(max_iter=2000, C=1.0).fit(sc.transform(X[dev]), y[dev])
     p_lr = lr.predict_proba(sc.transform(X[tst]))[:, 1]
-    print(f"{'logistic regression':<34}{'':>10}{yield_at(p_lr, y[tst]):>12.1%}")
+    print(f"{'logistic regression':<34}{'':>10}{yield_at(p_lr, y[tst]):>12.1%}{ci(p_lr)}")
 
     gb = HistGradientBoostingClassifier(max_iter=300, learning_rate=0.06,
                                         max_leaf_nodes=15, random_state=0)
     gb.fit(X[dev], y[dev])
     p_gb = gb.predict_proba(X[tst])[:, 1]
-    print(f"{'gradient boosting':<34}{'':>10}{yield_at(p_gb, y[tst]):>12.1%}")
+    print(f"{'gradient boosting':<34}{'':>10}{yield_at(p_gb, y[tst]):>12.1%}{ci(p_gb)}")
 
     # what the calibrator buys at fixed coverage, which is the product question
+    gap_curve, gb_curve = PrecisionCurve(tgap[tst], y[tst]), PrecisionCurve(p_gb, y[tst])
     print(f"\n{'keep top':>9}{'tuple gap':>12}{'calibrated':>12}")
     for K in (10, 20, 30, 40, 50):
         k = max(1, int(tst.sum() * K / 100))
-        a = y[tst][np.argsort(-tgap[tst])[:k]].mean()
-        b = y[tst][np.argsort(-p_gb)[:k]].mean()
-        print(f"{K:>8}%{a:>12.2%}{b:>12.2%}")
+        print(f"{K:>8}%{gap_curve.top(k):>12.2%}{gb_curve.top(k):>12.2%}")
 
 
 if __name__ == "__main__":
@@ -57,6 +57,7 @@ def deacc(s):
 # and step_6e can never drift on it.
 sys.path.insert(0, str(REPO))
 from pipeline.util_5c_token_prototypes import reflexive_evidence  # noqa: E402
+from pipeline.util_wsd_metrics import PrecisionCurve  # noqa: E402
 
 
 def has_target(word, sent):
@@ -431,32 +432,32 @@ def report(rows):
         print(f"  {lab:>7} tok  n={len(b):>7,}  shipped {pct(sum(r['ok_tup'] for r in b), len(b)):>8}"
               f"   mean menu {sum(r['n_tup'] for r in b)/len(b):.2f} tuples")
 
+    # One ranking per confidence signal and population. Stable, because these
+    # were always ranked with sorted(): equal scores keep row order.
+    signals = (("cgap", "ok_tup", None, "class gap (shipped)"),
+               ("tgap", "ok_tup", None, "tuple gap"),
+               ("sum_gap", "ok_sum", "0.02", "sum gap T=.02"))
+
+    def curve(pop, conf, ok, sub):
+        pick = (lambda r, key: r[key][sub]) if sub else (lambda r, key: r[key])
+        return PrecisionCurve([pick(r, conf) for r in pop], [pick(r, ok) for r in pop],
+                              kind="stable")
+
     # coverage curve on the non-trivial subset, by each confidence signal
     print(f"\naccuracy at top-K%% by confidence (menus >1 tuple, n={len(nt):,}):")
     print(f"  {'K':>5} {'class gap (shipped)':>22} {'tuple gap':>12} {'sum gap T=.02':>15}")
+    curves = [curve(nt, conf, ok, sub) for conf, ok, sub, _ in signals]
     for K in (5, 10, 25, 50, 75, 100):
         k = max(1, int(len(nt) * K / 100))
-        out = [f"  {K:>4}%"]
-        for conf, ok, sub in (("cgap", "ok_tup", None), ("tgap", "ok_tup", None),
-                              ("sum_gap", "ok_sum", "0.02")):
-            s = sorted(nt, key=lambda r: -(r[conf][sub] if sub else r[conf]))[:k]
-            acc = sum((r[ok][sub] if sub else r[ok]) for r in s) / k
-            out.append(f"{acc:>21.2%}" if conf == "cgap" else f"{acc:>11.2%}" if conf == "tgap" else f"{acc:>14.2%}")
-        print(" ".join(out))
+        a, b, c = (cv.top(k) for cv in curves)
+        print(f"  {K:>4}% {a:>21.2%} {b:>11.2%} {c:>14.2%}")
 
     # yield at 99% — the number the product actually needs
     for pop, plab in ((nt, "menus >1 tuple"), (tgt, "target-present only")):
         print(f"\nyield at 99% tuple accuracy ({plab}, n={len(pop):,}):")
-        for conf, ok, sub, lab in (("cgap", "ok_tup", None, "class gap (shipped)"),
-                                   ("tgap", "ok_tup", None, "tuple gap"),
-                                   ("sum_gap", "ok_sum", "0.02", "sum gap T=.02")):
-            s = sorted(pop, key=lambda r: -(r[conf][sub] if sub else r[conf]))
-            good = best = 0
-            for i, r in enumerate(s, 1):
-                good += (r[ok][sub] if sub else r[ok])
-                if good / i >= 0.99:
-                    best = i
-            print(f"  {lab:22} {best:>7,} of {len(s):,}  ({best/len(s):.1%})")
+        for conf, ok, sub, lab in signals:
+            best = int(curve(pop, conf, ok, sub).kept(0.99))
+            print(f"  {lab:22} {best:>7,} of {len(pop):,}  ({best/len(pop):.1%})")
 
     # shipped bands
     print(f"\nshipped bands (absolute cuts on the class gap), tuple accuracy:")
@@ -24,9 +24,13 @@ import importlib
 import json
 import sys
 
-from common import HERE, LABEL_DIR, read_corpus
+import numpy as np
+
+from common import HERE, LABEL_DIR, REPO, read_corpus
 
 sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(REPO))
+from pipeline.util_wsd_metrics import PrecisionCurve, bootstrap_yield  # noqa: E402
 
 
 def load_labels(corpus):
@@ -43,6 +47,8 @@ def main():
     ap.add_argument("--corpus", default="spanishdict")
     ap.add_argument("--split", default="test", choices=["dev", "test", "all"])
     ap.add_argument("--show-bad", action="store_true")
+    ap.add_argument("--bootstrap", type=int, default=0, metavar="N",
+                    help="add a 95%% interval on each yield from N resamples")
     args = ap.parse_args()
 
     labels = load_labels(args.corpus)
@@ -76,26 +82,32 @@ def main():
 
     print(f"\n{args.method} on {args.corpus}/{args.split}")
     print(f"  {n} sentences scored, {skipped} excluded by label file")
-    has_gold = [x for x in scored if x["has_gold"]]
+    # `scored` is already ranked, so the curve's stable sort on rank keeps it.
+    rank = -np.arange(n)
+    curve = PrecisionCurve(rank, [x["acceptable"] for x in scored], kind="stable")
+    gold_seen = np.cumsum([x["has_gold"] for x in scored])
+    exact_seen = np.cumsum([x["has_gold"] and x["exact"] for x in scored])
 
     print("\n  keep top   n     ACCEPTABLE (the metric)   BAD      exact-leaf")
     for f in (0.10, 0.25, 0.50, 0.75, 1.00):
         k = max(1, int(n * f))
-        band = scored[:k]
-        acc = sum(x["acceptable"] for x in band) / k
-        ex = ([x["exact"] for x in band if x["has_gold"]])
-        exs = f"{sum(ex)/len(ex):.1%}" if ex else "n/a"
+        acc = curve.top(k)
+        g = int(gold_seen[k - 1])
+        exs = f"{exact_seen[k - 1]/g:.1%}" if g else "n/a"
         print(f"  {f:>7.0%}   {k:>3}   {acc:>18.1%}   {1-acc:>6.1%}   {exs:>10}")
 
     print("\n  yield at a BAD-rate ceiling:")
-    for tgt in (0.00, 0.02, 0.05, 0.10):
-        best = 0
-        bad = 0
-        for i, x in enumerate(scored, 1):
-            bad += not x["acceptable"]
-            if bad / i <= tgt:
-                best = i
-        print(f"    BAD <= {tgt:>4.0%}   yield {best/n:>6.1%}  ({best} of {n})")
+    ceilings = (0.00, 0.02, 0.05, 0.10)
+    ci = {}
+    if args.bootstrap:
+        # A BAD-rate ceiling is a precision floor; the interval is on the yield.
+        conf = [x["conf"] for x in scored]
+        ci = bootstrap_yield(conf, [x["acceptable"] for x in scored],
+                             [1 - c for c in ceilings], n_boot=args.bootstrap)
+    for tgt, best in zip(ceilings, curve.kept_under(ceilings)):
+        band = ci.get(1 - tgt)
+        extra = f"  95% CI [{band[0]:.1%}, {band[1]:.1%}]" if band else ""
+        print(f"    BAD <= {tgt:>4.0%}   yield {best/n:>6.1%}  ({best} of {n}){extra}")
     print(f"\n  NOTE: {n} sentences resolves a BAD rate no finer than "
           f"1-in-{n} = {1/n:.1%}.")
 
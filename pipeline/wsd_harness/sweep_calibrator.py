@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Sweep calibrator settings against ONE load of the inputs.
+
+tool_6d_train_calibrator answers one question per invocation and re-reads the
+menu, the gold rows and the token predictions every time, then rebuilds the
+feature matrix. An ablation study is a grid of those runs. This loads and
+featurises once, writes the matrix and labels to .npy, and fans the grid out
+over a process pool whose workers memory-map the same arrays instead of each
+receiving a pickled copy.
+
+The grid is the product of:
+
+    --ablation     none / companion / structural / both   (the trainer's --no-*)
+    --target       tup / leaf
+    --learning-rate, --max-iter, --max-leaf-nodes         (the model)
+    --band-high, --band-medium                            (the escalation gate)
+
+Band targets only move the cuts, never the model, so one fit serves every band
+setting and they share its wall time. Evaluation is the trainer's exactly: the
+frozen word-level split, fit on dev, scored on test, band cuts read off the
+held-out curve with the same empty-band fallback.
+
+    python3 pipeline/wsd_harness/sweep_calibrator.py --rows ROWS.json \\
+        --token TOK.json --ablation none companion structural --target tup leaf \\
+        --workers 4 --out sweep.tsv
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO))
+from pipeline.tool_6d_train_calibrator import (  # noqa: E402
+    MODEL_PARAMS, ablate, band_cut, band_precisions, featurise_all, load_inputs,
+    make_model, split_of)
+from pipeline.util_wsd_metrics import PrecisionCurve  # noqa: E402
+
+ABLATIONS = {"none": (False, False), "companion": (True, False),
+             "structural": (False, True), "both": (True, True)}
+ARRAYS = ("X", "ok_tup", "ok_leaf", "dev")
+COLUMNS = ("ablation", "target", "learning_rate", "max_iter", "max_leaf_nodes",
+           "band_high", "band_medium", "positive", "tgap_yield99", "yield99",
+           "cut_high", "cut_medium", "share_high", "share_medium", "fit_s")
+
+_SHARED: dict = {}
+
+
+def write_arrays(work: Path, rows, tok, menus) -> None:
+    """Featurise once, unablated, and store what every config reads."""
+    X = featurise_all(rows, tok, menus)
+    arrays = {"X": X,
+              "ok_tup": np.array([int(r["ok_tup"]) for r in rows], np.int8),
+              "ok_leaf": np.array([int(r["ok_leaf"]) for r in rows], np.int8),
+              "dev": np.array([split_of(r["word"]) == "dev" for r in rows])}
+    for name, array in arrays.items():
+        np.save(work / f"{name}.npy", array, allow_pickle=False)
+
+
+def attach(work, threads=0) -> None:
+    """Pool initializer: map the arrays read-only, once per worker."""
+    if threads and "OMP_NUM_THREADS" not in os.environ:
+        # Set before sklearn loads, so N workers do not each start every core.
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+    for name in ARRAYS:
+        _SHARED[name] = np.load(Path(work) / f"{name}.npy", mmap_mode="r",
+                                allow_pickle=False)
+
+
+def grid(args) -> list[dict]:
+    """One entry per model fit; band settings ride along as a list."""
+    bands = list(itertools.product(args.band_high, args.band_medium))
+    return [{"ablation": ab, "target": tgt,
+             "params": {"learning_rate": lr, "max_iter": it, "max_leaf_nodes": leaves},
+             "bands": bands}
+            for ab, tgt, lr, it, leaves in itertools.product(
+                args.ablation, args.target, args.learning_rate, args.max_iter,
+                args.max_leaf_nodes)]
+
+
+def run_config(config: dict) -> list[dict]:
+    """Fit one config on dev and read every band setting off its test curve."""
+    t0 = time.perf_counter()
+    dev = np.asarray(_SHARED["dev"])
+    tst = ~dev
+    X = ablate(np.asarray(_SHARED["X"]), *ABLATIONS[config["ablation"]])
+    y = np.asarray(_SHARED["ok_" + config["target"]])
+    model = make_model(**config["params"])
+    model.fit(X[dev], y[dev])
+    p = model.predict_proba(X[tst])[:, 1]
+    fit_s = time.perf_counter() - t0
+    cal = PrecisionCurve(p, y[tst])
+    common = {"ablation": config["ablation"], "target": config["target"],
+              **config["params"], "positive": float(y[tst].mean()),
+              "tgap_yield99": PrecisionCurve(X[tst][:, 0], y[tst]).yield_at(0.99),
+              "yield99": cal.yield_at(0.99), "fit_s": fit_s}
+    out = []
+    for high, medium in config["bands"]:
+        prec = band_precisions(config["target"], high, medium)
+        (cut_hi, _), (cut_md, _) = band_cut(cal, prec["high"]), band_cut(cal, prec["medium"])
+        out.append({**common, "band_high": prec["high"], "band_medium": prec["medium"],
+                    "cut_high": round(cut_hi, 4), "cut_medium": round(cut_md, 4),
+                    "share_high": float((p >= cut_hi).mean()),
+                    "share_medium": float(((p >= cut_md) & (p < cut_hi)).mean())})
+    return out
+
+
+def sweep(configs, work, workers=1) -> list[dict]:
+    """Every config's rows, in grid order."""
+    if workers <= 1:
+        attach(work)
+        return [row for config in configs for row in run_config(config)]
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=attach,
+                             initargs=(str(work), threads)) as pool:
+        return [row for rows in pool.map(run_config, configs) for row in rows]
+
+
+def fmt(value) -> str:
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", required=True, help="bench_tuple_accuracy --out json")
+    ap.add_argument("--token", default="", help="bench_token_prototypes --out json")
+    ap.add_argument("--ablation", nargs="+", default=["none"], choices=list(ABLATIONS))
+    ap.add_argument("--target", nargs="+", default=["tup"], choices=["tup", "leaf"])
+    ap.add_argument("--learning-rate", nargs="+", type=float,
+                    default=[MODEL_PARAMS["learning_rate"]])
+    ap.add_argument("--max-iter", nargs="+", type=int, default=[MODEL_PARAMS["max_iter"]])
+    ap.add_argument("--max-leaf-nodes", nargs="+", type=int,
+                    default=[MODEL_PARAMS["max_leaf_nodes"]])
+    ap.add_argument("--band-high", nargs="+", type=float, default=[0.0],
+                    help="0 means the trainer's per-target default")
+    ap.add_argument("--band-medium", nargs="+", type=float, default=[0.0])
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--work", default="",
+                    help="directory for the shared .npy arrays (default: a temp dir)")
+    ap.add_argument("--out", default="", help="write the table here as TSV")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    rows, tok, menus = load_inputs(args.rows, args.token)
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(args.work or tmp)
+        work.mkdir(parents=True, exist_ok=True)
+        write_arrays(work, rows, tok, menus)
+        configs = grid(args)
+        print(f"{len(rows):,} items, {len(tok):,} with token predictions; "
+              f"inputs ready in {time.perf_counter() - t0:.1f}s")
+        print(f"{len(configs)} fits x {len(configs[0]['bands'])} band settings "
+              f"on {args.workers} worker(s)")
+        t1 = time.perf_counter()
+        results = sweep(configs, work, args.workers)
+    print(f"swept in {time.perf_counter() - t1:.1f}s\n")
+
+    widths = [max(len(c), *(len(fmt(r[c])) for r in results)) for c in COLUMNS]
+    print("  ".join(c.rjust(w) for c, w in zip(COLUMNS, widths)))
+    for r in results:
+        print("  ".join(fmt(r[c]).rjust(w) for c, w in zip(COLUMNS, widths)))
+    if args.out:
+        Path(args.out).write_text("\t".join(COLUMNS) + "\n" + "".join(
+            "\t".join(fmt(r[c]) for c in COLUMNS) + "\n" for r in results))
+        print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
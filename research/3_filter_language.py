@@ -24,25 +24,21 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
-try:
-    from lingua import Language, LanguageDetectorBuilder
-except ImportError:
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+from pipeline.util_line_lid import (  # noqa: E402
+    ALL_LANGUAGES,
+    LINGUA_AVAILABLE,
+    LineLanguageIdentifier,
+)
+
+if not LINGUA_AVAILABLE:
     sys.exit("lingua not installed: pip install lingua-language-detector")
 
 
-LANGUAGE_NAMES = {
-    Language.SPANISH: "spanish",
-    Language.FRENCH: "french",
-    Language.ENGLISH: "english",
-    Language.PORTUGUESE: "portuguese",
-    Language.ITALIAN: "italian",
-    Language.GERMAN: "german",
-    Language.CATALAN: "catalan",
-}
-
-
-def detect_language(detector, lyrics):
-    """Detect the primary language of a lyrics string."""
+def lid_text(lyrics):
+    """The lyric sample lingua sees for a song, or None if too short to judge."""
     lines = []
     for line in lyrics.split("\n"):
         stripped = line.strip()
@@ -51,15 +47,18 @@ def detect_language(detector, lyrics):
         lines.append(stripped)
 
     text = "\n".join(lines[:40])
-    if len(text) < 20:
-        return "unknown", 0.0
+    return text if len(text) >= 20 else None
+
 
-    results = detector.compute_language_confidence_values(text)
-    if results:
-        top = results[0]
-        label = LANGUAGE_NAMES.get(top.language, top.language.name.lower())
-        return label, top.value
-    return "unknown", 0.0
+def detect_language(lid, lyrics):
+    """Detect the primary language of a lyrics string."""
+    text = lid_text(lyrics)
+    if text is None:
+        return "unknown", 0.0
+    label, confidence = lid.verdict(text)
+    if label is None:
+        return "unknown", 0.0
+    return label, confidence
 
 
 def main():
@@ -67,24 +66,29 @@ def main():
     parser.add_argument("--input-dir", required=True, help="Directory of per-song JSON files")
     parser.add_argument("--min-confidence", type=float, default=0.5,
                         help="Minimum confidence to assign a language (default: 0.5)")
+    parser.add_argument("--lid-cache", default=None,
+                        help="Directory of cached LID verdicts shared with step 2a")
     args = parser.parse_args()
 
     input_dir = Path(args.input_dir)
     files = sorted(p for p in input_dir.glob("*.json") if not p.name.startswith("_"))
     print("Found %d song files in %s" % (len(files), input_dir))
 
-    print("Building lingua detector...")
-    detector = LanguageDetectorBuilder.from_all_languages().build()
-
-    counts = defaultdict(int)
-    for i, path in enumerate(files, 1):
+    songs = []
+    for path in files:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
         # Files are wrapped in a list for step 3 compat
-        song = data[0] if isinstance(data, list) else data
-        lyrics = song.get("lyrics", "")
+        songs.append(data[0] if isinstance(data, list) else data)
+
+    print("Detecting languages (lingua, all languages)...")
+    lid = LineLanguageIdentifier(ALL_LANGUAGES, cache_dir=args.lid_cache)
+    lid.prime(text for text in (lid_text(s.get("lyrics", "")) for s in songs) if text)
+    lid.save()
 
-        lang, conf = detect_language(detector, lyrics)
+    counts = defaultdict(int)
+    for i, (path, song) in enumerate(zip(files, songs), 1):
+        lang, conf = detect_language(lid, song.get("lyrics", ""))
         if conf < args.min_confidence:
             lang = "unknown"
 
@@ -100,6 +104,7 @@ def main():
             song.get("artist", "")[:20],
             lang, conf * 100))
 
+    print("\n" + lid.format_report())
     print("\n--- Summary ---")
     for lang, count in sorted(counts.items(), key=lambda x: -x[1]):
         print("  %-12s %3d songs -> %s/%s/" % (lang, count, input_dir, lang))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Content-addressed chunks of the offline deck files, for delta updates.
+
+A retained download used to re-fetch a whole file whenever its sha256 changed,
+so one corrected card cost the full 15 MB index. Each manifest file now also
+lists the chunks it is made of, in order. A chunk is a run of whole top-level
+entries, cut from the file's own bytes so that concatenating the chunks gives
+the file back exactly. A client that already holds the previous version copies
+the chunks it has out of its installed file and fetches only the new ones
+(js/offline-bundles-core.js).
+
+Chunk boundaries follow entry keys, not byte offsets: a chunk ends after an
+entry whose key (object member name, or an array item's "id") hashes to a
+boundary. Editing a card therefore changes only the chunk holding it, and
+inserting or removing one changes at most two; later chunks keep their hashes.
+
+Chunks are written once, as <sha256>.json under CHUNK_DIR. The .json suffix
+is only so static hosts compress them; a chunk by itself is not valid JSON.
+Each rebuild also writes a delta list per changed source under DELTA_DIR,
+naming the chunks added and dropped since the manifest it replaces, and then
+prunes CHUNK_DIR: a chunk no file of the new manifest or of the one it
+replaces lists is deleted. Clients still holding the previous manifest can
+finish their download; older chunks would otherwise pile up forever.
+
+    python3 scripts/offline_bundles.py FILE [--target-kb 256]
+prints how FILE would be chunked.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CHUNK_PATH = "Data/offline-chunks/"
+CHUNK_DIR = PROJECT_ROOT / CHUNK_PATH
+DELTA_DIR = CHUNK_DIR / "deltas"
+TARGET_CHUNK_BYTES = 256 * 1024
+# A run of entries whose keys all miss the boundary is cut here anyway.
+MAX_CHUNK_FACTOR = 4
+
+# Strings whole (so brackets and commas inside them are skipped), then the
+# structural characters.
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{},]', re.S)
+
+
+def entry_spans(body):
+    """Byte spans partitioning `body` at its top-level entries, else None.
+
+    Each span is one array item or object member with its trailing comma. The
+    opening bracket joins the first span and the closing bracket the last, so
+    the spans always cover the whole file.
+    """
+    stripped = body.lstrip()
+    if stripped[:1] not in (b"[", b"{"):
+        return None
+    spans = []
+    depth = 0
+    start = 0
+    for match in _TOKEN.finditer(body):
+        token = match.group()
+        if token in (b"[", b"{"):
+            depth += 1
+        elif token in (b"]", b"}"):
+            depth -= 1
+        elif token == b"," and depth == 1:
+            spans.append((start, match.end()))
+            start = match.end()
+    if depth != 0:
+        return None
+    spans.append((start, len(body)))
+    return spans
+
+
+def entry_key(body, span, is_object):
+    """The key an entry is known by: its member name, an item's "id", or its bytes."""
+    text = body[span[0]:span[1]].strip()
+    if span[0] == 0:
+        text = text[1:].lstrip()
+    if span[1] == len(body):
+        text = text[:-1].rstrip()
+    text = text[:-1] if text.endswith(b",") else text
+    if is_object:
+        match = _TOKEN.match(text)
+        return match.group() if match else text
+    try:
+        item = json.loads(text)
+    except ValueError:
+        return text
+    if isinstance(item, dict) and "id" in item:
+        return str(item["id"]).encode()
+    return text
+
+
+def chunk_spans(body, target=TARGET_CHUNK_BYTES):
+    """Byte spans of a file's chunks; one span if it is small or not a JSON container."""
+    spans = entry_spans(body) if len(body) > target else None
+    if not spans or len(spans) < 2:
+        return [(0, len(body))]
+    # The boundary rate is a power of two near the entries-per-target ratio,
+    # so it stays put across rebuilds unless the average entry size changes a lot.
+    per_chunk = max(1.0, target * len(spans) / len(body))
+    divisor = 2 ** max(0, round(math.log2(per_chunk)))
+    is_object = body.lstrip()[:1] == b"{"
+    chunks = []
+    start = 0
+    for span in spans:
+        key = entry_key(body, span, is_object)
+        at_boundary = int.from_bytes(hashlib.sha1(key).digest()[:4], "big") % divisor == 0
+        if at_boundary or span[1] - start >= target * MAX_CHUNK_FACTOR:
+            chunks.append((start, span[1]))
+            start = span[1]
+    if start < len(body):
+        chunks.append((start, len(body)))
+    return chunks
+
+
+def chunk_file(body, target=TARGET_CHUNK_BYTES):
+    """[(record, bytes)] for a file: record is {"sha256", "bytes"} of one chunk."""
+    out = []
+    for start, end in chunk_spans(body, target):
+        part = body[start:end]
+        out.append(({"sha256": hashlib.sha256(part).hexdigest(), "bytes": len(part)}, part))
+    return out
+
+
+def write_chunks(chunks, chunk_dir=None):
+    """Write chunks not already on disk; returns how many were new."""
+    chunk_dir = Path(chunk_dir or CHUNK_DIR)
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for record, part in chunks:
+        path = chunk_dir / (record["sha256"] + ".json")
+        if not path.exists():
+            path.write_bytes(part)
+            written += 1
+    return written
+
+
+def source_chunks(source):
+    """{sha256: bytes} of every chunk a manifest source's files are made of."""
+    return {chunk["sha256"]: chunk["bytes"]
+            for row in source.get("files") or []
+            for chunk in row.get("chunks") or []}
+
+
+def source_delta(previous, source):
+    """The delta list from a previous manifest entry of a source to its new one.
+
+    None when there is nothing earlier to compare with or no chunk changed.
+    """
+    before = source_chunks(previous or {})
+    after = source_chunks(source)
+    if not before or before.keys() == after.keys():
+        return None
+    added = [{"sha256": sha, "bytes": size} for sha, size in after.items() if sha not in before]
+    return {
+        "source": source["id"],
+        # The version the old layout was built for: contentVersion is bumped
+        # by hand in the manifest before the rebuild that refreshes it.
+        "from": previous.get("chunkedVersion", previous.get("contentVersion")),
+        "to": source.get("contentVersion"),
+        "added": added,
+        "removed": sorted(sha for sha in before if sha not in after),
+        "addedBytes": sum(row["bytes"] for row in added),
+    }
+
+
+def manifest_chunks(manifest):
+    """sha256 of every chunk any source of a manifest lists."""
+    return {sha for source in (manifest or {}).get("sources") or []
+            for sha in source_chunks(source)}
+
+
+def prune_chunks(manifests, chunk_dir=None):
+    """Delete chunk files none of `manifests` references; returns how many.
+
+    Only <sha256>.json files directly in the chunk directory are considered,
+    so the delta lists under it stay.
+    """
+    keep = set().union(*(manifest_chunks(manifest) for manifest in manifests))
+    removed = 0
+    for path in Path(chunk_dir or CHUNK_DIR).glob("*.json"):
+        if re.fullmatch(r"[0-9a-f]{64}", path.stem) and path.stem not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def write_delta(delta, delta_dir=None):
+    delta_dir = Path(delta_dir or DELTA_DIR) / delta["source"]
+    delta_dir.mkdir(parents=True, exist_ok=True)
+    path = delta_dir / ("%s.json" % delta["to"])
+    path.write_text(json.dumps(delta, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show how a deck file is chunked")
+    parser.add_argument("path")
+    parser.add_argument("--target-kb", type=int, default=TARGET_CHUNK_BYTES // 1024)
+    args = parser.parse_args()
+    body = Path(args.path).read_bytes()
+    chunks = chunk_file(body, args.target_kb * 1024)
+    print(json.dumps([record for record, _ in chunks]))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,10 @@ The grid covers every step listed in pipeline/CLAUDE.md, even ones that
 aren't yet retrofitted with step_version. Unversioned steps show EXISTS /
 MISSING + the file mtime.
 
+Below the grid, a timing section summarises the last few orchestrated runs per
+artist (data/pipeline_runs/*.json, written by run_artist_pipeline.py): wall
+seconds per step, oldest to newest, plus the API calls each run made.
+
 Adding a versioned step:
     1. Make the step stamp `step_version` into its output (_meta block or
        per-entry field — see pipeline/util_pipeline_meta.py).
@@ -31,6 +35,10 @@ from util_pipeline_meta import read_step_version, read_generated_at  # noqa: E40
 
 OUTPUT_FILE = PROJECT_ROOT / "PIPELINE_STATUS.txt"
 
+# How many orchestrated runs per artist the timing section shows.
+TIMING_HISTORY = 5
+RUN_REPORT_DIR = "data/pipeline_runs"
+
 # Sources we consider canonical for any per_source step. Rows for these always
 # appear even if no file exists yet — making "I haven't built this anywhere"
 # visible. Per-step override via per_source["expected"].
@@ -399,6 +407,73 @@ STEPS = [
 ]
 
 
+# ---------------------------------------------------------------------------
+# Timing / cost trends (run_artist_pipeline run reports)
+# ---------------------------------------------------------------------------
+
+def load_run_reports(artist_dir, limit=TIMING_HISTORY):
+    """Return the newest `limit` run reports for an artist, oldest first."""
+    run_dir = Path(artist_dir) / RUN_REPORT_DIR
+    if not run_dir.is_dir():
+        return []
+    reports = []
+    for path in sorted(run_dir.glob("*.json"))[-limit:]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                reports.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return reports
+
+
+def step_trends(reports):
+    """Return [(step, [(wall_seconds|None, api_calls|None), ...])] per step.
+
+    One slot per report, so a step skipped in a run shows as a gap rather than
+    shifting later runs left.
+    """
+    order = []
+    by_step = {}
+    for i, report in enumerate(reports):
+        for rec in report.get("steps") or []:
+            step = str(rec.get("step"))
+            if step not in by_step:
+                order.append(step)
+                by_step[step] = [(None, None)] * len(reports)
+            counters = (rec.get("metrics") or {}).get("counters") or {}
+            by_step[step][i] = (rec.get("wall_seconds"), counters.get("api_calls"))
+    return [(step, by_step[step]) for step in order]
+
+
+def build_timing_section(artists):
+    lines = ["", "Step timings (last %d orchestrated runs, oldest -> newest; "
+             "wall seconds, [API calls]):" % TIMING_HISTORY]
+    any_runs = False
+    for name, artist_dir in artists:
+        reports = load_run_reports(artist_dir)
+        if not reports:
+            continue
+        any_runs = True
+        lines.append("  %s  (%s)" % (name, ", ".join(
+            str(r.get("run_id", "?")) for r in reports[-1:])))
+        for step, cells in step_trends(reports):
+            rendered = []
+            for wall, calls in cells:
+                if wall is None:
+                    rendered.append("%12s" % "—")
+                    continue
+                cell = "%.1f" % wall
+                if calls:
+                    cell += " [%s]" % "{:,}".format(calls)
+                rendered.append("%12s" % cell)
+            lines.append("    %-7s %s" % (step, " ".join(rendered)))
+        totals = ["%12.1f" % (r.get("total_wall_seconds") or 0) for r in reports]
+        lines.append("    %-7s %s" % ("total", " ".join(totals)))
+    if not any_runs:
+        lines.append("  (no run reports yet — run pipeline/artist/run_artist_pipeline.py)")
+    return lines
+
+
 # ---------------------------------------------------------------------------
 # Dispatch
 # ---------------------------------------------------------------------------
@@ -688,6 +763,8 @@ def build_report():
     if not any_notes:
         lines.append("  (no versioned steps yet)")
 
+    lines.extend(build_timing_section(artists))
+
     return "\n".join(lines) + "\n"
 
 
@@ -1,29 +1,43 @@
 #!/usr/bin/env python3
-"""Refresh offline-content sizes/hashes and optionally add an Artist source."""
+"""Refresh offline-content sizes/hashes and optionally add an Artist source.
+
+Every file is also split into content-addressed chunks for delta updates
+(offline_bundles.py). New chunks are written next to the deck data, each
+source whose chunks changed gets a delta list, and chunks referenced by
+neither this manifest nor the one it replaces are pruned (--no-prune keeps
+them).
+"""
 
 import argparse
+import copy
 import hashlib
 import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+from offline_bundles import (CHUNK_PATH, TARGET_CHUNK_BYTES, chunk_file, prune_chunks,
+                             source_delta, write_chunks, write_delta)
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 MANIFEST_PATH = PROJECT_ROOT / "config" / "offline-content-manifest.json"
 ARTISTS_PATH = PROJECT_ROOT / "config" / "artists.json"
 
 
-def file_record(relative_path):
+def file_record(relative_path, chunk_bytes=TARGET_CHUNK_BYTES):
     path = PROJECT_ROOT / relative_path
     body = path.read_bytes()
+    chunks = chunk_file(body, chunk_bytes)
+    write_chunks(chunks)
     return {
         "path": relative_path,
         "bytes": len(body),
         "sha256": hashlib.sha256(body).hexdigest(),
+        "chunks": [record for record, _ in chunks],
     }
 
 
-def artist_source(artist_id, config, content_version):
+def artist_source(artist_id, config, content_version, chunk_bytes=TARGET_CHUNK_BYTES):
     required = ("masterPath", "indexPath", "examplesPath")
     missing = [key for key in required if not config.get(key)]
     if missing:
@@ -31,7 +45,7 @@ def artist_source(artist_id, config, content_version):
             "%s is not a split Artist deck; missing %s" %
             (artist_id, ", ".join(missing)))
     language = str(config.get("language") or "").lower()
-    files = [file_record(config[key]) for key in required]
+    files = [file_record(config[key], chunk_bytes) for key in required]
     storage_bytes = sum(row["bytes"] for row in files)
     return {
         "id": "artist-" + artist_id,
@@ -49,16 +63,20 @@ def artist_source(artist_id, config, content_version):
     }
 
 
-def refresh_manifest(add_artist=None, content_version=None, generated_at=None):
+def refresh_manifest(add_artist=None, content_version=None, generated_at=None,
+                     chunk_bytes=TARGET_CHUNK_BYTES, prune=True):
     manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    replaced = copy.deepcopy(manifest)
     artists = json.loads(ARTISTS_PATH.read_text(encoding="utf-8"))
     content_version = content_version or manifest.get("contentVersion")
+    previous = {source.get("id"): copy.deepcopy(source)
+                for source in manifest.get("sources") or []}
 
     if add_artist:
         config = artists.get(add_artist)
         if not config:
             raise ValueError("Unknown artist id: %s" % add_artist)
-        replacement = artist_source(add_artist, config, content_version)
+        replacement = artist_source(add_artist, config, content_version, chunk_bytes)
         for index, source in enumerate(manifest.get("sources") or []):
             if source.get("id") == replacement["id"]:
                 manifest["sources"][index] = replacement
@@ -67,14 +85,25 @@ def refresh_manifest(add_artist=None, content_version=None, generated_at=None):
             manifest.setdefault("sources", []).append(replacement)
 
     for source in manifest.get("sources") or []:
-        source["files"] = [file_record(row["path"])
+        source["files"] = [file_record(row["path"], chunk_bytes)
                            for row in source.get("files") or []]
         source["storageBytes"] = sum(row["bytes"] for row in source["files"])
         source["transferBytes"] = min(
             int(source.get("transferBytes") or source["storageBytes"]),
             source["storageBytes"],
         )
-
+        source["chunkedVersion"] = source.get("contentVersion")
+        delta = source_delta(previous.get(source.get("id")), source)
+        if delta:
+            write_delta(delta)
+            print("%s: %s -> %s adds %d chunks (%d of %d bytes)" % (
+                source["id"], delta["from"], delta["to"], len(delta["added"]),
+                delta["addedBytes"], source["storageBytes"]))
+            if delta["from"] == delta["to"]:
+                print("  warning: %s changed without a new contentVersion; "
+                      "installed copies will not update" % source["id"])
+
+    manifest["chunkPath"] = CHUNK_PATH
     if content_version:
         manifest["contentVersion"] = content_version
     manifest["generatedAt"] = generated_at or datetime.now(
@@ -83,6 +112,10 @@ def refresh_manifest(add_artist=None, content_version=None, generated_at=None):
         json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
         encoding="utf-8",
     )
+    if prune:
+        removed = prune_chunks([replaced, manifest])
+        if removed:
+            print("Pruned %d chunks no longer referenced" % removed)
 
 
 def main():
@@ -90,11 +123,17 @@ def main():
     parser.add_argument("--add-artist", help="Artist id from config/artists.json")
     parser.add_argument("--content-version")
     parser.add_argument("--generated-at")
+    parser.add_argument("--chunk-kb", type=int, default=TARGET_CHUNK_BYTES // 1024,
+                        help="Target size of the delta-update chunks")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="Keep chunks no current or previous manifest references")
     args = parser.parse_args()
     refresh_manifest(
         add_artist=args.add_artist,
         content_version=args.content_version,
         generated_at=args.generated_at,
+        chunk_bytes=args.chunk_kb * 1024,
+        prune=not args.no_prune,
     )
     print("Updated %s" % MANIFEST_PATH)
 
@@ -5,15 +5,19 @@
 // Bump CACHE_NAME alongside any change to ASSET_VERSION below — old caches
 // are deleted in the activate handler, so a bump forces the new pre-cache
 // list to be rebuilt on next install.
-const CACHE_NAME = 'flashcards-v263';
+const CACHE_NAME = 'flashcards-v267';
 const SHELL_CACHE_PREFIX = 'flashcards-v';
 const CONTENT_CACHE_PREFIX = 'fluency-content-';
 const CONTENT_STAGING_PREFIX = `${CONTENT_CACHE_PREFIX}staging-`;
+// Delta-update chunks (scripts/offline_bundles.py). js/offline-content.js
+// assembles them into retained files, so caching them here too would only
+// store every chunk twice.
+const CONTENT_CHUNK_PATH = '/Data/offline-chunks/';
 
 // Single source of truth for the module/CSS version tags. Must match
 // js/main.js's import URLs and index.html's modulepreload links. When you
 // bump the ?v= tags, change this and bump CACHE_NAME above.
-const ASSET_VERSION = '20260819b';
+const ASSET_VERSION = '20261019d';
 
 // Pre-cache the boot-critical static assets on install. Without this, the
 // first install populates the cache lazily — visit 1 doesn't go through
@@ -36,6 +40,7 @@ const urlsToCache = [
   `/js/offline-db.js?v=${ASSET_VERSION}`,
   `/js/sync-queue.js?v=${ASSET_VERSION}`,
   `/js/offline-content.js?v=${ASSET_VERSION}`,
+  `/js/offline-bundles-core.js?v=${ASSET_VERSION}`,
   `/js/speech.js?v=${ASSET_VERSION}`,
   `/js/artist-ui.js?v=${ASSET_VERSION}`,
   `/js/auth.js?v=${ASSET_VERSION}`,
@@ -46,6 +51,7 @@ const urlsToCache = [
   `/js/progress.js?v=${ASSET_VERSION}`,
   `/js/knowledge.js?v=${ASSET_VERSION}`,
   `/js/ui.js?v=${ASSET_VERSION}`,
+  `/js/filter-index-core.js?v=${ASSET_VERSION}`,
   `/js/vocab.js?v=${ASSET_VERSION}`,
   `/js/song-sets-core.js?v=${ASSET_VERSION}`,
   `/js/song-sets.js?v=${ASSET_VERSION}`,
@@ -132,6 +138,7 @@ self.addEventListener('fetch', event => {
   // This is what keeps Google Sheets writes (POST to the Apps Script endpoint)
   // out of the SW entirely — those are handled by js/sync-queue.js instead.
   if (request.method !== 'GET') return;
+  if (new URL(request.url).pathname.startsWith(CONTENT_CHUNK_PATH)) return;
 
   // The old cache-first navigation path meant the cached HTML continued to
   // request yesterday's ?v= modules on the first visit after every deploy.
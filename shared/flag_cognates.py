@@ -3,10 +3,19 @@ Shared cognate detection logic used by both artist and normal-mode pipelines.
 
 Scores Spanish-English cognate similarity (0.0–1.0) via:
 1. Suffix transformation rules → 1.0 (ción→tion, dad→ty, amente→ly, ar→ate, etc.)
-2. String similarity via SequenceMatcher
+2. String similarity via SequenceMatcher's ratio
 3. Phonetic normalization — English digraphs (ph→f, th→t, qu→cu, y→i)
    and Spanish prosthetic-e stripping (especial→special) before comparison
 
+`cognate_score` runs for every (form, gloss) pair of every sense, so the hot
+path is compiled: SUFFIX_RULES become a reversed-suffix trie, the ratio is
+`sequence_ratio` (difflib's own matching-block algorithm without the
+SequenceMatcher object overhead, skipped outright when its upper bound cannot
+beat the best ratio so far), and scores are memoized per (spanish, english)
+pair for the life of the process. Scores are identical to the plain difflib
+formulation; `pipeline/bench_cognate_score.py` checks that and measures
+throughput.
+
 Scores are stored in the cognates.json layer. The front-end filters at a
 user-chosen threshold, so there is no hardcoded pass/fail cutoff here.
 
@@ -90,6 +99,16 @@ def _strip_prosthetic_e(w):
     return w
 
 
+_NORMALIZED = {}
+
+
+def _normalized(s):
+    n = _NORMALIZED.get(s)
+    if n is None:
+        n = _NORMALIZED[s] = normalize(s)
+    return n
+
+
 def apply_suffix(w, src, dst):
     # type: (str, str, str) -> Optional[str]
     if w.endswith(src) and len(w) > len(src):
@@ -97,6 +116,70 @@ def apply_suffix(w, src, dst):
     return None
 
 
+# difflib turns on its "popular element" heuristic at this length of the
+# second sequence; below it, SequenceMatcher(None, a, b) has no junk at all.
+_AUTOJUNK_MIN = 200
+
+
+def _matching_size(a, b):
+    """Total size of SequenceMatcher(None, a, b).get_matching_blocks().
+
+    The same recursion difflib uses: take the longest common block (the first
+    one found scanning `a` then `b`, which is what makes the total
+    reproducible), then recurse on either side of it.
+    """
+    b2j = {}
+    for j, c in enumerate(b):
+        b2j.setdefault(c, []).append(j)
+    total = 0
+    queue = [(0, len(a), 0, len(b))]
+    while queue:
+        alo, ahi, blo, bhi = queue.pop()
+        besti = bestj = bestsize = 0
+        j2len = {}
+        for i in range(alo, ahi):
+            newj2len = {}
+            for j in b2j.get(a[i], ()):
+                if j < blo:
+                    continue
+                if j >= bhi:
+                    break
+                k = newj2len[j] = j2len.get(j - 1, 0) + 1
+                if k > bestsize:
+                    besti, bestj, bestsize = i - k + 1, j - k + 1, k
+            j2len = newj2len
+        if bestsize:
+            total += bestsize
+            if alo < besti and blo < bestj:
+                queue.append((alo, besti, blo, bestj))
+            if besti + bestsize < ahi and bestj + bestsize < bhi:
+                queue.append((besti + bestsize, ahi, bestj + bestsize, bhi))
+    return total
+
+
+def sequence_ratio(a, b):
+    # type: (str, str) -> float
+    """Exactly ``difflib.SequenceMatcher(None, a, b).ratio()``."""
+    if len(b) >= _AUTOJUNK_MIN:
+        return difflib.SequenceMatcher(None, a, b).ratio()
+    length = len(a) + len(b)
+    if not length:
+        return 1.0
+    return 2.0 * _matching_size(a, b) / length
+
+
+def _improves(best, a, b):
+    """Ratio of (a, b) if it could exceed `best`, else `best` unchanged.
+
+    2·min(len)/(len a + len b) bounds the ratio from above, so when it cannot
+    beat `best` the ratio is never computed; max() is unaffected either way.
+    """
+    length = len(a) + len(b)
+    if 2.0 * min(len(a), len(b)) / length <= best:
+        return best
+    return max(best, sequence_ratio(a, b))
+
+
 # Suffix mapping: (spanish_suffix, english_suffix)
 # Order matters — more specific suffixes first to avoid partial matches
 SUFFIX_RULES = [
@@ -165,6 +248,43 @@ SUFFIX_RULES = [
 ]
 
 
+def _compile_suffix_trie(rules):
+    """SUFFIX_RULES keyed by reversed Spanish suffix: one walk finds them all.
+
+    Each node maps the next character from the end of the word to a child;
+    the "" key (never a character) lists the English suffixes of every rule
+    whose Spanish suffix ends at that node.
+    """
+    trie = {}
+    for es_suffix, en_suffix in rules:
+        node = trie
+        for c in reversed(es_suffix):
+            node = node.setdefault(c, {})
+        node.setdefault("", []).append(en_suffix)
+    return trie
+
+
+_SUFFIX_TRIE = _compile_suffix_trie(SUFFIX_RULES)
+
+
+def _suffix_rule_matches(w, e, e0):
+    """True if any SUFFIX_RULES transform of `w` equals `e` or `e0`.
+
+    Same test as ``apply_suffix(w, src, dst) in (e0, e)`` over every rule,
+    including its requirement that a stem remains (len(w) > len(src)).
+    """
+    node = _SUFFIX_TRIE
+    for depth in range(1, len(w)):
+        node = node.get(w[-depth])
+        if node is None:
+            return False
+        for en_suffix in node.get("", ()):
+            result = w[:-depth] + en_suffix
+            if result == e0 or result == e:
+                return True
+    return False
+
+
 def split_english_glosses(translation):
     # type: (str) -> list
     """
@@ -194,6 +314,9 @@ def split_english_glosses(translation):
     return out
 
 
+_SCORES = {}
+
+
 def cognate_score(spanish, english):
     # type: (str, str) -> float
     """Return cognate similarity score (0.0–1.0) for a Spanish/English pair.
@@ -202,8 +325,16 @@ def cognate_score(spanish, english):
     <1.0 = best SequenceMatcher ratio (raw or phonetically normalized).
     0.0 = too short or no meaningful similarity.
     """
-    s = normalize(spanish)
-    e = normalize(english)
+    key = (spanish, english)
+    score = _SCORES.get(key)
+    if score is None:
+        score = _SCORES[key] = _cognate_score(spanish, english)
+    return score
+
+
+def _cognate_score(spanish, english):
+    s = _normalized(spanish)
+    e = _normalized(english)
 
     if len(s) < 4 or len(e) < 4:
         return 0.0
@@ -220,10 +351,8 @@ def cognate_score(spanish, english):
     # can incorrectly strip a terminal 's' that's part of the word itself
     # (e.g. "famous" → "famou"), so we need to also compare against the
     # pre-strip form to catch cases like famoso → famous.
-    for es_suffix, en_suffix in SUFFIX_RULES:
-        result = apply_suffix(s0, es_suffix, en_suffix)
-        if result is not None and (result == e0 or result == e):
-            return 1.0
+    if _suffix_rule_matches(s0, e, e0):
+        return 1.0
 
     # Also try with prosthetic-e stripped from Spanish (especial→special)
     s1 = _strip_prosthetic_e(s0)
@@ -232,13 +361,11 @@ def cognate_score(spanish, english):
     if s1 != s0:
         if s1 == e0:
             return 1.0
-        for es_suffix, en_suffix in SUFFIX_RULES:
-            result = apply_suffix(s1, es_suffix, en_suffix)
-            if result is not None and (result == e0 or result == e):
-                return 1.0
+        if _suffix_rule_matches(s1, e, e0):
+            return 1.0
 
     # Similarity: best of raw and phonetically-normalized ratios.
-    best = difflib.SequenceMatcher(None, s0, e0).ratio()
+    best = sequence_ratio(s0, e0)
 
     # Phonetic normalization: English digraphs (ph, th, qu, y-as-vowel) break
     # SequenceMatcher alignment.  Length guard: only for 6+ char words to
@@ -247,11 +374,11 @@ def cognate_score(spanish, english):
         e_phon = _phonetic_normalize_en(e0)
         # Try all combos: raw-sp × phon-en, stripped-sp × raw-en, stripped-sp × phon-en
         if e_phon != e0:
-            best = max(best, difflib.SequenceMatcher(None, s0, e_phon).ratio())
+            best = _improves(best, s0, e_phon)
         if s1 != s0:
-            best = max(best, difflib.SequenceMatcher(None, s1, e0).ratio())
+            best = _improves(best, s1, e0)
             if e_phon != e0:
-                best = max(best, difflib.SequenceMatcher(None, s1, e_phon).ratio())
+                best = _improves(best, s1, e_phon)
 
     return round(best, 3)
 
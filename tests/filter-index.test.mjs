@@ -0,0 +1,154 @@
+import assert from 'node:assert/strict';
+import { spawnSync } from 'node:child_process';
+import { createHash } from 'node:crypto';
+import { mkdtemp, readFile, rm, writeFile } from 'node:fs/promises';
+import { tmpdir } from 'node:os';
+import { join, resolve } from 'node:path';
+import test from 'node:test';
+
+const root = resolve(import.meta.dirname, '..');
+const source = await readFile(resolve(root, 'js/filter-index-core.js'), 'utf8');
+const {
+    decodeFilterIndex,
+    filterIndexPath,
+    hasRank,
+    hiddenReason,
+    idsOf,
+    isCurrent,
+    ranksOf,
+    visibleSet
+} = await import(`data:text/javascript;base64,${Buffer.from(source).toString('base64')}`);
+
+function deck(count) {
+    const index = [];
+    const master = {};
+    for (let n = 0; n < count; n++) {
+        const id = n.toString(16).padStart(6, '0');
+        const senses = [
+            { pos: n % 7 === 0 ? 'PROPN' : 'NOUN', translation: n % 11 === 0 ? '' : 'thing' },
+            ...(n % 3 === 0 ? [{ pos: 'PROPN', translation: 'Name' }] : [])
+        ];
+        if (n % 29 !== 0) {
+            master[id] = {
+                word: `w${n}`,
+                senses,
+                is_english: n % 13 === 0,
+                is_noise: n % 17 === 0,
+                is_english_loanword: n % 19 === 0,
+                is_propernoun_corpus: n % 23 === 0,
+                cognate_score: (n % 10) / 10
+            };
+        }
+        index.push({
+            id,
+            corpus_count: n % 5,
+            sense_frequencies: senses.map((_, i) => (n + i) % 4 === 0 ? 0 : 0.5)
+        });
+    }
+    return { index, master };
+}
+
+// Cards that reach the flag checks of buildFilteredVocab() on joined entries,
+// Main scope: a translated sense, or a one-off artist form.
+function candidates(index, master, { artist }) {
+    return index.filter(idx => {
+        const m = master[idx.id];
+        if (!m) return false;
+        return m.senses.some(sense => sense.translation.trim()) || (artist && idx.corpus_count <= 1);
+    });
+}
+
+// The flag checks themselves, with the count each dropped card adds to.
+function scan(index, master, { artist, cognateThreshold }) {
+    const kept = [];
+    const counts = { english: 0, cognates: 0, singleOcc: 0 };
+    for (const idx of candidates(index, master, { artist })) {
+        const m = master[idx.id];
+        const meanings = m.senses
+            .map((sense, i) => ({ ...sense, frequency: idx.sense_frequencies[i] }))
+            .filter(meaning => meaning.translation.trim());
+        if (artist) {
+            if (m.is_english || m.is_noise || m.is_english_loanword) { counts.english++; continue; }
+            const allPropn = meanings.length > 0 && meanings.every(meaning => meaning.pos === 'PROPN');
+            if (m.is_propernoun_corpus || allPropn) { counts.english++; continue; }
+            if (idx.corpus_count > 1 && !meanings.some(meaning => meaning.frequency >= 0.05)) {
+                counts.singleOcc++;
+                continue;
+            }
+        }
+        if (m.cognate_score >= cognateThreshold) { counts.cognates++; continue; }
+        kept.push(idx.id);
+    }
+    return { kept, counts };
+}
+
+const sha256 = async path => createHash('sha256').update(await readFile(path)).digest('hex');
+
+test('the shipped bitsets give the cards the per-entry filter keeps', async () => {
+    const dir = await mkdtemp(join(tmpdir(), 'filter-index-'));
+    try {
+        const { index, master } = deck(2000);
+        const indexPath = join(dir, 'Deckvocabulary.index.json');
+        const masterPath = join(dir, 'vocabulary_master.json');
+        await writeFile(indexPath, JSON.stringify(index));
+        await writeFile(masterPath, JSON.stringify(master));
+        const run = spawnSync('python3', [resolve(root, 'pipeline/util_8a_filter_index.py'), indexPath,
+                                          '--master', masterPath], { encoding: 'utf8' });
+        assert.equal(run.status, 0, run.stderr);
+
+        const filterIndex = decodeFilterIndex(JSON.parse(await readFile(filterIndexPath(indexPath), 'utf8')));
+        assert.deepEqual(filterIndex.ids, index.map(idx => idx.id));
+        for (const cognateThreshold of [0.75, 0.85, 0.95]) {
+            for (const artist of [true, false]) {
+                const expected = scan(index, master, { artist, cognateThreshold });
+                assert.ok(expected.kept.length > 100);
+                const visible = visibleSet(filterIndex, { artist, cognateThreshold });
+                assert.deepEqual(idsOf(filterIndex, visible), expected.kept);
+
+                // buildFilteredVocab() counts the cards it drops by reason.
+                const counts = { english: 0, cognates: 0, singleOcc: 0 };
+                for (const idx of candidates(index, master, { artist })) {
+                    const rank = filterIndex.ids.indexOf(idx.id);
+                    if (!hasRank(visible, rank)) {
+                        counts[hiddenReason(filterIndex, rank, { artist, cognateThreshold })]++;
+                    }
+                }
+                assert.deepEqual(counts, expected.counts);
+            }
+        }
+        assert.equal(visibleSet(filterIndex, { cognateThreshold: 0.8 }), null);
+
+        const sources = { index: await sha256(indexPath), master: await sha256(masterPath) };
+        assert.ok(isCurrent(filterIndex, sources));
+        assert.ok(!isCurrent(filterIndex, { index: sources.index }));
+        // The master is stamped after assembly: the bitsets no longer apply.
+        master[index[1].id].is_english_loanword = true;
+        await writeFile(masterPath, JSON.stringify(master));
+        assert.ok(!isCurrent(filterIndex, { ...sources, master: await sha256(masterPath) }));
+        assert.ok(!isCurrent(null, sources));
+    } finally {
+        await rm(dir, { recursive: true, force: true });
+    }
+});
+
+test('ranks come back in order across word boundaries', () => {
+    const set = new Uint32Array([0x80000001, 0, 0x00000004]);
+    assert.deepEqual(ranksOf(set), [0, 31, 66]);
+    assert.equal(filterIndexPath('Data/Spanish/vocabulary.index.json'), 'Data/Spanish/vocabulary.filter.json');
+    assert.equal(filterIndexPath('Data/Spanish/vocabulary.json'), null);
+});
+
+test('the level estimate reads rank order from the filter index', async () => {
+    const vocab = await readFile(resolve(root, 'js/vocab.js'), 'utf8');
+    assert.match(vocab, /joinedIndexCacheByPath\.has\(indexPath\) \? null : await fetchFilterIndex\(normalConfig\)/);
+    assert.match(vocab, /\(await fetchAndJoinIndex\(normalConfig\)\)\.map\(entry => entry\.id\)/);
+});
+
+test('buildFilteredVocab takes the flag checks from a current filter index', async () => {
+    const vocab = await readFile(resolve(root, 'js/vocab.js'), 'utf8');
+    assert.match(vocab, /sources\.master = masterSha256ByObject\.get\(window\._cachedMasterVocab\)/);
+    assert.match(vocab, /if \(!isCurrent\(filterIndex, sources\)\) return;/);
+    assert.match(vocab, /const place = useFilterIndex \? filterPlaceByEntry\.get\(item\) : undefined;/);
+    assert.match(vocab, /counts\[hiddenReason\(place\.index, place\.rank, visibleOptions\)\]\+\+;/);
+    assert.match(vocab, /const useFilterIndex = !\(activeArtist && artistVocabularyScope === 'extra'\);/);
+});
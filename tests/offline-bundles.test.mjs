@@ -0,0 +1,117 @@
+import assert from 'node:assert/strict';
+import { spawnSync } from 'node:child_process';
+import { mkdtemp, readdir, readFile, rm, writeFile } from 'node:fs/promises';
+import { tmpdir } from 'node:os';
+import { join, resolve } from 'node:path';
+import test from 'node:test';
+
+const root = resolve(import.meta.dirname, '..');
+const source = await readFile(resolve(root, 'js/offline-bundles-core.js'), 'utf8');
+const {
+    chunkLayout,
+    concatChunks,
+    installedChunks,
+    planFile,
+    updateBytes
+} = await import(`data:text/javascript;base64,${Buffer.from(source).toString('base64')}`);
+
+function deck(count, edit = {}) {
+    return Array.from({ length: count }, (_, n) => ({
+        id: n.toString(16).padStart(6, '0'),
+        word: edit[n] || `w${n}`,
+        senses: [{ gloss: 'x'.repeat(40 + (n * 37) % 300), note: 'commas, "quotes" and ]brackets{' }]
+    }));
+}
+
+// The chunk records scripts/offline_bundles.py writes into the manifest.
+async function chunked(dir, name, cards) {
+    const path = join(dir, name);
+    const body = Buffer.from(JSON.stringify(cards));
+    await writeFile(path, body);
+    const run = spawnSync('python3', [resolve(root, 'scripts/offline_bundles.py'), path, '--target-kb', '32'],
+                          { encoding: 'utf8' });
+    assert.equal(run.status, 0, run.stderr);
+    const file = { path: 'Data/deck.index.json', bytes: body.length, chunks: JSON.parse(run.stdout) };
+    return { body: new Uint8Array(body), file };
+}
+
+test('an update reuses the installed chunks and fetches only the changed ones', async () => {
+    const dir = await mkdtemp(join(tmpdir(), 'offline-bundles-'));
+    try {
+        const before = await chunked(dir, 'v1.json', deck(6000));
+        const after = await chunked(dir, 'v2.json', deck(6000, { 2500: 'corrected' }));
+        assert.ok(before.file.chunks.length > 20);
+        assert.equal(before.file.chunks.reduce((sum, c) => sum + c.bytes, 0), before.body.byteLength);
+
+        const layout = chunkLayout({ files: [before.file] });
+        const plan = planFile(after.file, installedChunks(layout));
+        const fetched = plan.filter(part => !part.from);
+        assert.equal(fetched.length, 1);
+
+        // What the client does: slice reused chunks out of the installed file
+        // and take the rest from the server.
+        let offset = 0;
+        const served = new Map();
+        for (const chunk of after.file.chunks) {
+            served.set(chunk.sha256, after.body.subarray(offset, offset + chunk.bytes));
+            offset += chunk.bytes;
+        }
+        const parts = plan.map(part => part.from
+            ? before.body.subarray(part.from.start, part.from.end)
+            : served.get(part.sha256));
+        assert.deepEqual(concatChunks(parts), after.body);
+
+        const source = { files: [after.file, { path: 'Data/songs.json', bytes: 900 }] };
+        assert.equal(updateBytes(source, layout), fetched[0].bytes + 900);
+        assert.equal(updateBytes(source, null), after.body.byteLength + 900);
+    } finally {
+        await rm(dir, { recursive: true, force: true });
+    }
+});
+
+test('files without chunks keep the whole-file download', async () => {
+    assert.equal(planFile({ path: 'a.json', bytes: 10 }, new Map()), null);
+    assert.deepEqual(chunkLayout({ files: [{ path: 'a.json', bytes: 10 }] }), {});
+    const [worker, content] = await Promise.all([
+        readFile(resolve(root, 'service-worker.js'), 'utf8'),
+        readFile(resolve(root, 'js/offline-content.js'), 'utf8')
+    ]);
+    assert.match(content, /assembled\?\.response \|\| await fetchWholeFile/);
+    assert.match(worker, /startsWith\(CONTENT_CHUNK_PATH\)\) return;/);
+});
+
+test('a rebuild prunes chunks only older manifests reference', async () => {
+    const dir = await mkdtemp(join(tmpdir(), 'offline-chunks-'));
+    try {
+        const sha = n => n.toString(16).repeat(64);
+        const manifest = (...shas) => ({
+            sources: [{ files: [{ chunks: shas.map(s => ({ sha256: sha(s), bytes: 1 })) }] }]
+        });
+        for (const n of [1, 2, 3]) await writeFile(join(dir, `${sha(n)}.json`), 'x');
+        await writeFile(join(dir, 'notes.json'), '{}');
+        const script = [
+            'import json, sys',
+            `sys.path.insert(0, ${JSON.stringify(resolve(root, 'scripts'))})`,
+            'from offline_bundles import prune_chunks',
+            'print(prune_chunks(json.loads(sys.argv[1]), sys.argv[2]))'
+        ].join('\n');
+        // The replaced manifest listed 1 and 2, the new one lists 2: only 3 goes.
+        const run = spawnSync('python3', ['-c', script, JSON.stringify([manifest(1, 2), manifest(2)]), dir],
+                              { encoding: 'utf8' });
+        assert.equal(run.status, 0, run.stderr);
+        assert.equal(run.stdout.trim(), '1');
+        assert.deepEqual((await readdir(dir)).sort(), [`${sha(1)}.json`, `${sha(2)}.json`, 'notes.json']);
+    } finally {
+        await rm(dir, { recursive: true, force: true });
+    }
+});
+
+test('a chunk that cannot be fetched falls back to the whole file', async () => {
+    const content = await readFile(resolve(root, 'js/offline-content.js'), 'utf8');
+    const assemble = content.slice(content.indexOf('async function assembleFile'),
+                                   content.indexOf('async function fetchWholeFile'));
+    assert.doesNotMatch(assemble, /throw new Error/);
+    assert.match(assemble, /if \(!response\.ok\) return null;/);
+    assert.match(assemble, /await sha256Hex\(body\) !== part\.sha256\) return null;/);
+    assert.match(assemble, /if \(signal\?\.aborted\) throw error;/);
+});
@@ -17,6 +17,9 @@ test('offline manifest files have exact sizes and checksums', async () => {
             const body = await readFile(resolve(root, file.path));
             assert.equal(body.byteLength, file.bytes, file.path);
             assert.equal(createHash('sha256').update(body).digest('hex'), file.sha256, file.path);
+            if (file.chunks) {
+                assert.equal(file.chunks.reduce((sum, chunk) => sum + chunk.bytes, 0), file.bytes, file.path);
+            }
         }
     }
 });